@@ -40,6 +40,12 @@ from .events import (
 )
 from .providers import LLMMessage, LLMProvider
 from .tools.base import AgentTool, ToolResult
+from .tools.concurrency import (
+    DEFAULT_MAX_PARALLEL_TOOLS,
+    batch_tool_calls,
+    is_concurrency_safe,
+    run_batch,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -79,6 +85,7 @@ class AgentOptions:
     transform_context: Callable[[list[LLMMessage]], list[LLMMessage]] | None = None
     steering_mode: Literal["all", "one-at-a-time"] = "one-at-a-time"
     follow_up_mode: Literal["all", "one-at-a-time"] = "one-at-a-time"
+    max_parallel_tools: int = DEFAULT_MAX_PARALLEL_TOOLS
 
 
 def default_convert_to_llm(messages: list[AgentMessage]) -> list[LLMMessage]:
@@ -487,99 +494,101 @@ class AgentLoop:
     
     async def execute_tool_calls(self, tool_calls: list[dict[str, Any]]) -> None:
         """
-        Execute tool calls sequentially with progress tracking
+        Execute tool calls with progress tracking
+        
+        Consecutive calls of concurrency-safe tools run concurrently (at most
+        ``options.max_parallel_tools`` at once); every other call runs alone.
+        Start/end events and tool results always follow call order.
         
         Args:
             tool_calls: List of tool calls to execute
         """
-        for tool_call in tool_calls:
-            # Check for steering before each tool
+        batches = batch_tool_calls(
+            tool_calls, lambda tc: is_concurrency_safe(self.tools.get(tc["name"]))
+        )
+        for batch in batches:
+            # Check for steering before each batch
             if self.state.steering_queue:
                 logger.info("Steering detected, stopping tool execution")
                 break
             
-            tool_call_id = tool_call["id"]
-            tool_name = tool_call["name"]
-            params = tool_call.get("params", {})
-            
-            # Create progress callback for this tool execution
-            async def progress_callback(current: int, total: int, message: str = ""):
-                """Progress callback for long-running tools"""
-                await self.event_emitter.emit(ToolExecutionUpdateEvent(
-                    tool_call_id=tool_call_id,
-                    tool_name=tool_name,
-                    progress=current / total if total > 0 else 0,
-                    message=message
+            # Emit tool execution start
+            for tool_call in batch:
+                await self.event_emitter.emit(ToolExecutionStartEvent(
+                    tool_name=tool_call["name"],
+                    tool_call_id=tool_call["id"],
+                    params=tool_call.get("params", {})
                 ))
             
-            # Emit tool execution start
-            await self.event_emitter.emit(ToolExecutionStartEvent(
+            results = await run_batch(batch, self._invoke_tool, self.options.max_parallel_tools)
+            
+            for tool_call, result in zip(batch, results):
+                await self._finish_tool_call(tool_call["id"], result)
+    
+    async def _invoke_tool(self, tool_call: dict[str, Any]) -> ToolResult:
+        """Run one tool call; raises if the tool is unknown or fails"""
+        tool_call_id = tool_call["id"]
+        tool_name = tool_call["name"]
+        params = tool_call.get("params", {})
+        
+        tool = self.tools.get(tool_name)
+        if not tool:
+            raise LookupError(f"Tool '{tool_name}' not found")
+        
+        # Create progress callback for this tool execution
+        async def progress_callback(current: int, total: int, message: str = ""):
+            """Progress callback for long-running tools"""
+            await self.event_emitter.emit(ToolExecutionUpdateEvent(
+                tool_call_id=tool_call_id,
                 tool_name=tool_name,
+                progress=current / total if total > 0 else 0,
+                message=message
+            ))
+        
+        # Execute tool with progress callback if supported
+        if hasattr(tool, 'execute_with_progress'):
+            return await tool.execute_with_progress(params, progress_callback)
+        return await tool.execute(params)
+    
+    async def _finish_tool_call(self, tool_call_id: str, result: ToolResult | BaseException) -> None:
+        """Emit the end event and record the tool result message"""
+        if isinstance(result, BaseException):
+            error_msg = str(result)
+            if isinstance(result, LookupError):
+                logger.error(error_msg)
+            else:
+                logger.error(f"Tool execution error: {result}", exc_info=result)
+            
+            # Emit error
+            await self.event_emitter.emit(ToolExecutionEndEvent(
                 tool_call_id=tool_call_id,
-                params=params
+                success=False,
+                error=error_msg
             ))
             
-            try:
-                # Get tool
-                tool = self.tools.get(tool_name)
-                if not tool:
-                    error_msg = f"Tool '{tool_name}' not found"
-                    logger.error(error_msg)
-                    
-                    # Emit error
-                    await self.event_emitter.emit(ToolExecutionEndEvent(
-                        tool_call_id=tool_call_id,
-                        success=False,
-                        error=error_msg
-                    ))
-                    
-                    # Add error result to messages
-                    self.state.messages.append(AgentMessage(
-                        role="toolResult",
-                        tool_call_id=tool_call_id,
-                        content=f"Error: {error_msg}"
-                    ))
-                    continue
-                
-                # Execute tool with progress callback if supported
-                if hasattr(tool, 'execute_with_progress'):
-                    result: ToolResult = await tool.execute_with_progress(params, progress_callback)
-                else:
-                    result: ToolResult = await tool.execute(params)
-                
-                # Emit tool execution end
-                await self.event_emitter.emit(ToolExecutionEndEvent(
-                    tool_call_id=tool_call_id,
-                    success=result.success,
-                    result=result.content if result.success else None,
-                    error=result.error if not result.success else None
-                ))
-                
-                # Add result to messages
-                result_content = result.content if result.success else f"Error: {result.error}"
-                self.state.messages.append(AgentMessage(
-                    role="toolResult",
-                    tool_call_id=tool_call_id,
-                    content=result_content
-                ))
-                
-            except Exception as e:
-                error_msg = str(e)
-                logger.error(f"Tool execution error: {e}", exc_info=True)
-                
-                # Emit error
-                await self.event_emitter.emit(ToolExecutionEndEvent(
-                    tool_call_id=tool_call_id,
-                    success=False,
-                    error=error_msg
-                ))
-                
-                # Add error result
-                self.state.messages.append(AgentMessage(
-                    role="toolResult",
-                    tool_call_id=tool_call_id,
-                    content=f"Error: {error_msg}"
-                ))
+            # Add error result
+            self.state.messages.append(AgentMessage(
+                role="toolResult",
+                tool_call_id=tool_call_id,
+                content=f"Error: {error_msg}"
+            ))
+            return
+        
+        # Emit tool execution end
+        await self.event_emitter.emit(ToolExecutionEndEvent(
+            tool_call_id=tool_call_id,
+            success=result.success,
+            result=result.content if result.success else None,
+            error=result.error if not result.success else None
+        ))
+        
+        # Add result to messages
+        result_content = result.content if result.success else f"Error: {result.error}"
+        self.state.messages.append(AgentMessage(
+            role="toolResult",
+            tool_call_id=tool_call_id,
+            content=result_content
+        ))
     
     def steer(self, message: str) -> None:
         """
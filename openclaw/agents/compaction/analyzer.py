@@ -3,16 +3,28 @@ Token analysis for context management
 """
 
 import logging
-from typing import Any
+from typing import Any, Protocol
 
 logger = logging.getLogger(__name__)
 
+# Per-message overhead for role and framing (2-4 tokens in practice)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class Tokenizer(Protocol):
+    """Anything with an ``encode`` returning a token sequence (e.g. tiktoken)"""
+
+    def encode(self, text: str) -> Any: ...
+
 
 class TokenAnalyzer:
     """
     Analyze token usage in messages
 
-    Provides accurate token counting for different models
+    Provides accurate token counting for different models. A real tokenizer
+    is used when one is installed locally (tiktoken for GPT models) or
+    plugged in via ``tokenizer``/``set_tokenizer``; otherwise counts fall
+    back to a per-character estimate.
     """
 
     # Approximate tokens per character for different models
@@ -23,15 +35,32 @@ class TokenAnalyzer:
         "default": 0.25,  # Default estimate
     }
 
-    def __init__(self, model_name: str = "default"):
+    def __init__(self, model_name: str = "default", tokenizer: Tokenizer | None = None):
         """
         Initialize analyzer
 
         Args:
             model_name: Model name for token estimation
+            tokenizer: Tokenizer to use instead of the model's default one
         """
         self.model_name = model_name
-        self._tokenizer = None
+        self._tokenizer = tokenizer
+        if tokenizer is None:
+            self._load_tokenizer()
+
+    @property
+    def has_tokenizer(self) -> bool:
+        """Whether counts come from a real tokenizer rather than an estimate"""
+        return self._tokenizer is not None
+
+    def set_tokenizer(self, tokenizer: Tokenizer | None) -> None:
+        """
+        Plug in a tokenizer (or None to fall back to estimation)
+
+        Counts already recorded by a session ledger are not recomputed
+        unless the session is handed a new counter.
+        """
+        self._tokenizer = tokenizer
 
     def estimate_tokens(self, text: str) -> int:
         """
@@ -69,23 +98,33 @@ class TokenAnalyzer:
         Returns:
             Estimated total token count
         """
-        total = 0
-
-        for msg in messages:
-            # Count role tokens (2-4 tokens per message overhead)
-            total += 4
-
-            # Count content tokens
-            content = msg.get("content", "")
-            if isinstance(content, str):
-                total += self.estimate_tokens(content)
-            elif isinstance(content, list):
-                for item in content:
-                    if isinstance(item, dict):
-                        if "text" in item:
-                            total += self.estimate_tokens(item["text"])
-                        elif "content" in item:
-                            total += self.estimate_tokens(str(item["content"]))
+        return sum(self.count_message_tokens(msg) for msg in messages)
+
+    def count_message_tokens(self, message: dict[str, Any]) -> int:
+        """
+        Estimate token count for a single message
+
+        This is the per-message term of ``estimate_messages_tokens``, so a
+        running total built from it matches a full recount.
+
+        Args:
+            message: Message dict
+
+        Returns:
+            Estimated token count including per-message overhead
+        """
+        total = MESSAGE_OVERHEAD_TOKENS
+
+        content = message.get("content", "")
+        if isinstance(content, str):
+            total += self.estimate_tokens(content)
+        elif isinstance(content, list):
+            for item in content:
+                if isinstance(item, dict):
+                    if "text" in item:
+                        total += self.estimate_tokens(item["text"])
+                    elif "content" in item:
+                        total += self.estimate_tokens(str(item["content"]))
 
         return total
 
@@ -774,7 +774,11 @@ class ContextWindow:
     
     def add_tokens(self, count: int) -> None:
         """Add tokens to current count"""
-        self.current_tokens += int(count)
+        self.set_tokens(self.current_tokens + int(count))
+    
+    def set_tokens(self, count: int) -> None:
+        """Set current count (e.g. from a session's token ledger)"""
+        self.current_tokens = int(count)
         self.should_compress = self.current_tokens > int(self.max_tokens * 0.8)
     
     def reset(self) -> None:
@@ -796,6 +800,10 @@ class ContextManager:
     Context manager for agent runtime.
     
     Manages message history and context windows across sessions.
+    
+    Feed each session's running token total (``Session.token_count``) to
+    ``update_session`` to keep its window current without recounting the
+    history; ``remaining_tokens`` then reports the exact budget left.
     """
     
     def __init__(self, default_window_size: int = 32000):
@@ -813,6 +821,30 @@ class ContextManager:
         if session_id in self.windows:
             self.windows[session_id].reset()
     
+    def update_session(
+        self, session_id: str, token_count: int, max_tokens: int | None = None
+    ) -> ContextWindow:
+        """
+        Record a session's current token count.
+        
+        Args:
+            session_id: Session identifier
+            token_count: Tokens currently in the session history
+            max_tokens: Optional window size override for this session
+            
+        Returns:
+            The session's ContextWindow
+        """
+        window = self.get_window(session_id)
+        if max_tokens and max_tokens != window.max_tokens:
+            window.max_tokens = window.total_tokens = int(max_tokens)
+        window.set_tokens(token_count)
+        return window
+    
+    def remaining_tokens(self, session_id: str) -> int:
+        """Tokens left in a session's window"""
+        return self.get_window(session_id).available()
+    
     def clear_session(self, session_id: str) -> None:
         """Clear session context"""
         if session_id in self.windows:
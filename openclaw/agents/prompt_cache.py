@@ -0,0 +1,94 @@
+"""
+Prefix-stable request layout for provider prompt caching
+
+Providers cache a prompt by prefix: a request reuses the cached work only
+up to the first byte that differs from an earlier request. A request is
+therefore laid out as
+
+    [stable system prompt] [history ...] [volatile system note]
+
+with cache breakpoints after the system prompt and after the last history
+message. Per-call content (the current time) goes last so it never
+invalidates the prefix, and history is truncated in blocks rather than one
+message per turn so its first message stays put for several turns.
+"""
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import TypeVar
+
+from .providers.base import LLMMessage
+
+T = TypeVar("T")
+
+# Older messages are dropped this many at a time when history is truncated
+DEFAULT_HISTORY_STEP = 10
+
+
+def stable_history_window(
+    messages: list[T], limit: int, step: int = DEFAULT_HISTORY_STEP
+) -> list[T]:
+    """
+    Keep system messages plus at most ``limit`` recent conversation messages
+
+    Unlike a plain ``[-limit:]`` slice, the cut point only advances in
+    multiples of ``step``, so the kept history starts with the same message
+    for ``step`` consecutive appends and the request prefix stays cacheable.
+    Between ``limit - step + 1`` and ``limit`` messages are kept.
+
+    Args:
+        messages: Session messages (anything with a ``role`` attribute)
+        limit: Maximum conversation messages to keep
+        step: Granularity of the cut point
+
+    Returns:
+        System messages followed by the kept conversation, in order
+    """
+    system = [m for m in messages if m.role == "system"]
+    conversation = [m for m in messages if m.role != "system"]
+    if len(conversation) <= limit:
+        return system + conversation
+
+    step = max(1, min(step, limit))
+    overflow = len(conversation) - limit
+    start = -(-overflow // step) * step
+    return system + conversation[start:]
+
+
+def apply_cache_layout(
+    messages: list[LLMMessage], volatile: str | None, supports_caching: bool
+) -> list[LLMMessage]:
+    """
+    Mark cache breakpoints and place per-call system content
+
+    Args:
+        messages: Request messages, leading system prompt first
+        volatile: Per-call system text (may be empty)
+        supports_caching: ``LLMProvider.supports_prompt_caching``
+
+    Returns:
+        New message list; the input messages are not modified
+    """
+    laid_out = list(messages)
+    if not supports_caching:
+        # No cached prefix to protect: fold the note into the system prompt
+        if volatile:
+            if laid_out and laid_out[0].role == "system":
+                first = laid_out[0]
+                laid_out[0] = replace(first, content=f"{first.content}\n{volatile}")
+            else:
+                laid_out.insert(0, LLMMessage(role="system", content=volatile))
+        return laid_out
+
+    leading_system = 0
+    while leading_system < len(laid_out) and laid_out[leading_system].role == "system":
+        leading_system += 1
+    if leading_system:
+        index = leading_system - 1
+        laid_out[index] = replace(laid_out[index], cache_breakpoint=True)
+    if len(laid_out) > leading_system:
+        laid_out[-1] = replace(laid_out[-1], cache_breakpoint=True)
+
+    if volatile:
+        laid_out.append(LLMMessage(role="system", content=volatile))
+    return laid_out
@@ -5,6 +5,7 @@ Anthropic Claude provider implementation
 import logging
 import os
 from collections.abc import AsyncIterator
+from typing import Any
 
 from anthropic import AsyncAnthropic
 
@@ -12,6 +13,8 @@ from .base import LLMMessage, LLMProvider, LLMResponse
 
 logger = logging.getLogger(__name__)
 
+_EPHEMERAL = {"type": "ephemeral"}
+
 
 class AnthropicProvider(LLMProvider):
     """
@@ -28,6 +31,10 @@ class AnthropicProvider(LLMProvider):
     def provider_name(self) -> str:
         return "anthropic"
 
+    @property
+    def supports_prompt_caching(self) -> bool:
+        return True
+
     def get_client(self) -> AsyncAnthropic:
         """Get Anthropic client"""
         if self._client is None:
@@ -39,6 +46,38 @@ class AnthropicProvider(LLMProvider):
 
         return self._client
 
+    def _format_messages(
+        self, messages: list[LLMMessage]
+    ) -> tuple[list[dict[str, Any]] | None, list[dict[str, Any]]]:
+        """
+        Convert messages to Anthropic's system blocks and message list
+
+        Leading system messages become system blocks. System messages after
+        the conversation has started (per-call notes placed after the cached
+        prefix) are sent as user text, since Anthropic only accepts a system
+        prompt up front. ``cache_breakpoint`` becomes ``cache_control``.
+        """
+        system: list[dict[str, Any]] = []
+        anthropic_messages: list[dict[str, Any]] = []
+
+        for msg in messages:
+            if msg.role == "system" and not anthropic_messages:
+                block = {"type": "text", "text": msg.content}
+                if msg.cache_breakpoint:
+                    block["cache_control"] = _EPHEMERAL
+                system.append(block)
+            elif msg.role == "system":
+                anthropic_messages.append(
+                    {"role": "user", "content": [{"type": "text", "text": msg.content}]}
+                )
+            else:
+                content = msg.content
+                if msg.cache_breakpoint and content:
+                    content = _with_cache_control(content)
+                anthropic_messages.append({"role": msg.role, "content": content})
+
+        return system or None, anthropic_messages
+
     async def stream(
         self,
         messages: list[LLMMessage],
@@ -49,17 +88,7 @@ class AnthropicProvider(LLMProvider):
         """Stream responses from Anthropic"""
         client = self.get_client()
 
-        # Convert messages to Anthropic format
-        anthropic_messages = []
-        for msg in messages:
-            if msg.role != "system":  # System handled separately
-                anthropic_messages.append({"role": msg.role, "content": msg.content})
-
-        # Extract system message
-        system = None
-        system_msgs = [m for m in messages if m.role == "system"]
-        if system_msgs:
-            system = system_msgs[0].content
+        system, anthropic_messages = self._format_messages(messages)
 
         try:
             # Start streaming
@@ -99,9 +128,33 @@ class AnthropicProvider(LLMProvider):
                     yield LLMResponse(type="tool_call", content=None, tool_calls=tool_calls)
 
                 yield LLMResponse(
-                    type="done", content=None, finish_reason=final_message.stop_reason
+                    type="done",
+                    content=None,
+                    finish_reason=final_message.stop_reason,
+                    usage=_usage_dict(getattr(final_message, "usage", None)),
                 )
 
         except Exception as e:
             logger.error(f"Anthropic streaming error: {e}")
             yield LLMResponse(type="error", content=str(e))
+
+
+def _with_cache_control(content: Any) -> Any:
+    """Return content with a cache breakpoint on its last block"""
+    if isinstance(content, str):
+        return [{"type": "text", "text": content, "cache_control": _EPHEMERAL}]
+    if isinstance(content, list) and content and isinstance(content[-1], dict):
+        return [*content[:-1], {**content[-1], "cache_control": _EPHEMERAL}]
+    return content
+
+
+def _usage_dict(usage: Any) -> dict[str, int] | None:
+    """Normalize Anthropic usage, including prompt cache reads and writes"""
+    if usage is None:
+        return None
+    return {
+        "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+        "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+        "cache_read_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+        "cache_write_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+    }
@@ -19,6 +19,7 @@ class LLMMessage:
     images: list[str] | None = None  # List of image URLs or file paths
     tool_calls: list[dict] | None = None  # Tool calls (for assistant messages)
     tool_call_id: str | None = None  # Tool call ID (for toolResult messages)
+    cache_breakpoint: bool = False  # Cache the prompt up to and including this message
 
 
 @dataclass
@@ -29,6 +30,7 @@ class LLMResponse:
     content: Any
     tool_calls: list[dict] | None = None
     finish_reason: str | None = None
+    # input_tokens, output_tokens, cache_read_tokens, cache_write_tokens
     usage: dict | None = None
 
 
@@ -91,6 +93,18 @@ class LLMProvider(ABC):
         """Whether this provider supports tool/function calling"""
         return True
 
+    @property
+    def supports_prompt_caching(self) -> bool:
+        """
+        Whether this provider reuses a cached prompt prefix
+
+        Providers that return True honour ``LLMMessage.cache_breakpoint``
+        (or cache prefixes automatically) and accept system messages after
+        the conversation has started, which is where per-call content goes
+        so it does not invalidate the cached prefix.
+        """
+        return False
+
     @property
     def supports_streaming(self) -> bool:
         """Whether this provider supports streaming"""
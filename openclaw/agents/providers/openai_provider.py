@@ -38,6 +38,12 @@ class OpenAIProvider(LLMProvider):
     def provider_name(self) -> str:
         return "openai"
 
+    @property
+    def supports_prompt_caching(self) -> bool:
+        # OpenAI caches long prompt prefixes automatically; compatible servers
+        # may not, and some chat templates reject a system message mid-chat
+        return self.base_url is None
+
     def get_client(self) -> AsyncOpenAI:
         """Get OpenAI client"""
         if self._client is None:
@@ -81,13 +87,21 @@ class OpenAIProvider(LLMProvider):
             if tools:
                 params["tools"] = tools
 
+            # Final chunk carries usage, including cached prompt tokens
+            if self.base_url is None:
+                params.setdefault("stream_options", {"include_usage": True})
+
             # Start streaming
             stream = await client.chat.completions.create(**params)
 
             # Track tool calls
             tool_calls_buffer = {}
+            finish_reason = None
+            usage = None
 
             async for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage = _usage_dict(chunk.usage)
                 if not chunk.choices:
                     continue
 
@@ -137,9 +151,27 @@ class OpenAIProvider(LLMProvider):
                             )
 
                         yield LLMResponse(type="tool_call", content=None, tool_calls=tool_calls)
+                        tool_calls_buffer = {}
 
-                    yield LLMResponse(type="done", content=None, finish_reason=choice.finish_reason)
+                    finish_reason = choice.finish_reason
+
+            # Done only after the stream ends, so the usage chunk is included
+            if finish_reason:
+                yield LLMResponse(
+                    type="done", content=None, finish_reason=finish_reason, usage=usage
+                )
 
         except Exception as e:
             logger.error(f"OpenAI streaming error: {e}")
             yield LLMResponse(type="error", content=str(e))
+
+
+def _usage_dict(usage) -> dict[str, int]:
+    """Normalize OpenAI usage, including automatically cached prompt tokens"""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "input_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "output_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        "cache_read_tokens": getattr(details, "cached_tokens", 0) or 0,
+        "cache_write_tokens": 0,
+    }
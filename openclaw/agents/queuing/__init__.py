@@ -2,7 +2,17 @@
 Session and global queuing for concurrent request management
 """
 
-from .lane import Lane
+from .admission import OverflowPolicy, QueueFullError, TurnAdmission, TurnTicket
+from .lane import Lane, LaneStoppedError, WeightedFairLane
 from .queue import QueueManager
 
-__all__ = ["Lane", "QueueManager"]
+__all__ = [
+    "Lane",
+    "LaneStoppedError",
+    "OverflowPolicy",
+    "QueueFullError",
+    "QueueManager",
+    "TurnAdmission",
+    "TurnTicket",
+    "WeightedFairLane",
+]
@@ -0,0 +1,299 @@
+"""
+Admission control for streaming agent turns
+
+A turn is an async iterator of events, so it cannot be handed to a
+``Lane`` as a single coroutine. Instead the caller holds an admission for
+as long as it iterates:
+
+- one turn per session at a time (turns of a session run in arrival order);
+- at most ``max_concurrent`` turns across all sessions;
+- global slots are granted first-come first-served, and a session only ever
+  has its oldest turn waiting for one, so a session with a backlog cannot
+  starve the others.
+
+When a turn arrives for a session that is already busy, ``overflow``
+decides what happens: wait in line, reject it, or coalesce its message into
+a follow-up that the running turn picks up when it finishes.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WAITING_TURNS = 100
+
+
+class OverflowPolicy(StrEnum):
+    """What to do with a turn for a session that is already running one"""
+    WAIT = "wait"
+    REJECT = "reject"
+    FOLLOWUP = "followup"
+
+
+class QueueFullError(Exception):
+    """Raised when a turn cannot be admitted"""
+
+    def __init__(self, message: str, session_id: str, waiting: int, active: int):
+        super().__init__(message)
+        self.session_id = session_id
+        self.waiting = waiting
+        self.active = active
+
+
+@dataclass
+class AdmissionStats:
+    """Turn admission counters"""
+    admitted: int = 0
+    rejected: int = 0
+    coalesced: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.admitted += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+
+
+@dataclass
+class TurnTicket:
+    """
+    An admitted (or coalesced) turn
+
+    Attributes:
+        session_id: Session the turn belongs to
+        coalesced: True if the message was merged into the running turn's
+            follow-up; the caller must not run a turn of its own
+        waited: Seconds spent queued before admission
+    """
+    session_id: str
+    coalesced: bool = False
+    waited: float = 0.0
+    _admission: TurnAdmission | None = field(default=None, repr=False)
+
+    def take_followups(self) -> list[str]:
+        """Messages coalesced into this turn while it was running"""
+        if self._admission is None or self.coalesced:
+            return []
+        return self._admission.take_followups(self.session_id)
+
+
+@dataclass
+class _SessionState:
+    busy: bool = False
+    waiters: deque[asyncio.Future] = field(default_factory=deque)
+    followups: list[str] = field(default_factory=list)
+
+
+class TurnAdmission:
+    """
+    Per-session serialization plus a fair global cap for streaming turns
+
+    Example:
+        admission = TurnAdmission(max_concurrent=10)
+        async with admission.admit(session_id, message) as ticket:
+            if not ticket.coalesced:
+                async for event in run_turn(...):
+                    yield event
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 10,
+        overflow: OverflowPolicy | str = OverflowPolicy.WAIT,
+        max_waiting: int = DEFAULT_MAX_WAITING_TURNS,
+    ):
+        """
+        Initialize admission control
+
+        Args:
+            max_concurrent: Maximum turns running at once across sessions
+            overflow: Policy for turns arriving while their session is busy
+            max_waiting: Maximum turns queued before new ones are rejected
+        """
+        self.max_concurrent = max_concurrent
+        self.overflow = OverflowPolicy(overflow)
+        self.max_waiting = max_waiting
+        self.stats = AdmissionStats()
+
+        self._sessions: dict[str, _SessionState] = {}
+        self._active = 0
+        self._waiting = 0
+        self._global_waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def active(self) -> int:
+        """Turns currently running"""
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        """Turns queued for their session or for a global slot"""
+        return self._waiting
+
+    def is_busy(self, session_id: str) -> bool:
+        state = self._sessions.get(session_id)
+        return state is not None and state.busy
+
+    @asynccontextmanager
+    async def admit(self, session_id: str, message: str | None = None) -> AsyncIterator[TurnTicket]:
+        """
+        Hold a turn slot for the duration of the block
+
+        Args:
+            session_id: Session identifier
+            message: User message (needed to coalesce into a follow-up)
+
+        Raises:
+            QueueFullError: If the turn is rejected
+        """
+        ticket = await self._acquire(session_id, message)
+        try:
+            yield ticket
+        finally:
+            if not ticket.coalesced:
+                self._release(session_id)
+
+    def take_followups(self, session_id: str) -> list[str]:
+        """Pop messages coalesced for a session's running turn"""
+        state = self._sessions.get(session_id)
+        if state is None or not state.followups:
+            return []
+        followups, state.followups = state.followups, []
+        return followups
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get admission statistics"""
+        admitted = self.stats.admitted
+        return {
+            "max_concurrent": self.max_concurrent,
+            "overflow": self.overflow.value,
+            "active": self._active,
+            "waiting": self._waiting,
+            "busy_sessions": sum(1 for s in self._sessions.values() if s.busy),
+            "admitted": admitted,
+            "rejected": self.stats.rejected,
+            "coalesced": self.stats.coalesced,
+            "avg_wait_ms": (self.stats.total_wait / admitted * 1000) if admitted else 0.0,
+            "max_wait_ms": self.stats.max_wait * 1000,
+        }
+
+    # =========================================================================
+    # Acquire / release
+    # =========================================================================
+
+    async def _acquire(self, session_id: str, message: str | None) -> TurnTicket:
+        state = self._sessions.get(session_id)
+        if state is None:
+            state = self._sessions[session_id] = _SessionState()
+
+        if state.busy:
+            if self.overflow == OverflowPolicy.REJECT:
+                self._reject(session_id, "Session is busy")
+            if self.overflow == OverflowPolicy.FOLLOWUP and message is not None:
+                state.followups.append(message)
+                self.stats.coalesced += 1
+                logger.debug(f"Coalesced turn into follow-up for session {session_id}")
+                return TurnTicket(session_id, coalesced=True)
+
+        must_wait = state.busy or self._active >= self.max_concurrent or self._global_waiters
+        if must_wait and self._waiting >= self.max_waiting:
+            self._reject(session_id, "Queue is full")
+
+        started = time.monotonic()
+        self._waiting += 1
+        try:
+            if state.busy:
+                await self._wait_for_session(session_id, state)
+            else:
+                state.busy = True
+            try:
+                await self._acquire_slot()
+            except BaseException:
+                self._release_session(session_id)
+                raise
+        finally:
+            self._waiting -= 1
+
+        waited = time.monotonic() - started
+        self.stats.record_wait(waited)
+        return TurnTicket(session_id, waited=waited, _admission=self)
+
+    def _reject(self, session_id: str, reason: str) -> None:
+        self.stats.rejected += 1
+        state = self._sessions.get(session_id)
+        if state is not None and not state.busy:
+            del self._sessions[session_id]
+        raise QueueFullError(reason, session_id, self._waiting, self._active)
+
+    async def _wait_for_session(self, session_id: str, state: _SessionState) -> None:
+        """Wait until the session's running turn hands it over"""
+        future = asyncio.get_running_loop().create_future()
+        state.waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The session was handed to us just before the cancellation
+                self._release_session(session_id)
+            else:
+                state.waiters.remove(future)
+            raise
+
+    async def _acquire_slot(self) -> None:
+        """Take a global slot, first-come first-served"""
+        if self._active < self.max_concurrent and not self._global_waiters:
+            self._active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._global_waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release_slot()
+            else:
+                self._global_waiters.remove(future)
+            raise
+
+    def _release(self, session_id: str) -> None:
+        self._release_slot()
+        self._release_session(session_id)
+
+    def _release_slot(self) -> None:
+        """Hand the slot to the oldest waiter, or free it"""
+        while self._global_waiters:
+            future = self._global_waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
+
+    def _release_session(self, session_id: str) -> None:
+        """Hand the session to its next turn, or mark it idle"""
+        state = self._sessions.get(session_id)
+        if state is None:
+            return
+        while state.waiters:
+            future = state.waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+
+        state.busy = False
+        if state.followups:
+            logger.warning(
+                f"Dropping {len(state.followups)} follow-up(s) for session {session_id}: "
+                "turn ended without taking them"
+            )
+        del self._sessions[session_id]
@@ -1,11 +1,23 @@
 """
 Queue lane for managing concurrent execution
+
+A lane is a counting semaphore with an explicit waiter queue: a task runs
+in the caller's own coroutine as soon as a slot is free, and releasing a
+slot hands it straight to the next waiter. There is no worker task and no
+polling, so an idle lane costs a few hundred bytes and nothing at all on
+the event loop.
+
+``WeightedFairLane`` orders its waiters by start-time fair queuing across
+flows (sessions, channels, ...) instead of first-come first-served.
 """
 from __future__ import annotations
 
 
 import asyncio
+import heapq
 import logging
+import time
+from collections import deque
 from collections.abc import Callable, Coroutine
 from typing import Any, TypeVar
 
@@ -14,6 +26,10 @@ logger = logging.getLogger(__name__)
 T = TypeVar("T")
 
 
+class LaneStoppedError(RuntimeError):
+    """Raised for tasks still queued when a lane is stopped"""
+
+
 class Lane:
     """
     A queue lane for sequential or limited concurrent execution
@@ -32,99 +48,105 @@ class Lane:
         """
         self.name = name
         self.max_concurrent = max_concurrent
-        self.queue: asyncio.Queue = asyncio.Queue()
         self.active = 0
-        self._worker_task: asyncio.Task | None = None
-        self._running = False
+        self.last_used = time.monotonic()
+        self._waiters: deque[asyncio.Future] = deque()
+        self._stopped = False
+
+    @property
+    def queued(self) -> int:
+        """Tasks waiting for a slot"""
+        return len(self._waiters)
+
+    @property
+    def idle(self) -> bool:
+        """No task running or waiting"""
+        return self.active == 0 and self.queued == 0
 
     async def enqueue(
-        self, task: Callable[[], Coroutine[Any, Any, T]], timeout: float | None = None
+        self,
+        task: Callable[[], Coroutine[Any, Any, T]],
+        timeout: float | None = None,
+        flow: str | None = None,
     ) -> T:
         """
         Enqueue a task for execution
 
         Args:
             task: Async function to execute
-            timeout: Optional timeout in seconds
+            timeout: Optional timeout in seconds (queueing plus execution)
+            flow: Flow key for fair queuing (ignored by FIFO lanes)
 
         Returns:
             Task result
         """
-        # Create future for result
-        future: asyncio.Future[T] = asyncio.Future()
-
-        # Add to queue
-        await self.queue.put((task, future))
-
-        # Start worker if not running
-        if not self._running:
-            self._start_worker()
-
-        # Wait for result
         try:
             if timeout:
-                return await asyncio.wait_for(future, timeout=timeout)
-            else:
-                return await future
+                return await asyncio.wait_for(self._run(task, flow), timeout=timeout)
+            return await self._run(task, flow)
         except TimeoutError:
             logger.error(f"Task timed out in lane {self.name}")
             raise
 
-    def _start_worker(self) -> None:
-        """Start background worker"""
-        if self._worker_task is None or self._worker_task.done():
-            self._running = True
-            self._worker_task = asyncio.create_task(self._worker())
-
-    async def _worker(self) -> None:
-        """Background worker that processes queue"""
-        logger.debug(f"Lane {self.name} worker started")
-
+    async def _run(self, task: Callable[[], Coroutine[Any, Any, T]], flow: str | None) -> T:
+        await self._acquire(flow)
         try:
-            while self._running:
-                try:
-                    # Get next task (with timeout to check _running)
-                    task, future = await asyncio.wait_for(self.queue.get(), timeout=1.0)
-
-                    # Wait if max concurrent reached
-                    while self.active >= self.max_concurrent:
-                        await asyncio.sleep(0.1)
-
-                    # Execute task
-                    self.active += 1
-                    asyncio.create_task(self._execute_task(task, future))
-
-                except TimeoutError:
-                    # Check if queue is empty and no active tasks
-                    if self.queue.empty() and self.active == 0:
-                        self._running = False
-                        break
-
-        except Exception as e:
-            logger.error(f"Lane {self.name} worker error: {e}")
+            return await task()
         finally:
-            logger.debug(f"Lane {self.name} worker stopped")
+            self._release()
+
+    async def _acquire(self, flow: str | None) -> None:
+        """Take a slot, or wait until one is handed over"""
+        if self._stopped:
+            raise LaneStoppedError(f"Lane {self.name} is stopped")
+        if self.active < self.max_concurrent and self.queued == 0:
+            self.active += 1
+            return
 
-    async def _execute_task(
-        self, task: Callable[[], Coroutine[Any, Any, T]], future: asyncio.Future[T]
-    ) -> None:
-        """Execute a single task"""
+        future = asyncio.get_running_loop().create_future()
+        self._push_waiter(future, flow)
         try:
-            result = await task()
-            if not future.done():
-                future.set_result(result)
-        except Exception as e:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed to us just before the cancellation
+                self._release()
+            else:
+                self._discard_waiter(future)
+            raise
+
+    def _release(self) -> None:
+        """Hand the slot to the next waiter, or free it"""
+        self.last_used = time.monotonic()
+        while self.queued:
+            future = self._pop_waiter()
             if not future.done():
-                future.set_exception(e)
-        finally:
-            self.active -= 1
-            self.queue.task_done()
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    # Waiter queue (FIFO); overridden by WeightedFairLane
+
+    def _push_waiter(self, future: asyncio.Future, flow: str | None) -> None:
+        self._waiters.append(future)
+
+    def _pop_waiter(self) -> asyncio.Future:
+        return self._waiters.popleft()
+
+    def _discard_waiter(self, future: asyncio.Future) -> None:
+        self._waiters.remove(future)
+
+    def _drain_waiters(self) -> list[asyncio.Future]:
+        waiters = list(self._waiters)
+        self._waiters.clear()
+        return waiters
 
     async def stop(self) -> None:
-        """Stop the worker"""
-        self._running = False
-        if self._worker_task:
-            await self._worker_task
+        """Stop accepting tasks and fail the ones still queued"""
+        self._stopped = True
+        for future in self._drain_waiters():
+            if not future.done():
+                future.set_exception(LaneStoppedError(f"Lane {self.name} is stopped"))
 
     def get_stats(self) -> dict:
         """Get lane statistics"""
@@ -132,6 +154,109 @@ class Lane:
             "name": self.name,
             "max_concurrent": self.max_concurrent,
             "active": self.active,
-            "queued": self.queue.qsize(),
-            "running": self._running,
+            "queued": self.queued,
+            "running": not self.idle,
         }
+
+
+class _Flow:
+    __slots__ = ("finish", "queued")
+
+    def __init__(self) -> None:
+        self.finish = 0.0
+        self.queued = 0
+
+
+class WeightedFairLane(Lane):
+    """
+    Lane whose waiters are served by weighted fair queuing across flows
+
+    Each queued task gets a start tag ``max(virtual_time, flow.finish)``
+    and advances its flow's finish tag by ``1 / weight``; the waiter with
+    the smallest start tag runs next. A flow with weight 2 therefore gets
+    twice the slots of a weight-1 flow while both are backlogged, and a
+    flow with a long backlog cannot starve a newcomer. Flow state is
+    dropped as soon as a flow has nothing queued.
+
+    Example:
+        lane = WeightedFairLane("global", 10, weights={"channel:slack": 2.0})
+        await lane.enqueue(task, flow="channel:slack")
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int = 1,
+        weights: dict[str, float] | None = None,
+        default_weight: float = 1.0,
+    ):
+        """
+        Initialize lane
+
+        Args:
+            name: Lane identifier
+            max_concurrent: Maximum concurrent tasks
+            weights: Weight per flow key
+            default_weight: Weight of flows not listed in ``weights``
+        """
+        super().__init__(name, max_concurrent)
+        self.weights = dict(weights or {})
+        self.default_weight = default_weight
+        self._heap: list[tuple[float, int, str, asyncio.Future]] = []
+        self._flows: dict[str, _Flow] = {}
+        self._virtual_time = 0.0
+        self._seq = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._heap)
+
+    def set_weight(self, flow: str, weight: float) -> None:
+        """Set the weight of a flow"""
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        self.weights[flow] = weight
+
+    def _push_waiter(self, future: asyncio.Future, flow: str | None) -> None:
+        key = flow or ""
+        state = self._flows.get(key)
+        if state is None:
+            state = self._flows[key] = _Flow()
+        start = max(self._virtual_time, state.finish)
+        state.finish = start + 1.0 / self.weights.get(key, self.default_weight)
+        state.queued += 1
+        self._seq += 1
+        heapq.heappush(self._heap, (start, self._seq, key, future))
+
+    def _pop_waiter(self) -> asyncio.Future:
+        start, _, key, future = heapq.heappop(self._heap)
+        self._virtual_time = start
+        self._forget(key)
+        return future
+
+    def _discard_waiter(self, future: asyncio.Future) -> None:
+        for i, entry in enumerate(self._heap):
+            if entry[3] is future:
+                self._heap[i] = self._heap[-1]
+                self._heap.pop()
+                heapq.heapify(self._heap)
+                self._forget(entry[2])
+                return
+
+    def _forget(self, key: str) -> None:
+        """Drop flow state once nothing of it is queued"""
+        state = self._flows[key]
+        state.queued -= 1
+        if state.queued == 0:
+            del self._flows[key]
+
+    def _drain_waiters(self) -> list[asyncio.Future]:
+        waiters = [entry[3] for entry in self._heap]
+        self._heap.clear()
+        self._flows.clear()
+        return waiters
+
+    def get_stats(self) -> dict:
+        stats = super().get_stats()
+        stats["flows"] = len(self._flows)
+        return stats
@@ -6,15 +6,24 @@ from __future__ import annotations
 
 import hashlib
 import logging
+import time
 from collections.abc import Callable, Coroutine
+from contextlib import AbstractAsyncContextManager
 from typing import Any, TypeVar
 
-from .lane import Lane
+from .admission import DEFAULT_MAX_WAITING_TURNS, OverflowPolicy, TurnAdmission, TurnTicket
+from .lane import Lane, WeightedFairLane
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# Idle session lanes are dropped after this many seconds
+DEFAULT_LANE_TTL = 300.0
+
+# Lanes examined per lookup when pruning idle ones
+_PRUNE_BUDGET = 4
+
 
 class QueueManager:
     """
@@ -23,22 +32,45 @@ class QueueManager:
     Features:
     - Per-session sequential execution (prevents conflicts)
     - Global concurrent limit (resource management)
-    - Automatic lane creation and cleanup
+    - Automatic lane creation, and reclaiming of lanes idle for ``lane_ttl``
+    - Optional weighted fair queuing across sessions/channels in the global lane
+    - Admission control for streaming turns (see ``admit``)
     """
 
-    def __init__(self, max_concurrent_per_session: int = 1, max_concurrent_global: int = 10):
+    def __init__(
+        self,
+        max_concurrent_per_session: int = 1,
+        max_concurrent_global: int = 10,
+        overflow: OverflowPolicy | str = OverflowPolicy.WAIT,
+        max_waiting_turns: int = DEFAULT_MAX_WAITING_TURNS,
+        lane_ttl: float = DEFAULT_LANE_TTL,
+        fair_queuing: bool = False,
+        flow_weights: dict[str, float] | None = None,
+    ):
         """
         Initialize queue manager
 
         Args:
             max_concurrent_per_session: Max concurrent per session
             max_concurrent_global: Max concurrent globally
+            overflow: What to do with a turn for a busy session
+            max_waiting_turns: Max turns queued before new ones are rejected
+            lane_ttl: Seconds an idle session lane is kept
+            fair_queuing: Serve the global lane by weighted fair queuing
+            flow_weights: Weight per flow key (session ID, or the ``flow``
+                passed to ``enqueue_global``/``enqueue_both``)
         """
         self.max_concurrent_per_session = max_concurrent_per_session
         self.max_concurrent_global = max_concurrent_global
+        self.lane_ttl = lane_ttl
 
+        # Ordered by last lookup, so idle lanes collect at the front
         self._session_lanes: dict[str, Lane] = {}
-        self._global_lane = Lane("global", max_concurrent_global)
+        if fair_queuing:
+            self._global_lane: Lane = WeightedFairLane("global", max_concurrent_global, flow_weights)
+        else:
+            self._global_lane = Lane("global", max_concurrent_global)
+        self.turns = TurnAdmission(max_concurrent_global, overflow, max_waiting_turns)
 
     def get_session_lane(self, session_id: str) -> Lane:
         """
@@ -50,13 +82,50 @@ class QueueManager:
         Returns:
             Lane for this session
         """
-        if session_id not in self._session_lanes:
+        lane = self._session_lanes.pop(session_id, None)
+        if lane is None:
             # Create deterministic lane name
             lane_name = f"session-{self._hash_session_id(session_id)}"
-            self._session_lanes[session_id] = Lane(lane_name, self.max_concurrent_per_session)
+            lane = Lane(lane_name, self.max_concurrent_per_session)
             logger.debug(f"Created lane for session: {session_id}")
+        lane.last_used = time.monotonic()
+        self._session_lanes[session_id] = lane
+
+        # The lane just looked up is last and never reached here
+        self._prune(min(_PRUNE_BUDGET, len(self._session_lanes) - 1))
+        return lane
+
+    def prune_idle_lanes(self) -> int:
+        """
+        Drop every session lane idle for longer than ``lane_ttl``
 
-        return self._session_lanes[session_id]
+        Lookups already prune a few lanes each, so calling this is only
+        needed to reclaim memory eagerly.
+
+        Returns:
+            Number of lanes removed
+        """
+        return self._prune(len(self._session_lanes))
+
+    def _prune(self, budget: int) -> int:
+        """Examine up to ``budget`` of the least recently looked-up lanes"""
+        removed = 0
+        cutoff = time.monotonic() - self.lane_ttl
+        for _ in range(min(budget, len(self._session_lanes))):
+            session_id = next(iter(self._session_lanes))
+            lane = self._session_lanes[session_id]
+            if not lane.idle:
+                # Busy lanes go to the back; they are idle-checked again later
+                del self._session_lanes[session_id]
+                self._session_lanes[session_id] = lane
+            elif lane.last_used <= cutoff:
+                del self._session_lanes[session_id]
+                removed += 1
+            else:
+                break
+        if removed:
+            logger.debug(f"Pruned {removed} idle session lane(s)")
+        return removed
 
     def get_global_lane(self) -> Lane:
         """Get global lane"""
@@ -83,7 +152,10 @@ class QueueManager:
         return await lane.enqueue(task, timeout)
 
     async def enqueue_global(
-        self, task: Callable[[], Coroutine[Any, Any, T]], timeout: float | None = None
+        self,
+        task: Callable[[], Coroutine[Any, Any, T]],
+        timeout: float | None = None,
+        flow: str | None = None,
     ) -> T:
         """
         Enqueue task in global lane
@@ -91,17 +163,19 @@ class QueueManager:
         Args:
             task: Async function to execute
             timeout: Optional timeout
+            flow: Flow key for fair queuing (e.g. "channel:telegram")
 
         Returns:
             Task result
         """
-        return await self._global_lane.enqueue(task, timeout)
+        return await self._global_lane.enqueue(task, timeout, flow)
 
     async def enqueue_both(
         self,
         session_id: str,
         task: Callable[[], Coroutine[Any, Any, T]],
         timeout: float | None = None,
+        flow: str | None = None,
     ) -> T:
         """
         Enqueue task in both session and global lanes
@@ -114,6 +188,7 @@ class QueueManager:
             session_id: Session identifier
             task: Async function to execute
             timeout: Optional timeout
+            flow: Flow key for fair queuing (defaults to the session ID)
 
         Returns:
             Task result
@@ -122,10 +197,25 @@ class QueueManager:
 
         # Enqueue in session lane, which then enqueues in global
         async def wrapped_task():
-            return await self._global_lane.enqueue(task, timeout)
+            return await self._global_lane.enqueue(task, timeout, flow or session_id)
 
         return await session_lane.enqueue(wrapped_task, timeout)
 
+    def admit(
+        self, session_id: str, message: str | None = None
+    ) -> AbstractAsyncContextManager[TurnTicket]:
+        """
+        Admit a streaming turn for the duration of an ``async with`` block
+
+        Args:
+            session_id: Session identifier
+            message: User message (coalesced under the follow-up policy)
+
+        Returns:
+            Async context manager yielding a TurnTicket
+        """
+        return self.turns.admit(session_id, message)
+
     async def cleanup_session(self, session_id: str) -> None:
         """
         Clean up session lane
@@ -145,6 +235,7 @@ class QueueManager:
             "global": self._global_lane.get_stats(),
             "sessions": {sid: lane.get_stats() for sid, lane in self._session_lanes.items()},
             "total_sessions": len(self._session_lanes),
+            "turns": self.turns.get_stats(),
         }
 
     def _hash_session_id(self, session_id: str) -> str:
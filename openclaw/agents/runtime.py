@@ -15,6 +15,7 @@ from .context import ContextManager
 from .errors import classify_error, format_error_message, is_retryable_error
 from .failover import FailoverReason, FallbackChain, FallbackManager
 from .formatting import FormatMode, ToolFormatter
+from .prompt_cache import apply_cache_layout, stable_history_window
 from .providers import (
     AnthropicProvider,
     BedrockProvider,
@@ -24,10 +25,18 @@ from .providers import (
     OllamaProvider,
     OpenAIProvider,
 )
-from .queuing import QueueManager
+from .queuing import OverflowPolicy, QueueFullError, QueueManager
 from .session import Session
+from .system_prompt import SystemPromptParts
+from .text_coalescer import CoalesceOptions, TextDeltaCoalescer
 from .thinking import ThinkingExtractor, ThinkingMode
 from .tools.base import AgentTool
+from .tools.concurrency import (
+    DEFAULT_MAX_PARALLEL_TOOLS,
+    batch_tool_calls,
+    is_concurrency_safe,
+    run_batch,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -84,8 +93,11 @@ class MultiProviderRuntime:
         fallback_models: list[str] | None = None,
         auth_profiles: list[AuthProfile] | None = None,
         enable_queuing: bool = False,
+        queue_overflow: OverflowPolicy | str = OverflowPolicy.WAIT,
         tool_format: FormatMode = FormatMode.MARKDOWN,
         compaction_strategy: CompactionStrategy = CompactionStrategy.KEEP_IMPORTANT,
+        text_coalescing: CoalesceOptions | None = None,
+        max_parallel_tools: int = DEFAULT_MAX_PARALLEL_TOOLS,
         **kwargs,
     ):
         self.model_str = model
@@ -103,7 +115,7 @@ class MultiProviderRuntime:
 
         # Initialize context manager
         if enable_context_management:
-            self.context_manager = ContextManager(self.model_name)
+            self.context_manager = ContextManager()
         else:
             self.context_manager = None
 
@@ -127,11 +139,14 @@ class MultiProviderRuntime:
             self.auth_rotation = RotationManager(store)
 
         # Queuing
-        self.queue_manager = QueueManager() if enable_queuing else None
+        self.queue_manager = QueueManager(overflow=queue_overflow) if enable_queuing else None
 
         # Tool formatting
         self.tool_formatter = ToolFormatter(tool_format)
 
+        # Concurrency-safe tool calls of one turn run at most this many at once
+        self.max_parallel_tools = max_parallel_tools
+
         # Advanced compaction
         self.compaction_strategy = compaction_strategy
         if self.context_manager:
@@ -142,7 +157,13 @@ class MultiProviderRuntime:
             self.compaction_manager = None
 
         # Observer pattern: event listeners (e.g., Gateway)
+        # Regular listeners get text deltas merged by the coalescer;
+        # raw listeners get every event as produced.
         self.event_listeners: list = []
+        self.raw_event_listeners: list = []
+        self.text_coalescer = TextDeltaCoalescer(
+            self._dispatch_coalesced, text_coalescing or CoalesceOptions()
+        )
         
         # AgentLoop-style features
         self.steering_queue: list[str] = []  # Interrupt current turn with these messages
@@ -166,15 +187,18 @@ class MultiProviderRuntime:
             # Default to anthropic
             return "anthropic", model
 
-    def add_event_listener(self, listener):
+    def add_event_listener(self, listener, raw: bool = False):
         """
         Register an event listener (observer pattern)
 
         The listener will be called for every AgentEvent produced during run_turn.
         This allows components like Gateway to observe agent events without direct coupling.
+        Consecutive text deltas are merged (see ``text_coalescing``) unless
+        ``raw`` is set.
 
         Args:
             listener: Callable that accepts AgentEvent. Can be sync or async.
+            raw: Receive every text delta unmerged
 
         Example:
             async def on_agent_event(event: AgentEvent):
@@ -182,14 +206,15 @@ class MultiProviderRuntime:
 
             agent_runtime.add_event_listener(on_agent_event)
         """
-        self.event_listeners.append(listener)
+        (self.raw_event_listeners if raw else self.event_listeners).append(listener)
         logger.debug(f"Registered event listener: {listener}")
 
     def remove_event_listener(self, listener):
         """Remove an event listener"""
-        if listener in self.event_listeners:
-            self.event_listeners.remove(listener)
-            logger.debug(f"Removed event listener: {listener}")
+        for listeners in (self.event_listeners, self.raw_event_listeners):
+            if listener in listeners:
+                listeners.remove(listener)
+                logger.debug(f"Removed event listener: {listener}")
     
     def add_steering_message(self, message: str):
         """
@@ -232,8 +257,17 @@ class MultiProviderRuntime:
         return None
 
     async def _notify_observers(self, event: Event):
-        """Notify all registered observers of an event"""
-        for listener in self.event_listeners:
+        """Notify raw observers now and the others through the coalescer"""
+        await self._dispatch(self.raw_event_listeners, event)
+        if self.event_listeners:
+            await self.text_coalescer.push(event)
+
+    async def _dispatch_coalesced(self, event: Event):
+        await self._dispatch(self.event_listeners, event)
+
+    async def _dispatch(self, listeners: list, event: Event):
+        """Call each listener with an event"""
+        for listener in listeners:
             try:
                 if asyncio.iscoroutinefunction(listener):
                     await listener(event)
@@ -286,7 +320,7 @@ class MultiProviderRuntime:
         tools: list[AgentTool] | None = None,
         max_tokens: int = 4096,
         images: list[str] | None = None,
-        system_prompt: str | None = None,
+        system_prompt: str | SystemPromptParts | None = None,
     ) -> AsyncIterator[AgentEvent]:
         """
         Run an agent turn with the configured provider
@@ -306,7 +340,10 @@ class MultiProviderRuntime:
             tools: Optional list of tools
             max_tokens: Maximum tokens to generate
             images: Optional list of image URLs
-            system_prompt: Optional system prompt (injected at session start)
+            system_prompt: Optional system prompt (injected at session start).
+                With SystemPromptParts only the stable part is stored; the
+                volatile part is sent with every request, after the history,
+                so it does not break the provider's cached prompt prefix.
 
         Yields:
             AgentEvent objects
@@ -316,33 +353,37 @@ class MultiProviderRuntime:
 
         # Wrap in queue if enabled
         if self.queue_manager:
-            # Queue management: ensure only one turn per session, respect global limits
+            # One turn per session, bounded and fair across sessions
             session_id = session.session_id if session else "default"
-            
-            # Check if queue is full (global limit)
-            global_stats = self.queue_manager.get_global_lane().get_stats()
-            max_queue_size = global_stats["max_concurrent"] * 2  # Allow some buffer
-            
-            if global_stats["queued"] + global_stats["active"] >= max_queue_size:
-                # Queue is full, emit error
-                error_event = AgentEvent(
+            try:
+                async with self.queue_manager.admit(session_id, message) as ticket:
+                    if ticket.coalesced:
+                        yield AgentEvent("queued", {"mode": "followup", "session_id": session_id})
+                        return
+
+                    if ticket.waited > 0.1:
+                        logger.info(f"Turn for session {session_id} waited {ticket.waited:.2f}s for admission")
+                    pending, pending_images = message, images
+                    while pending is not None:
+                        async for event in self._run_turn_internal(
+                            session, pending, tools, max_tokens, pending_images, system_prompt
+                        ):
+                            yield event
+                        # Messages that arrived meanwhile run as one follow-up turn
+                        followups = ticket.take_followups()
+                        pending = "\n\n".join(followups) if followups else None
+                        pending_images = None
+            except QueueFullError as e:
+                stats = self.queue_manager.turns.get_stats()
+                yield AgentEvent(
                     "error",
                     {
-                        "message": "Queue is full. Please try again later.",
-                        "queue_size": global_stats["queued"],
-                        "active": global_stats["active"],
-                        "max_size": max_queue_size
-                    }
+                        "message": f"{e}. Please try again later.",
+                        "queue_size": e.waiting,
+                        "active": e.active,
+                        "max_size": stats["max_concurrent"],
+                    },
                 )
-                yield error_event
-                return
-            
-            # Execute with queue management
-            # Note: generators can't be wrapped directly in enqueue_both,
-            # so we track execution but don't enforce hard queuing for streaming
-            logger.info(f"Executing turn with queue management for session {session_id}")
-            async for event in self._run_turn_internal(session, message, tools, max_tokens, images, system_prompt):
-                yield event
         else:
             async for event in self._run_turn_internal(session, message, tools, max_tokens, images, system_prompt):
                 yield event
@@ -354,9 +395,13 @@ class MultiProviderRuntime:
         tools: list[AgentTool],
         max_tokens: int,
         images: list[str] | None = None,
-        system_prompt: str | None = None,
+        system_prompt: str | SystemPromptParts | None = None,
     ) -> AsyncIterator[AgentEvent]:
         """Internal run turn implementation"""
+        volatile_prompt = None
+        if isinstance(system_prompt, SystemPromptParts):
+            system_prompt, volatile_prompt = system_prompt.stable, system_prompt.volatile
+
         # Inject system prompt at the start of the session (only if no messages yet)
         if system_prompt and len(session.messages) == 0:
             session.add_system_message(system_prompt)
@@ -378,36 +423,43 @@ class MultiProviderRuntime:
 
         # Check context window and compact if needed
         if self.compaction_manager and self.enable_context_management:
-            messages_for_api = session.get_messages_for_api()
-            current_tokens = self.token_analyzer.estimate_messages_tokens(messages_for_api)
-            window = self.context_manager.check_context(current_tokens)
+            # The session's ledger keeps a running total, so this is O(1)
+            session.set_token_counter(self.token_analyzer.count_message_tokens)
+            current_tokens = session.token_count
+            window = self.context_manager.update_session(session.session_id, current_tokens)
 
             if window.should_compress:
                 logger.info(f"Context at {current_tokens}/{window.total_tokens} tokens, compacting")
                 # Use advanced compaction
                 target_tokens = int(window.total_tokens * 0.7)  # Use 70% of window
-                compacted = self.compaction_manager.compact(messages_for_api, target_tokens)
+                compacted = self.compaction_manager.compact(
+                    session.get_messages_for_api(), target_tokens
+                )
 
                 # Update session with compacted messages
                 # Convert back to Message objects
                 from .session import Message
 
-                session.messages = [
-                    Message(
-                        role=m["role"],
-                        content=m["content"],
-                        tool_calls=m.get("tool_calls"),
-                        tool_call_id=m.get("tool_call_id"),
-                        name=m.get("name"),
-                    )
-                    for m in compacted
-                ]
+                session.replace_messages(
+                    [
+                        Message(
+                            role=m["role"],
+                            content=m["content"],
+                            tool_calls=m.get("tool_calls"),
+                            tool_call_id=m.get("tool_call_id"),
+                            name=m.get("name"),
+                        )
+                        for m in compacted
+                    ]
+                )
+                compacted_tokens = session.token_count
+                self.context_manager.update_session(session.session_id, compacted_tokens)
 
                 event = AgentEvent(
                     "compaction",
                     {
                         "original_tokens": current_tokens,
-                        "compacted_tokens": self.token_analyzer.estimate_messages_tokens(compacted),
+                        "compacted_tokens": compacted_tokens,
                         "strategy": self.compaction_strategy.value,
                     },
                 )
@@ -468,22 +520,13 @@ class MultiProviderRuntime:
                 
                 all_messages = session.get_messages()
                 
-                # If too many messages, keep system message + recent history
-                if len(all_messages) > MAX_HISTORY_MESSAGES:
-                    # Separate system messages from conversation
-                    system_msgs = [m for m in all_messages if m.role == "system"]
-                    conversation_msgs = [m for m in all_messages if m.role != "system"]
-                    
-                    # Keep only recent conversation
-                    recent_conversation = conversation_msgs[-MAX_HISTORY_MESSAGES:]
-                    messages_to_send = system_msgs + recent_conversation
-                    
+                # Keep system messages + recent history; the cut point moves in
+                # blocks so the request prefix stays cacheable between turns
+                messages_to_send = stable_history_window(all_messages, MAX_HISTORY_MESSAGES)
+                if len(messages_to_send) < len(all_messages):
                     logger.warning(
-                        f"⚠️ Context too long! Truncating from {len(all_messages)} to {len(messages_to_send)} messages "
-                        f"(keeping {len(system_msgs)} system + {len(recent_conversation)} recent)"
+                        f"⚠️ Context too long! Truncating from {len(all_messages)} to {len(messages_to_send)} messages"
                     )
-                else:
-                    messages_to_send = all_messages
                 
                 llm_messages = []
                 for i, msg in enumerate(messages_to_send):
@@ -496,6 +539,10 @@ class MultiProviderRuntime:
                     # Historical messages: no images
                     llm_messages.append(LLMMessage(role=msg.role, content=msg.content, images=msg_images))
                 
+                llm_messages = apply_cache_layout(
+                    llm_messages, volatile_prompt, self.provider.supports_prompt_caching
+                )
+                
                 # DEBUG: Log message count and content
                 logger.info(f"📝 Sending {len(llm_messages)} message(s) to provider")
                 if len(llm_messages) <= 5:
@@ -583,11 +630,17 @@ class MultiProviderRuntime:
 
                     elif response.type == "tool_call":
                         tool_calls = response.tool_calls or []
-
-                        # Execute tools
+                        known_calls = []
                         for tc in tool_calls:
                             tool = next((t for t in tools if t.name == tc["name"]), None)
                             if tool:
+                                known_calls.append((tc, tool))
+
+                        # Execute tools; consecutive concurrency-safe calls run
+                        # together, and events follow call order either way
+                        batches = batch_tool_calls(known_calls, lambda call: is_concurrency_safe(call[1]))
+                        for batch in batches:
+                            for tc, _tool in batch:
                                 # Format tool use
                                 formatted_use = self.tool_formatter.format_tool_use(
                                     tc["name"], tc["arguments"]
@@ -604,9 +657,16 @@ class MultiProviderRuntime:
                                 await self._notify_observers(event)
                                 yield event
 
-                                # Execute tool
+                            results = await run_batch(
+                                batch,
+                                lambda call: call[1].execute(call[0]["arguments"]),
+                                self.max_parallel_tools,
+                            )
+
+                            for (tc, _tool), result in zip(batch, results):
                                 try:
-                                    result = await tool.execute(tc["arguments"])
+                                    if isinstance(result, BaseException):
+                                        raise result
                                     success = result.success if result else False
                                     output = result.content if result else "No output"
 
@@ -693,6 +753,11 @@ class MultiProviderRuntime:
                                     )
 
                     elif response.type == "done":
+                        if response.usage:
+                            event = AgentEvent("usage", {**response.usage, "model": current_model})
+                            await self._notify_observers(event)
+                            yield event
+
                         # Extract thinking if ON mode
                         final_text = accumulated_text
                         if self.thinking_mode == ThinkingMode.ON and self.thinking_extractor:
@@ -735,6 +800,9 @@ class MultiProviderRuntime:
                     for msg in session.get_messages():
                         msg_images = getattr(msg, 'images', None)
                         llm_messages.append(LLMMessage(role=msg.role, content=msg.content, images=msg_images))
+                    llm_messages = apply_cache_layout(
+                        llm_messages, volatile_prompt, self.provider.supports_prompt_caching
+                    )
                     
                     # Add explicit instruction to NOT use tools
                     # This is a workaround for Gemini's AFC (Automatic Function Calling)
@@ -771,6 +839,11 @@ class MultiProviderRuntime:
                             yield event
                             
                         elif response.type == "done":
+                            if response.usage:
+                                event = AgentEvent("usage", {**response.usage, "model": current_model})
+                                await self._notify_observers(event)
+                                yield event
+
                             # Save final response
                             if accumulated_text:
                                 session.add_assistant_message(accumulated_text, [])
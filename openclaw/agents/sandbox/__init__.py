@@ -9,9 +9,12 @@ from .docker import (
     exec_docker,
     ensure_docker_image,
     docker_container_state,
+    invalidate_docker_cache,
 )
+from .exec_channel import ExecChannel, ExecChannelError
 from .constants import DEFAULT_SANDBOX_IMAGE, SANDBOX_AGENT_WORKSPACE_MOUNT
 from .config_hash import compute_sandbox_config_hash
+from .pool import SandboxPool, get_sandbox_pool
 from .registry import SandboxRegistry, get_sandbox_registry
 
 __all__ = [
@@ -20,9 +23,14 @@ __all__ = [
     "exec_docker",
     "ensure_docker_image",
     "docker_container_state",
+    "invalidate_docker_cache",
+    "ExecChannel",
+    "ExecChannelError",
     "DEFAULT_SANDBOX_IMAGE",
     "SANDBOX_AGENT_WORKSPACE_MOUNT",
     "compute_sandbox_config_hash",
+    "SandboxPool",
+    "get_sandbox_pool",
     "SandboxRegistry",
     "get_sandbox_registry",
 ]
@@ -7,14 +7,49 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 from .constants import DEFAULT_SANDBOX_IMAGE, SANDBOX_AGENT_WORKSPACE_MOUNT
+from .exec_channel import CHANNEL_MAX_COMMAND_BYTES, ExecChannel, ExecChannelError
 
 logger = logging.getLogger(__name__)
 
+# Positive image lookups are trusted this long (images rarely disappear)
+IMAGE_CACHE_TTL_SEC = 300.0
+
+# Container state lookups are trusted briefly; our own start/stop update it
+STATE_CACHE_TTL_SEC = 2.0
+
+_image_cache: dict[str, float] = {}  # image -> expiry (monotonic)
+_state_cache: dict[str, tuple[float, dict[str, bool]]] = {}  # name -> (expiry, state)
+
+
+def invalidate_docker_cache(image: str | None = None, container: str | None = None) -> None:
+    """
+    Drop cached image/container lookups
+
+    Call after changing images or containers outside this module.
+    Without arguments, everything is dropped.
+    """
+    if image is None and container is None:
+        _image_cache.clear()
+        _state_cache.clear()
+        return
+    if image is not None:
+        _image_cache.pop(image, None)
+    if container is not None:
+        _state_cache.pop(container, None)
+
+
+def _set_container_state(name: str, exists: bool, running: bool) -> None:
+    _state_cache[name] = (
+        time.monotonic() + STATE_CACHE_TTL_SEC,
+        {"exists": exists, "running": running},
+    )
+
 
 async def exec_docker(args: list[str], allow_failure: bool = False) -> dict[str, Any]:
     """
@@ -84,19 +119,24 @@ async def read_docker_port(container_name: str, port: int) -> int | None:
     return mapped if mapped > 0 else None
 
 
-async def docker_image_exists(image: str) -> bool:
+async def docker_image_exists(image: str, use_cache: bool = True) -> bool:
     """
     Check if a Docker image exists locally
     
     Args:
         image: Image name
+        use_cache: Trust a recent positive lookup
         
     Returns:
         True if image exists
     """
+    if use_cache and _image_cache.get(image, 0.0) > time.monotonic():
+        return True
+    
     result = await exec_docker(["image", "inspect", image], allow_failure=True)
     
     if result["code"] == 0:
+        _image_cache[image] = time.monotonic() + IMAGE_CACHE_TTL_SEC
         return True
     
     stderr = result["stderr"].strip()
@@ -125,6 +165,7 @@ async def ensure_docker_image(image: str):
         logger.info("Pulling default sandbox image...")
         await exec_docker(["pull", "debian:bookworm-slim"])
         await exec_docker(["tag", "debian:bookworm-slim", DEFAULT_SANDBOX_IMAGE])
+        _image_cache[image] = time.monotonic() + IMAGE_CACHE_TTL_SEC
         logger.info("Default sandbox image ready")
         return
     
@@ -133,25 +174,33 @@ async def ensure_docker_image(image: str):
     )
 
 
-async def docker_container_state(name: str) -> dict[str, bool]:
+async def docker_container_state(name: str, use_cache: bool = True) -> dict[str, bool]:
     """
     Get container state
     
     Args:
         name: Container name
+        use_cache: Trust a lookup from the last STATE_CACHE_TTL_SEC
         
     Returns:
         Dict with exists and running booleans
     """
+    if use_cache:
+        cached = _state_cache.get(name)
+        if cached and cached[0] > time.monotonic():
+            return dict(cached[1])
+    
     result = await exec_docker(
         ["inspect", "-f", "{{.State.Running}}", name],
         allow_failure=True
     )
     
     if result["code"] != 0:
+        _set_container_state(name, exists=False, running=False)
         return {"exists": False, "running": False}
     
     running = result["stdout"].strip() == "true"
+    _set_container_state(name, exists=True, running=running)
     return {"exists": True, "running": running}
 
 
@@ -199,18 +248,27 @@ class DockerSandboxConfig:
 class DockerSandbox:
     """Docker sandbox manager for isolated code execution"""
     
-    def __init__(self, config: DockerSandboxConfig, workspace_dir: Path | None = None):
+    def __init__(
+        self,
+        config: DockerSandboxConfig,
+        workspace_dir: Path | None = None,
+        persistent_exec: bool = True,
+    ):
         """
         Initialize Docker sandbox
         
         Args:
             config: Sandbox configuration
             workspace_dir: Workspace directory to mount
+            persistent_exec: Run commands over a long-lived exec channel
+                instead of one ``docker exec`` per command
         """
         self.config = config
         self.workspace_dir = workspace_dir
+        self.persistent_exec = persistent_exec
         self.container_name: str | None = None
         self._started = False
+        self._channel: ExecChannel | None = None
     
     async def start(self) -> str:
         """
@@ -284,8 +342,11 @@ class DockerSandbox:
         
         # Run container
         await exec_docker(args)
+        _set_container_state(self.container_name, exists=True, running=True)
         
         self._started = True
+        if self.persistent_exec:
+            self._channel = ExecChannel(self.container_name)
         return self.container_name
     
     async def stop(self):
@@ -295,21 +356,56 @@ class DockerSandbox:
         
         logger.info(f"Stopping sandbox container: {self.container_name}")
         
+        if self._channel is not None:
+            await self._channel.close()
+            self._channel = None
+        
         # Stop container
         await exec_docker(["stop", self.container_name], allow_failure=True)
         
         # Remove container
         await exec_docker(["rm", self.container_name], allow_failure=True)
+        _set_container_state(self.container_name, exists=False, running=False)
         
         self._started = False
     
+    async def reset(self):
+        """
+        Return the container to a clean state for reuse
+        
+        Kills every process except the container's init and clears /tmp.
+        The workspace mount is left alone.
+        """
+        if not self.container_name or not self._started:
+            raise RuntimeError("Sandbox not started")
+        
+        # The channel's agent would be killed too; reopen it lazily
+        if self._channel is not None:
+            await self._channel.close()
+        
+        await exec_docker(
+            [
+                "exec",
+                self.container_name,
+                "sh",
+                "-c",
+                "kill -9 -1 2>/dev/null; rm -rf /tmp/* /tmp/.[!.]* 2>/dev/null; true",
+            ],
+            allow_failure=True,
+        )
+    
     async def exec_command(self, cmd: str, **kwargs) -> dict[str, Any]:
         """
         Execute command in sandbox container
         
+        Commands go over the persistent exec channel when it is enabled
+        and idle; concurrent or very large commands, and sandboxes whose
+        image cannot run the channel agent, use a one-shot ``docker exec``.
+        
         Args:
             cmd: Shell command to execute
-            **kwargs: Additional options (timeout_ms, etc.)
+            **kwargs: Additional options (timeout_ms, etc.; the timeout is
+                honoured on the exec channel)
             
         Returns:
             Dict with stdout, stderr, exit_code
@@ -317,6 +413,41 @@ class DockerSandbox:
         if not self.container_name or not self._started:
             raise RuntimeError("Sandbox not started")
         
+        channel = self._channel
+        if (
+            channel is not None
+            and not channel.busy
+            and len(cmd.encode()) <= CHANNEL_MAX_COMMAND_BYTES
+        ):
+            timeout_ms = kwargs.get("timeout_ms")
+            try:
+                result = await channel.run(cmd, timeout=timeout_ms / 1000 if timeout_ms else None)
+            except TimeoutError:
+                return {
+                    "stdout": "",
+                    "stderr": f"Command timed out after {timeout_ms}ms",
+                    "exit_code": 124,
+                    "success": False,
+                }
+            except ExecChannelError as e:
+                if e.command_sent:
+                    return {
+                        "stdout": "",
+                        "stderr": str(e),
+                        "exit_code": 1,
+                        "success": False,
+                    }
+                # The image cannot host the agent; stop trying
+                logger.warning(f"Exec channel unavailable, using docker exec: {e}")
+                self._channel = None
+            else:
+                return {
+                    "stdout": result["stdout"],
+                    "stderr": result["stderr"],
+                    "exit_code": result["code"],
+                    "success": result["code"] == 0,
+                }
+        
         # Build exec command
         args = ["exec", self.container_name, "sh", "-c", cmd]
         
@@ -0,0 +1,173 @@
+"""Persistent exec channel into a sandbox container
+
+Every ``docker exec`` forks the docker CLI, round-trips the daemon API and
+sets up a new exec session, which costs tens to hundreds of milliseconds
+per tool call. The channel instead starts one long-lived
+``docker exec -i <container> sh`` running a tiny agent loop and sends
+commands to it over stdin.
+
+Protocol (one command at a time, after the agent has printed "ready"):
+
+    host  -> agent:  "<id> <base64 command>\\n"
+    agent -> host:   "<id> <exit code> <stdout bytes> <stderr bytes>\\n"
+                     followed by the raw stdout and stderr
+
+Commands run in a fresh ``sh -c`` with stdin from /dev/null, so they see
+the same environment and isolation as a one-shot ``docker exec``. The agent
+needs only ``sh``, ``base64``, ``mktemp``, ``wc`` and ``cat``.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import itertools
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Commands larger than this go through a one-shot ``docker exec`` instead
+# (the agent reads requests with ``read -r``, which is byte-at-a-time)
+CHANNEL_MAX_COMMAND_BYTES = 64 * 1024
+
+# How long the agent may take to come up
+CHANNEL_OPEN_TIMEOUT_SEC = 10.0
+
+AGENT_SCRIPT = r"""
+command -v base64 >/dev/null 2>&1 || exit 127
+echo ready
+while IFS= read -r line; do
+  id=${line%% *}
+  cmd=$(printf '%s' "${line#* }" | base64 -d)
+  out=$(mktemp) || exit 1
+  err=$(mktemp) || exit 1
+  sh -c "$cmd" </dev/null >"$out" 2>"$err"
+  code=$?
+  printf '%s %s %s %s\n' "$id" "$code" $(wc -c <"$out") $(wc -c <"$err")
+  cat "$out" "$err"
+  rm -f "$out" "$err"
+done
+"""
+
+
+class ExecChannelError(RuntimeError):
+    """
+    The channel could not be opened, died, or spoke out of protocol
+
+    ``command_sent`` tells whether the command may already have run, i.e.
+    whether retrying it through ``docker exec`` is unsafe.
+    """
+
+    def __init__(self, message: str, command_sent: bool = True):
+        super().__init__(message)
+        self.command_sent = command_sent
+
+
+class ExecChannel:
+    """Long-lived command channel into one container"""
+
+    def __init__(self, container_name: str):
+        self.container_name = container_name
+        self._proc: asyncio.subprocess.Process | None = None
+        self._lock = asyncio.Lock()
+        self._ids = itertools.count(1)
+
+    @property
+    def busy(self) -> bool:
+        """Whether a command is in flight"""
+        return self._lock.locked()
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None
+
+    async def run(self, cmd: str, timeout: float | None = None) -> dict[str, Any]:
+        """
+        Run a shell command in the container
+
+        Args:
+            cmd: Shell command
+            timeout: Seconds before the channel is abandoned (the command
+                itself keeps running in the container)
+
+        Returns:
+            Dict with stdout, stderr, code
+
+        Raises:
+            ExecChannelError: If the channel is unusable
+            TimeoutError: If ``timeout`` expired
+        """
+        async with self._lock:
+            if not self.alive:
+                await self._open()
+            try:
+                return await asyncio.wait_for(self._roundtrip(cmd), timeout)
+            except (TimeoutError, ExecChannelError, ConnectionError):
+                # Output of the abandoned command would desync the stream
+                await self.close()
+                raise
+
+    async def close(self) -> None:
+        """Terminate the channel's ``docker exec`` process"""
+        proc, self._proc = self._proc, None
+        if proc is None or proc.returncode is not None:
+            return
+        try:
+            proc.stdin.close()
+            await asyncio.wait_for(proc.wait(), timeout=1.0)
+        except (TimeoutError, ConnectionError):
+            proc.kill()
+            await proc.wait()
+
+    async def _open(self) -> None:
+        try:
+            self._proc = await asyncio.create_subprocess_exec(
+                "docker",
+                "exec",
+                "-i",
+                self.container_name,
+                "sh",
+                "-c",
+                AGENT_SCRIPT,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except OSError as e:
+            raise ExecChannelError(f"Cannot start exec channel: {e}", command_sent=False) from e
+
+        try:
+            ready = await asyncio.wait_for(self._proc.stdout.readline(), CHANNEL_OPEN_TIMEOUT_SEC)
+        except TimeoutError:
+            ready = b""
+        if ready != b"ready\n":
+            await self.close()
+            raise ExecChannelError(
+                f"Exec channel into {self.container_name} did not start", command_sent=False
+            )
+        logger.debug(f"Opened exec channel into {self.container_name}")
+
+    async def _roundtrip(self, cmd: str) -> dict[str, Any]:
+        request_id = str(next(self._ids))
+        encoded = base64.b64encode(cmd.encode()).decode("ascii")
+        self._proc.stdin.write(f"{request_id} {encoded}\n".encode("ascii"))
+        await self._proc.stdin.drain()
+
+        header = await self._proc.stdout.readline()
+        parts = header.split()
+        try:
+            if len(parts) != 4 or parts[0].decode() != request_id:
+                raise ValueError
+            code, out_len, err_len = (int(p) for p in parts[1:])
+        except ValueError:
+            raise ExecChannelError(f"Unexpected exec channel reply: {header[:80]!r}") from None
+        try:
+            body = await self._proc.stdout.readexactly(out_len + err_len)
+        except asyncio.IncompleteReadError as e:
+            raise ExecChannelError("Exec channel closed mid-reply") from e
+
+        return {
+            "stdout": body[:out_len].decode(errors="replace"),
+            "stderr": body[out_len:].decode(errors="replace"),
+            "code": code,
+        }
@@ -0,0 +1,299 @@
+"""Warm sandbox container pool
+
+Cold-starting a sandbox (image check, ``docker run``, first exec) costs
+seconds. The pool keeps started containers ready per configuration and
+workspace, hands them out exclusively, and takes them back after a reset
+so the next session starts warm.
+
+A running container's bind mounts cannot be changed, so warm containers
+are keyed by config hash *and* workspace directory; sessions of the same
+agent share a workspace and therefore a pool key.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .config_hash import compute_sandbox_config_hash
+from .constants import HOT_CONTAINER_WINDOW_MS
+from .docker import DockerSandbox, DockerSandboxConfig, docker_container_state
+
+logger = logging.getLogger(__name__)
+
+# Warm containers kept ready per key after the first acquire. Off by
+# default: each spare is a running container; the gateway opts in through
+# ``sandbox.pool.minIdle``.
+DEFAULT_MIN_IDLE = 0
+
+# Idle containers kept per key at most; extra released ones are stopped
+DEFAULT_MAX_IDLE = 4
+
+
+@dataclass
+class _PoolKey:
+    config: DockerSandboxConfig
+    workspace_dir: Path | None
+    idle: list[tuple[float, DockerSandbox]] = field(default_factory=list)
+    warming: int = 0
+
+
+class SandboxPool:
+    """
+    Pool of pre-started sandbox containers
+
+    Features:
+    - Pre-warmed containers per config hash and workspace
+    - Exclusive checkout; release resets the container for reuse
+    - Optional background refill to ``min_idle`` after each acquire
+    - Idle containers stopped after ``idle_ttl_sec``
+    """
+
+    def __init__(
+        self,
+        min_idle: int = DEFAULT_MIN_IDLE,
+        max_idle: int = DEFAULT_MAX_IDLE,
+        idle_ttl_sec: float = HOT_CONTAINER_WINDOW_MS / 1000,
+    ):
+        """
+        Initialize pool
+
+        Args:
+            min_idle: Warm containers to keep ready per key once it is used
+                (0 keeps only released containers)
+            max_idle: Idle containers kept per key at most
+            idle_ttl_sec: Stop containers idle for longer than this
+        """
+        self.min_idle = min_idle
+        self.max_idle = max(max_idle, min_idle)
+        self.idle_ttl_sec = idle_ttl_sec
+
+        self._keys: dict[str, _PoolKey] = {}
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task] = set()
+        self._stats = {"hits": 0, "misses": 0, "released": 0, "discarded": 0}
+
+    @staticmethod
+    def pool_key(config: DockerSandboxConfig, workspace_dir: Path | None = None) -> str:
+        """Key shared by interchangeable containers"""
+        return compute_sandbox_config_hash(
+            {**config.to_dict(), "workspace_dir": str(workspace_dir) if workspace_dir else None}
+        )
+
+    async def acquire(
+        self, config: DockerSandboxConfig, workspace_dir: Path | None = None
+    ) -> DockerSandbox:
+        """
+        Check out a started sandbox, warm if one is available
+
+        Args:
+            config: Sandbox configuration
+            workspace_dir: Workspace directory to mount
+
+        Returns:
+            Started DockerSandbox, owned by the caller until ``release``
+        """
+        key = self.pool_key(config, workspace_dir)
+        async with self._lock:
+            entry = self._keys.setdefault(key, _PoolKey(config, workspace_dir))
+            candidates = entry.idle
+            entry.idle = []
+
+        sandbox = None
+        # Newest first: the likeliest to still be running
+        while candidates:
+            _, candidate = candidates.pop()
+            state = await docker_container_state(candidate.container_name)
+            if state["running"]:
+                sandbox = candidate
+                break
+            await self._discard(candidate)
+
+        async with self._lock:
+            # Unchecked candidates go back; they were valid a moment ago
+            entry.idle = candidates + entry.idle
+
+        if sandbox is not None:
+            self._stats["hits"] += 1
+            logger.debug(f"Acquired warm sandbox {sandbox.container_name}")
+        else:
+            self._stats["misses"] += 1
+            sandbox = DockerSandbox(config, workspace_dir)
+            await sandbox.start()
+
+        self._schedule_refill(key)
+        return sandbox
+
+    async def release(
+        self, sandbox: DockerSandbox, reset: bool = True, idle_sec: float = 0.0
+    ) -> None:
+        """
+        Return a sandbox to the pool
+
+        Args:
+            sandbox: Sandbox from ``acquire``
+            reset: Kill leftover processes and clear /tmp before reuse
+            idle_sec: How long the sandbox has already sat unused; it counts
+                against ``idle_ttl_sec``
+        """
+        if idle_sec > self.idle_ttl_sec:
+            await self._discard(sandbox)
+            return
+
+        key = self.pool_key(sandbox.config, sandbox.workspace_dir)
+        try:
+            if reset:
+                await sandbox.reset()
+        except Exception as e:
+            logger.warning(f"Resetting sandbox {sandbox.container_name} failed: {e}")
+            await self._discard(sandbox)
+            return
+
+        async with self._lock:
+            entry = self._keys.setdefault(key, _PoolKey(sandbox.config, sandbox.workspace_dir))
+            if len(entry.idle) < self.max_idle:
+                entry.idle.append((time.monotonic() - idle_sec, sandbox))
+                self._stats["released"] += 1
+                return
+        await self._discard(sandbox)
+
+    async def prewarm(
+        self,
+        config: DockerSandboxConfig,
+        workspace_dir: Path | None = None,
+        count: int | None = None,
+    ) -> int:
+        """
+        Start containers ahead of the first acquire
+
+        Args:
+            config: Sandbox configuration
+            workspace_dir: Workspace directory to mount
+            count: Idle containers wanted (default ``min_idle``)
+
+        Returns:
+            Number of containers started
+        """
+        key = self.pool_key(config, workspace_dir)
+        async with self._lock:
+            entry = self._keys.setdefault(key, _PoolKey(config, workspace_dir))
+        return await self._fill(entry, self.min_idle if count is None else count)
+
+    async def prune(self) -> int:
+        """
+        Stop containers idle past ``idle_ttl_sec``
+
+        Returns:
+            Number of containers stopped
+        """
+        cutoff = time.monotonic() - self.idle_ttl_sec
+        expired: list[DockerSandbox] = []
+        async with self._lock:
+            for entry in self._keys.values():
+                expired.extend(s for t, s in entry.idle if t < cutoff)
+                entry.idle = [(t, s) for t, s in entry.idle if t >= cutoff]
+        for sandbox in expired:
+            await self._discard(sandbox)
+        return len(expired)
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters and idle containers per key"""
+        return {
+            **self._stats,
+            "idle": {key: len(entry.idle) for key, entry in self._keys.items()},
+        }
+
+    async def shutdown(self) -> None:
+        """Stop every idle container and pending refill"""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        async with self._lock:
+            sandboxes = [s for entry in self._keys.values() for _, s in entry.idle]
+            self._keys.clear()
+        await asyncio.gather(*(self._discard(s) for s in sandboxes), return_exceptions=True)
+
+    def _schedule_refill(self, key: str) -> None:
+        if self.min_idle <= 0:
+            return
+        task = asyncio.create_task(self._fill(self._keys[key], self.min_idle))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fill(self, entry: _PoolKey, target: int) -> int:
+        """Start containers until ``target`` are idle or warming"""
+        async with self._lock:
+            missing = max(0, min(target, self.max_idle) - len(entry.idle) - entry.warming)
+            entry.warming += missing
+        if not missing:
+            return 0
+
+        async def warm_one() -> DockerSandbox:
+            sandbox = DockerSandbox(entry.config, entry.workspace_dir)
+            try:
+                await sandbox.start()
+            except BaseException:
+                # Don't leak a half-started container (e.g. on shutdown)
+                await self._discard(sandbox)
+                raise
+            return sandbox
+
+        try:
+            results = await asyncio.gather(
+                *(warm_one() for _ in range(missing)), return_exceptions=True
+            )
+        finally:
+            entry.warming -= missing
+
+        started = 0
+        surplus: list[DockerSandbox] = []
+        async with self._lock:
+            for result in results:
+                if isinstance(result, BaseException):
+                    logger.warning(f"Pre-warming sandbox failed: {result}")
+                elif len(entry.idle) < self.max_idle:
+                    entry.idle.append((time.monotonic(), result))
+                    started += 1
+                else:
+                    surplus.append(result)
+        for sandbox in surplus:
+            await self._discard(sandbox)
+        return started
+
+    async def _discard(self, sandbox: DockerSandbox) -> None:
+        self._stats["discarded"] += 1
+        try:
+            await sandbox.stop()
+        except Exception as e:
+            logger.warning(f"Error stopping sandbox {sandbox.container_name}: {e}")
+
+
+# Global pool instance
+_pool: SandboxPool | None = None
+
+
+def get_sandbox_pool(
+    min_idle: int | None = None,
+    max_idle: int | None = None,
+    idle_ttl_sec: float | None = None,
+) -> SandboxPool:
+    """
+    Get global sandbox pool instance
+
+    Limits passed here are applied to the pool (creating it if needed);
+    omitted ones keep their current value.
+    """
+    global _pool
+    if _pool is None:
+        _pool = SandboxPool()
+    if min_idle is not None:
+        _pool.min_idle = min_idle
+    if max_idle is not None:
+        _pool.max_idle = max_idle
+    if idle_ttl_sec is not None:
+        _pool.idle_ttl_sec = idle_ttl_sec
+    _pool.max_idle = max(_pool.max_idle, _pool.min_idle)
+    return _pool
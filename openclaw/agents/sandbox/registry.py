@@ -14,6 +14,7 @@ from typing import Any
 from .config_hash import compute_sandbox_config_hash
 from .constants import HOT_CONTAINER_WINDOW_MS
 from .docker import DockerSandbox, DockerSandboxConfig, docker_container_state
+from .pool import SandboxPool, get_sandbox_pool
 
 logger = logging.getLogger(__name__)
 
@@ -35,10 +36,13 @@ class SandboxRegistry:
     
     Manages hot container reuse for performance.
     Containers with matching configuration can be reused
-    within HOT_CONTAINER_WINDOW_MS (5 minutes).
+    within HOT_CONTAINER_WINDOW_MS (5 minutes). New containers
+    come from the pool (warm when possible) and go back to it
+    when they leave the hot window.
     """
     
-    def __init__(self):
+    def __init__(self, pool: SandboxPool | None = None):
+        self._pool = pool
         self._containers: dict[str, ContainerEntry] = {}
         self._cleanup_task: asyncio.Task | None = None
         self._lock = asyncio.Lock()
@@ -84,9 +88,13 @@ class SandboxRegistry:
                 entry.last_used_ms = now_ms
                 return entry.sandbox
             
-            # No hot container found, create new one
-            sandbox = DockerSandbox(config, workspace_dir)
-            container_name = await sandbox.start()
+            # No hot container found, take one from the pool or create it
+            if self._pool is not None:
+                sandbox = await self._pool.acquire(config, workspace_dir)
+                container_name = sandbox.container_name
+            else:
+                sandbox = DockerSandbox(config, workspace_dir)
+                container_name = await sandbox.start()
             
             # Register
             entry = ContainerEntry(
@@ -123,13 +131,21 @@ class SandboxRegistry:
             if entry:
                 logger.info(f"Cleaning up old sandbox container: {container_name}")
                 try:
-                    await entry.sandbox.stop()
+                    await self._retire(entry.sandbox, (now_ms - entry.last_used_ms) / 1000)
                 except Exception as e:
                     logger.warning(f"Error stopping container {container_name}: {e}")
                 
                 async with self._lock:
                     self._containers.pop(container_name, None)
     
+    async def _retire(self, sandbox: DockerSandbox, idle_sec: float = 0.0):
+        """Hand a container back to the pool, or stop it"""
+        if self._pool is not None:
+            # Time already spent unused counts against the pool's idle TTL
+            await self._pool.release(sandbox, idle_sec=idle_sec)
+        else:
+            await sandbox.stop()
+    
     async def _cleanup_loop(self):
         """Background cleanup task"""
         while True:
@@ -137,6 +153,8 @@ class SandboxRegistry:
                 # Run cleanup every minute
                 await asyncio.sleep(60)
                 await self.cleanup_old_containers()
+                if self._pool is not None:
+                    await self._pool.prune()
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -158,6 +176,9 @@ class SandboxRegistry:
         
         if self._cleanup_task:
             self._cleanup_task.cancel()
+        
+        if self._pool is not None:
+            await self._pool.shutdown()
 
 
 # Global registry instance
@@ -168,5 +189,5 @@ def get_sandbox_registry() -> SandboxRegistry:
     """Get global sandbox registry instance"""
     global _registry
     if _registry is None:
-        _registry = SandboxRegistry()
+        _registry = SandboxRegistry(pool=get_sandbox_pool())
     return _registry
@@ -6,12 +6,17 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
+from openclaw.agents.compaction.analyzer import TokenAnalyzer
 from openclaw.agents.session_ids import generate_session_id, looks_like_session_id
 from openclaw.routing.session_key import (
     build_agent_main_session_key,
@@ -22,6 +27,24 @@ from openclaw.routing.session_key import (
 
 logger = logging.getLogger(__name__)
 
+# Number of journal entries accumulated before a background compaction folds
+# them into the snapshot file.
+JOURNAL_COMPACT_THRESHOLD = 500
+
+# Shared single worker so compactions never pile up on the caller's thread
+_compaction_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-compact")
+
+# Created on first count so importing sessions doesn't load a tokenizer
+_default_analyzer: TokenAnalyzer | None = None
+
+
+def _default_token_counter(message: dict[str, Any]) -> int:
+    """Counts API-format messages until a session is given a model-specific counter"""
+    global _default_analyzer
+    if _default_analyzer is None:
+        _default_analyzer = TokenAnalyzer()
+    return _default_analyzer.count_message_tokens(message)
+
 
 class Message(BaseModel):
     """A single message in a conversation"""
@@ -34,6 +57,9 @@ class Message(BaseModel):
     name: str | None = None  # For tool results
     images: list[str] | None = None  # Image URLs or paths
 
+    # Token count recorded by the owning session's ledger (not persisted)
+    _tokens: int | None = PrivateAttr(default=None)
+
     def to_api_format(self) -> dict[str, Any]:
         """Convert to API format for LLM calls"""
         msg = {"role": self.role, "content": self.content}
@@ -53,6 +79,26 @@ class Message(BaseModel):
 class Session(BaseModel):
     """
     Manages a conversation session with persistence
+
+    Storage layout (journal mode, the default):
+    - ``.sessions/<id>.json``: snapshot of the full session (legacy format)
+    - ``.sessions/<id>.journal``: append-only JSONL of changes since the snapshot
+
+    Each message or metadata change appends one line to the journal, so the
+    per-turn write cost does not grow with history length. Once the journal
+    reaches ``compact_threshold`` entries it is folded into the snapshot in a
+    background thread (write temp file, fsync, rename). Every journal entry
+    carries a sequence number and the snapshot records the last sequence it
+    includes, so a crash between the two renames never replays an entry twice.
+
+    Existing ``.json`` sessions need no migration step: they are loaded as the
+    base snapshot and new changes are journaled on top of them.
+
+    The session also keeps a token ledger: each message is counted once when
+    it is added (or loaded) and ``token_count`` returns the running total,
+    so context-window checks do not re-tokenize the history every turn.
+    Replacing ``messages`` wholesale is detected and recounted lazily;
+    ``replace_messages`` does that eagerly and persists the result.
     """
 
     session_id: str
@@ -64,15 +110,53 @@ class Session(BaseModel):
 
     model_config = {"arbitrary_types_allowed": True}
 
-    def __init__(self, session_id: str, workspace_dir: Path, **kwargs):
-        """Initialize session, loading from disk if exists"""
+    _journal_enabled: bool = PrivateAttr(default=True)
+    _compact_threshold: int = PrivateAttr(default=JOURNAL_COMPACT_THRESHOLD)
+    _journal_seq: int = PrivateAttr(default=0)
+    _journal_entries: int = PrivateAttr(default=0)
+    _compaction_pending: bool = PrivateAttr(default=False)
+    _compaction_future: Future | None = PrivateAttr(default=None)
+    # Set by close(); a closed session no longer writes snapshots
+    _closed: bool = PrivateAttr(default=False)
+    # Guards in-memory state and journal appends
+    _state_lock: threading.RLock = PrivateAttr(default_factory=threading.RLock)
+    # Serializes snapshot writers (background compaction vs. foreground _save)
+    _compact_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    # Token ledger: running total over the list object it was computed for
+    _token_counter: Callable[[dict[str, Any]], int] = PrivateAttr(
+        default_factory=lambda: _default_token_counter
+    )
+    _token_total: int = PrivateAttr(default=0)
+    _ledger_messages: list[Message] | None = PrivateAttr(default=None)
+    _ledger_len: int = PrivateAttr(default=0)
+
+    def __init__(
+        self,
+        session_id: str,
+        workspace_dir: Path,
+        journal: bool = True,
+        compact_threshold: int = JOURNAL_COMPACT_THRESHOLD,
+        **kwargs,
+    ):
+        """
+        Initialize session, loading from disk if exists
+
+        Args:
+            session_id: Session identifier
+            workspace_dir: Workspace containing the ``.sessions`` directory
+            journal: Append changes to a journal instead of rewriting the
+                whole session file on every change
+            compact_threshold: Journal entries before background compaction
+        """
         super().__init__(session_id=session_id, workspace_dir=workspace_dir, **kwargs)
+        self._journal_enabled = journal
+        self._compact_threshold = max(1, compact_threshold)
 
         # Create sessions directory
         self._sessions_dir.mkdir(parents=True, exist_ok=True)
 
         # Load existing session if exists
-        if self._session_file.exists() and not self.messages:
+        if not self.messages and (self._session_file.exists() or self._journal_file.exists()):
             self._load()
 
     @property
@@ -85,12 +169,25 @@ class Session(BaseModel):
         """Get session file path"""
         return self._sessions_dir / f"{self.session_id}.json"
 
+    @property
+    def _journal_file(self) -> Path:
+        """Get append-only journal path"""
+        return self._sessions_dir / f"{self.session_id}.journal"
+
     def add_message(self, role: str, content: str, **kwargs) -> Message:
         """Add a message to the session"""
         msg = Message(role=role, content=content, **kwargs)
-        self.messages.append(msg)
-        self.updated_at = datetime.now(UTC).isoformat()
-        self._save()
+        with self._state_lock:
+            self.messages.append(msg)
+            if self._ledger_messages is self.messages and self._ledger_len == len(self.messages) - 1:
+                self._token_total += self._message_tokens(msg)
+                self._ledger_len += 1
+            self.updated_at = datetime.now(UTC).isoformat()
+            journaled = self._append_journal(
+                {"op": "message", "message": msg.model_dump(mode="json")}
+            )
+        if not journaled:
+            self._save()
         return msg
 
     def add_user_message(self, content: str) -> Message:
@@ -122,48 +219,233 @@ class Session(BaseModel):
         messages = self.get_messages(limit)
         return [msg.to_api_format() for msg in messages]
 
+    @property
+    def token_count(self) -> int:
+        """Tokens in the current history, from the running ledger"""
+        with self._state_lock:
+            self._sync_tokens()
+            return self._token_total
+
+    def set_token_counter(self, counter: Callable[[dict[str, Any]], int]) -> None:
+        """
+        Count tokens with ``counter`` (e.g. ``TokenAnalyzer.count_message_tokens``)
+
+        Switching to a different counter recounts the history once; passing
+        the current one again is a no-op.
+        """
+        with self._state_lock:
+            if counter == self._token_counter:
+                return
+            self._token_counter = counter
+            for msg in self.messages:
+                msg._tokens = None
+            self._ledger_messages = None
+
+    def replace_messages(self, messages: list[Message]) -> None:
+        """Replace the history (e.g. after compaction) and persist it"""
+        with self._state_lock:
+            self.messages = list(messages)
+            self.updated_at = datetime.now(UTC).isoformat()
+            self._sync_tokens()
+        # The journal only appends, so a rewritten history needs a snapshot
+        self._save()
+
+    def _message_tokens(self, msg: Message) -> int:
+        """Token count for one message, computed on first use"""
+        if msg._tokens is None:
+            msg._tokens = self._token_counter(msg.to_api_format())
+        return msg._tokens
+
+    def _sync_tokens(self) -> None:
+        """Recount the ledger if messages changed outside add_message"""
+        if self._ledger_messages is self.messages and self._ledger_len == len(self.messages):
+            return
+        self._token_total = sum(self._message_tokens(msg) for msg in self.messages)
+        self._ledger_messages = self.messages
+        self._ledger_len = len(self.messages)
+
     def clear(self) -> None:
         """Clear all messages"""
-        self.messages = []
-        self.updated_at = datetime.utcnow().isoformat()
+        with self._state_lock:
+            self.messages = []
+            self.updated_at = datetime.utcnow().isoformat()
+        # Clearing discards history anyway, so rewrite the snapshot directly
         self._save()
 
     def set_metadata(self, key: str, value: Any) -> None:
         """Set metadata value"""
-        self.metadata[key] = value
-        self._save()
+        with self._state_lock:
+            self.metadata[key] = value
+            journaled = self._append_journal({"op": "metadata", "key": key, "value": value})
+        if not journaled:
+            self._save()
 
     def get_metadata(self, key: str, default: Any = None) -> Any:
         """Get metadata value"""
         return self.metadata.get(key, default)
 
-    def _save(self) -> None:
-        """Save session to disk"""
+    def flush(self) -> None:
+        """Fold the journal into the snapshot now (blocks until written)"""
+        self._save()
+
+    def close(self) -> None:
+        """
+        Stop background compaction: wait for a running one to finish and
+        drop a queued one, so nothing is written after the session is
+        closed (e.g. deleted)
+        """
+        with self._compact_lock:
+            self._closed = True
+            future = self._compaction_future
+        if future is not None:
+            future.cancel()
+
+    def _append_journal(self, record: dict[str, Any]) -> bool:
+        """
+        Append one change to the journal (caller holds the state lock)
+
+        Returns False when the caller must write a full snapshot instead:
+        in legacy mode, or on first write when no base snapshot exists yet.
+        """
+        if not self._journal_enabled or not self._session_file.exists():
+            return False
+
+        self._journal_seq += 1
+        record["seq"] = self._journal_seq
+        record["updated_at"] = self.updated_at
+        line = json.dumps(record, default=str, separators=(",", ":"), ensure_ascii=False)
         try:
-            data = {
-                "session_id": self.session_id,
-                "messages": [msg.model_dump() for msg in self.messages],
-                "metadata": self.metadata,
-                "created_at": self.created_at,
-                "updated_at": self.updated_at,
-            }
-            with open(self._session_file, "w") as f:
-                json.dump(data, f, indent=2, default=str)
+            with open(self._journal_file, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
         except Exception as e:
-            logger.error(f"Failed to save session: {e}")
+            logger.error(f"Failed to append session journal: {e}")
+            return True
 
-    def _load(self) -> None:
-        """Load session from disk"""
+        self._journal_entries += 1
+        if self._journal_entries >= self._compact_threshold and not self._compaction_pending:
+            self._compaction_pending = True
+            self._compaction_future = _compaction_executor.submit(self._compact)
+        return True
+
+    def _compact(self) -> None:
+        """Background compaction entry point"""
         try:
-            with open(self._session_file) as f:
-                data = json.load(f)
+            self._save()
+        except Exception as e:
+            logger.error(f"Session compaction failed: {e}")
 
-            self.messages = [Message(**msg) for msg in data.get("messages", [])]
-            self.metadata = data.get("metadata", {})
-            self.created_at = data.get("created_at", self.created_at)
-            self.updated_at = data.get("updated_at", self.updated_at)
+    def _save(self) -> None:
+        """
+        Write a full snapshot atomically and drop journal entries it covers
+        """
+        with self._compact_lock:
+            if self._closed:
+                return
+            try:
+                with self._state_lock:
+                    # Shallow copies are enough: messages are never mutated in place
+                    messages = list(self.messages)
+                    metadata = dict(self.metadata)
+                    created_at = self.created_at
+                    updated_at = self.updated_at
+                    covered_seq = self._journal_seq
+                    self._compaction_pending = False
+
+                data = {
+                    "session_id": self.session_id,
+                    "messages": [msg.model_dump() for msg in messages],
+                    "metadata": metadata,
+                    "created_at": created_at,
+                    "updated_at": updated_at,
+                    "journal_seq": covered_seq,
+                }
+                _atomic_write_text(
+                    self._session_file, json.dumps(data, indent=2, default=str)
+                )
+
+                with self._state_lock:
+                    self._truncate_journal(covered_seq)
+            except Exception as e:
+                logger.error(f"Failed to save session: {e}")
+
+    def _truncate_journal(self, covered_seq: int) -> None:
+        """Rewrite the journal keeping only entries newer than covered_seq"""
+        journal = self._journal_file
+        if not journal.exists():
+            self._journal_entries = 0
+            return
+
+        remaining: list[str] = []
+        with open(journal, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    if json.loads(line).get("seq", 0) > covered_seq:
+                        remaining.append(line if line.endswith("\n") else line + "\n")
+                except json.JSONDecodeError:
+                    continue
+
+        if remaining:
+            _atomic_write_text(journal, "".join(remaining))
+        else:
+            journal.unlink(missing_ok=True)
+        self._journal_entries = len(remaining)
+
+    def _load(self) -> None:
+        """Load snapshot from disk and replay the journal on top of it"""
+        covered_seq = 0
+        try:
+            if self._session_file.exists():
+                with open(self._session_file) as f:
+                    data = json.load(f)
+
+                self.messages = [Message(**msg) for msg in data.get("messages", [])]
+                self.metadata = data.get("metadata", {})
+                self.created_at = data.get("created_at", self.created_at)
+                self.updated_at = data.get("updated_at", self.updated_at)
+                covered_seq = data.get("journal_seq", 0)
         except Exception as e:
             logger.error(f"Failed to load session: {e}")
+            return
+
+        self._journal_seq = covered_seq
+        if not self._journal_file.exists():
+            return
+
+        replayed = 0
+        torn = False
+        with open(self._journal_file, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-append leaves a partial last line
+                    logger.warning(f"Ignoring torn journal entry in {self._journal_file}")
+                    torn = True
+                    break
+                seq = record.get("seq", 0)
+                if seq <= covered_seq:
+                    continue
+                self._apply_journal_record(record)
+                self._journal_seq = max(self._journal_seq, seq)
+                replayed += 1
+
+        self._journal_entries = replayed
+        if torn or not self._journal_enabled:
+            # Fold everything into the snapshot so later appends start clean
+            self._save()
+
+    def _apply_journal_record(self, record: dict[str, Any]) -> None:
+        """Apply a single journal entry to in-memory state"""
+        op = record.get("op")
+        if op == "message":
+            self.messages.append(Message(**record["message"]))
+        elif op == "metadata":
+            self.metadata[record["key"]] = record.get("value")
+        else:
+            logger.warning(f"Unknown session journal op: {op}")
+            return
+        if record.get("updated_at"):
+            self.updated_at = record["updated_at"]
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary"""
@@ -177,6 +459,26 @@ class Session(BaseModel):
         }
 
 
+def _atomic_write_text(path: Path, text: str) -> None:
+    """Write text to path via temp file + fsync + rename"""
+    tmp = path.with_name(f"{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    try:
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
 class SessionManager:
     """
     Manages multiple sessions with enhanced session key support
@@ -349,9 +651,10 @@ class SessionManager:
         Returns:
             True if deleted, False if not found
         """
-        # Remove from memory
-        if session_id in self._sessions:
-            del self._sessions[session_id]
+        # Remove from memory, letting any background compaction finish first
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            session.close()
 
         # Remove from session map
         keys_to_remove = [k for k, v in self._session_map.items() if v == session_id]
@@ -363,6 +666,8 @@ class SessionManager:
             logger.info(f"Removed {len(keys_to_remove)} session key(s) for {session_id}")
 
         # Remove from disk
+        journal_file = self.workspace_dir / ".sessions" / f"{session_id}.journal"
+        journal_file.unlink(missing_ok=True)
         session_file = self.workspace_dir / ".sessions" / f"{session_id}.json"
         if session_file.exists():
             session_file.unlink()
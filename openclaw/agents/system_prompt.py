@@ -16,7 +16,7 @@ Section order matches TypeScript src/agents/system-prompt.ts buildAgentSystemPro
  12. Documentation
  13. Sandbox (if enabled)
  14. User Identity
- 15. Time section
+ 15. Time section (emitted last, as the volatile suffix; see below)
  16. Workspace Files (injected) note
  17. Reply Tags
  18. Messaging
@@ -28,10 +28,17 @@ Section order matches TypeScript src/agents/system-prompt.ts buildAgentSystemPro
  24. Silent Replies
  25. Heartbeats
  26. Runtime
+
+Prompt caching: providers reuse a cached prompt prefix only while it is
+byte-identical across calls. ``build_agent_system_prompt_parts`` therefore
+returns the prompt as a stable prefix (sections that only change with
+config, tools or workspace files) and a volatile suffix (the Time section,
+which changes every call). ``build_agent_system_prompt`` joins the two.
 """
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Literal
 
@@ -64,7 +71,35 @@ from .system_prompt_sections import (
 logger = logging.getLogger(__name__)
 
 
-def build_agent_system_prompt(
+@dataclass(frozen=True)
+class SystemPromptParts:
+    """System prompt split for prefix caching."""
+
+    stable: str
+    volatile: str = ""
+
+    @property
+    def text(self) -> str:
+        """The full prompt, stable prefix first."""
+        return "\n".join(part for part in (self.stable, self.volatile) if part)
+
+    def __str__(self) -> str:
+        return self.text
+
+
+def build_agent_system_prompt(workspace_dir: Path, **kwargs) -> str:
+    """
+    Build the agent system prompt as a single string.
+
+    Takes the same arguments as ``build_agent_system_prompt_parts``.
+
+    Returns:
+        Complete system prompt string
+    """
+    return build_agent_system_prompt_parts(workspace_dir, **kwargs).text
+
+
+def build_agent_system_prompt_parts(
     workspace_dir: Path,
     tool_names: list[str] | None = None,
     tool_summaries: dict[str, str] | None = None,
@@ -90,11 +125,12 @@ def build_agent_system_prompt(
     message_tool_hints: list[str] | None = None,
     message_channel_options: str = "telegram|discord|slack|signal",
     has_gateway: bool = True,
-) -> str:
+) -> SystemPromptParts:
     """
-    Build the agent system prompt.
+    Build the agent system prompt, split into stable and volatile parts.
 
-    Section order matches TypeScript ``buildAgentSystemPrompt`` exactly.
+    Section order matches TypeScript ``buildAgentSystemPrompt``, except that
+    the Time section is moved to the volatile suffix.
 
     Args:
         workspace_dir: Workspace directory path
@@ -122,11 +158,11 @@ def build_agent_system_prompt(
         has_gateway: Whether gateway tool is available
 
     Returns:
-        Complete system prompt string
+        SystemPromptParts with the cacheable prefix and the per-call suffix
     """
     # --- "none" mode: just identity ---
     if prompt_mode == "none":
-        return "You are a personal assistant running inside OpenClaw."
+        return SystemPromptParts("You are a personal assistant running inside OpenClaw.")
 
     is_minimal = prompt_mode == "minimal"
     available_tools = set(tool_names or [])
@@ -238,7 +274,8 @@ def build_agent_system_prompt(
     lines.extend(build_user_identity_section(owner_line, is_minimal))
 
     # ── 15. Time ─────────────────────────────────────────────────────
-    lines.extend(build_time_section(user_timezone))
+    # Changes on every call, so it is kept out of the cacheable prefix
+    volatile_lines = build_time_section(user_timezone)
 
     # ── 16. Workspace Files (injected) note ──────────────────────────
     lines.extend(build_workspace_files_note_section())
@@ -322,13 +359,14 @@ def build_agent_system_prompt(
 
     # Filter empty strings that were added only for conditional sections
     prompt = "\n".join(line for line in lines if line is not None)
+    volatile = "\n".join(line for line in volatile_lines if line is not None)
     
     # Replace session workspace placeholder
     # Note: For now, using workspace_dir as fallback
     # Future: Add session_workspace parameter and use resolve_session_workspace_dir()
     prompt = prompt.replace("{{SESSION_WORKSPACE}}", str(workspace_dir))
     
-    return prompt
+    return SystemPromptParts(stable=prompt, volatile=volatile)
 
 
 def _is_soul_file(file: dict) -> bool:
@@ -0,0 +1,161 @@
+"""
+Text-delta coalescing for runtime observers
+
+Providers stream text a few tokens at a time. Observers such as the gateway
+turn every event into a websocket frame per client, so the runtime merges
+consecutive ``AGENT_TEXT`` deltas of a session before notifying them:
+
+- a merged delta is emitted ``window_ms`` after its first piece arrived,
+  or as soon as it reaches ``max_bytes``;
+- any other event of the session (tool use, thinking, turn end, errors)
+  flushes the pending text first, so observers see events in order.
+
+The event stream yielded by ``run_turn`` is not coalesced.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from ..events import Event, EventType
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CoalesceOptions:
+    """
+    Text-delta coalescing knobs
+
+    Attributes:
+        window_ms: Longest time a delta is held back (0 disables coalescing)
+        max_bytes: Flush once the pending text reaches this many UTF-8 bytes
+    """
+    window_ms: float = 40.0
+    max_bytes: int = 4096
+
+
+@dataclass
+class _PendingText:
+    first: Event
+    parts: list[str] = field(default_factory=list)
+    size: int = 0
+    timer: asyncio.TimerHandle | None = None
+
+
+def is_text_delta(event: Event) -> bool:
+    """Whether an event is a streamed AGENT_TEXT delta"""
+    if event.type != EventType.AGENT_TEXT or not isinstance(event.data, dict):
+        return False
+    delta = event.data.get("delta")
+    return isinstance(delta, dict) and delta.get("type") == "text_delta"
+
+
+class TextDeltaCoalescer:
+    """
+    Merge consecutive text deltas per session before emitting them
+
+    Example:
+        coalescer = TextDeltaCoalescer(notify, CoalesceOptions(window_ms=40))
+        await coalescer.push(event)   # for every runtime event
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[Event], Awaitable[None]],
+        options: CoalesceOptions | None = None,
+    ):
+        """
+        Initialize coalescer
+
+        Args:
+            emit: Receives merged and passed-through events, in order
+            options: Window and size limits
+        """
+        self.emit = emit
+        self.options = options or CoalesceOptions()
+        self.events_in = 0
+        self.events_out = 0
+        self._pending: dict[str | None, _PendingText] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.options.window_ms > 0
+
+    async def push(self, event: Event) -> None:
+        """Add an event; text deltas may be held back, others flush first"""
+        self.events_in += 1
+        if not self.enabled:
+            await self._emit(event)
+            return
+
+        key = event.session_id
+        if not is_text_delta(event):
+            async with self._lock:
+                await self._flush_locked(key)
+                await self._emit(event)
+            return
+
+        text = event.data["delta"].get("text") or ""
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = _PendingText(first=event)
+            pending.timer = asyncio.get_running_loop().call_later(
+                self.options.window_ms / 1000, self._schedule_flush, key, pending
+            )
+            self._pending[key] = pending
+        pending.parts.append(text)
+        pending.size += len(text.encode("utf-8"))
+
+        if pending.size >= self.options.max_bytes:
+            await self.flush(key)
+
+    async def flush(self, session_id: str | None = None) -> None:
+        """Emit the pending text of one session now"""
+        async with self._lock:
+            await self._flush_locked(session_id)
+
+    async def flush_all(self) -> None:
+        """Emit the pending text of every session now"""
+        async with self._lock:
+            for key in list(self._pending):
+                await self._flush_locked(key)
+
+    def _schedule_flush(self, key: str | None, pending: _PendingText) -> None:
+        """Timer callback: flush unless this buffer was already emitted"""
+        if self._pending.get(key) is pending:
+            asyncio.ensure_future(self.flush(key))
+
+    async def _flush_locked(self, key: str | None) -> None:
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        if pending.timer is not None:
+            pending.timer.cancel()
+
+        first = pending.first
+        if len(pending.parts) == 1:
+            await self._emit(first)
+            return
+
+        data = dict(first.data)
+        data["delta"] = {**first.data["delta"], "text": "".join(pending.parts)}
+        await self._emit(Event(
+            type=first.type,
+            source=first.source,
+            data=data,
+            timestamp=first.timestamp,
+            session_id=first.session_id,
+            channel_id=first.channel_id,
+            request_id=first.request_id,
+        ))
+
+    async def _emit(self, event: Event) -> None:
+        self.events_out += 1
+        try:
+            await self.emit(event)
+        except Exception as e:
+            logger.error(f"Coalesced event delivery failed: {e}", exc_info=True)
@@ -37,6 +37,10 @@ class AgentToolBase(ABC, Generic[TParams, TDetails]):
     - parameters: JSON Schema for parameters
     - execute: Async execution with streaming support
     
+    Tools that only read state (no side effects, idempotent) may set
+    ``concurrency_safe = True`` so several calls of them in one assistant
+    turn run concurrently (see ``tools.concurrency``).
+    
     Example:
         ```python
         class ReadFileTool(AgentToolBase[dict, dict]):
@@ -90,6 +94,9 @@ class AgentToolBase(ABC, Generic[TParams, TDetails]):
         ```
     """
     
+    # Safe to run alongside other concurrency-safe tool calls
+    concurrency_safe: bool = False
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -352,8 +359,12 @@ class LegacyAgentTool:
     - Set self.name, self.description in __init__
     - Implement get_schema() -> dict
     - Implement async _execute_impl(params) -> ToolResult
+    - Set ``concurrency_safe = True`` if the tool is read-only and idempotent
     """
     
+    # Safe to run alongside other concurrency-safe tool calls
+    concurrency_safe: bool = False
+    
     def __init__(self):
         self.name = ""
         self.description = ""
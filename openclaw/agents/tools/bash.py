@@ -1,18 +1,29 @@
 """Bash execution tool with exec security configuration"""
 from __future__ import annotations
 
-
 import asyncio
 import logging
 import os
 import shlex
+import time
+from collections.abc import Awaitable, Callable
 from pathlib import Path
 from typing import Any
 
 from .base import AgentTool, ToolResult
+from .output_buffer import DEFAULT_MAX_OUTPUT_BYTES, HeadTailBuffer
 
 logger = logging.getLogger(__name__)
 
+# Pipe read size
+READ_CHUNK_BYTES = 64 * 1024
+
+# Partial output is reported at most this often, and at most this much at once
+PROGRESS_INTERVAL_SEC = 0.5
+PROGRESS_MAX_BYTES = 4096
+
+ProgressCallback = Callable[[int, int, str], Awaitable[None]]
+
 
 class BashTool(AgentTool):
     """Execute bash commands with configurable security modes and approval workflow"""
@@ -47,6 +58,8 @@ class BashTool(AgentTool):
         self.safe_bins = set(self.exec_config.get("safe_bins", []))
         self.path_prepend = self.exec_config.get("path_prepend", [])
         self.timeout_sec = self.exec_config.get("timeout_sec", 120)
+        # Cap on captured output per stream; the middle is dropped beyond it
+        self.max_output_bytes = self.exec_config.get("max_output_bytes", DEFAULT_MAX_OUTPUT_BYTES)
         self.workspace_dir = workspace_dir
         self.approval_manager = approval_manager
 
@@ -130,6 +143,23 @@ class BashTool(AgentTool):
     
     async def execute(self, params: dict[str, Any]) -> ToolResult:
         """Execute bash command with security checks and approval workflow"""
+        return await self._execute(params, None)
+
+    async def execute_with_progress(
+        self, params: dict[str, Any], progress_callback: ProgressCallback
+    ) -> ToolResult:
+        """
+        Execute bash command, reporting partial output while it runs
+
+        ``progress_callback(bytes_so_far, 0, text)`` receives new output at
+        most every ``PROGRESS_INTERVAL_SEC``; the total is unknown (0).
+        """
+        return await self._execute(params, progress_callback)
+
+    async def _execute(
+        self, params: dict[str, Any], progress_callback: ProgressCallback | None
+    ) -> ToolResult:
+        """Security checks, approval workflow and streaming execution"""
         command = params.get("command", "")
         working_dir = params.get("working_directory")
 
@@ -212,32 +242,50 @@ class BashTool(AgentTool):
                 env=env,
             )
 
+            # Drain both pipes as output arrives into bounded buffers
+            stdout_buf = HeadTailBuffer(self.max_output_bytes)
+            stderr_buf = HeadTailBuffer(self.max_output_bytes)
+            progress = _ProgressReporter(progress_callback)
+            readers = asyncio.gather(
+                _drain(process.stdout, stdout_buf, progress),
+                _drain(process.stderr, stderr_buf, progress),
+            )
+
             # Wait for completion with configurable timeout
             try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(), 
+                await asyncio.wait_for(
+                    asyncio.shield(readers),
                     timeout=self.timeout_sec
                 )
+                await process.wait()
             except TimeoutError:
                 process.kill()
+                await process.wait()
+                # Collect what is left in the pipes (a grandchild may hold them open)
+                try:
+                    await asyncio.wait_for(readers, timeout=1.0)
+                except Exception:
+                    pass
+                await progress.close()
+                partial = _combine(stdout_buf, stderr_buf)
                 return ToolResult(
                     success=False, 
-                    content="", 
-                    error=f"Command timed out after {self.timeout_sec} seconds"
+                    content=partial, 
+                    error=f"Command timed out after {self.timeout_sec} seconds",
+                    metadata={
+                        "truncated": stdout_buf.truncated or stderr_buf.truncated,
+                        "outputBytes": stdout_buf.total_bytes + stderr_buf.total_bytes,
+                    },
                 )
+            await progress.close()
 
-            # Decode output
-            stdout_text = stdout.decode("utf-8", errors="replace")
-            stderr_text = stderr.decode("utf-8", errors="replace")
-
-            # Combine output
-            output = ""
-            if stdout_text:
-                output += stdout_text
-            if stderr_text:
-                if output:
-                    output += "\n"
-                output += stderr_text
+            output = _combine(stdout_buf, stderr_buf)
+            truncated = stdout_buf.truncated or stderr_buf.truncated
+            if truncated:
+                logger.info(
+                    f"Bash output truncated: {stdout_buf.total_bytes + stderr_buf.total_bytes} bytes "
+                    f"captured to {self.max_output_bytes} per stream"
+                )
 
             return ToolResult(
                 success=process.returncode == 0,
@@ -248,6 +296,8 @@ class BashTool(AgentTool):
                     "security_mode": self.security_mode,
                     "ask_mode": self.ask_mode,
                     "timeout_sec": self.timeout_sec,
+                    "truncated": truncated,
+                    "outputBytes": stdout_buf.total_bytes + stderr_buf.total_bytes,
                 },
             )
 
@@ -269,3 +319,75 @@ class BashTool(AgentTool):
             
             # Check again in 1 second
             await asyncio.sleep(1.0)
+
+
+class _ProgressReporter:
+    """Throttled forwarding of new output to a progress callback"""
+
+    def __init__(self, callback: ProgressCallback | None):
+        self.callback = callback
+        self.pending = bytearray()
+        self.total_bytes = 0
+        self.last_sent = 0.0
+        self._flush_task: asyncio.Task | None = None
+
+    async def feed(self, data: bytes) -> None:
+        self.total_bytes += len(data)
+        if self.callback is None:
+            return
+        self.pending += data
+        # Only the latest output matters for a live view
+        if len(self.pending) > PROGRESS_MAX_BYTES:
+            del self.pending[: len(self.pending) - PROGRESS_MAX_BYTES]
+        if self._flush_task is None:
+            # Sent once the interval since the last update has passed, even
+            # if the command goes quiet in the meantime
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(max(0.0, self.last_sent + PROGRESS_INTERVAL_SEC - time.monotonic()))
+        self._flush_task = None
+        await self.flush()
+
+    async def close(self) -> None:
+        """Send whatever is still pending"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        if self.callback is None or not self.pending:
+            return
+        text = self.pending.decode("utf-8", errors="replace")
+        self.pending.clear()
+        self.last_sent = time.monotonic()
+        try:
+            await self.callback(self.total_bytes, 0, text)
+        except Exception as e:
+            logger.debug(f"Bash progress callback failed: {e}")
+
+
+async def _drain(
+    stream: asyncio.StreamReader | None, buffer: HeadTailBuffer, progress: _ProgressReporter
+) -> None:
+    """Read a pipe to EOF in chunks"""
+    if stream is None:
+        return
+    while True:
+        data = await stream.read(READ_CHUNK_BYTES)
+        if not data:
+            return
+        buffer.write(data)
+        await progress.feed(data)
+
+
+def _combine(stdout_buf: HeadTailBuffer, stderr_buf: HeadTailBuffer) -> str:
+    """stdout, then stderr on a new line (as before streaming)"""
+    output = stdout_buf.getvalue()
+    stderr_text = stderr_buf.getvalue()
+    if stderr_text:
+        if output:
+            output += "\n"
+        output += stderr_text
+    return output
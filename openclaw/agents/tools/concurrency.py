@@ -0,0 +1,84 @@
+"""
+Concurrent execution of independent tool calls
+
+A model often asks for several read-only tools at once (``web_fetch``,
+``memory_search``, ``read_file``, ...). Tools that set
+``concurrency_safe = True`` may run side by side:
+
+- consecutive safe calls form one batch, run with at most
+  ``max_parallel`` in flight;
+- every other call (bash, patches, file writes, unknown tools) is a batch
+  of its own, so it never overlaps anything;
+- results come back in call order, so callers can emit events and append
+  tool messages exactly as they would for sequential execution.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Safe tool calls running at once within one batch
+DEFAULT_MAX_PARALLEL_TOOLS = 8
+
+
+def is_concurrency_safe(tool: Any) -> bool:
+    """Whether a tool declared itself safe to run alongside other safe tools"""
+    return tool is not None and bool(getattr(tool, "concurrency_safe", False))
+
+
+def batch_tool_calls(calls: list[T], is_safe: Callable[[T], bool]) -> list[list[T]]:
+    """
+    Split tool calls into batches that may each run concurrently
+
+    Args:
+        calls: Tool calls in the order the model issued them
+        is_safe: Whether a call may overlap other safe calls
+
+    Returns:
+        Batches in call order; unsafe calls are always alone
+    """
+    batches: list[list[T]] = []
+    safe_run = False
+    for call in calls:
+        safe = is_safe(call)
+        if safe and safe_run:
+            batches[-1].append(call)
+        else:
+            batches.append([call])
+        safe_run = safe
+    return batches
+
+
+async def run_batch(
+    batch: list[T],
+    run: Callable[[T], Awaitable[R]],
+    max_parallel: int = DEFAULT_MAX_PARALLEL_TOOLS,
+) -> list[R | BaseException]:
+    """
+    Run one batch, at most ``max_parallel`` calls at a time
+
+    Args:
+        batch: Calls from ``batch_tool_calls``
+        run: Executes one call
+        max_parallel: Concurrency bound
+
+    Returns:
+        Results in batch order; a call that raised yields its exception
+    """
+    if len(batch) == 1:
+        try:
+            return [await run(batch[0])]
+        except Exception as e:
+            return [e]
+
+    semaphore = asyncio.Semaphore(max(1, max_parallel))
+
+    async def bounded(call: T) -> R:
+        async with semaphore:
+            return await run(call)
+
+    return await asyncio.gather(*(bounded(call) for call in batch), return_exceptions=True)
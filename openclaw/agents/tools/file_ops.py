@@ -12,6 +12,8 @@ logger = logging.getLogger(__name__)
 class ReadFileTool(AgentTool):
     """Read file contents"""
 
+    concurrency_safe = True
+
     def __init__(self):
         super().__init__()
         self.name = "read_file"
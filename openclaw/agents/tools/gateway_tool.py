@@ -95,6 +95,8 @@ class AgentsListTool(AgentTool):
     List configured agents (matches TypeScript agents-list-tool.ts).
     """
     
+    concurrency_safe = True
+    
     def __init__(self, config=None):
         super().__init__()
         self.name = "agents_list"
@@ -150,6 +152,8 @@ class SessionStatusTool(AgentTool):
     Get current session status (matches TypeScript session-status-tool.ts).
     """
     
+    concurrency_safe = True
+    
     def __init__(self, session_manager=None):
         super().__init__()
         self.name = "session_status"
@@ -25,6 +25,8 @@ class MemorySearchTool(AgentTool):
     before answering questions about prior work, decisions, dates, people, preferences, or todos.
     """
     
+    concurrency_safe = True
+    
     def __init__(
         self,
         workspace_dir: Path,
@@ -169,6 +171,8 @@ class MemoryGetTool(AgentTool):
     Use after memory_search to pull only the needed lines and keep context small.
     """
     
+    concurrency_safe = True
+    
     def __init__(
         self,
         workspace_dir: Path,
@@ -0,0 +1,93 @@
+"""
+Bounded buffers for subprocess output
+
+Tools that run commands read child output incrementally into these buffers
+instead of collecting it whole, so memory stays flat however much a command
+prints.
+"""
+from __future__ import annotations
+
+# Default cap on captured output per stream
+DEFAULT_MAX_OUTPUT_BYTES = 200_000
+
+
+class HeadTailBuffer:
+    """
+    Keep the first and last bytes of a stream, dropping the middle
+
+    The head (first ``max_bytes // 2`` bytes) usually holds the command's
+    framing and the tail holds the result or error, so both ends survive
+    truncation. Memory use never exceeds ``max_bytes`` plus one chunk.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_OUTPUT_BYTES):
+        self.max_bytes = max(2, max_bytes)
+        self.head_limit = self.max_bytes // 2
+        self.tail_limit = self.max_bytes - self.head_limit
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total_bytes = 0
+
+    @property
+    def truncated(self) -> bool:
+        """Whether any output was dropped"""
+        return self.total_bytes > len(self.head) + len(self.tail)
+
+    @property
+    def dropped_bytes(self) -> int:
+        """Bytes dropped from the middle"""
+        return self.total_bytes - len(self.head) - len(self.tail)
+
+    def write(self, data: bytes) -> None:
+        """Append a chunk of output"""
+        self.total_bytes += len(data)
+        room = self.head_limit - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data:
+            self.tail += data
+            if len(self.tail) > self.tail_limit:
+                del self.tail[: len(self.tail) - self.tail_limit]
+
+    def getvalue(self, encoding: str = "utf-8") -> str:
+        """Decoded output, with a marker where bytes were dropped"""
+        if not self.truncated:
+            return (self.head + self.tail).decode(encoding, errors="replace")
+        head, tail = bytes(self.head), bytes(self.tail)
+        if encoding.replace("-", "").lower() == "utf8":
+            # Don't turn characters cut by the split into replacement chars
+            head = head[: _utf8_complete_end(head)]
+            tail = tail[_utf8_start(tail) :]
+        dropped = self.total_bytes - len(head) - len(tail)
+        return (
+            f"{head.decode(encoding, errors='replace')}\n"
+            f"[... {dropped} bytes truncated ...]\n"
+            f"{tail.decode(encoding, errors='replace')}"
+        )
+
+
+def _utf8_complete_end(data: bytes) -> int:
+    """Length of ``data`` without a trailing incomplete UTF-8 sequence"""
+    for i in range(len(data) - 1, max(len(data) - 4, -1), -1):
+        byte = data[i]
+        if byte & 0xC0 != 0x80:
+            # Lead byte: is its sequence complete?
+            if byte >= 0xF0:
+                needed = 4
+            elif byte >= 0xE0:
+                needed = 3
+            elif byte >= 0xC0:
+                needed = 2
+            else:
+                needed = 1
+            return i if len(data) - i < needed else len(data)
+    return len(data)
+
+
+def _utf8_start(data: bytes) -> int:
+    """Offset past continuation bytes cut off from their lead byte"""
+    i = 0
+    while i < min(len(data), 3) and data[i] & 0xC0 == 0x80:
+        i += 1
+    return i
@@ -1,24 +1,44 @@
 """Process management tool"""
 
-import asyncio
 import logging
 from typing import Any
 
 import psutil
 
+from openclaw.process.supervisor import ProcessSupervisor, get_process_supervisor
+
 from .base import AgentTool, ToolResult
 
 logger = logging.getLogger(__name__)
 
+# Default number of output lines returned by "log" without an offset
+DEFAULT_LOG_LINES = 50
+
+# Output returned per "log" call at most
+MAX_LOG_BYTES = 64 * 1024
+
 
 class ProcessTool(AgentTool):
-    """Manage system processes"""
+    """
+    Manage system processes
+
+    Processes started here run under a ProcessSupervisor: their output is
+    drained continuously into a bounded ring buffer (so a background child
+    never blocks on a full pipe) and read back with the ``log`` action,
+    either as a tail or incrementally from the ``next_offset`` of the
+    previous read. Exited processes are reaped and kept readable for a while.
+    """
 
-    def __init__(self):
+    def __init__(self, supervisor: ProcessSupervisor | None = None):
         super().__init__()
         self.name = "process"
-        self.description = "Manage and monitor system processes"
-        self._tracked_processes: dict[str, asyncio.subprocess.Process] = {}
+        self.description = (
+            "Manage and monitor system processes. Start long-running commands in the "
+            "background, read their output with action 'log' (pass the returned "
+            "next_offset as 'offset' to get only new output), and check CPU/memory with 'status'."
+        )
+        # Shared by default, so gateway shutdown stops the processes it started
+        self.supervisor = supervisor or get_process_supervisor()
 
     def get_schema(self) -> dict[str, Any]:
         return {
@@ -26,7 +46,7 @@ class ProcessTool(AgentTool):
             "properties": {
                 "action": {
                     "type": "string",
-                    "enum": ["start", "stop", "status", "list", "kill", "wait"],
+                    "enum": ["start", "stop", "status", "list", "kill", "wait", "log"],
                     "description": "Process action",
                 },
                 "command": {"type": "string", "description": "Command to execute (for start)"},
@@ -41,6 +61,18 @@ class ProcessTool(AgentTool):
                     "type": "string",
                     "description": "Working directory for the command",
                 },
+                "offset": {
+                    "type": "integer",
+                    "description": "For log: return output after this offset (next_offset of a previous log call)",
+                },
+                "lines": {
+                    "type": "integer",
+                    "description": f"For log without offset: number of trailing lines (default {DEFAULT_LOG_LINES})",
+                },
+                "timeout": {
+                    "type": "number",
+                    "description": "For wait: seconds to wait before returning (default: until exit)",
+                },
             },
             "required": ["action"],
         }
@@ -65,6 +97,8 @@ class ProcessTool(AgentTool):
                 return await self._kill_process(params)
             elif action == "wait":
                 return await self._wait_process(params)
+            elif action == "log":
+                return await self._process_log(params)
             else:
                 return ToolResult(success=False, content="", error=f"Unknown action: {action}")
 
@@ -72,54 +106,49 @@ class ProcessTool(AgentTool):
             logger.error(f"Process tool error: {e}", exc_info=True)
             return ToolResult(success=False, content="", error=str(e))
 
+    def _not_found(self, process_id: str) -> ToolResult:
+        return ToolResult(success=False, content="", error=f"Process '{process_id}' not found")
+
     async def _start_process(self, params: dict[str, Any]) -> ToolResult:
         """Start a process"""
         command = params.get("command", "")
-        process_id = params.get("process_id") or f"proc-{len(self._tracked_processes)}"
+        process_id = params.get("process_id")
         background = params.get("background", True)
         working_dir = params.get("working_directory")
 
         if not command:
             return ToolResult(success=False, content="", error="command required")
 
-        # Create subprocess
-        process = await asyncio.create_subprocess_shell(
-            command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, cwd=working_dir
-        )
-
-        # Track process
-        self._tracked_processes[process_id] = process
+        proc = await self.supervisor.start(command, process_id=process_id, cwd=working_dir)
 
         if not background:
             # Wait for completion
-            stdout, stderr = await process.communicate()
-
-            output = ""
-            if stdout:
-                output += stdout.decode("utf-8", errors="replace")
-            if stderr:
-                if output:
-                    output += "\n"
-                output += stderr.decode("utf-8", errors="replace")
+            await self.supervisor.wait(proc.process_id)
+            skipped = max(0, proc.log.end_offset - MAX_LOG_BYTES)
+            log = self.supervisor.read(proc.process_id, since=skipped, max_bytes=MAX_LOG_BYTES)
+            self.supervisor.remove(proc.process_id)
 
-            # Remove from tracking
-            del self._tracked_processes[process_id]
+            truncated = skipped + log["dropped_bytes"]
+            content = log["output"]
+            if truncated:
+                content = f"[truncated {truncated} bytes]\n{content}"
 
             return ToolResult(
-                success=process.returncode == 0,
-                content=output,
+                success=proc.returncode == 0,
+                content=content,
                 metadata={
-                    "process_id": process_id,
-                    "exit_code": process.returncode,
-                    "pid": process.pid,
+                    "process_id": proc.process_id,
+                    "exit_code": proc.returncode,
+                    "pid": proc.pid,
+                    "truncated_bytes": truncated,
                 },
             )
         else:
             # Return immediately
             return ToolResult(
                 success=True,
-                content=f"Started process '{process_id}' (PID: {process.pid})",
-                metadata={"process_id": process_id, "pid": process.pid, "background": True},
+                content=f"Started process '{proc.process_id}' (PID: {proc.pid})",
+                metadata={"process_id": proc.process_id, "pid": proc.pid, "background": True},
             )
 
     async def _stop_process(self, params: dict[str, Any]) -> ToolResult:
@@ -129,21 +158,16 @@ class ProcessTool(AgentTool):
         if not process_id:
             return ToolResult(success=False, content="", error="process_id required")
 
-        if process_id not in self._tracked_processes:
-            return ToolResult(success=False, content="", error=f"Process '{process_id}' not found")
+        if not self.supervisor.get(process_id):
+            return self._not_found(process_id)
 
-        process = self._tracked_processes[process_id]
+        return_code = await self.supervisor.stop(process_id, timeout=5.0)
 
-        try:
-            process.terminate()
-            await asyncio.wait_for(process.wait(), timeout=5.0)
-        except TimeoutError:
-            process.kill()
-            await process.wait()
-
-        del self._tracked_processes[process_id]
-
-        return ToolResult(success=True, content=f"Stopped process '{process_id}'")
+        return ToolResult(
+            success=True,
+            content=f"Stopped process '{process_id}'",
+            metadata={"process_id": process_id, "return_code": return_code},
+        )
 
     async def _process_status(self, params: dict[str, Any]) -> ToolResult:
         """Get process status"""
@@ -151,29 +175,28 @@ class ProcessTool(AgentTool):
         pid = params.get("pid")
 
         if process_id:
-            if process_id not in self._tracked_processes:
-                return ToolResult(
-                    success=False, content="", error=f"Process '{process_id}' not found"
-                )
-
-            process = self._tracked_processes[process_id]
-            return_code = process.returncode
+            proc = self.supervisor.get(process_id)
+            if not proc:
+                return self._not_found(process_id)
 
-            if return_code is None:
+            if proc.running:
                 status = "running"
             else:
-                status = f"exited with code {return_code}"
+                status = f"exited with code {proc.returncode}"
+
+            metadata = {**proc.to_dict(), "status": status}
+            content = f"Process '{process_id}': {status}"
+            usage = self.supervisor.sample()["processes"].get(process_id)
+            if usage:
+                metadata.update(usage)
+                content += (
+                    f"\n  CPU: {usage['cpu_percent']}%"
+                    f"\n  RSS: {usage['rss_bytes'] / (1024 * 1024):.1f} MB"
+                    f" ({usage['num_processes']} process(es))"
+                )
+            content += f"\n  Output: {proc.log.end_offset} bytes"
 
-            return ToolResult(
-                success=True,
-                content=f"Process '{process_id}': {status}",
-                metadata={
-                    "process_id": process_id,
-                    "pid": process.pid,
-                    "status": status,
-                    "return_code": return_code,
-                },
-            )
+            return ToolResult(success=True, content=content, metadata=metadata)
 
         elif pid:
             try:
@@ -196,35 +219,34 @@ class ProcessTool(AgentTool):
 
             except psutil.NoSuchProcess:
                 return ToolResult(success=False, content="", error=f"Process {pid} not found")
-            except ImportError:
-                return ToolResult(
-                    success=False,
-                    content="",
-                    error="psutil not installed. Install with: pip install psutil",
-                )
         else:
             return ToolResult(success=False, content="", error="process_id or pid required")
 
     async def _list_processes(self, params: dict[str, Any]) -> ToolResult:
         """List tracked processes"""
-        if not self._tracked_processes:
+        processes = self.supervisor.list_processes()
+        if not processes:
             return ToolResult(success=True, content="No tracked processes", metadata={"count": 0})
 
-        output = f"Tracked processes ({len(self._tracked_processes)}):\n\n"
-        for proc_id, process in self._tracked_processes.items():
-            return_code = process.returncode
-            status = "running" if return_code is None else f"exited ({return_code})"
-            output += f"- **{proc_id}**: PID {process.pid}, {status}\n"
+        sample = self.supervisor.sample()
+        output = f"Tracked processes ({len(processes)}):\n\n"
+        for proc in processes:
+            status = "running" if proc.running else f"exited ({proc.returncode})"
+            output += f"- **{proc.process_id}**: PID {proc.pid}, {status}\n"
+        total = sample["total"]
+        if total["running"]:
+            output += (
+                f"\nRunning: {total['running']}, CPU {total['cpu_percent']}%, "
+                f"RSS {total['rss_bytes'] / (1024 * 1024):.1f} MB\n"
+            )
 
         return ToolResult(
             success=True,
             content=output,
             metadata={
-                "count": len(self._tracked_processes),
-                "processes": [
-                    {"process_id": pid, "pid": p.pid, "return_code": p.returncode}
-                    for pid, p in self._tracked_processes.items()
-                ],
+                "count": len(processes),
+                "processes": [proc.to_dict() for proc in processes],
+                "total": total,
             },
         )
 
@@ -234,15 +256,10 @@ class ProcessTool(AgentTool):
         pid = params.get("pid")
 
         if process_id:
-            if process_id not in self._tracked_processes:
-                return ToolResult(
-                    success=False, content="", error=f"Process '{process_id}' not found"
-                )
+            if not self.supervisor.get(process_id):
+                return self._not_found(process_id)
 
-            process = self._tracked_processes[process_id]
-            process.kill()
-            await process.wait()
-            del self._tracked_processes[process_id]
+            await self.supervisor.kill(process_id)
 
             return ToolResult(success=True, content=f"Killed process '{process_id}'")
 
@@ -253,8 +270,6 @@ class ProcessTool(AgentTool):
                 return ToolResult(success=True, content=f"Killed process {pid}")
             except psutil.NoSuchProcess:
                 return ToolResult(success=False, content="", error=f"Process {pid} not found")
-            except ImportError:
-                return ToolResult(success=False, content="", error="psutil not installed")
         else:
             return ToolResult(success=False, content="", error="process_id or pid required")
 
@@ -265,27 +280,55 @@ class ProcessTool(AgentTool):
         if not process_id:
             return ToolResult(success=False, content="", error="process_id required")
 
-        if process_id not in self._tracked_processes:
-            return ToolResult(success=False, content="", error=f"Process '{process_id}' not found")
-
-        process = self._tracked_processes[process_id]
+        if not self.supervisor.get(process_id):
+            return self._not_found(process_id)
 
         # Wait for completion
-        stdout, stderr = await process.communicate()
+        return_code = await self.supervisor.wait(process_id, timeout=params.get("timeout"))
+        log = self.supervisor.read(process_id, tail_bytes=MAX_LOG_BYTES)
+
+        if log["running"]:
+            return ToolResult(
+                success=True,
+                content=log["output"],
+                metadata={"process_id": process_id, "running": True, "next_offset": log["next_offset"]},
+            )
+
+        return ToolResult(
+            success=return_code == 0,
+            content=log["output"],
+            metadata={"process_id": process_id, "exit_code": return_code},
+        )
+
+    async def _process_log(self, params: dict[str, Any]) -> ToolResult:
+        """Read process output: new output since an offset, or the tail"""
+        process_id = params.get("process_id", "")
+
+        if not process_id:
+            return ToolResult(success=False, content="", error="process_id required")
 
-        output = ""
-        if stdout:
-            output += stdout.decode("utf-8", errors="replace")
-        if stderr:
-            if output:
-                output += "\n"
-            output += stderr.decode("utf-8", errors="replace")
+        if not self.supervisor.get(process_id):
+            return self._not_found(process_id)
 
-        # Remove from tracking
-        del self._tracked_processes[process_id]
+        offset = params.get("offset")
+        if offset is not None:
+            log = self.supervisor.read(process_id, since=int(offset), max_bytes=MAX_LOG_BYTES)
+        else:
+            lines = int(params.get("lines") or DEFAULT_LOG_LINES)
+            log = self.supervisor.read(process_id, tail_lines=lines, tail_bytes=MAX_LOG_BYTES)
+
+        content = log["output"]
+        if log["dropped_bytes"]:
+            content = f"[... {log['dropped_bytes']} bytes no longer buffered ...]\n{content}"
 
         return ToolResult(
-            success=process.returncode == 0,
-            content=output,
-            metadata={"process_id": process_id, "exit_code": process.returncode},
+            success=True,
+            content=content,
+            metadata={
+                "process_id": process_id,
+                "next_offset": log["next_offset"],
+                "dropped_bytes": log["dropped_bytes"],
+                "running": log["running"],
+                "return_code": log["return_code"],
+            },
         )
@@ -12,6 +12,8 @@ logger = logging.getLogger(__name__)
 class SessionsListTool(AgentTool):
     """List all sessions"""
 
+    concurrency_safe = True
+
     def __init__(self, session_manager: SessionManager):
         super().__init__()
         self.name = "sessions_list"
@@ -60,6 +62,8 @@ class SessionsListTool(AgentTool):
 class SessionsHistoryTool(AgentTool):
     """Get session history"""
 
+    concurrency_safe = True
+
     def __init__(self, session_manager: SessionManager):
         super().__init__()
         self.name = "sessions_history"
@@ -13,6 +13,8 @@ logger = logging.getLogger(__name__)
 class WebFetchTool(AgentTool):
     """Fetch web page contents"""
 
+    concurrency_safe = True
+
     def __init__(self):
         super().__init__()
         self.name = "web_fetch"
@@ -74,6 +76,8 @@ class WebFetchTool(AgentTool):
 class WebSearchTool(AgentTool):
     """Search the web using DuckDuckGo"""
 
+    concurrency_safe = True
+
     def __init__(self):
         super().__init__()
         self.name = "web_search"
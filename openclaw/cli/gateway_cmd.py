@@ -81,6 +81,8 @@ def run(
                     await asyncio.sleep(1)
             except asyncio.CancelledError:
                 pass
+            finally:
+                await bootstrap.shutdown()
         
         asyncio.run(run_with_bootstrap())
     
@@ -85,12 +85,11 @@ def start(
             console.print(f"\n[green]✓[/green] Gateway running on ws://127.0.0.1:{results.get('gateway_port', 18789)}")
             console.print("[dim]Press Ctrl+C to stop[/dim]\n")
             
-            # Keep alive until Ctrl+C
+            # Keep alive until Ctrl+C (which cancels this task)
             try:
                 while True:
                     await asyncio.sleep(1)
-            except KeyboardInterrupt:
-                console.print("\n[yellow]Shutting down...[/yellow]")
+            finally:
                 await bootstrap.shutdown()
         
         asyncio.run(start_gateway())
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 
 from pydantic import BaseModel, Field
-from typing import Any
+from typing import Any, Literal
 
 
 class ModelConfig(BaseModel):
@@ -45,6 +45,7 @@ class ExecToolConfig(BaseModel):
     safe_bins: list[str] = Field(default_factory=lambda: ["python", "pip", "git", "node", "npm"])
     path_prepend: list[str] = Field(default_factory=list)
     timeout_sec: int = Field(default=120)
+    max_output_bytes: int = Field(default=200_000)
 
 
 class ToolsConfig(BaseModel):
@@ -155,10 +156,41 @@ class ModelsConfig(BaseModel):
     providers: dict[str, Any] | None = Field(default=None)
 
 
+class MemoryIVFConfig(BaseModel):
+    """IVF (approximate) vector index tuning, see memory.ann_index.IVFOptions"""
+    nlist: int | None = Field(default=None)
+    nprobe: int = Field(default=16)
+    min_train_size: int = Field(default=10_000, alias="minTrainSize")
+    train_sample: int = Field(default=100_000, alias="trainSample")
+    train_iterations: int = Field(default=10, alias="trainIterations")
+    drift_threshold: float = Field(default=0.25, alias="driftThreshold")
+
+    model_config = {"populate_by_name": True}
+
+
 class MemoryConfig(BaseModel):
     """Memory configuration"""
     enabled: bool = Field(default=True)
     provider: str = Field(default="simple")
+    # "flat" (exact) or "ivf" (approximate, once the corpus is large enough)
+    index_type: Literal["flat", "ivf"] = Field(default="flat", alias="indexType")
+    ivf: MemoryIVFConfig | None = Field(default=None)
+
+    model_config = {"populate_by_name": True}
+
+
+class SandboxPoolConfig(BaseModel):
+    """Warm sandbox container pool, see agents.sandbox.pool.SandboxPool"""
+    min_idle: int = Field(default=0, alias="minIdle")
+    max_idle: int = Field(default=4, alias="maxIdle")
+    idle_ttl_sec: float = Field(default=300.0, alias="idleTtlSec")
+
+    model_config = {"populate_by_name": True}
+
+
+class SandboxConfig(BaseModel):
+    """Sandbox configuration"""
+    pool: SandboxPoolConfig = Field(default_factory=SandboxPoolConfig)
 
 
 class CronConfig(BaseModel):
@@ -209,6 +241,7 @@ class ClawdbotConfig(BaseModel):
     canvas_host: dict[str, Any] | None = Field(default=None, alias="canvasHost")
     talk: dict[str, Any] | None = Field(default=None)
     memory: MemoryConfig | None = Field(default=None)
+    sandbox: SandboxConfig | None = Field(default=None)
 
     class Config:
         extra = "allow"  # Allow extra fields for extensibility
@@ -0,0 +1,59 @@
+"""Session store (sessions.json) and path helpers"""
+
+from .index import SessionStoreIndex
+from .paths import (
+    get_default_store_path,
+    resolve_agent_sessions_dir,
+    resolve_session_store_path,
+    resolve_session_transcript_path,
+)
+from .store import (
+    SessionStoreView,
+    clear_session_store_cache_for_test,
+    get_session_store_index,
+    load_session_store,
+    save_session_store,
+    update_session_store,
+    update_session_store_async,
+    update_session_store_entry,
+)
+from .transcripts import (
+    TranscriptSummary,
+    compact_transcript,
+    delete_transcript,
+    get_transcript_summary,
+    read_first_user_message,
+    read_last_message_preview,
+    read_session_messages,
+    read_transcript_preview,
+    write_transcript_line,
+)
+from .types import DeliveryContext, SessionEntry, SessionOrigin
+
+__all__ = [
+    "DeliveryContext",
+    "SessionEntry",
+    "SessionOrigin",
+    "SessionStoreIndex",
+    "SessionStoreView",
+    "TranscriptSummary",
+    "clear_session_store_cache_for_test",
+    "compact_transcript",
+    "delete_transcript",
+    "get_default_store_path",
+    "get_session_store_index",
+    "get_transcript_summary",
+    "load_session_store",
+    "read_first_user_message",
+    "read_last_message_preview",
+    "read_session_messages",
+    "read_transcript_preview",
+    "resolve_agent_sessions_dir",
+    "resolve_session_store_path",
+    "resolve_session_transcript_path",
+    "save_session_store",
+    "update_session_store",
+    "update_session_store_async",
+    "update_session_store_entry",
+    "write_transcript_line",
+]
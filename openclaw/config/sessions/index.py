@@ -0,0 +1,75 @@
+"""
+Secondary indexes over a session store snapshot
+
+Built once per cached store generation so list/resolve calls can avoid a
+full scan and a sort over every session key.
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+from openclaw.agents.session_entry import SessionEntry
+from openclaw.routing.session_key import parse_agent_session_key
+
+
+class SessionStoreIndex:
+    """
+    Indexes on updated_at, label, spawned_by and agent id
+
+    Every bucket lists keys newest-first, so filtered queries can page
+    through a bucket without sorting.
+    """
+
+    def __init__(self, store: Mapping[str, SessionEntry]):
+        # sorted() is stable, so ties keep store insertion order
+        self.by_updated: list[str] = sorted(
+            store, key=lambda k: store[k].updated_at, reverse=True
+        )
+        self.by_label: dict[str, list[str]] = {}
+        self.by_spawned_by: dict[str, list[str]] = {}
+        self.by_agent: dict[str, list[str]] = {}
+
+        for key in self.by_updated:
+            entry = store[key]
+            if entry.label:
+                self.by_label.setdefault(entry.label, []).append(key)
+            if entry.spawned_by:
+                self.by_spawned_by.setdefault(entry.spawned_by, []).append(key)
+            parsed = parse_agent_session_key(key)
+            if parsed:
+                self.by_agent.setdefault(parsed.agent_id, []).append(key)
+
+    def __len__(self) -> int:
+        return len(self.by_updated)
+
+    def candidates(
+        self,
+        agent_id: str | None = None,
+        spawned_by: str | None = None,
+        label: str | None = None,
+    ) -> list[str]:
+        """
+        Get candidate keys for equality filters, newest first
+
+        Returns the smallest matching bucket; callers still check every
+        filter per entry when more than one is given.
+
+        Args:
+            agent_id: Agent ID filter
+            spawned_by: Parent session filter
+            label: Label filter
+
+        Returns:
+            Keys sorted by updated_at descending
+        """
+        buckets: list[list[str]] = []
+        if agent_id:
+            buckets.append(self.by_agent.get(agent_id, []))
+        if spawned_by:
+            buckets.append(self.by_spawned_by.get(spawned_by, []))
+        if label:
+            buckets.append(self.by_label.get(label, []))
+
+        if not buckets:
+            return self.by_updated
+        return min(buckets, key=len)
@@ -0,0 +1,97 @@
+"""
+Session store and transcript paths
+
+Layout (matches TypeScript):
+    ~/.openclaw/agents/<agentId>/sessions/sessions.json
+    ~/.openclaw/agents/<agentId>/sessions/<sessionId>.jsonl
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from openclaw.config.paths import get_openclaw_config_dir
+from openclaw.routing.session_key import normalize_agent_id
+
+STORE_FILENAME = "sessions.json"
+
+
+def resolve_state_dir() -> Path:
+    """
+    Get OpenClaw state directory
+
+    Returns:
+        Path to state directory (``OPENCLAW_STATE_DIR`` or ~/.openclaw)
+    """
+    override = os.environ.get("OPENCLAW_STATE_DIR")
+    if override:
+        return Path(override).expanduser()
+    return get_openclaw_config_dir()
+
+
+def resolve_agent_sessions_dir(agent_id: str = "main") -> Path:
+    """
+    Get sessions directory for an agent
+
+    Args:
+        agent_id: Agent identifier
+
+    Returns:
+        Path to ``agents/<agentId>/sessions``
+    """
+    return resolve_state_dir() / "agents" / normalize_agent_id(agent_id) / "sessions"
+
+
+def get_default_store_path(agent_id: str = "main") -> Path:
+    """
+    Get default sessions.json path for an agent
+
+    Args:
+        agent_id: Agent identifier
+
+    Returns:
+        Path to the agent's sessions.json
+    """
+    return resolve_agent_sessions_dir(agent_id) / STORE_FILENAME
+
+
+def resolve_session_store_path(store: str | None = None, agent_id: str = "main") -> Path:
+    """
+    Resolve a configured store path
+
+    Supports ``~`` expansion and the ``{agentId}`` placeholder.
+
+    Args:
+        store: Configured store path (falls back to the default)
+        agent_id: Agent identifier
+
+    Returns:
+        Resolved sessions.json path
+    """
+    if not store:
+        return get_default_store_path(agent_id)
+    expanded = store.replace("{agentId}", normalize_agent_id(agent_id))
+    return Path(expanded).expanduser()
+
+
+def resolve_session_transcript_path(
+    session_id: str,
+    store_path: str | Path,
+    session_file: str | None = None,
+) -> Path:
+    """
+    Resolve transcript path for a session
+
+    Args:
+        session_id: Session identifier
+        store_path: Path to sessions.json
+        session_file: Transcript filename/path recorded in the entry
+
+    Returns:
+        Path to the session's JSONL transcript
+    """
+    sessions_dir = Path(store_path).parent
+    if session_file:
+        candidate = Path(session_file).expanduser()
+        return candidate if candidate.is_absolute() else sessions_dir / candidate
+    return sessions_dir / f"{session_id}.jsonl"
@@ -0,0 +1,566 @@
+"""
+Session store (sessions.json) persistence
+
+Mirrors the TypeScript ``config/sessions/store.ts`` with three additions for
+large stores:
+
+- In-process cache per store path, validated against the file's inode,
+  mtime and size, so repeated loads never re-parse an unchanged file
+- Secondary indexes (updated_at, label, spawned_by, agent id) built once
+  per cached generation and exposed through ``SessionStoreView.index``
+- ``update_session_store_async`` funnels concurrent mutators through a
+  single writer coroutine per store, applying each batch in one locked
+  read-modify-write
+
+Writes are atomic (temp file + fsync + rename) and serialized across
+processes with a ``sessions.json.lock`` file.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import re
+import secrets
+import threading
+import time
+from collections.abc import Callable, ItemsView, Iterator, ValuesView
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from openclaw.agents.session_entry import SessionEntry, merge_session_entry
+
+from .index import SessionStoreIndex
+
+logger = logging.getLogger(__name__)
+
+LOCK_TIMEOUT_S = 10.0
+LOCK_STALE_S = 30.0
+LOCK_POLL_S = 0.025
+
+StoreMutator = Callable[[dict[str, SessionEntry]], Any]
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+@dataclass
+class _CacheRecord:
+    """One cached generation of a store file"""
+    store: dict[str, SessionEntry]
+    stat_key: tuple[int, int, int] | None
+    index: SessionStoreIndex | None = None
+
+
+class SessionStoreView(dict):
+    """
+    Store dict returned by ``load_session_store``
+
+    Shares the cached store's entries until they are read: each entry is
+    deep-copied on first access, so callers may mutate what they get back
+    without touching the cache (persist changes with ``update_session_store``).
+    The ``index`` property serves the cached generation's secondary indexes
+    until keys are added or removed.
+    """
+
+    def __init__(self, record: _CacheRecord):
+        super().__init__(record.store)
+        self._record = record
+        self._modified = False
+        # Keys whose value is already private to this view
+        self._owned: set[str] = set()
+
+    @property
+    def index(self) -> SessionStoreIndex | None:
+        """Secondary indexes, or None once the view diverged from the cache"""
+        if self._modified:
+            return None
+        return _ensure_index(self._record)
+
+    def _touch(self) -> None:
+        self._modified = True
+
+    def _own(self, key, value):
+        if key not in self._owned:
+            value = value.model_copy(deep=True)
+            super().__setitem__(key, value)
+            self._owned.add(key)
+        return value
+
+    def __getitem__(self, key):
+        return self._own(key, super().__getitem__(key))
+
+    # Defined so dict(view) and {**view} go through __getitem__
+    def __iter__(self):
+        return super().__iter__()
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def values(self):
+        return ValuesView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def copy(self):
+        return dict(self.items())
+
+    def __setitem__(self, key, value):
+        self._touch()
+        self._owned.add(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._touch()
+        super().__delitem__(key)
+
+    def pop(self, key, *default):
+        self._touch()
+        if key in self:
+            value = self[key]
+            super().__delitem__(key)
+            return value
+        return super().pop(key, *default)
+
+    def popitem(self):
+        self._touch()
+        key, value = super().popitem()
+        return key, self._own(key, value)
+
+    def clear(self):
+        self._touch()
+        super().clear()
+
+    def update(self, *args, **kwargs):
+        self._touch()
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def _entries(self) -> dict[str, SessionEntry]:
+        """Current entries without copying (unread ones are the cache's)"""
+        return dict(super().items())
+
+
+_cache: dict[str, _CacheRecord] = {}
+_cache_lock = threading.Lock()
+_path_locks: dict[str, threading.Lock] = {}
+
+
+def _cache_key(store_path: str | Path) -> str:
+    return str(Path(store_path).expanduser().resolve())
+
+
+def _stat_key(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _ensure_index(record: _CacheRecord) -> SessionStoreIndex:
+    index = record.index
+    if index is None:
+        index = SessionStoreIndex(record.store)
+        record.index = index
+    return index
+
+
+def clear_session_store_cache_for_test() -> None:
+    """Drop all cached stores (tests only)"""
+    with _cache_lock:
+        _cache.clear()
+
+
+# ============================================================================
+# Normalization
+# ============================================================================
+
+_CAMEL_RE = re.compile(r"(?<!^)(?=[A-Z])")
+
+# Legacy field names from older store formats
+_LEGACY_FIELDS = {
+    "provider": "channel",
+    "room": "group_channel",
+}
+
+
+def _to_snake(key: str) -> str:
+    return _CAMEL_RE.sub("_", key).lower()
+
+
+def _normalize_entry_dict(raw: dict[str, Any]) -> dict[str, Any]:
+    """Accept camelCase (TypeScript) and legacy field names"""
+    data: dict[str, Any] = {}
+    for key, value in raw.items():
+        snake = _to_snake(key)
+        snake = _LEGACY_FIELDS.get(snake, snake)
+        if snake not in data or data[snake] is None:
+            data[snake] = value
+
+    for nested in ("origin", "delivery_context"):
+        if isinstance(data.get(nested), dict):
+            data[nested] = {_to_snake(k): v for k, v in data[nested].items()}
+
+    # Derive delivery context from last_* fields when absent
+    if not data.get("delivery_context") and (data.get("last_channel") or data.get("last_to")):
+        data["delivery_context"] = {
+            "channel": data.get("last_channel"),
+            "to": data.get("last_to"),
+            "account_id": data.get("last_account_id"),
+            "thread_id": data.get("last_thread_id"),
+        }
+    return data
+
+
+def _parse_store(raw: Any) -> dict[str, SessionEntry]:
+    store: dict[str, SessionEntry] = {}
+    if not isinstance(raw, dict):
+        return store
+    for key, value in raw.items():
+        if not isinstance(value, dict):
+            continue
+        try:
+            store[key] = SessionEntry(**_normalize_entry_dict(value))
+        except Exception as e:
+            logger.warning(f"Skipping invalid session entry {key}: {e}")
+    return store
+
+
+def _normalize_entry(entry: SessionEntry) -> SessionEntry:
+    if entry.delivery_context is None and (entry.last_channel or entry.last_to):
+        return SessionEntry(**_normalize_entry_dict(entry.model_dump(exclude_none=True)))
+    return entry
+
+
+# ============================================================================
+# Load / save
+# ============================================================================
+
+def _read_record(path: Path) -> _CacheRecord:
+    stat_key = _stat_key(path)
+    if stat_key is None:
+        return _CacheRecord(store={}, stat_key=None)
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+    except Exception as e:
+        logger.warning(f"Failed to read session store {path}: {e}")
+        raw = {}
+    # If the file was replaced between stat and read, the stale stat key
+    # just forces a re-read on the next load.
+    return _CacheRecord(store=_parse_store(raw), stat_key=stat_key)
+
+
+def _load_record(store_path: str | Path, skip_cache: bool = False) -> _CacheRecord:
+    path = Path(store_path).expanduser()
+    key = _cache_key(path)
+    if not skip_cache:
+        with _cache_lock:
+            record = _cache.get(key)
+        if record is not None and record.stat_key == _stat_key(path):
+            return record
+
+    record = _read_record(path)
+    with _cache_lock:
+        _cache[key] = record
+    return record
+
+
+def load_session_store(
+    store_path: str | Path, skip_cache: bool = False
+) -> dict[str, SessionEntry]:
+    """
+    Load session store
+
+    Args:
+        store_path: Path to sessions.json
+        skip_cache: Force a re-read from disk
+
+    Returns:
+        SessionStoreView mapping session key -> SessionEntry (empty if missing)
+    """
+    return SessionStoreView(_load_record(store_path, skip_cache=skip_cache))
+
+
+def get_session_store_index(store_path: str | Path) -> SessionStoreIndex:
+    """
+    Get secondary indexes for the current store generation
+
+    Args:
+        store_path: Path to sessions.json
+
+    Returns:
+        SessionStoreIndex (built lazily, cached until the store changes)
+    """
+    return _ensure_index(_load_record(store_path))
+
+
+def _serialize_store(store: dict[str, SessionEntry]) -> str:
+    data = {key: entry.model_dump(mode="json", exclude_none=True) for key, entry in store.items()}
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _write_store_atomic(path: Path, store: dict[str, SessionEntry]) -> _CacheRecord:
+    """Write ``store`` and cache it as the new generation (the cache takes ownership)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(_serialize_store(store))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+    record = _CacheRecord(store=store, stat_key=_stat_key(path))
+    with _cache_lock:
+        _cache[_cache_key(path)] = record
+    return record
+
+
+@contextmanager
+def _store_lock(path: Path) -> Iterator[None]:
+    """Serialize writers in-process (thread lock) and across processes (lock file)"""
+    key = _cache_key(path)
+    with _cache_lock:
+        thread_lock = _path_locks.setdefault(key, threading.Lock())
+
+    with thread_lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = path.with_name(f"{path.name}.lock")
+        # Written into the lock so release never removes another holder's lock
+        token = f"{os.getpid()} {secrets.token_hex(8)}\n"
+        deadline = time.monotonic() + LOCK_TIMEOUT_S
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+            except FileExistsError:
+                try:
+                    age = time.time() - lock_path.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                if age > LOCK_STALE_S:
+                    logger.warning(f"Removing stale session store lock: {lock_path}")
+                    lock_path.unlink(missing_ok=True)
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Timed out waiting for session store lock: {lock_path}")
+                time.sleep(LOCK_POLL_S)
+                continue
+            try:
+                os.write(fd, token.encode())
+            finally:
+                os.close(fd)
+            break
+
+        try:
+            yield
+        finally:
+            _release_lock(lock_path, token)
+
+
+def _release_lock(lock_path: Path, token: str) -> None:
+    """Remove the lock file if it still holds our token"""
+    try:
+        current = lock_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return
+    if current != token:
+        # Broken as stale while we held it and since taken by another writer
+        logger.warning(f"Session store lock was taken over, leaving it: {lock_path}")
+        return
+    lock_path.unlink(missing_ok=True)
+
+
+def save_session_store(store_path: str | Path, store: dict[str, SessionEntry]) -> None:
+    """
+    Save session store atomically
+
+    Args:
+        store_path: Path to sessions.json
+        store: Mapping of session key -> SessionEntry
+    """
+    path = Path(store_path).expanduser()
+    # The cache keeps its own entries; callers may go on mutating theirs
+    normalized = {
+        key: _normalize_entry(entry.model_copy(deep=True)) for key, entry in store.items()
+    }
+    with _store_lock(path):
+        _write_store_atomic(path, normalized)
+
+
+# ============================================================================
+# Updates
+# ============================================================================
+
+def _apply_mutators(
+    store_path: str | Path, mutators: list[StoreMutator]
+) -> list[tuple[bool, Any]]:
+    """
+    Apply mutators in one locked read-modify-write
+
+    Mutators see a ``SessionStoreView`` of the cached generation, so only
+    the entries they read are copied; the result is written and cached as
+    is. Entries a mutator stores become part of the cache. A mutator that
+    raises is rolled back on its own: the batch is replayed from the
+    on-disk state without it, so it never leaves partial changes.
+
+    Returns:
+        (ok, result-or-exception) per mutator, in order
+    """
+    path = Path(store_path).expanduser()
+    with _store_lock(path):
+        base = _load_record(path)
+
+        results: list[tuple[bool, Any]] = []
+        applied: list[StoreMutator] = []
+        working = SessionStoreView(base)
+        for mutator in mutators:
+            try:
+                results.append((True, mutator(working)))
+                applied.append(mutator)
+            except Exception as e:
+                results.append((False, e))
+                working = SessionStoreView(base)
+                for previous in applied:
+                    previous(working)
+
+        if applied:
+            normalized = {
+                key: _normalize_entry(entry) for key, entry in working._entries().items()
+            }
+            _write_store_atomic(path, normalized)
+
+    # Returned entries now live in the cache; hand callers their own copy
+    return [
+        (ok, value.model_copy(deep=True) if isinstance(value, SessionEntry) else value)
+        for ok, value in results
+    ]
+
+
+def update_session_store(store_path: str | Path, mutator: StoreMutator) -> Any:
+    """
+    Atomically read, mutate and write the session store
+
+    Args:
+        store_path: Path to sessions.json
+        mutator: Callable that mutates the store dict in place
+
+    Returns:
+        Mutator's return value
+
+    Raises:
+        Whatever the mutator raised (the store is left unchanged)
+    """
+    [(ok, value)] = _apply_mutators(store_path, [mutator])
+    if not ok:
+        raise value
+    return value
+
+
+class _BatchedStoreWriter:
+    """Single writer coroutine that coalesces queued mutators per store"""
+
+    def __init__(self, store_path: str, loop: asyncio.AbstractEventLoop):
+        self.store_path = store_path
+        self.loop = loop
+        self._pending: list[tuple[StoreMutator, asyncio.Future]] = []
+        self._task: asyncio.Task | None = None
+
+    async def submit(self, mutator: StoreMutator) -> Any:
+        future = self.loop.create_future()
+        self._pending.append((mutator, future))
+        if self._task is None or self._task.done():
+            self._task = self.loop.create_task(self._drain())
+        return await future
+
+    async def _drain(self) -> None:
+        while self._pending:
+            batch, self._pending = self._pending, []
+            try:
+                results = await asyncio.to_thread(
+                    _apply_mutators, self.store_path, [mutator for mutator, _ in batch]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), (ok, value) in zip(batch, results):
+                if future.done():
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+
+_writers: dict[str, _BatchedStoreWriter] = {}
+
+
+async def update_session_store_async(store_path: str | Path, mutator: StoreMutator) -> Any:
+    """
+    Batched variant of ``update_session_store`` for the event loop
+
+    Concurrent calls for the same store are applied together in one locked
+    read-modify-write on a worker thread, so N simultaneous patches cost a
+    single parse and a single write.
+
+    Args:
+        store_path: Path to sessions.json
+        mutator: Callable that mutates the store dict in place
+
+    Returns:
+        Mutator's return value
+    """
+    loop = asyncio.get_running_loop()
+    key = _cache_key(store_path)
+    writer = _writers.get(key)
+    if writer is None or writer.loop is not loop:
+        writer = _BatchedStoreWriter(key, loop)
+        _writers[key] = writer
+    return await writer.submit(mutator)
+
+
+def update_session_store_entry(
+    store_path: str | Path,
+    session_key: str,
+    patch: dict[str, Any],
+) -> SessionEntry | None:
+    """
+    Merge a patch into one existing entry
+
+    Args:
+        store_path: Path to sessions.json
+        session_key: Session key to update
+        patch: Partial SessionEntry fields
+
+    Returns:
+        Updated entry, or None if the key does not exist
+    """
+
+    def mutator(store: dict[str, SessionEntry]) -> SessionEntry | None:
+        existing = store.get(session_key)
+        if existing is None:
+            return None
+        updated = merge_session_entry(existing, patch)
+        store[session_key] = updated
+        return updated
+
+    return update_session_store(store_path, mutator)
@@ -0,0 +1,137 @@
+"""
+Transcript mirroring helpers (matches TypeScript ``config/sessions/transcript.ts``)
+
+Used when a reply is delivered outside an agent run (e.g. cron or channel
+mirroring) and must still show up in the session's transcript.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+from .paths import get_default_store_path, resolve_session_transcript_path
+from .store import load_session_store
+from .transcripts import read_session_messages, write_transcript_line
+
+logger = logging.getLogger(__name__)
+
+CURRENT_SESSION_VERSION = 3
+
+__all__ = [
+    "CURRENT_SESSION_VERSION",
+    "append_assistant_message_to_session_transcript",
+    "ensure_session_header",
+    "read_session_messages",
+    "resolve_mirrored_transcript_text",
+]
+
+
+def ensure_session_header(
+    transcript_path: str | Path,
+    session_id: str,
+    cwd: str | None = None,
+) -> None:
+    """
+    Write the session header line if the transcript does not exist yet
+
+    Args:
+        transcript_path: Path to the JSONL transcript
+        session_id: Session identifier
+        cwd: Working directory recorded in the header
+    """
+    path = Path(transcript_path)
+    if path.exists():
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    header = {
+        "type": "session",
+        "version": CURRENT_SESSION_VERSION,
+        "id": session_id,
+        "timestamp": datetime.now(UTC).isoformat(),
+        "cwd": cwd or os.getcwd(),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(header) + "\n")
+
+
+def resolve_mirrored_transcript_text(
+    text: str | None = None,
+    media_urls: list[str] | None = None,
+) -> str | None:
+    """
+    Resolve transcript text for a mirrored reply
+
+    Falls back to the media file names when there is no text.
+
+    Returns:
+        Text to record, or None if there is nothing to record
+    """
+    trimmed = (text or "").strip()
+    if trimmed:
+        return trimmed
+
+    names = []
+    for url in media_urls or []:
+        raw = (url or "").strip()
+        if not raw:
+            continue
+        name = Path(urlparse(raw).path or raw).name
+        if name:
+            names.append(name)
+    return ", ".join(names) if names else None
+
+
+def append_assistant_message_to_session_transcript(
+    agent_id: str | None,
+    session_key: str,
+    text: str | None = None,
+    media_urls: list[str] | None = None,
+    store_path: str | Path | None = None,
+) -> dict[str, Any]:
+    """
+    Append a delivered assistant message to a session's transcript
+
+    Args:
+        agent_id: Agent identifier (used to resolve the default store)
+        session_key: Session key in the store
+        text: Message text
+        media_urls: Media URLs delivered with the message
+        store_path: Explicit sessions.json path
+
+    Returns:
+        {"ok": True, "session_file": str} or {"ok": False, "reason": str}
+    """
+    mirror_text = resolve_mirrored_transcript_text(text, media_urls)
+    if not mirror_text:
+        return {"ok": False, "reason": "empty text"}
+
+    resolved_store = Path(store_path) if store_path else get_default_store_path(agent_id or "main")
+    entry = load_session_store(resolved_store).get(session_key)
+    if entry is None or not entry.session_id:
+        return {"ok": False, "reason": f"unknown sessionKey: {session_key}"}
+
+    transcript_path = resolve_session_transcript_path(
+        entry.session_id, resolved_store, entry.session_file
+    )
+    ensure_session_header(transcript_path, entry.session_id)
+
+    write_transcript_line(transcript_path, {
+        "type": "message",
+        "message": {
+            "role": "assistant",
+            "content": [{"type": "text", "text": mirror_text}],
+            "api": "openai-responses",
+            "provider": "openclaw",
+            "model": "delivery-mirror",
+            "stopReason": "stop",
+            "timestamp": int(time.time() * 1000),
+        },
+    })
+
+    return {"ok": True, "session_file": str(transcript_path)}
@@ -0,0 +1,467 @@
+"""
+Session transcript (JSONL) access
+
+Transcripts live next to sessions.json as ``<sessionId>.jsonl``. Lines are
+either the session header (``{"type": "session", ...}``), TypeScript-style
+message records (``{"type": "message", "message": {...}}``) or flat
+``{"role": ..., "content": ...}`` records written by the migration tool.
+
+Listing helpers (derived title, last-message preview) are served from a
+per-transcript summary instead of re-reading the transcript:
+
+- ``write_transcript_line`` updates the summary incrementally
+- Summaries are cached in memory and persisted to a small
+  ``<transcript>.summary`` sidecar for cold starts
+- A summary is validated against the transcript's size/mtime; if the file
+  only grew (appended by another writer) just the new tail is parsed,
+  otherwise the summary is rebuilt from scratch (legacy transcripts,
+  compaction)
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from .paths import resolve_session_transcript_path
+
+logger = logging.getLogger(__name__)
+
+# Max characters kept for the first user message / last message preview
+PREVIEW_MAX_CHARS = 200
+
+SUMMARY_SUFFIX = ".summary"
+SUMMARY_VERSION = 1
+
+
+# ============================================================================
+# Record parsing
+# ============================================================================
+
+def _content_to_text(content: Any) -> str:
+    """Flatten string or content-block message content to text"""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        parts = []
+        for block in content:
+            if isinstance(block, str):
+                parts.append(block)
+            elif isinstance(block, dict) and block.get("type") in (None, "text"):
+                text = block.get("text")
+                if isinstance(text, str):
+                    parts.append(text)
+        return "\n".join(parts)
+    return ""
+
+
+def parse_transcript_message(record: Any) -> dict[str, Any] | None:
+    """
+    Normalize one transcript record to a message dict
+
+    Args:
+        record: Parsed JSONL record
+
+    Returns:
+        {"role", "content" (text), "timestamp"} or None for non-message lines
+    """
+    if not isinstance(record, dict):
+        return None
+    if record.get("type") == "message" and isinstance(record.get("message"), dict):
+        message = record["message"]
+    elif "role" in record and record.get("type") in (None, "message"):
+        message = record
+    else:
+        return None
+
+    return {
+        "role": message.get("role", "other"),
+        "content": _content_to_text(message.get("content", "")),
+        "timestamp": message.get("timestamp", record.get("timestamp")),
+    }
+
+
+def _iter_transcript_lines(path: Path, start: int = 0):
+    """
+    Yield (message or None, end_offset) for each complete line from start
+
+    Non-message lines (header, metadata, unparsable) yield None so callers
+    can still track how far the file has been consumed.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        offset = start
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                # Partial line from an in-progress append
+                break
+            offset += len(raw)
+            try:
+                record = json.loads(raw)
+            except json.JSONDecodeError:
+                yield None, offset
+                continue
+            yield parse_transcript_message(record), offset
+
+
+def read_session_messages(transcript_path: str | Path) -> list[dict[str, Any]]:
+    """
+    Read all messages from a transcript
+
+    Args:
+        transcript_path: Path to the JSONL transcript
+
+    Returns:
+        Normalized message dicts (header and non-message lines skipped)
+    """
+    path = Path(transcript_path)
+    if not path.exists():
+        return []
+    return [message for message, _ in _iter_transcript_lines(path) if message is not None]
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    text = " ".join(text.split())
+    if len(text) > max_chars:
+        return text[: max_chars - 1] + "…"
+    return text
+
+
+# ============================================================================
+# Summaries
+# ============================================================================
+
+@dataclass
+class TranscriptSummary:
+    """Listing fields derived from one transcript"""
+    size: int
+    mtime_ns: int
+    message_count: int = 0
+    first_user_message: str | None = None
+    last_message_preview: str | None = None
+
+    def apply(self, message: dict[str, Any]) -> None:
+        """Fold one appended message into the summary"""
+        self.message_count += 1
+        role = message.get("role")
+        text = (message.get("content") or "").strip()
+        if not text or role not in ("user", "assistant"):
+            return
+        if role == "user" and self.first_user_message is None:
+            self.first_user_message = _truncate(text, PREVIEW_MAX_CHARS)
+        self.last_message_preview = _truncate(text, PREVIEW_MAX_CHARS)
+
+
+_summary_cache: dict[str, TranscriptSummary] = {}
+_summary_lock = threading.Lock()
+
+
+def _summary_path(transcript_path: Path) -> Path:
+    return transcript_path.with_name(transcript_path.name + SUMMARY_SUFFIX)
+
+
+def _read_sidecar(transcript_path: Path) -> TranscriptSummary | None:
+    try:
+        with open(_summary_path(transcript_path), encoding="utf-8") as f:
+            data = json.load(f)
+        if data.pop("version", None) != SUMMARY_VERSION:
+            return None
+        return TranscriptSummary(**data)
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _write_sidecar(transcript_path: Path, summary: TranscriptSummary) -> None:
+    sidecar = _summary_path(transcript_path)
+    tmp = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": SUMMARY_VERSION, **asdict(summary)}, f, ensure_ascii=False)
+        os.replace(tmp, sidecar)
+    except OSError as e:
+        # The sidecar is only a cache; it is rebuilt from the transcript if missing
+        logger.debug(f"Failed to write transcript summary {sidecar}: {e}")
+        tmp.unlink(missing_ok=True)
+
+
+def _refresh_summary(
+    path: Path, summary: TranscriptSummary | None, size: int, mtime_ns: int
+) -> TranscriptSummary:
+    """Bring a summary up to date with the transcript's current size"""
+    if summary is not None and size >= summary.size:
+        # Append-only growth: parse just the new tail
+        start = summary.size
+    else:
+        summary = TranscriptSummary(size=0, mtime_ns=0)
+        start = 0
+
+    end = start
+    for message, offset in _iter_transcript_lines(path, start):
+        if message is not None:
+            summary.apply(message)
+        end = offset
+    # Stop at the last complete line so a half-written append is re-read later
+    summary.size = end
+    summary.mtime_ns = mtime_ns if end == size else 0
+    return summary
+
+
+def get_transcript_summary(
+    session_id: str,
+    store_path: str | Path,
+    session_file: str | None = None,
+) -> TranscriptSummary | None:
+    """
+    Get listing summary for a session transcript
+
+    Costs one stat() when the cached summary is current.
+
+    Args:
+        session_id: Session identifier
+        store_path: Path to sessions.json
+        session_file: Transcript filename recorded in the entry
+
+    Returns:
+        TranscriptSummary, or None if the transcript does not exist
+    """
+    # String paths and os.stat keep the hot (cached) path cheap for large listings
+    key = _transcript_key(session_id, store_path, session_file)
+    try:
+        st = os.stat(key)
+    except OSError:
+        return None
+
+    with _summary_lock:
+        summary = _summary_cache.get(key)
+    if summary is not None and summary.size == st.st_size and summary.mtime_ns == st.st_mtime_ns:
+        return summary
+
+    path = Path(key)
+    if summary is None:
+        summary = _read_sidecar(path)
+        if summary is not None and summary.size == st.st_size and summary.mtime_ns == st.st_mtime_ns:
+            with _summary_lock:
+                _summary_cache[key] = summary
+            return summary
+
+    try:
+        summary = _refresh_summary(path, summary, st.st_size, st.st_mtime_ns)
+    except OSError as e:
+        logger.warning(f"Failed to read transcript {path}: {e}")
+        return None
+
+    with _summary_lock:
+        _summary_cache[key] = summary
+    _write_sidecar(path, summary)
+    return summary
+
+
+def _transcript_key(session_id: str, store_path: str | Path, session_file: str | None) -> str:
+    """String form of resolve_session_transcript_path"""
+    sessions_dir = os.path.dirname(os.fspath(store_path))
+    if session_file:
+        candidate = os.path.expanduser(session_file)
+        return candidate if os.path.isabs(candidate) else os.path.join(sessions_dir, candidate)
+    return os.path.join(sessions_dir, f"{session_id}.jsonl")
+
+
+def _forget_summary(path: Path) -> None:
+    with _summary_lock:
+        _summary_cache.pop(str(path), None)
+    _summary_path(path).unlink(missing_ok=True)
+
+
+def clear_transcript_summary_cache_for_test() -> None:
+    """Drop all in-memory summaries (tests only)"""
+    with _summary_lock:
+        _summary_cache.clear()
+
+
+# ============================================================================
+# Reads
+# ============================================================================
+
+def read_first_user_message(
+    session_id: str,
+    store_path: str | Path,
+    session_file: str | None = None,
+) -> str | None:
+    """Get the first user message of a transcript (truncated)"""
+    summary = get_transcript_summary(session_id, store_path, session_file)
+    return summary.first_user_message if summary else None
+
+
+def read_last_message_preview(
+    session_id: str,
+    store_path: str | Path,
+    session_file: str | None = None,
+) -> str | None:
+    """Get a preview of the last user/assistant message (truncated)"""
+    summary = get_transcript_summary(session_id, store_path, session_file)
+    return summary.last_message_preview if summary else None
+
+
+def read_transcript_preview(
+    session_id: str,
+    store_path: str | Path,
+    session_file: str | None = None,
+    limit: int = 12,
+    max_chars: int = 240,
+) -> list[dict[str, Any]]:
+    """
+    Read the last messages of a transcript for preview
+
+    Args:
+        session_id: Session identifier
+        store_path: Path to sessions.json
+        session_file: Transcript filename recorded in the entry
+        limit: Number of messages to return
+        max_chars: Maximum characters per message
+
+    Returns:
+        List of {"role", "content"} dicts, oldest first
+    """
+    path = resolve_session_transcript_path(session_id, store_path, session_file)
+    if not path.exists() or limit <= 0:
+        return []
+
+    tail: list[dict[str, Any]] = []
+    for message, _ in _iter_transcript_lines(path):
+        if message is None:
+            continue
+        tail.append(message)
+        if len(tail) > limit:
+            tail.pop(0)
+
+    return [
+        {"role": message["role"], "content": _truncate(message["content"], max_chars)}
+        for message in tail
+    ]
+
+
+# ============================================================================
+# Writes
+# ============================================================================
+
+def write_transcript_line(transcript_path: str | Path, record: dict[str, Any]) -> None:
+    """
+    Append one record to a transcript and update its summary
+
+    Args:
+        transcript_path: Path to the JSONL transcript
+        record: JSON-serializable record
+    """
+    path = Path(transcript_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+    key = str(path)
+    with _summary_lock:
+        summary = _summary_cache.get(key)
+
+    with open(path, "ab") as f:
+        start = f.tell()
+        f.write(line)
+    st = path.stat()
+
+    if summary is not None and summary.size == start and st.st_size == start + len(line):
+        message = parse_transcript_message(record)
+        if message is not None:
+            summary.apply(message)
+        summary.size = st.st_size
+        summary.mtime_ns = st.st_mtime_ns
+        _write_sidecar(path, summary)
+    else:
+        # No current summary (or a concurrent writer): refresh lazily on next read
+        with _summary_lock:
+            _summary_cache.pop(key, None)
+
+
+def _archive_transcript(path: Path, reason: str) -> Path:
+    stamp = time.strftime("%Y-%m-%dT%H-%M-%S", time.gmtime())
+    archived = path.with_name(f"{path.name}.{reason}.{stamp}")
+    shutil.copy2(path, archived)
+    return archived
+
+
+def compact_transcript(
+    session_id: str,
+    store_path: str | Path,
+    keep_lines: int,
+    session_file: str | None = None,
+    archive_reason: str = "compaction",
+) -> dict[str, Any]:
+    """
+    Keep only the last N lines of a transcript (header preserved)
+
+    Args:
+        session_id: Session identifier
+        store_path: Path to sessions.json
+        keep_lines: Number of trailing lines to keep
+        session_file: Transcript filename recorded in the entry
+        archive_reason: Suffix for the archived copy
+
+    Returns:
+        {"removed_lines", "kept_lines", "archived_path"}
+    """
+    path = resolve_session_transcript_path(session_id, store_path, session_file)
+    if not path.exists():
+        return {"removed_lines": 0, "kept_lines": 0, "archived_path": None}
+
+    with open(path, encoding="utf-8") as f:
+        lines = [line for line in f if line.strip()]
+
+    header: list[str] = []
+    if lines:
+        try:
+            if json.loads(lines[0]).get("type") == "session":
+                header = [lines[0]]
+                lines = lines[1:]
+        except (json.JSONDecodeError, AttributeError):
+            pass
+
+    keep = max(0, keep_lines)
+    kept = lines[-keep:] if keep else []
+    removed = len(lines) - len(kept)
+    if removed <= 0:
+        return {"removed_lines": 0, "kept_lines": len(kept), "archived_path": None}
+
+    archived = _archive_transcript(path, archive_reason)
+    tmp = path.with_name(f"{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.writelines(header + kept)
+    os.replace(tmp, path)
+    _forget_summary(path)
+
+    return {"removed_lines": removed, "kept_lines": len(kept), "archived_path": str(archived)}
+
+
+def delete_transcript(
+    session_id: str,
+    store_path: str | Path,
+    session_file: str | None = None,
+    archive_first: bool = True,
+    archive_reason: str = "delete",
+) -> str | None:
+    """
+    Delete a transcript, optionally archiving it first
+
+    Returns:
+        Archived path, if archived
+    """
+    path = resolve_session_transcript_path(session_id, store_path, session_file)
+    _forget_summary(path)
+    if not path.exists():
+        return None
+
+    archived = None
+    if archive_first:
+        archived = str(_archive_transcript(path, archive_reason))
+    path.unlink(missing_ok=True)
+    return archived
@@ -0,0 +1,21 @@
+"""
+Session store types
+
+Re-exports the session entry models so config-level code can import them
+from ``openclaw.config.sessions`` (matching the TypeScript layout).
+"""
+from __future__ import annotations
+
+from openclaw.agents.session_entry import (
+    DeliveryContext,
+    SessionEntry,
+    SessionOrigin,
+    merge_session_entry,
+)
+
+__all__ = [
+    "DeliveryContext",
+    "SessionEntry",
+    "SessionOrigin",
+    "merge_session_entry",
+]
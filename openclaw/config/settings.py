@@ -37,6 +37,9 @@ class ExecConfig(BaseModel):
         default_factory=list, description="Directories to prepend to PATH"
     )
     timeout_sec: int = Field(default=120, gt=0, description="Default timeout in seconds")
+    max_output_bytes: int = Field(
+        default=200_000, gt=0, description="Output captured per stream; the middle is dropped beyond it"
+    )
     background_ms: int = Field(default=10000, gt=0, description="Time before auto-backgrounding")
 
     @field_validator("host")
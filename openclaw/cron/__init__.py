@@ -14,6 +14,7 @@ from .types import (
     CronJobState,
     CronPayload,
     CronSchedule,
+    MisfirePolicy,
 )
 
 __all__ = [
@@ -23,4 +24,5 @@ __all__ = [
     "CronPayload",
     "CronDelivery",
     "CronJobState",
+    "MisfirePolicy",
 ]
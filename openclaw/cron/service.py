@@ -14,7 +14,9 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import datetime, timezone
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timezone
 from pathlib import Path
 from typing import Any, Optional, Dict, Callable, Awaitable, Union
 
@@ -22,7 +24,8 @@ from .types import (
     CronJob,
     AgentTurnPayload,
     SystemEventPayload,
-    CronJobState
+    CronJobState,
+    MisfirePolicy,
 )
 from .schedule import compute_next_run
 from .timer import CronTimer
@@ -30,6 +33,15 @@ from .store import CronStore, CronRunLog
 
 logger = logging.getLogger(__name__)
 
+# Due jobs running at once
+DEFAULT_MAX_CONCURRENT_JOBS = 8
+
+# A run later than this counts as missed (see MisfirePolicy)
+DEFAULT_MISFIRE_GRACE_MS = 60_000
+
+# Missed occurrences replayed per job under MisfirePolicy.CATCH_UP
+DEFAULT_MAX_CATCH_UP_RUNS = 10
+
 
 class CronService:
     """
@@ -42,6 +54,8 @@ class CronService:
     - Persistent storage
     - Run logs
     - Auto delivery
+    - Concurrent execution of due jobs with global/per-target limits
+    - Missed-run policies (run once, skip, catch up)
     """
     
     def __init__(
@@ -51,6 +65,11 @@ class CronService:
         on_system_event: Optional[Callable[[str, Optional[str]], Awaitable[None]]] = None,
         on_isolated_agent: Optional[Callable[[CronJob], Awaitable[Dict[str, Any]]]] = None,
         on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+        max_concurrent_jobs: int = DEFAULT_MAX_CONCURRENT_JOBS,
+        max_concurrent_per_target: int | None = None,
+        misfire_policy: MisfirePolicy | str = MisfirePolicy.RUN_ONCE,
+        misfire_grace_ms: int = DEFAULT_MISFIRE_GRACE_MS,
+        max_catch_up_runs: int = DEFAULT_MAX_CATCH_UP_RUNS,
     ):
         """
         Initialize Cron service
@@ -61,6 +80,13 @@ class CronService:
             on_system_event: System event callback (text, agent_id)
             on_isolated_agent: Isolated Agent execution callback (job) -> result
             on_event: Event broadcast callback (event)
+            max_concurrent_jobs: Max due jobs running at once
+            max_concurrent_per_target: Max jobs running at once per target
+                session (main session of an agent, or an isolated job); None
+                for no limit
+            misfire_policy: What to do with runs later than misfire_grace_ms
+            misfire_grace_ms: Lateness after which a run counts as missed
+            max_catch_up_runs: Missed occurrences replayed per job on catch-up
         """
         self.jobs: Dict[str, CronJob] = {}
         self._running = False
@@ -72,6 +98,17 @@ class CronService:
         self.on_isolated_agent = on_isolated_agent
         self.on_event = on_event
         
+        # Execution limits and missed-run handling
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.max_concurrent_per_target = max_concurrent_per_target
+        self.misfire_policy = MisfirePolicy(misfire_policy)
+        self.misfire_grace_ms = misfire_grace_ms
+        self.max_catch_up_runs = max_catch_up_runs
+        self._job_slots = asyncio.Semaphore(max_concurrent_jobs)
+        self._target_slots: dict[str, list] = {}  # key -> [Semaphore, users]
+        self._inflight: set[asyncio.Task] = set()
+        self._catch_up_runs: dict[str, int] = {}
+        
         # Storage and logging
         self._store: Optional[CronStore] = None
         if store_path:
@@ -112,6 +149,9 @@ class CronService:
             self._timer.stop()
             self._timer = None
         
+        for task in list(self._inflight):
+            task.cancel()
+        
         logger.info("CronService stopped")
         self._broadcast_event({
             "action": "service-stopped",
@@ -149,7 +189,7 @@ class CronService:
             
             # Reschedule timer
             if self._timer and self._running:
-                self._timer.arm_timer(list(self.jobs.values()))
+                self._timer.schedule_job(job)
             
             logger.info(f"✅ Added cron job: {job.name} (id={job.id})")
             self._broadcast_event({
@@ -185,15 +225,17 @@ class CronService:
             job.state.next_run_ms = compute_next_run(job.schedule, now_ms)
             
             # Update
+            running = self.jobs[job.id].state.running_at_ms is not None
             self.jobs[job.id] = job
             
             # Persist
             if self._store:
                 self._store.save(list(self.jobs.values()))
             
-            # Reschedule
-            if self._timer and self._running:
-                self._timer.arm_timer(list(self.jobs.values()))
+            # Reschedule (a running job is rescheduled when its run ends,
+            # so it can't fire again mid-run)
+            if self._timer and self._running and not running:
+                self._timer.schedule_job(job)
             
             logger.info(f"✅ Updated job: {job.id}")
             self._broadcast_event({
@@ -231,7 +273,8 @@ class CronService:
             
             # Reschedule
             if self._timer and self._running:
-                self._timer.arm_timer(list(self.jobs.values()))
+                self._timer.unschedule_job(job_id)
+            self._catch_up_runs.pop(job_id, None)
             
             logger.info(f"✅ Removed job: {job_id}")
             self._broadcast_event({
@@ -308,21 +351,105 @@ class CronService:
     
     async def _on_timer_fired(self, due_jobs: list[CronJob]) -> None:
         """
-        Timer fired - Execute all due tasks
+        Timer fired - Dispatch all due tasks
+        
+        Jobs run concurrently in the background, limited by
+        max_concurrent_jobs and max_concurrent_per_target, so a slow job
+        does not hold up others due at the same time.
         
         Args:
             due_jobs: List of due tasks
         """
         logger.info(f"⏰ Timer fired: {len(due_jobs)} due jobs")
         
+        now_ms = int(datetime.now(UTC).timestamp() * 1000)
+        skipped = False
+        
         for job in due_jobs:
             if not job.enabled:
                 continue
             
-            try:
+            if self.misfire_policy == MisfirePolicy.SKIP and self._is_missed(job, now_ms):
+                logger.info(f"Skipping missed run of job {job.id}")
+                job.state.next_run_ms = compute_next_run(job.schedule, now_ms)
+                if self._timer and self._running:
+                    self._timer.schedule_job(job)
+                skipped = True
+                self._broadcast_event({
+                    "action": "job-skipped",
+                    "jobId": job.id,
+                    "jobName": job.name,
+                    "nextRun": job.state.next_run_ms,
+                })
+                continue
+            
+            task = asyncio.create_task(self._dispatch_job(job))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+        
+        if skipped and self._store:
+            self._store.save(list(self.jobs.values()))
+    
+    async def _dispatch_job(self, job: CronJob) -> None:
+        """Run a due job once a target slot and a global slot are free"""
+        try:
+            async with self._target_slot(job), self._job_slots:
                 await self._execute_job(job)
-            except Exception as e:
-                logger.error(f"Error executing job {job.id}: {e}", exc_info=True)
+        except Exception as e:
+            logger.error(f"Error executing job {job.id}: {e}", exc_info=True)
+    
+    @asynccontextmanager
+    async def _target_slot(self, job: CronJob) -> AsyncIterator[None]:
+        """Hold one of max_concurrent_per_target slots of the job's target"""
+        if not self.max_concurrent_per_target:
+            yield
+            return
+        
+        key = self._target_key(job)
+        slot = self._target_slots.get(key)
+        if slot is None:
+            slot = self._target_slots[key] = [asyncio.Semaphore(self.max_concurrent_per_target), 0]
+        slot[1] += 1
+        try:
+            async with slot[0]:
+                yield
+        finally:
+            slot[1] -= 1
+            if slot[1] == 0:
+                del self._target_slots[key]
+    
+    def _target_key(self, job: CronJob) -> str:
+        """Session a job runs in: the agent's main session, or its own"""
+        if job.session_target == "isolated":
+            return f"isolated:{job.id}"
+        return f"main:{job.agent_id or 'default'}"
+    
+    def _is_missed(self, job: CronJob, now_ms: int) -> bool:
+        """Whether a due run is later than the misfire grace period"""
+        next_run_ms = job.state.next_run_ms
+        return next_run_ms is not None and now_ms - next_run_ms > self.misfire_grace_ms
+    
+    def _next_run_after(self, job: CronJob, scheduled_ms: int | None, now_ms: int) -> int | None:
+        """
+        Next run time after a run that was scheduled for ``scheduled_ms``
+        
+        Under MisfirePolicy.CATCH_UP an occurrence that was passed over
+        while the job was late is returned (so it runs right away), up to
+        max_catch_up_runs in a row; otherwise the next run after now.
+        """
+        if (
+            self.misfire_policy == MisfirePolicy.CATCH_UP
+            and scheduled_ms is not None
+            and scheduled_ms <= now_ms
+        ):
+            caught_up = self._catch_up_runs.get(job.id, 0)
+            next_ms = compute_next_run(job.schedule, scheduled_ms)
+            if next_ms is not None and next_ms <= now_ms and caught_up < self.max_catch_up_runs:
+                self._catch_up_runs[job.id] = caught_up + 1
+                return next_ms
+        
+        self._catch_up_runs.pop(job.id, None)
+        return compute_next_run(job.schedule, now_ms)
     
     async def _execute_job(self, job: CronJob) -> Dict[str, Any]:
         """
@@ -340,6 +467,7 @@ class CronService:
         
         # Update status
         now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+        scheduled_ms = job.state.next_run_ms
         job.state.running_at_ms = now_ms
         
         # Broadcast start event
@@ -384,10 +512,17 @@ class CronService:
             
             # Calculate next run time
             if not job.delete_after_run:
-                job.state.next_run_ms = compute_next_run(
-                    job.schedule,
+                job.state.next_run_ms = self._next_run_after(
+                    job,
+                    scheduled_ms,
                     int(datetime.now(timezone.utc).timestamp() * 1000)
                 )
+                
+                # Back into the timer: this job, or the definition that
+                # replaced it during the run (update_job leaves that to us)
+                current = self.jobs.get(job.id)
+                if self._timer and self._running and current is not None:
+                    self._timer.schedule_job(current)
             else:
                 # One-shot task, delete after execution
                 logger.info(f"Job {job.id} is one-shot, removing after execution")
@@ -6,6 +6,7 @@ import logging
 import shutil
 import tempfile
 import uuid
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
@@ -153,9 +154,24 @@ class CronRunLog:
     
     Features:
     - JSONL format (one line per run)
-    - Auto-pruning (keep recent runs)
+    - O(1) appends to an active segment (``<job_id>.jsonl``)
+    - Rotation instead of pruning: once the active segment holds
+      ``max_entries`` runs it becomes the previous segment
+      (``<job_id>.1.jsonl``), replacing the one before
+    - Tail reads that seek back from the end of the file
+    
+    Between ``max_entries`` and ``2 * max_entries - 1`` runs are on disk;
+    ``read`` returns at most the ``max_entries`` most recent.
     """
     
+    # Block size for reading segments backwards
+    _TAIL_BLOCK = 8192
+    
+    # Active segment line counts by path: (size in bytes, lines), shared by
+    # the short-lived instances and bounded, least recently used out first
+    _line_counts: OrderedDict[Path, tuple[int, int]] = OrderedDict()
+    _MAX_LINE_COUNTS = 1024
+    
     def __init__(self, log_dir: Path, job_id: str, max_entries: int = 100):
         """
         Initialize run log
@@ -166,6 +182,7 @@ class CronRunLog:
             max_entries: Maximum entries to keep
         """
         self.log_path = log_dir / f"{job_id}.jsonl"
+        self.prev_path = log_dir / f"{job_id}.1.jsonl"
         self.max_entries = max_entries
         
         # Ensure log directory exists
@@ -179,11 +196,17 @@ class CronRunLog:
             entry: Run entry data
         """
         try:
-            with open(self.log_path, "a") as f:
-                f.write(json.dumps(entry) + "\n")
+            data = (json.dumps(entry) + "\n").encode()
+            lines = self._count_lines() + 1
             
-            # Prune if needed
-            self._prune_if_needed()
+            with open(self.log_path, "ab") as f:
+                f.write(data)
+                size = f.tell()
+            
+            if lines >= self.max_entries:
+                self._rotate()
+            else:
+                self._remember_count(size, lines)
             
         except Exception as e:
             logger.error(f"Error appending to run log: {e}", exc_info=True)
@@ -196,61 +219,86 @@ class CronRunLog:
             limit: Maximum entries to return (most recent)
             
         Returns:
-            List of run entries
+            List of run entries, oldest first
         """
-        if not self.log_path.exists():
-            return []
+        wanted = min(limit, self.max_entries) if limit else self.max_entries
         
         try:
-            entries: list[dict[str, Any]] = []
-            
-            with open(self.log_path) as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    try:
-                        entry = json.loads(line)
-                        entries.append(entry)
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Error parsing log entry: {e}")
-                        continue
-            
-            # Return most recent entries if limit specified
-            if limit:
-                return entries[-limit:]
-            
-            return entries
-            
+            lines = self._tail_lines(self.log_path, wanted)
+            if len(lines) < wanted:
+                lines = self._tail_lines(self.prev_path, wanted - len(lines)) + lines
         except Exception as e:
             logger.error(f"Error reading run log: {e}", exc_info=True)
             return []
-    
-    def _prune_if_needed(self) -> None:
-        """Prune old entries if log exceeds max_entries"""
-        entries = self.read()
         
-        if len(entries) > self.max_entries:
-            # Keep only most recent entries
-            entries = entries[-self.max_entries:]
-            
-            # Rewrite log file
+        entries: list[dict[str, Any]] = []
+        for line in lines:
             try:
-                with open(self.log_path, "w") as f:
-                    for entry in entries:
-                        f.write(json.dumps(entry) + "\n")
-                
-                logger.debug(f"Pruned run log to {len(entries)} entries")
-                
-            except Exception as e:
-                logger.error(f"Error pruning run log: {e}", exc_info=True)
+                entries.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                logger.error(f"Error parsing log entry: {e}")
+        return entries
+    
+    def _tail_lines(self, path: Path, count: int) -> list[bytes]:
+        """Last ``count`` non-empty lines of a file, read backwards in blocks"""
+        if count <= 0 or not path.exists():
+            return []
+        
+        with open(path, "rb") as f:
+            pos = f.seek(0, 2)
+            buf = b""
+            # count + 1 newlines guarantee count complete lines after the first
+            while pos > 0 and buf.count(b"\n") < count + 1:
+                step = min(self._TAIL_BLOCK, pos)
+                pos -= step
+                f.seek(pos)
+                buf = f.read(step) + buf
+        
+        parts = buf.split(b"\n")
+        # The first part may be cut off unless we reached the start
+        if pos > 0:
+            parts = parts[1:]
+        lines = [line for line in parts if line.strip()]
+        return lines[-count:]
+    
+    def _count_lines(self) -> int:
+        """Lines in the active segment, recounted only if changed elsewhere"""
+        try:
+            size = self.log_path.stat().st_size
+        except FileNotFoundError:
+            self._line_counts.pop(self.log_path, None)
+            return 0
+        
+        cached = self._line_counts.get(self.log_path)
+        if cached and cached[0] == size:
+            self._line_counts.move_to_end(self.log_path)
+            return cached[1]
+        
+        # Bounded by max_entries, since larger segments are rotated
+        with open(self.log_path, "rb") as f:
+            lines = sum(1 for line in f if line.strip())
+        self._remember_count(size, lines)
+        return lines
+    
+    def _remember_count(self, size: int, lines: int) -> None:
+        self._line_counts[self.log_path] = (size, lines)
+        self._line_counts.move_to_end(self.log_path)
+        while len(self._line_counts) > self._MAX_LINE_COUNTS:
+            self._line_counts.popitem(last=False)
+    
+    def _rotate(self) -> None:
+        """Make the full active segment the previous one"""
+        self.log_path.replace(self.prev_path)
+        self._line_counts.pop(self.log_path, None)
+        logger.debug(f"Rotated run log {self.log_path}")
     
     def clear(self) -> None:
         """Clear run log"""
         try:
-            if self.log_path.exists():
-                self.log_path.unlink()
+            for path in (self.log_path, self.prev_path):
+                if path.exists():
+                    path.unlink()
+            self._line_counts.pop(self.log_path, None)
             logger.info(f"Cleared run log: {self.log_path}")
         except Exception as e:
             logger.error(f"Error clearing run log: {e}", exc_info=True)
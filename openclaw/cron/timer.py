@@ -1,10 +1,22 @@
-"""Timer management matching TypeScript openclaw/src/cron/service/timer.ts"""
+"""Timer management matching TypeScript openclaw/src/cron/service/timer.ts
+
+Jobs live in a min-heap keyed by ``next_run_ms``. Adding, updating or
+removing a job is O(log n): an update pushes a fresh entry and the old one
+is skipped when it surfaces (the heap is compacted once stale entries
+dominate). A single long-lived task sleeps until the earliest entry and is
+woken early only when a job is scheduled ahead of it.
+
+A job popped from the heap stays out of it until it is scheduled again
+(normally once its run finishes), so a slow run never fires twice.
+"""
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
-from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Callable
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
 
 from .schedule import compute_next_run, is_due
 
@@ -16,21 +28,32 @@ logger = logging.getLogger(__name__)
 # Maximum timeout for asyncio.sleep (about 24 days)
 MAX_TIMEOUT_MS = 2**31 - 1
 
+# Compact the heap once it holds this many times more entries than jobs
+_COMPACT_RATIO = 2
+_COMPACT_MIN = 64
+
+
+def _now_ms() -> int:
+    return int(datetime.now(UTC).timestamp() * 1000)
+
 
 class CronTimer:
     """
     Timer manager for cron jobs
-    
+
     Features:
-    - Single timer for next due job (efficient)
+    - Single timer task for the earliest due job
+    - O(log n) add/update/remove via ``schedule_job``/``unschedule_job``
     - Handles long delays
-    - Automatic rescheduling
+
+    ``on_timer_callback`` receives the due jobs and is awaited by the timer
+    task, so it should hand long-running work off rather than run it inline.
     """
-    
-    def __init__(self, on_timer_callback: Callable[[list[CronJob]], None]):
+
+    def __init__(self, on_timer_callback: Callable[[list[CronJob]], Awaitable[None]]):
         """
         Initialize timer
-        
+
         Args:
             on_timer_callback: Callback function when timer fires
         """
@@ -38,135 +61,183 @@ class CronTimer:
         self.timer_task: asyncio.Task | None = None
         self.next_fire_ms: int | None = None
         self.running = False
-    
+
+        self._jobs: dict[str, CronJob] = {}
+        self._heap: list[tuple[int, int, str]] = []
+        # Live heap entry per scheduled job: (next_run_ms, seq)
+        self._scheduled: dict[str, tuple[int, int]] = {}
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+
     def arm_timer(self, jobs: list[CronJob]) -> None:
         """
-        Arm timer for next due job
-        
+        Rebuild the schedule from all jobs and start the timer
+
         Args:
             jobs: List of cron jobs
         """
-        # Cancel existing timer
-        if self.timer_task and not self.timer_task.done():
-            self.timer_task.cancel()
-            self.timer_task = None
-        
-        # Find next job to run
-        now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
-        
-        next_job: CronJob | None = None
-        next_run_ms: int | None = None
-        
+        now_ms = _now_ms()
+        self._jobs = {job.id: job for job in jobs}
+        self._scheduled.clear()
+        self._heap = []
         for job in jobs:
-            if not job.enabled:
-                continue
-            
-            # Compute next run if not set
-            if job.state.next_run_ms is None:
-                job.state.next_run_ms = compute_next_run(job.schedule, now_ms)
-            
-            if job.state.next_run_ms is None:
-                continue
-            
-            # Track earliest next run
-            if next_run_ms is None or job.state.next_run_ms < next_run_ms:
-                next_run_ms = job.state.next_run_ms
-                next_job = job
-        
-        # If no jobs to run, don't arm timer
-        if next_job is None or next_run_ms is None:
+            entry = self._entry_for(job, now_ms)
+            if entry is not None:
+                self._heap.append(entry)
+        heapq.heapify(self._heap)
+
+        self.running = True
+        if not self._scheduled:
             logger.info("No jobs to schedule")
-            self.next_fire_ms = None
             return
-        
-        # Calculate delay
-        delay_ms = max(0, next_run_ms - now_ms)
-        
-        # Clamp to MAX_TIMEOUT_MS
-        if delay_ms > MAX_TIMEOUT_MS:
-            logger.warning(f"Delay {delay_ms}ms exceeds max, clamping to {MAX_TIMEOUT_MS}ms")
-            delay_ms = MAX_TIMEOUT_MS
-        
-        delay_seconds = delay_ms / 1000
-        
-        logger.info(f"Arming timer for job '{next_job.name}' ({next_job.id}) in {delay_seconds:.1f}s")
-        
-        # Store next fire time
-        self.next_fire_ms = next_run_ms
-        
-        # Create timer task
-        self.timer_task = asyncio.create_task(self._timer_wait(delay_seconds, jobs))
-    
-    async def _timer_wait(self, delay_seconds: float, jobs: list[CronJob]) -> None:
+        self._ensure_task()
+
+    def schedule_job(self, job: CronJob) -> None:
         """
-        Wait for delay and then fire timer
-        
+        Add a job or reschedule it after its ``next_run_ms`` changed
+
+        Disabled jobs and jobs without a next run are removed instead.
+
         Args:
-            delay_seconds: Delay in seconds
-            jobs: List of jobs
+            job: Cron job
         """
-        try:
-            await asyncio.sleep(delay_seconds)
-            
-            # Timer fired - find and run due jobs
-            logger.info("Timer fired")
-            await self._on_timer_fired(jobs)
-            
-        except asyncio.CancelledError:
-            logger.debug("Timer cancelled")
-        except Exception as e:
-            logger.error(f"Error in timer: {e}", exc_info=True)
-    
-    async def _on_timer_fired(self, jobs: list[CronJob]) -> None:
+        self._jobs[job.id] = job
+        entry = self._entry_for(job, _now_ms())
+        if entry is None:
+            self._maybe_compact()
+            return
+
+        heapq.heappush(self._heap, entry)
+        self._maybe_compact()
+        if self.running and (self.next_fire_ms is None or entry[0] < self.next_fire_ms):
+            self._ensure_task()
+
+    def unschedule_job(self, job_id: str) -> None:
         """
-        Handle timer firing
-        
+        Remove a job from the schedule
+
         Args:
-            jobs: List of jobs to check
+            job_id: Job ID
         """
-        now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
-        
-        # Find all due jobs
-        due_jobs: list[CronJob] = []
-        
-        for job in jobs:
-            if not job.enabled:
+        self._jobs.pop(job_id, None)
+        if self._scheduled.pop(job_id, None) is not None:
+            self._maybe_compact()
+
+    def _ensure_task(self) -> None:
+        """Start the timer task, or wake it to re-check the earliest job"""
+        if self.timer_task is None or self.timer_task.done():
+            self.timer_task = asyncio.create_task(self._run())
+        else:
+            self._wakeup.set()
+
+    def _entry_for(self, job: CronJob, now_ms: int) -> tuple[int, int, str] | None:
+        """Register the live heap entry for a job, or drop it if unschedulable"""
+        self._scheduled.pop(job.id, None)
+        if not job.enabled:
+            return None
+
+        # Compute next run if not set
+        if job.state.next_run_ms is None:
+            job.state.next_run_ms = compute_next_run(job.schedule, now_ms)
+        if job.state.next_run_ms is None:
+            return None
+
+        self._seq += 1
+        self._scheduled[job.id] = (job.state.next_run_ms, self._seq)
+        return (job.state.next_run_ms, self._seq, job.id)
+
+    def _is_live(self, entry: tuple[int, int, str]) -> bool:
+        run_ms, seq, job_id = entry
+        return self._scheduled.get(job_id) == (run_ms, seq)
+
+    def _peek(self) -> int | None:
+        """Earliest scheduled run, discarding stale entries on top"""
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def _pop_due(self, now_ms: int) -> list[CronJob]:
+        """Take every job due at ``now_ms`` out of the schedule"""
+        due: list[CronJob] = []
+        while self._heap and is_due(self._heap[0][0], now_ms):
+            entry = heapq.heappop(self._heap)
+            if not self._is_live(entry):
+                continue
+            run_ms, _, job_id = entry
+            del self._scheduled[job_id]
+            job = self._jobs.get(job_id)
+            if job is None or not job.enabled:
+                continue
+            if job.state.next_run_ms != run_ms:
+                # Changed without schedule_job(); go by the job itself
+                self.schedule_job(job)
                 continue
-            
-            if is_due(job.state.next_run_ms, now_ms):
-                due_jobs.append(job)
-        
-        if due_jobs:
-            logger.info(f"Running {len(due_jobs)} due jobs")
-            
-            # Call callback with due jobs
-            await self.on_timer(due_jobs)
-        
-        # Rearm timer for next job
-        self.arm_timer(jobs)
-    
+            due.append(job)
+        return due
+
+    def _maybe_compact(self) -> None:
+        """Drop stale entries once they outnumber live ones"""
+        if len(self._heap) > max(_COMPACT_MIN, _COMPACT_RATIO * len(self._scheduled)):
+            self._heap = [
+                (run_ms, seq, job_id) for job_id, (run_ms, seq) in self._scheduled.items()
+            ]
+            heapq.heapify(self._heap)
+
+    async def _run(self) -> None:
+        """Sleep until the earliest job is due, then hand due jobs over"""
+        try:
+            while self.running:
+                self._wakeup.clear()
+                next_run_ms = self._peek()
+                self.next_fire_ms = next_run_ms
+
+                if next_run_ms is None:
+                    await self._wakeup.wait()
+                    continue
+
+                now_ms = _now_ms()
+                if next_run_ms > now_ms:
+                    # Clamp to MAX_TIMEOUT_MS
+                    delay_ms = min(next_run_ms - now_ms, MAX_TIMEOUT_MS)
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=delay_ms / 1000)
+                    except TimeoutError:
+                        pass
+                    continue
+
+                due_jobs = self._pop_due(now_ms)
+                if due_jobs:
+                    logger.info(f"Timer fired: {len(due_jobs)} due jobs")
+                    try:
+                        await self.on_timer(due_jobs)
+                    except Exception as e:
+                        logger.error(f"Error in timer: {e}", exc_info=True)
+        except asyncio.CancelledError:
+            logger.debug("Timer cancelled")
+
     def stop(self) -> None:
         """Stop timer"""
+        self.running = False
         if self.timer_task and not self.timer_task.done():
             self.timer_task.cancel()
             self.timer_task = None
-        
+
         self.next_fire_ms = None
-        self.running = False
-        
+
         logger.info("Timer stopped")
-    
+
     def get_status(self) -> dict[str, any]:
         """Get timer status"""
         status = {
             "running": self.timer_task is not None and not self.timer_task.done(),
             "next_fire_ms": self.next_fire_ms,
+            "scheduled_jobs": len(self._scheduled),
         }
-        
+
         if self.next_fire_ms:
-            now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+            now_ms = _now_ms()
             time_until_ms = self.next_fire_ms - now_ms
             status["time_until_ms"] = max(0, time_until_ms)
             status["time_until_seconds"] = max(0, time_until_ms / 1000)
-        
+
         return status
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
+from enum import StrEnum
 from typing import Any, Literal
 
 
@@ -69,6 +70,15 @@ class CronDelivery:
     best_effort: bool = False  # Continue on delivery errors
 
 
+# Missed-run handling
+class MisfirePolicy(StrEnum):
+    """What to do with a run that is more than the grace period late"""
+    
+    RUN_ONCE = "run-once"  # Run once now, then schedule from now
+    SKIP = "skip"  # Drop the missed run, schedule from now
+    CATCH_UP = "catch-up"  # Run every missed occurrence (bounded)
+
+
 # Job state
 @dataclass
 class CronJobState:
@@ -13,17 +13,17 @@ from dataclasses import asdict
 from openclaw.agents.session_entry import SessionEntry
 from openclaw.config.sessions.store import (
     load_session_store,
-    update_session_store,
+    update_session_store_async,
 )
 from openclaw.config.sessions.paths import get_default_store_path
 from openclaw.config.sessions.transcripts import (
-    read_session_preview_items,
     compact_transcript,
     delete_transcript,
 )
 from openclaw.gateway.session_utils import (
     SessionsListOptions,
     list_sessions_from_store,
+    read_session_preview_items,
     resolve_gateway_session_store_target,
     resolve_main_session_key,
 )
@@ -347,7 +347,7 @@ class SessionsPatchMethod:
                 model_catalog=None
             )
         
-        update_session_store(target.store_path, mutator)
+        await update_session_store_async(target.store_path, mutator)
         
         # Reload to get updated entry
         store = load_session_store(target.store_path)
@@ -435,7 +435,7 @@ class SessionsResetMethod:
             
             store[target.canonical_key] = reset_entry
         
-        update_session_store(target.store_path, mutator)
+        await update_session_store_async(target.store_path, mutator)
         
         return {
             "ok": True,
@@ -506,7 +506,7 @@ class SessionsDeleteMethod:
             if target.canonical_key in store_dict:
                 del store_dict[target.canonical_key]
         
-        update_session_store(target.store_path, mutator)
+        await update_session_store_async(target.store_path, mutator)
         
         return {"ok": True, "deleted": True}
     
@@ -577,7 +577,7 @@ class SessionsCompactMethod:
                 e.compaction_count = (e.compaction_count or 0) + 1
                 e.updated_at = int(time.time() * 1000)
         
-        update_session_store(target.store_path, mutator)
+        await update_session_store_async(target.store_path, mutator)
         
         return {
             "ok": True,
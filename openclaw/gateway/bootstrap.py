@@ -249,6 +249,19 @@ class GatewayBootstrap:
             results["errors"].append(f"tool_registry: {e}")
         results["steps_completed"] += 1
         
+        # Step 10.5: Size the warm sandbox pool from config
+        sandbox_config = getattr(self.config, "sandbox", None) if self.config else None
+        if sandbox_config:
+            logger.info("Step 10.5: Configuring sandbox pool")
+            from ..agents.sandbox.pool import get_sandbox_pool
+            pool_config = sandbox_config.pool
+            get_sandbox_pool(
+                min_idle=pool_config.min_idle,
+                max_idle=pool_config.max_idle,
+                idle_ttl_sec=pool_config.idle_ttl_sec,
+            )
+        results["steps_completed"] += 0.5
+        
         # Step 11: Load skills
         logger.info("Step 11: Loading skills")
         try:
@@ -619,4 +632,12 @@ class GatewayBootstrap:
             except Exception as e:
                 logger.error(f"Channel manager stop error: {e}")
         
+        # Stop supervised processes (they run in their own process groups,
+        # so they would otherwise outlive the gateway)
+        try:
+            from ..process.supervisor import shutdown_process_supervisor
+            await shutdown_process_supervisor()
+        except Exception as e:
+            logger.error(f"Process supervisor shutdown error: {e}")
+        
         logger.info("Gateway shutdown complete")
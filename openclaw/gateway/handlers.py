@@ -93,11 +93,13 @@ async def handle_health(connection: Any, params: dict[str, Any]) -> dict[str, An
 @register_handler("status")
 async def handle_status(connection: Any, params: dict[str, Any]) -> dict[str, Any]:
     """Get server status"""
+    gateway = getattr(connection, "gateway", None)
     return {
         "gateway": {
             "running": True,
             "port": connection.config.gateway.port,
-            "connections": 1,  # TODO: Track actual connections
+            "connections": len(gateway.connections) if gateway else 1,
+            "broadcast": gateway.get_broadcast_metrics() if gateway else None,
         },
         "agents": {
             "count": len(connection.config.agents.agents) if connection.config.agents.agents else 0
@@ -410,7 +412,8 @@ async def handle_agent_queue_status(connection: Any, params: dict[str, Any]) ->
         "enabled": True,
         "global": stats.get("global", {}),
         "sessions": stats.get("sessions", {}),
-        "total_sessions": stats.get("total_sessions", 0)
+        "total_sessions": stats.get("total_sessions", 0),
+        "turns": stats.get("turns", {}),
     }
 
 
@@ -650,22 +653,27 @@ async def handle_cron_runs(connection: Any, params: dict[str, Any]) -> list[dict
         logger.warning("Cron service not available")
         return []
     
+    if not cron_service.log_dir:
+        return []
+    
     try:
         from openclaw.cron.store import CronRunLog
         
-        # Read run log for the job
-        run_log = CronRunLog(job_id, cron_service.store.store_path.parent / "runs")
+        # Read the tail of the run log for the job
+        run_log = CronRunLog(cron_service.log_dir, job_id)
         entries = run_log.read(limit=limit)
         
         # Convert to API format
         return [
             {
-                "jobId": entry.get("job_id"),
+                "jobId": entry.get("job_id", job_id),
                 "runId": entry.get("run_id"),
-                "startedAt": entry.get("started_at"),
+                "startedAt": entry.get("started_at", entry.get("timestamp")),
                 "completedAt": entry.get("completed_at"),
+                "durationMs": entry.get("duration_ms"),
                 "status": entry.get("status"),
                 "result": entry.get("result", {}),
+                "summary": entry.get("summary"),
                 "error": entry.get("error")
             }
             for entry in entries
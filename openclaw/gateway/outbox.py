@@ -0,0 +1,190 @@
+"""
+Per-connection send queues for gateway broadcasts
+
+Broadcast frames are serialized once and offered to every connection's
+bounded outbox. Each outbox is drained by its own writer task, so one slow
+websocket never delays delivery to the others.
+
+A connection whose outbox is full is a slow consumer: frames broadcast with
+``dropIfSlow`` are dropped for it, any other frame closes the connection
+(code 1008), matching the TypeScript gateway.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Queue bounds per connection
+DEFAULT_MAX_QUEUED_FRAMES = 1024
+DEFAULT_MAX_QUEUED_BYTES = 1_572_864  # 1.5 MiB
+
+SLOW_CONSUMER_CLOSE_CODE = 1008
+
+
+@dataclass
+class OutboxStats:
+    """Send queue counters (per connection, or gateway-wide totals)"""
+    enqueued: int = 0
+    sent: int = 0
+    dropped: int = 0
+    max_depth: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "maxDepth": self.max_depth,
+        }
+
+
+class ConnectionOutbox:
+    """
+    Bounded send queue drained by a writer task
+
+    Example:
+        outbox = ConnectionOutbox(websocket)
+        outbox.offer(frame_json, drop_if_slow=True)
+        ...
+        await outbox.close()
+    """
+
+    def __init__(
+        self,
+        websocket: Any,
+        max_frames: int = DEFAULT_MAX_QUEUED_FRAMES,
+        max_bytes: int = DEFAULT_MAX_QUEUED_BYTES,
+        totals: OutboxStats | None = None,
+        send: Callable[[str], Awaitable[None]] | None = None,
+    ):
+        """
+        Initialize outbox
+
+        Args:
+            websocket: Connection with an async ``send`` (and ``close``)
+            max_frames: Maximum queued frames before the consumer is slow
+            max_bytes: Maximum queued bytes before the consumer is slow
+            totals: Shared counters updated alongside this outbox's own
+            send: Frame writer (defaults to ``websocket.send``)
+        """
+        self.websocket = websocket
+        self.send = send or websocket.send
+        self.max_frames = max_frames
+        self.max_bytes = max_bytes
+        self.stats = OutboxStats()
+        self._totals = totals
+        self.closed = False
+
+        self._queue: deque[str] = deque()
+        self._queued_bytes = 0
+        self._wakeup = asyncio.Event()
+        self._writer: asyncio.Task | None = None
+
+    @property
+    def depth(self) -> int:
+        """Frames waiting to be sent"""
+        return len(self._queue)
+
+    @property
+    def queued_bytes(self) -> int:
+        return self._queued_bytes
+
+    @property
+    def slow(self) -> bool:
+        return len(self._queue) >= self.max_frames or self._queued_bytes >= self.max_bytes
+
+    def offer(self, data: str, drop_if_slow: bool = False) -> bool:
+        """
+        Queue a serialized frame without waiting
+
+        Args:
+            data: Serialized frame
+            drop_if_slow: Drop the frame (instead of closing) if the queue is full
+
+        Returns:
+            True if the frame was queued
+        """
+        if self.closed:
+            return False
+
+        if self.slow:
+            self._count_dropped(1)
+            if not drop_if_slow:
+                logger.warning(
+                    f"Closing slow consumer ({len(self._queue)} frames, "
+                    f"{self._queued_bytes} bytes queued)"
+                )
+                self._close_slow()
+            return False
+
+        self._queue.append(data)
+        self._queued_bytes += len(data)
+        self.stats.enqueued += 1
+        self.stats.max_depth = max(self.stats.max_depth, len(self._queue))
+        if self._totals is not None:
+            self._totals.enqueued += 1
+            self._totals.max_depth = max(self._totals.max_depth, len(self._queue))
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._drain())
+        self._wakeup.set()
+        return True
+
+    async def _drain(self) -> None:
+        """Writer task: send queued frames in order"""
+        while not self.closed:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            data = self._queue.popleft()
+            self._queued_bytes -= len(data)
+            try:
+                await self.send(data)
+            except Exception as e:
+                logger.debug(f"Outbox send failed, stopping writer: {e}")
+                self._discard()
+                return
+            self.stats.sent += 1
+            if self._totals is not None:
+                self._totals.sent += 1
+
+    def _close_slow(self) -> None:
+        self._discard()
+        if self._writer is not None:
+            self._writer.cancel()
+        asyncio.create_task(self._close_websocket())
+
+    async def _close_websocket(self) -> None:
+        try:
+            await self.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE, reason="slow consumer")
+        except Exception as e:
+            logger.debug(f"Error closing slow consumer: {e}")
+
+    def _discard(self) -> None:
+        self.closed = True
+        self._count_dropped(len(self._queue))
+        self._queue.clear()
+        self._queued_bytes = 0
+
+    def _count_dropped(self, count: int) -> None:
+        self.stats.dropped += count
+        if self._totals is not None:
+            self._totals.dropped += count
+
+    async def close(self) -> None:
+        """Stop the writer task and drop unsent frames"""
+        self._discard()
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._writer = None
@@ -60,11 +60,21 @@ from ..config import ClawdbotConfig
 from ..events import Event
 from .channel_manager import ChannelManager, discover_channel_plugins
 from .handlers import get_method_handler
+from .outbox import ConnectionOutbox, OutboxStats
 from .protocol import ErrorShape, EventFrame, RequestFrame, ResponseFrame
 from .protocol.frames import ConnectRequest, HelloResponse
 
 logger = logging.getLogger(__name__)
 
+# Requests handled concurrently per connection (priority methods excepted)
+MAX_IN_FLIGHT_REQUESTS = 8
+
+# Requests accepted per connection (running or waiting for a slot)
+MAX_PENDING_REQUESTS = 256
+
+# Control methods that bypass the in-flight limit
+PRIORITY_METHODS = frozenset({"chat.abort", "health", "ping"})
+
 
 class GatewayConnection:
     """Represents a single WebSocket connection"""
@@ -79,11 +89,18 @@ class GatewayConnection:
         self.auth_context = AuthContext(role="operator", scopes=set())
         self.nonce: Optional[str] = None
         self.connect_challenge_sent = False
+        # Every frame on the connection goes through the outbox's single
+        # writer task, so responses, events and broadcasts keep their order
+        self.outbox = ConnectionOutbox(
+            websocket, totals=gateway.outbox_totals if gateway else None
+        )
+        self._request_slots = asyncio.Semaphore(MAX_IN_FLIGHT_REQUESTS)
+        self._request_tasks: set[asyncio.Task] = set()
 
     async def send_response(
         self, request_id: str | int, payload: Any = None, error: ErrorShape | None = None
     ) -> None:
-        """Send response frame (supports JSON-RPC 2.0 format)"""
+        """Queue response frame (supports JSON-RPC 2.0 format)"""
         # Send JSON-RPC 2.0 format
         if error:
             response = {
@@ -100,32 +117,30 @@ class GatewayConnection:
                 "id": request_id,
                 "result": payload,
             }
-        await self.websocket.send(json.dumps(response))
+        self.outbox.offer(json.dumps(response))
 
     async def send_event(self, event: str, payload: Any = None) -> None:
-        """Send event frame"""
+        """Queue event frame"""
         event_frame = EventFrame(event=event, payload=payload)
-        await self.websocket.send(event_frame.model_dump_json())
+        self.outbox.offer(event_frame.model_dump_json())
 
-    async def handle_message(self, message: str) -> None:
-        """Handle incoming message"""
+    def _parse_request(self, message: str) -> RequestFrame | None:
+        """Parse a request frame (None if the message is not a request)"""
         try:
             data = json.loads(message)
             
             # Support both custom frame format and standard JSON-RPC 2.0
             if "jsonrpc" in data:
                 # Standard JSON-RPC 2.0 format
-                request = RequestFrame(
+                return RequestFrame(
                     type="req",
                     id=data.get("id"),
                     method=data.get("method"),
                     params=data.get("params", {}),
                 )
-                await self.handle_request(request)
             elif data.get("type") == "req":
                 # Custom frame format
-                request = RequestFrame(**data)
-                await self.handle_request(request)
+                return RequestFrame(**data)
             else:
                 logger.warning(f"Unknown message format: {data}")
 
@@ -133,6 +148,71 @@ class GatewayConnection:
             logger.error(f"Invalid JSON: {e}")
         except Exception as e:
             logger.error(f"Error handling message: {e}", exc_info=True)
+        return None
+
+    async def handle_message(self, message: str) -> None:
+        """Handle incoming message and wait for its response"""
+        request = self._parse_request(message)
+        if request is not None:
+            await self.handle_request(request)
+
+    async def dispatch_message(self, message: str) -> None:
+        """
+        Start handling an incoming message without waiting for it
+
+        ``connect`` is handled inline so later requests see its outcome.
+        Other requests run as tasks: at most MAX_IN_FLIGHT_REQUESTS at a
+        time, except PRIORITY_METHODS which never wait for a slot.
+        """
+        request = self._parse_request(message)
+        if request is None:
+            return
+        if request.method == "connect":
+            await self.handle_request(request)
+            return
+
+        if len(self._request_tasks) >= MAX_PENDING_REQUESTS:
+            await self.send_response(
+                request.id,
+                error=ErrorShape(
+                    code="UNAVAILABLE",
+                    message=f"Too many pending requests (limit {MAX_PENDING_REQUESTS})",
+                ),
+            )
+            return
+
+        task = asyncio.create_task(self._run_request(request))
+        self._request_tasks.add(task)
+        task.add_done_callback(self._request_done)
+
+    def _request_done(self, task: asyncio.Task) -> None:
+        """Forget a finished request task, logging anything it raised"""
+        self._request_tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.error(f"Request task failed: {exc}", exc_info=exc)
+
+    async def _run_request(self, request: RequestFrame) -> None:
+        if request.method in PRIORITY_METHODS:
+            await self.handle_request(request)
+            return
+        async with self._request_slots:
+            await self.handle_request(request)
+
+    @property
+    def in_flight(self) -> int:
+        """Requests running or waiting for a slot"""
+        return len(self._request_tasks)
+
+    async def cancel_requests(self) -> None:
+        """Cancel in-flight requests (on disconnect) and wait for them"""
+        tasks = list(self._request_tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     async def handle_request(self, request: RequestFrame) -> None:
         """Handle request frame with authorization"""
@@ -408,6 +488,10 @@ class GatewayServer:
         self.http_server_task = None
         self.active_runs: dict[str, asyncio.Task] = {}  # Track active agent runs for abort
         
+        # Broadcast metrics (every connection's outbox also counts here)
+        self._broadcast_frames = 0
+        self.outbox_totals = OutboxStats()
+        
         # Initialize memory manager (lazy initialization)
         self._memory_manager = None
         
@@ -498,10 +582,10 @@ class GatewayServer:
             })
             logger.debug(f"Sent connect.challenge with nonce")
             
-            # Handle messages
+            # Handle messages (requests run concurrently)
             async for message in websocket:
                 if isinstance(message, str):
-                    await connection.handle_message(message)
+                    await connection.dispatch_message(message)
                 else:
                     logger.warning(f"Received non-text message: {type(message)}")
         except websockets.exceptions.ConnectionClosed:
@@ -510,24 +594,67 @@ class GatewayServer:
             logger.error(f"Connection error: {e}", exc_info=True)
         finally:
             self.connections.discard(connection)
+            await connection.cancel_requests()
+            await connection.outbox.close()
 
-    async def broadcast_event(self, event: str, payload: Any = None) -> None:
-        """Broadcast event to all connected clients"""
-        disconnected = set()
+    def broadcast(self, event: str, payload: Any = None, opts: dict[str, Any] | None = None) -> int:
+        """
+        Queue an event for every connected client without waiting
+
+        The frame is serialized once and offered to each connection's
+        outbox; per-connection writer tasks do the sends.
+
+        Args:
+            event: Event name
+            payload: Event payload
+            opts: Options dict, may include:
+                - dropIfSlow: bool - Skip clients whose send queue is full
+                  (otherwise such clients are disconnected)
+
+        Returns:
+            Number of connections the frame was queued for
+        """
+        data = EventFrame(event=event, payload=payload).model_dump_json()
+        drop_if_slow = bool((opts or {}).get("dropIfSlow"))
+        self._broadcast_frames += 1
+
+        queued = 0
+        closed = []
         for connection in self.connections:
-            try:
-                await connection.send_event(event, payload)
-            except Exception as e:
-                logger.error(f"Failed to send event to connection: {e}")
-                disconnected.add(connection)
+            if connection.outbox.offer(data, drop_if_slow):
+                queued += 1
+            elif connection.outbox.closed:
+                closed.append(connection)
+
+        # Clean up disconnected and slow connections
+        self.connections.difference_update(closed)
+        return queued
 
-        # Clean up disconnected connections
-        self.connections -= disconnected
+    async def broadcast_event(
+        self, event: str, payload: Any = None, opts: dict[str, Any] | None = None
+    ) -> None:
+        """Broadcast event to all connected clients"""
+        self.broadcast(event, payload, opts)
+
+    def get_broadcast_metrics(self) -> dict[str, Any]:
+        """Broadcast queue depth and drop metrics"""
+        outboxes = [connection.outbox for connection in self.connections]
+        return {
+            "connections": len(outboxes),
+            "frames": self._broadcast_frames,
+            "queueDepth": sum(outbox.depth for outbox in outboxes),
+            "maxQueueDepth": max((outbox.depth for outbox in outboxes), default=0),
+            "queuedBytes": sum(outbox.queued_bytes for outbox in outboxes),
+            "sent": self.outbox_totals.sent,
+            "dropped": self.outbox_totals.dropped,
+            "slowConnections": sum(1 for outbox in outboxes if outbox.slow),
+        }
     
     def get_memory_manager(self):
         """Get or create memory manager (lazy initialization)"""
         if self._memory_manager is None:
             try:
+                from openclaw.memory.ann_index import IVFOptions
                 from openclaw.memory.builtin_manager import BuiltinMemoryManager
                 
                 # Determine workspace directory
@@ -540,10 +667,19 @@ class GatewayServer:
                 if self.config and hasattr(self.config, 'agent') and hasattr(self.config.agent, 'id'):
                     agent_id = self.config.agent.id
                 
+                # Vector index from the memory config (exact search by default)
+                index_options: dict[str, Any] = {}
+                memory_config = getattr(self.config, "memory", None)
+                if memory_config:
+                    index_options["index_type"] = memory_config.index_type
+                    if memory_config.ivf:
+                        index_options["ivf_options"] = IVFOptions(**memory_config.ivf.model_dump())
+                
                 self._memory_manager = BuiltinMemoryManager(
                     agent_id=agent_id,
                     workspace_dir=workspace_dir,
-                    embedding_provider="openai"
+                    embedding_provider="openai",
+                    **index_options,
                 )
                 logger.info(f"Memory manager initialized for agent '{agent_id}' at {workspace_dir}")
             except Exception as e:
@@ -656,6 +792,7 @@ class GatewayServer:
         # Close all WebSocket connections
         for connection in list(self.connections):
             try:
+                await connection.outbox.close()
                 await connection.websocket.close()
             except Exception as e:
                 logger.error(f"Error closing connection: {e}")
@@ -18,8 +18,7 @@ from openclaw.config.sessions.paths import (
     resolve_session_store_path,
 )
 from openclaw.config.sessions.transcripts import (
-    read_first_user_message,
-    read_last_message_preview,
+    get_transcript_summary,
     read_transcript_preview,
 )
 from openclaw.routing.session_key import (
@@ -379,6 +378,53 @@ class SessionsListOptions:
     offset: int = 0
 
 
+def _entry_matches_list_filters(
+    key: str,
+    entry: SessionEntry,
+    opts: SessionsListOptions,
+    cutoff_ms: int | None,
+) -> bool:
+    """Check a store entry against sessions.list filters"""
+    # Agent ID filter
+    if opts.agent_id:
+        parsed = parse_agent_session_key(key)
+        if not parsed or parsed.agent_id != opts.agent_id:
+            return False
+    
+    # Spawned by filter
+    if opts.spawned_by and entry.spawned_by != opts.spawned_by:
+        return False
+    
+    # Label filter
+    if opts.label and entry.label != opts.label:
+        return False
+    
+    # Search filter (case-insensitive)
+    if opts.search:
+        search_lower = opts.search.lower()
+        searchable = " ".join([
+            entry.session_id,
+            entry.label or "",
+            entry.display_name or "",
+            entry.subject or "",
+            key,
+        ]).lower()
+        if search_lower not in searchable:
+            return False
+    
+    # Include global/unknown
+    if key == "global" and not opts.include_global:
+        return False
+    if key == "unknown" and not opts.include_unknown:
+        return False
+    
+    # Active minutes filter
+    if cutoff_ms is not None and entry.updated_at < cutoff_ms:
+        return False
+    
+    return True
+
+
 def list_sessions_from_store(
     store_path: str,
     store: Dict[str, SessionEntry],
@@ -398,54 +444,47 @@ def list_sessions_from_store(
     if opts is None:
         opts = SessionsListOptions()
     
+    cutoff_ms = None
+    if opts.active_minutes:
+        cutoff_ms = int(time.time() * 1000) - (opts.active_minutes * 60 * 1000)
+    
+    # Stores loaded via load_session_store carry prebuilt secondary indexes:
+    # candidates come back newest-first, so no sort is needed and paging can
+    # stop as soon as the requested window is filled.
+    index = getattr(store, "index", None)
+    if index is not None:
+        candidate_keys = index.candidates(
+            agent_id=opts.agent_id,
+            spawned_by=opts.spawned_by,
+            label=opts.label,
+        )
+        presorted = True
+    else:
+        candidate_keys = list(store.keys())
+        presorted = False
+    
+    window_end = opts.offset + opts.limit if (presorted and opts.limit) else None
+    
     # Filter sessions
     filtered_sessions: List[tuple[str, SessionEntry]] = []
     
-    for key, entry in store.items():
-        # Agent ID filter
-        if opts.agent_id:
-            parsed = parse_agent_session_key(key)
-            if not parsed or parsed.agent_id != opts.agent_id:
-                continue
+    for key in candidate_keys:
+        entry = store[key]
         
-        # Spawned by filter
-        if opts.spawned_by and entry.spawned_by != opts.spawned_by:
-            continue
-        
-        # Label filter
-        if opts.label and entry.label != opts.label:
-            continue
-        
-        # Search filter (case-insensitive)
-        if opts.search:
-            search_lower = opts.search.lower()
-            searchable = " ".join([
-                entry.session_id,
-                entry.label or "",
-                entry.display_name or "",
-                entry.subject or "",
-                key,
-            ]).lower()
-            if search_lower not in searchable:
-                continue
+        if presorted and cutoff_ms is not None and entry.updated_at < cutoff_ms:
+            # Everything after this is older still
+            break
         
-        # Include global/unknown
-        if key == "global" and not opts.include_global:
+        if not _entry_matches_list_filters(key, entry, opts, cutoff_ms):
             continue
-        if key == "unknown" and not opts.include_unknown:
-            continue
-        
-        # Active minutes filter
-        if opts.active_minutes:
-            now_ms = int(time.time() * 1000)
-            cutoff_ms = now_ms - (opts.active_minutes * 60 * 1000)
-            if entry.updated_at < cutoff_ms:
-                continue
         
         filtered_sessions.append((key, entry))
+        if window_end is not None and len(filtered_sessions) >= window_end:
+            break
     
     # Sort by updated_at (newest first)
-    filtered_sessions.sort(key=lambda x: x[1].updated_at, reverse=True)
+    if not presorted:
+        filtered_sessions.sort(key=lambda x: x[1].updated_at, reverse=True)
     
     # Apply offset and limit
     if opts.offset > 0:
@@ -458,27 +497,24 @@ def list_sessions_from_store(
     for key, entry in filtered_sessions:
         kind = classify_session_key(key, entry)
         
+        # Derived title and preview come from the transcript summary, which is
+        # cached in memory and only re-read when the transcript changes
+        summary = None
+        if (opts.add_derived_titles or opts.add_last_message_preview) and (
+            entry.session_file or entry.session_id
+        ):
+            summary = get_transcript_summary(entry.session_id, store_path, entry.session_file)
+        
         # Optionally add derived title
         derived_title = None
         if opts.add_derived_titles:
-            first_message = None
-            if entry.session_file or entry.session_id:
-                first_message = read_first_user_message(
-                    entry.session_id,
-                    store_path,
-                    entry.session_file
-                )
+            first_message = summary.first_user_message if summary else None
             derived_title = derive_session_title(entry, first_message)
         
         # Optionally add last message preview
         last_message_preview = None
-        if opts.add_last_message_preview:
-            if entry.session_file or entry.session_id:
-                last_message_preview = read_last_message_preview(
-                    entry.session_id,
-                    store_path,
-                    entry.session_file
-                )
+        if opts.add_last_message_preview and summary:
+            last_message_preview = summary.last_message_preview
         
         row = GatewaySessionRow(
             key=key,
@@ -249,8 +249,11 @@ def _resolve_by_label(params: SessionResolveParams) -> SessionResolveResult:
         try:
             store = load_session_store(str(store_path))
             
-            # Search for matching label
-            for key, entry in store.items():
+            # Search for matching label (indexed when loaded from the store cache)
+            index = getattr(store, "index", None)
+            label_keys = index.by_label.get(label, []) if index is not None else store.keys()
+            for key in label_keys:
+                entry = store[key]
                 if entry.label == label:
                     # Apply filters
                     if _entry_matches_filters(key, entry, params):
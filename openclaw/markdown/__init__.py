@@ -1,14 +1,17 @@
 """Markdown parsing and rendering"""
 
-from .parser import parse_markdown, MarkdownDocument
+from .parser import parse_heading, parse_markdown, MarkdownDocument
 from .renderer import render_markdown, render_to_terminal
-from .code_fence import extract_code_blocks, CodeBlock
+from .code_fence import extract_code_blocks, fence_closes, match_fence, CodeBlock
 
 __all__ = [
+    "parse_heading",
     "parse_markdown",
     "MarkdownDocument",
     "render_markdown",
     "render_to_terminal",
     "extract_code_blocks",
+    "fence_closes",
+    "match_fence",
     "CodeBlock",
 ]
@@ -4,6 +4,9 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 
+# Opening/closing fence line: up to 3 spaces, then 3+ backticks or tildes
+FENCE_PATTERN = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+
 
 @dataclass
 class CodeBlock:
@@ -16,6 +19,36 @@ class CodeBlock:
     metadata: dict[str, str] | None = None
 
 
+def match_fence(line: str) -> str | None:
+    """
+    Return the fence marker if the line opens or closes a code fence
+    
+    Args:
+        line: Single markdown line
+        
+    Returns:
+        Fence marker (e.g. "```" or "~~~~"), or None
+    """
+    match = FENCE_PATTERN.match(line)
+    return match.group(1) if match else None
+
+
+def fence_closes(opening: str, line: str) -> bool:
+    """
+    Check whether a line closes the fence opened with ``opening``
+    
+    A closing fence uses the same character, is at least as long as the
+    opening fence and carries no info string.
+    """
+    marker = match_fence(line)
+    return (
+        marker is not None
+        and marker[0] == opening[0]
+        and len(marker) >= len(opening)
+        and not line.strip()[len(marker):].strip()
+    )
+
+
 def extract_code_blocks(text: str) -> list[CodeBlock]:
     """
     Extract code blocks from markdown
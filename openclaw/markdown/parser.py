@@ -1,9 +1,13 @@
 """Markdown parser"""
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass, field
 from typing import Any
 
+# ATX heading line ("## Title", optional closing hashes)
+HEADING_PATTERN = re.compile(r"^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$")
+
 
 @dataclass
 class MarkdownDocument:
@@ -17,6 +21,22 @@ class MarkdownDocument:
     code_blocks: list[dict[str, Any]] = field(default_factory=list)
 
 
+def parse_heading(line: str) -> tuple[int, str] | None:
+    """
+    Parse an ATX heading line
+    
+    Args:
+        line: Single markdown line
+        
+    Returns:
+        (level, title) or None if the line is not a heading
+    """
+    match = HEADING_PATTERN.match(line.rstrip("\r\n"))
+    if not match:
+        return None
+    return len(match.group(1)), (match.group(2) or "").strip()
+
+
 def parse_markdown(text: str, extensions: list[str] | None = None) -> MarkdownDocument:
     """
     Parse markdown text
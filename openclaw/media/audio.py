@@ -5,16 +5,30 @@ This module provides audio processing capabilities including:
 - Audio trimming and splitting
 - Volume adjustment
 - Audio analysis
+
+ffmpeg runs through the shared async FFmpegRunner, so processing never
+blocks the event loop and concurrent jobs are limited.
 """
 from __future__ import annotations
 
 import logging
-import subprocess
 from pathlib import Path
 from typing import Any
 
+from .ffmpeg_runner import FFmpegError, FFmpegRunner, get_ffmpeg_runner
+
 logger = logging.getLogger(__name__)
 
+# Container (ffmpeg -f) used when writing each format to a pipe
+PIPE_CONTAINERS = {
+    "mp3": "mp3",
+    "aac": "adts",
+    "opus": "ogg",
+    "ogg": "ogg",
+    "flac": "flac",
+    "wav": "wav",
+}
+
 
 class AudioProcessingError(Exception):
     """Audio processing error"""
@@ -24,33 +38,53 @@ class AudioProcessingError(Exception):
 class AudioProcessor:
     """Audio processing operations using ffmpeg"""
     
-    def __init__(self, ffmpeg_path: str = "ffmpeg"):
+    def __init__(self, ffmpeg_path: str = "ffmpeg", runner: FFmpegRunner | None = None):
         """
         Initialize audio processor
         
         Args:
             ffmpeg_path: Path to ffmpeg executable
+            runner: ffmpeg runner (default: the shared one for ffmpeg_path)
         """
         self.ffmpeg_path = ffmpeg_path
+        self.runner = runner or get_ffmpeg_runner(ffmpeg_path)
     
-    def check_ffmpeg(self) -> bool:
+    async def check_ffmpeg(self) -> bool:
         """
-        Check if ffmpeg is available
+        Check if ffmpeg is available (probed once per binary)
         
         Returns:
             True if ffmpeg is available
         """
+        return await self.runner.available()
+    
+    async def _codec_args(self, output_format: str) -> list[str]:
+        """Encoder arguments for a format, based on the probed encoders"""
+        capabilities = await self.runner.probe()
+        if output_format == "mp3":
+            return ["-codec:a", "libmp3lame"]
+        elif output_format == "aac":
+            return ["-codec:a", "aac"]
+        elif output_format in ("opus", "ogg"):
+            if capabilities.has_encoder("libopus") or not capabilities.has_encoder("opus"):
+                return ["-codec:a", "libopus"]
+            # Native encoder is still flagged experimental
+            return ["-codec:a", "opus", "-strict", "-2"]
+        elif output_format == "flac":
+            return ["-codec:a", "flac"]
+        elif output_format == "wav":
+            return ["-codec:a", "pcm_s16le"]
+        return []
+    
+    async def _run(self, cmd: list[str], action: str, input_data: bytes | None = None, timeout: float = 300) -> bytes:
+        if not await self.check_ffmpeg():
+            raise AudioProcessingError("ffmpeg not available")
         try:
-            result = subprocess.run(
-                [self.ffmpeg_path, "-version"],
-                capture_output=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
+            return await self.runner.run(cmd, input_data=input_data, timeout=timeout)
+        except FFmpegError as e:
+            raise AudioProcessingError(f"{action} failed: {e}") from e
     
-    def convert_audio(
+    async def convert_audio(
         self,
         input_path: Path | str,
         output_path: Path | str,
@@ -74,9 +108,6 @@ class AudioProcessor:
         Raises:
             AudioProcessingError: If conversion fails
         """
-        if not self.check_ffmpeg():
-            raise AudioProcessingError("ffmpeg not available")
-        
         input_path = Path(input_path)
         output_path = Path(output_path)
         
@@ -85,50 +116,65 @@ class AudioProcessor:
             output_format = output_path.suffix.lstrip(".")
         
         # Build ffmpeg command
-        cmd = [
-            self.ffmpeg_path,
-            "-i", str(input_path),
-            "-b:a", bitrate,
-        ]
+        cmd = ["-i", str(input_path), "-b:a", bitrate]
         
         if sample_rate:
             cmd.extend(["-ar", str(sample_rate)])
         
         # Format-specific options
-        if output_format == "mp3":
-            cmd.extend(["-codec:a", "libmp3lame"])
-        elif output_format == "aac":
-            cmd.extend(["-codec:a", "aac"])
-        elif output_format == "opus":
-            cmd.extend(["-codec:a", "libopus"])
-        elif output_format == "flac":
-            cmd.extend(["-codec:a", "flac"])
-        elif output_format == "wav":
-            cmd.extend(["-codec:a", "pcm_s16le"])
-        
+        cmd.extend(await self._codec_args(output_format))
         cmd.extend(["-y", str(output_path)])
         
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                timeout=300
-            )
-            
-            if result.returncode != 0:
-                raise AudioProcessingError(
-                    f"ffmpeg error: {result.stderr.decode('utf-8', errors='ignore')}"
-                )
+        await self._run(cmd, "Conversion")
+        logger.info(f"Converted audio: {input_path} -> {output_path}")
+        return True
+    
+    async def convert_audio_bytes(
+        self,
+        data: bytes,
+        output_format: str,
+        bitrate: str = "128k",
+        sample_rate: int | None = None,
+        channels: int | None = None,
+        input_format: str | None = None,
+    ) -> bytes:
+        """
+        Convert in-memory audio (e.g. a voice note), streaming through pipes
+        
+        Args:
+            data: Input audio bytes
+            output_format: Output format (mp3, aac, opus, ogg, flac, wav)
+            bitrate: Audio bitrate
+            sample_rate: Sample rate in Hz
+            channels: Number of output channels
+            input_format: ffmpeg input format, if it can't be detected
             
-            logger.info(f"Converted audio: {input_path} -> {output_path}")
-            return True
+        Returns:
+            Converted audio bytes
             
-        except subprocess.TimeoutExpired:
-            raise AudioProcessingError("Audio conversion timeout")
-        except Exception as e:
-            raise AudioProcessingError(f"Conversion failed: {e}")
+        Raises:
+            AudioProcessingError: If conversion fails
+        """
+        container = PIPE_CONTAINERS.get(output_format)
+        if container is None:
+            raise AudioProcessingError(f"Cannot stream {output_format} output; use convert_audio")
+        
+        cmd = []
+        if input_format:
+            cmd.extend(["-f", input_format])
+        cmd.extend(["-i", "pipe:0", "-vn", "-b:a", bitrate])
+        if sample_rate:
+            cmd.extend(["-ar", str(sample_rate)])
+        if channels:
+            cmd.extend(["-ac", str(channels)])
+        cmd.extend(await self._codec_args(output_format))
+        cmd.extend(["-f", container, "pipe:1"])
+        
+        output = await self._run(cmd, "Conversion", input_data=data)
+        logger.debug(f"Converted {len(data)} bytes of audio to {len(output)} bytes of {output_format}")
+        return output
     
-    def trim_audio(
+    async def trim_audio(
         self,
         input_path: Path | str,
         output_path: Path | str,
@@ -152,9 +198,6 @@ class AudioProcessor:
         Raises:
             AudioProcessingError: If trimming fails
         """
-        if not self.check_ffmpeg():
-            raise AudioProcessingError("ffmpeg not available")
-        
         if duration is None and end_time is None:
             raise AudioProcessingError("Either duration or end_time must be specified")
         
@@ -165,7 +208,6 @@ class AudioProcessor:
         output_path = Path(output_path)
         
         cmd = [
-            self.ffmpeg_path,
             "-i", str(input_path),
             "-ss", str(start_time),
         ]
@@ -177,25 +219,11 @@ class AudioProcessor:
         
         cmd.extend(["-codec", "copy", "-y", str(output_path)])
         
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                timeout=300
-            )
-            
-            if result.returncode != 0:
-                raise AudioProcessingError(
-                    f"ffmpeg error: {result.stderr.decode('utf-8', errors='ignore')}"
-                )
-            
-            logger.info(f"Trimmed audio: {input_path} -> {output_path}")
-            return True
-            
-        except Exception as e:
-            raise AudioProcessingError(f"Trimming failed: {e}")
+        await self._run(cmd, "Trimming")
+        logger.info(f"Trimmed audio: {input_path} -> {output_path}")
+        return True
     
-    def adjust_volume(
+    async def adjust_volume(
         self,
         input_path: Path | str,
         output_path: Path | str,
@@ -215,38 +243,20 @@ class AudioProcessor:
         Raises:
             AudioProcessingError: If adjustment fails
         """
-        if not self.check_ffmpeg():
-            raise AudioProcessingError("ffmpeg not available")
-        
         input_path = Path(input_path)
         output_path = Path(output_path)
         
         cmd = [
-            self.ffmpeg_path,
             "-i", str(input_path),
             "-filter:a", f"volume={volume_db}dB",
             "-y", str(output_path)
         ]
         
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                timeout=300
-            )
-            
-            if result.returncode != 0:
-                raise AudioProcessingError(
-                    f"ffmpeg error: {result.stderr.decode('utf-8', errors='ignore')}"
-                )
-            
-            logger.info(f"Adjusted volume: {input_path} -> {output_path} ({volume_db}dB)")
-            return True
-            
-        except Exception as e:
-            raise AudioProcessingError(f"Volume adjustment failed: {e}")
+        await self._run(cmd, "Volume adjustment")
+        logger.info(f"Adjusted volume: {input_path} -> {output_path} ({volume_db}dB)")
+        return True
     
-    def extract_audio_from_video(
+    async def extract_audio_from_video(
         self,
         input_path: Path | str,
         output_path: Path | str,
@@ -268,39 +278,21 @@ class AudioProcessor:
         Raises:
             AudioProcessingError: If extraction fails
         """
-        if not self.check_ffmpeg():
-            raise AudioProcessingError("ffmpeg not available")
-        
         input_path = Path(input_path)
         output_path = Path(output_path)
         
         cmd = [
-            self.ffmpeg_path,
             "-i", str(input_path),
             "-vn",  # No video
             "-b:a", bitrate,
             "-y", str(output_path)
         ]
         
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                timeout=600
-            )
-            
-            if result.returncode != 0:
-                raise AudioProcessingError(
-                    f"ffmpeg error: {result.stderr.decode('utf-8', errors='ignore')}"
-                )
-            
-            logger.info(f"Extracted audio: {input_path} -> {output_path}")
-            return True
-            
-        except Exception as e:
-            raise AudioProcessingError(f"Audio extraction failed: {e}")
+        await self._run(cmd, "Audio extraction", timeout=600)
+        logger.info(f"Extracted audio: {input_path} -> {output_path}")
+        return True
     
-    def concatenate_audio(
+    async def concatenate_audio(
         self,
         input_paths: list[Path | str],
         output_path: Path | str,
@@ -318,52 +310,28 @@ class AudioProcessor:
         Raises:
             AudioProcessingError: If concatenation fails
         """
-        if not self.check_ffmpeg():
-            raise AudioProcessingError("ffmpeg not available")
-        
         if len(input_paths) < 2:
             raise AudioProcessingError("At least 2 input files required")
         
         output_path = Path(output_path)
         
-        # Create concat file list
-        concat_file = output_path.parent / "concat_list.txt"
-        with open(concat_file, "w") as f:
-            for input_path in input_paths:
-                f.write(f"file '{Path(input_path).absolute()}'\n")
+        # Concat list goes over stdin, so concurrent jobs can't clobber it
+        concat_list = "".join(
+            f"file '{Path(input_path).absolute()}'\n" for input_path in input_paths
+        )
         
         cmd = [
-            self.ffmpeg_path,
             "-f", "concat",
             "-safe", "0",
-            "-i", str(concat_file),
+            "-protocol_whitelist", "file,pipe",
+            "-i", "pipe:0",
             "-c", "copy",
             "-y", str(output_path)
         ]
         
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                timeout=600
-            )
-            
-            # Clean up concat file
-            concat_file.unlink()
-            
-            if result.returncode != 0:
-                raise AudioProcessingError(
-                    f"ffmpeg error: {result.stderr.decode('utf-8', errors='ignore')}"
-                )
-            
-            logger.info(f"Concatenated {len(input_paths)} audio files -> {output_path}")
-            return True
-            
-        except Exception as e:
-            # Clean up on error
-            if concat_file.exists():
-                concat_file.unlink()
-            raise AudioProcessingError(f"Concatenation failed: {e}")
+        await self._run(cmd, "Concatenation", input_data=concat_list.encode(), timeout=600)
+        logger.info(f"Concatenated {len(input_paths)} audio files -> {output_path}")
+        return True
 
 
 # Convenience functions
@@ -378,11 +346,11 @@ def get_audio_processor() -> AudioProcessor:
     return _default_processor
 
 
-def convert_audio(input_path: Path | str, output_path: Path | str, **kwargs) -> bool:
+async def convert_audio(input_path: Path | str, output_path: Path | str, **kwargs) -> bool:
     """Convert audio file"""
-    return get_audio_processor().convert_audio(input_path, output_path, **kwargs)
+    return await get_audio_processor().convert_audio(input_path, output_path, **kwargs)
 
 
-def trim_audio(input_path: Path | str, output_path: Path | str, **kwargs) -> bool:
+async def trim_audio(input_path: Path | str, output_path: Path | str, **kwargs) -> bool:
     """Trim audio file"""
-    return get_audio_processor().trim_audio(input_path, output_path, **kwargs)
+    return await get_audio_processor().trim_audio(input_path, output_path, **kwargs)
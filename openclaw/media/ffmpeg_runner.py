@@ -0,0 +1,207 @@
+"""
+Async ffmpeg job runner
+
+Runs ffmpeg as an asyncio subprocess so transcodes never block the event
+loop, with:
+- A concurrency limit per ffmpeg binary (default: number of CPU cores),
+  so a burst of voice notes queues instead of oversubscribing the CPU
+- Input and output over pipes (``pipe:0`` / ``pipe:1``) where the
+  container format allows it, instead of temp files
+- A one-time probe of the binary's version and encoders, shared by all
+  callers
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+# Default timeout for one ffmpeg job
+DEFAULT_TIMEOUT_SEC = 300.0
+
+# Timeout for each probe command
+_PROBE_TIMEOUT_SEC = 10.0
+
+# Bytes of ffmpeg stderr kept in error messages
+_STDERR_TAIL_BYTES = 2000
+
+
+class FFmpegError(RuntimeError):
+    """ffmpeg is unavailable, failed, or timed out"""
+
+
+@dataclass(frozen=True)
+class FFmpegCapabilities:
+    """Result of probing an ffmpeg binary"""
+
+    available: bool
+    version: str | None = None
+    encoders: frozenset[str] = field(default_factory=frozenset)
+
+    def has_encoder(self, name: str) -> bool:
+        return name in self.encoders
+
+
+def parse_encoders(output: str) -> frozenset[str]:
+    """Encoder names from ``ffmpeg -encoders`` output"""
+    names = set()
+    listing = False
+    for line in output.splitlines():
+        if line.strip().startswith("------"):
+            listing = True
+            continue
+        parts = line.split()
+        if listing and len(parts) >= 2:
+            names.add(parts[1])
+    return frozenset(names)
+
+
+class FFmpegRunner:
+    """
+    Concurrency-limited async ffmpeg runner
+
+    One runner per ffmpeg binary; use ``get_ffmpeg_runner()`` to share it.
+    """
+
+    def __init__(self, ffmpeg_path: str = "ffmpeg", max_concurrency: int | None = None):
+        """
+        Initialize runner
+
+        Args:
+            ffmpeg_path: Path to ffmpeg executable
+            max_concurrency: Jobs run at once (default: number of CPU cores)
+        """
+        self.ffmpeg_path = ffmpeg_path
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+        self._capabilities: FFmpegCapabilities | None = None
+        # Loop-bound primitives, recreated if the runner is used from another loop
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._probe_task: asyncio.Task | None = None
+
+    async def probe(self) -> FFmpegCapabilities:
+        """Version and encoders of the binary; probed once, then cached"""
+        if self._capabilities is not None:
+            return self._capabilities
+        self._bind_loop()
+        if self._probe_task is None:
+            self._probe_task = asyncio.ensure_future(self._probe())
+        self._capabilities = await asyncio.shield(self._probe_task)
+        return self._capabilities
+
+    async def available(self) -> bool:
+        """Whether the ffmpeg binary works"""
+        return (await self.probe()).available
+
+    async def run(
+        self,
+        args: list[str],
+        input_data: bytes | None = None,
+        timeout: float | None = DEFAULT_TIMEOUT_SEC,
+    ) -> bytes:
+        """
+        Run one ffmpeg job
+
+        Args:
+            args: ffmpeg arguments (without the binary); read input from
+                ``pipe:0`` and write output to ``pipe:1`` to use the pipes
+            input_data: Bytes fed to ffmpeg's stdin
+            timeout: Seconds before the job is killed
+
+        Returns:
+            ffmpeg's stdout (the output when writing to ``pipe:1``)
+
+        Raises:
+            FFmpegError: If ffmpeg is unavailable, fails, or times out
+        """
+        if not await self.available():
+            raise FFmpegError("ffmpeg not available")
+
+        cmd = [self.ffmpeg_path, "-hide_banner", "-loglevel", "error"]
+        if input_data is None:
+            cmd.append("-nostdin")
+        cmd.extend(args)
+
+        async with self._bind_loop():
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE if input_data is not None else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(input_data), timeout)
+            except TimeoutError:
+                raise FFmpegError(f"ffmpeg timed out after {timeout}s") from None
+            finally:
+                # Covers timeouts and cancellation of the awaiting task
+                if proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
+
+        if proc.returncode != 0:
+            detail = stderr[-_STDERR_TAIL_BYTES:].decode("utf-8", errors="ignore").strip()
+            raise FFmpegError(f"ffmpeg error: {detail or f'exit code {proc.returncode}'}")
+        return stdout
+
+    def _bind_loop(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._probe_task = None
+        return self._semaphore
+
+    async def _probe(self) -> FFmpegCapabilities:
+        async def output(*args: str) -> str | None:
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    self.ffmpeg_path,
+                    "-hide_banner",
+                    *args,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+            except OSError:
+                return None
+            try:
+                stdout, _ = await asyncio.wait_for(proc.communicate(), _PROBE_TIMEOUT_SEC)
+            except TimeoutError:
+                return None
+            finally:
+                if proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
+            return stdout.decode("utf-8", errors="ignore") if proc.returncode == 0 else None
+
+        version, encoders = await asyncio.gather(output("-version"), output("-encoders"))
+        if version is None:
+            logger.warning(f"ffmpeg not available at {self.ffmpeg_path}")
+            return FFmpegCapabilities(available=False)
+
+        first_line = version.splitlines()[0] if version else ""
+        capabilities = FFmpegCapabilities(
+            available=True,
+            version=first_line.split()[2] if len(first_line.split()) > 2 else None,
+            encoders=parse_encoders(encoders or ""),
+        )
+        logger.debug(
+            f"Probed ffmpeg {capabilities.version}: {len(capabilities.encoders)} encoders"
+        )
+        return capabilities
+
+
+# Shared runners, one per binary
+_runners: dict[str, FFmpegRunner] = {}
+
+
+def get_ffmpeg_runner(ffmpeg_path: str = "ffmpeg") -> FFmpegRunner:
+    """Get the shared runner for an ffmpeg binary"""
+    runner = _runners.get(ffmpeg_path)
+    if runner is None:
+        runner = _runners[ffmpeg_path] = FFmpegRunner(ffmpeg_path)
+    return runner
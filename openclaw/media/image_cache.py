@@ -0,0 +1,217 @@
+"""
+Cache of derived image variants
+
+The same image is often sent again: to several channels, or on every turn
+that re-reads it. Derived variants (resized JPEG, optimized PNG, converted
+HEIC, ...) are keyed by a hash of the source bytes plus the operation and
+its parameters, and kept in a byte-bounded in-memory LRU with an optional
+disk tier, so a variant is encoded once. Concurrent requests for the same
+variant share one computation.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# In-memory variants kept at most
+DEFAULT_MEMORY_CACHE_BYTES = 64 * 1024 * 1024
+
+# On-disk variants kept at most (oldest files are removed beyond this)
+DEFAULT_DISK_CACHE_BYTES = 512 * 1024 * 1024
+
+# Buffers larger than this are hashed off the event loop
+_HASH_INLINE_BYTES = 1024 * 1024
+
+
+class ImageVariantCache:
+    """
+    Content-addressed LRU (memory, optionally disk) of derived image bytes
+
+    Features:
+    - Keys from a content hash of the source and the variant parameters
+    - Memory tier bounded in bytes, least recently used evicted first
+    - Optional disk tier that survives restarts
+    - In-flight deduplication of identical computations
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MEMORY_CACHE_BYTES,
+        disk_dir: Path | str | None = None,
+        disk_max_bytes: int = DEFAULT_DISK_CACHE_BYTES,
+    ):
+        """
+        Initialize cache
+
+        Args:
+            max_bytes: Memory tier size
+            disk_dir: Directory for the disk tier (memory only if None)
+            disk_max_bytes: Disk tier size
+        """
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_bytes = disk_max_bytes
+
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._disk_size: int | None = None
+        # key -> [task, number of waiters]
+        self._inflight: dict[str, list] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def content_hash(buffer: bytes) -> str:
+        """Hash of the source bytes"""
+        return hashlib.blake2b(buffer, digest_size=20).hexdigest()
+
+    async def hash_buffer(self, buffer: bytes) -> str:
+        """``content_hash``, computed in a thread for large buffers"""
+        if len(buffer) <= _HASH_INLINE_BYTES:
+            return self.content_hash(buffer)
+        return await asyncio.to_thread(self.content_hash, buffer)
+
+    @staticmethod
+    def variant_key(content_hash: str, operation: str, *params: object) -> str:
+        """Key of one variant of a source (also its file name on disk)"""
+        parts = [content_hash, operation, *(str(p) for p in params)]
+        return re.sub(r"[^A-Za-z0-9._=-]", "_", "-".join(parts))
+
+    def get(self, key: str) -> bytes | None:
+        """Cached variant, or None"""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            return value
+        path = self._disk_path(key)
+        if path is None:
+            return None
+        try:
+            value = path.read_bytes()
+            # Touch on hit so disk eviction (oldest mtime first) is LRU
+            os.utime(path)
+        except OSError:
+            return None
+        self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: bytes) -> None:
+        """Store a variant in every tier"""
+        self._remember(key, value)
+        path = self._disk_path(key)
+        if path is None or path.exists():
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(value)
+            tmp.replace(path)
+        except OSError as e:
+            logger.warning(f"Failed to write image cache entry: {e}")
+            return
+        if self._disk_size is not None:
+            self._disk_size += len(value)
+        self._prune_disk()
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[bytes]]) -> bytes:
+        """
+        Cached variant, computing it once if missing
+
+        A caller that is cancelled stops waiting; the computation itself is
+        cancelled only when no other caller is waiting for it.
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        slot = self._inflight.get(key)
+        if slot is None:
+            self.misses += 1
+            task = asyncio.ensure_future(compute())
+            slot = self._inflight[key] = [task, 0]
+            task.add_done_callback(lambda t: self._finish(key, t))
+        task = slot[0]
+        slot[1] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            slot[1] -= 1
+            if slot[1] == 0 and not task.done():
+                task.cancel()
+
+    def clear(self) -> None:
+        """Drop the memory tier"""
+        self._entries.clear()
+        self._size = 0
+
+    def _finish(self, key: str, task: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self.put(key, task.result())
+
+    def _remember(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        self._entries[key] = value
+        self._size += len(value)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _disk_path(self, key: str) -> Path | None:
+        if self.disk_dir is None:
+            return None
+        return self.disk_dir / key[:2] / key
+
+    def _prune_disk(self) -> None:
+        """Remove the oldest files once the disk tier exceeds its size"""
+        if self._disk_size is None:
+            self._disk_size = sum(f.stat().st_size for f in self._disk_files())
+        if self._disk_size <= self.disk_max_bytes:
+            return
+
+        files = sorted(self._disk_files(), key=lambda f: f.stat().st_mtime)
+        target = self.disk_max_bytes * 9 // 10
+        size = sum(f.stat().st_size for f in files)
+        for f in files:
+            if size <= target:
+                break
+            try:
+                size -= f.stat().st_size
+                f.unlink()
+            except OSError:
+                continue
+        self._disk_size = size
+
+    def _disk_files(self) -> list[Path]:
+        return [f for f in self.disk_dir.glob("*/*") if f.is_file() and not f.name.endswith(".tmp")]
+
+
+# Global cache instance
+_cache: ImageVariantCache | None = None
+
+
+def get_image_variant_cache() -> ImageVariantCache:
+    """Get global image variant cache instance"""
+    global _cache
+    if _cache is None:
+        _cache = ImageVariantCache()
+    return _cache
+
+
+def set_image_variant_cache(cache: ImageVariantCache | None) -> None:
+    """Replace the global image variant cache (None restores the default)"""
+    global _cache
+    _cache = cache
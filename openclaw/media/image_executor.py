@@ -0,0 +1,146 @@
+"""
+Executor for CPU-bound image work
+
+Decoding, resizing and encoding a large photo takes hundreds of
+milliseconds of pure CPU. Run on the event loop, that stalls every
+websocket and channel in the gateway, so image operations are submitted
+here instead: to a process pool sized to the machine's cores, or to a
+thread pool where processes are unavailable (Pillow releases the GIL for
+most decode/resize/encode work, so threads still overlap).
+
+Cancelling the awaiting task drops a job that has not started yet; a job
+that is already running finishes in its worker and its result is discarded.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ImageExecutor:
+    """
+    Process pool (with thread-pool fallback) for image operations
+
+    Functions submitted must be module-level and their arguments picklable.
+    """
+
+    def __init__(self, max_workers: int | None = None, use_processes: bool = True):
+        """
+        Initialize executor
+
+        Args:
+            max_workers: Worker count (default: number of CPU cores)
+            use_processes: Use a process pool; threads otherwise
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_processes = use_processes
+        self._pool: Executor | None = None
+        self._kind: str | None = None
+
+    @property
+    def kind(self) -> str:
+        """Pool kind in use (or to be used): ``process`` or ``thread``"""
+        return self._kind or ("process" if self.use_processes else "thread")
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run ``fn(*args)`` in a worker
+
+        Raises:
+            RuntimeError: If a worker process died while running the job
+        """
+        pool = self._ensure_pool()
+        try:
+            future = pool.submit(fn, *args)
+        except BrokenProcessPool:
+            # Broken by a crash another job already reported
+            self._discard_pool(pool)
+            pool = self._ensure_pool()
+            future = pool.submit(fn, *args)
+        except (OSError, NotImplementedError) as e:
+            if self._kind != "process":
+                raise
+            # Processes can't be spawned here (no semaphores, seccomp, ...)
+            logger.warning(f"Process pool unavailable, using threads for image work: {e}")
+            self._discard_pool(pool)
+            self.use_processes = False
+            pool = self._ensure_pool()
+            future = pool.submit(fn, *args)
+
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool as e:
+            # A worker died (e.g. a decoder crashed on a hostile image);
+            # don't retry the job, but give later jobs a fresh pool
+            self._discard_pool(pool)
+            raise RuntimeError(f"Image worker process died: {e}") from e
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the pool; a later ``run`` starts a new one"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+            self._kind = None
+
+    def _ensure_pool(self) -> Executor:
+        if self._pool is None:
+            if self.use_processes:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=_worker_context()
+                )
+                self._kind = "process"
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="openclaw-image"
+                )
+                self._kind = "thread"
+        return self._pool
+
+    def _discard_pool(self, pool: Executor) -> None:
+        if self._pool is pool:
+            self._pool = None
+            self._kind = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _worker_context() -> multiprocessing.context.BaseContext:
+    """
+    Start method for worker processes
+
+    Never ``fork``: the gateway is multi-threaded by the time image work
+    starts, and a forked child can inherit a lock held by another thread
+    and deadlock.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+# Global executor instance
+_executor: ImageExecutor | None = None
+
+
+def get_image_executor() -> ImageExecutor:
+    """Get global image executor instance"""
+    global _executor
+    if _executor is None:
+        _executor = ImageExecutor()
+    return _executor
+
+
+def set_image_executor(executor: ImageExecutor | None) -> None:
+    """Replace the global image executor (None restores the default)"""
+    global _executor
+    if _executor is not None and _executor is not executor:
+        _executor.shutdown(wait=False)
+    _executor = executor
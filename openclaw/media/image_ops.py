@@ -6,13 +6,23 @@ Matches TypeScript src/media/image-ops.ts
 from __future__ import annotations
 
 import io
+import json
 import logging
 import subprocess
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
 
+from .image_cache import get_image_variant_cache
+from .image_executor import get_image_executor
+
 logger = logging.getLogger(__name__)
 
+# Sizes and JPEG qualities tried by optimize_image, in order
+FIT_SIDES = (2048, 1536, 1024, 768, 512)
+FIT_JPEG_QUALITIES = (85, 75, 65, 55)
+
+_sips_available: bool | None = None
+
 
 @dataclass
 class ImageMetadata:
@@ -62,16 +72,19 @@ class ImageProcessor:
     
     @staticmethod
     def has_sips() -> bool:
-        """Check if sips is available (macOS)."""
-        try:
-            result = subprocess.run(
-                ["sips", "--version"],
-                capture_output=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            return False
+        """Check if sips is available (macOS). Probed once per process."""
+        global _sips_available
+        if _sips_available is None:
+            try:
+                result = subprocess.run(
+                    ["sips", "--version"],
+                    capture_output=True,
+                    timeout=5
+                )
+                _sips_available = result.returncode == 0
+            except (FileNotFoundError, subprocess.TimeoutExpired):
+                _sips_available = False
+        return _sips_available
     
     @staticmethod
     async def convert_heic_to_jpeg(buffer: bytes) -> bytes:
@@ -90,23 +103,9 @@ class ImageProcessor:
         # Try Pillow first (if pillow-heif plugin available)
         if ImageProcessor.has_pillow():
             try:
-                from PIL import Image
-                from pillow_heif import register_heif_opener
-                
-                register_heif_opener()
-                
-                img = Image.open(io.BytesIO(buffer))
-                
-                # Convert to RGB if needed
-                if img.mode != "RGB":
-                    img = img.convert("RGB")
-                
-                # Save as JPEG
-                output = io.BytesIO()
-                img.save(output, format="JPEG", quality=90)
-                
-                logger.info(f"Converted HEIC to JPEG using Pillow ({len(buffer)} -> {len(output.getvalue())} bytes)")
-                return output.getvalue()
+                jpeg_buffer = await run_image_variant("heic-jpeg", buffer, _heic_to_jpeg_pillow)
+                logger.info(f"Converted HEIC to JPEG using Pillow ({len(buffer)} -> {len(jpeg_buffer)} bytes)")
+                return jpeg_buffer
             
             except ImportError:
                 logger.debug("pillow-heif not available")
@@ -116,30 +115,9 @@ class ImageProcessor:
         # Try sips (macOS)
         if ImageProcessor.has_sips():
             try:
-                import tempfile
-                
-                with tempfile.NamedTemporaryFile(suffix=".heic", delete=False) as tmp_in:
-                    tmp_in.write(buffer)
-                    tmp_in_path = Path(tmp_in.name)
-                
-                tmp_out_path = tmp_in_path.with_suffix(".jpg")
-                
-                result = subprocess.run(
-                    ["sips", "-s", "format", "jpeg", str(tmp_in_path), "--out", str(tmp_out_path)],
-                    capture_output=True,
-                    timeout=30
-                )
-                
-                if result.returncode == 0 and tmp_out_path.exists():
-                    jpeg_buffer = tmp_out_path.read_bytes()
-                    tmp_in_path.unlink(missing_ok=True)
-                    tmp_out_path.unlink(missing_ok=True)
-                    
-                    logger.info(f"Converted HEIC to JPEG using sips ({len(buffer)} -> {len(jpeg_buffer)} bytes)")
-                    return jpeg_buffer
-                
-                tmp_in_path.unlink(missing_ok=True)
-                tmp_out_path.unlink(missing_ok=True)
+                jpeg_buffer = await run_image_variant("heic-jpeg", buffer, _heic_to_jpeg_sips)
+                logger.info(f"Converted HEIC to JPEG using sips ({len(buffer)} -> {len(jpeg_buffer)} bytes)")
+                return jpeg_buffer
             
             except Exception as e:
                 logger.warning(f"sips HEIC conversion failed: {e}")
@@ -153,6 +131,9 @@ class ImageProcessor:
         """
         Get image metadata (width, height, format).
         
+        Only the image header is parsed, so this runs inline rather than
+        in the image executor.
+        
         Args:
             buffer: Image buffer
         
@@ -210,28 +191,7 @@ class ImageProcessor:
         if not ImageProcessor.has_pillow():
             raise RuntimeError("Pillow required for image resize")
         
-        from PIL import Image
-        
-        img = Image.open(io.BytesIO(buffer))
-        
-        # Convert to RGB if needed
-        if img.mode != "RGB":
-            img = img.convert("RGB")
-        
-        # Resize if needed
-        if img.width > max_side or img.height > max_side:
-            # Calculate new size maintaining aspect ratio
-            ratio = min(max_side / img.width, max_side / img.height)
-            new_size = (int(img.width * ratio), int(img.height * ratio))
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
-            
-            logger.debug(f"Resized image: {img.width}x{img.height} -> {new_size}")
-        
-        # Save as JPEG
-        output = io.BytesIO()
-        img.save(output, format="JPEG", quality=quality, optimize=True)
-        
-        return output.getvalue()
+        return await run_image_variant("jpeg", buffer, _resize_to_jpeg, max_side, quality)
     
     @staticmethod
     async def optimize_to_png(
@@ -253,26 +213,7 @@ class ImageProcessor:
         if not ImageProcessor.has_pillow():
             raise RuntimeError("Pillow required for PNG optimization")
         
-        from PIL import Image
-        
-        img = Image.open(io.BytesIO(buffer))
-        
-        # Resize if needed
-        if img.width > max_side or img.height > max_side:
-            ratio = min(max_side / img.width, max_side / img.height)
-            new_size = (int(img.width * ratio), int(img.height * ratio))
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
-        
-        # Save as PNG
-        output = io.BytesIO()
-        img.save(
-            output,
-            format="PNG",
-            compress_level=compression_level,
-            optimize=True
-        )
-        
-        return output.getvalue()
+        return await run_image_variant("png", buffer, _optimize_to_png, max_side, compression_level)
     
     @staticmethod
     async def optimize_image(
@@ -311,39 +252,142 @@ class ImageProcessor:
         has_alpha = await ImageProcessor.has_alpha_channel(buffer)
         use_png = preserve_alpha and has_alpha
         
-        # Try progressively smaller sizes
-        for max_side in [2048, 1536, 1024, 768, 512]:
-            if use_png:
-                optimized = await ImageProcessor.optimize_to_png(
-                    buffer, max_side=max_side, compression_level=9
-                )
+        # Decode once and try progressively smaller sizes in one worker job
+        packed = await run_image_variant("fit", buffer, _optimize_to_fit, max_bytes, use_png)
+        return _unpack_optimized(packed)
+
+
+async def run_image_variant(operation: str, buffer: bytes, fn, *params) -> bytes:
+    """
+    Run ``fn(buffer, *params)`` in the image executor, once per variant
+    
+    Results are cached by content hash of ``buffer``, operation and params.
+    """
+    cache = get_image_variant_cache()
+    key = cache.variant_key(await cache.hash_buffer(buffer), operation, *params)
+    return await cache.get_or_compute(
+        key, lambda: get_image_executor().run(fn, buffer, *params)
+    )
+
+
+# Worker functions: module-level so they can run in a process pool
+
+
+def _fit_side(img, max_side: int):
+    """Downscale so neither side exceeds max_side, keeping the aspect ratio"""
+    from PIL import Image
+    
+    if img.width > max_side or img.height > max_side:
+        ratio = min(max_side / img.width, max_side / img.height)
+        new_size = (int(img.width * ratio), int(img.height * ratio))
+        logger.debug(f"Resized image: {img.width}x{img.height} -> {new_size}")
+        img = img.resize(new_size, Image.Resampling.LANCZOS)
+    return img
+
+
+def _encode_jpeg(img, quality: int) -> bytes:
+    output = io.BytesIO()
+    img.save(output, format="JPEG", quality=quality, optimize=True)
+    return output.getvalue()
+
+
+def _encode_png(img, compression_level: int) -> bytes:
+    output = io.BytesIO()
+    img.save(output, format="PNG", compress_level=compression_level, optimize=True)
+    return output.getvalue()
+
+
+def _open_image(buffer: bytes, rgb: bool = False):
+    from PIL import Image
+    
+    img = Image.open(io.BytesIO(buffer))
+    # Convert to RGB if needed
+    if rgb and img.mode != "RGB":
+        img = img.convert("RGB")
+    return img
+
+
+def _resize_to_jpeg(buffer: bytes, max_side: int, quality: int) -> bytes:
+    return _encode_jpeg(_fit_side(_open_image(buffer, rgb=True), max_side), quality)
+
+
+def _optimize_to_png(buffer: bytes, max_side: int, compression_level: int) -> bytes:
+    return _encode_png(_fit_side(_open_image(buffer), max_side), compression_level)
+
+
+def _optimize_to_fit(buffer: bytes, max_bytes: int, use_png: bool) -> bytes:
+    """Smallest-effort variant under max_bytes, packed with its parameters"""
+    img = _open_image(buffer, rgb=not use_png)
+    img.load()
+    for max_side in FIT_SIDES:
+        scaled = _fit_side(img, max_side)
+        if use_png:
+            optimized = _encode_png(scaled, 9)
+            if len(optimized) <= max_bytes:
+                return _pack_optimized(OptimizedImage(
+                    buffer=optimized,
+                    optimized_size=len(optimized),
+                    resize_side=max_side,
+                    format="png",
+                    compression_level=9,
+                ))
+        else:
+            # Try multiple JPEG qualities
+            for quality in FIT_JPEG_QUALITIES:
+                optimized = _encode_jpeg(scaled, quality)
                 if len(optimized) <= max_bytes:
-                    return OptimizedImage(
+                    return _pack_optimized(OptimizedImage(
                         buffer=optimized,
                         optimized_size=len(optimized),
                         resize_side=max_side,
-                        format="png",
-                        compression_level=9,
-                    )
-            else:
-                # Try multiple JPEG qualities
-                for quality in [85, 75, 65, 55]:
-                    optimized = await ImageProcessor.resize_to_jpeg(
-                        buffer, max_side=max_side, quality=quality
-                    )
-                    if len(optimized) <= max_bytes:
-                        return OptimizedImage(
-                            buffer=optimized,
-                            optimized_size=len(optimized),
-                            resize_side=max_side,
-                            format="jpeg",
-                            quality=quality,
-                        )
-        
-        # Could not optimize below limit
-        raise ValueError(
-            f"Could not optimize image below {max_bytes} bytes"
+                        format="jpeg",
+                        quality=quality,
+                    ))
+    
+    # Could not optimize below limit
+    raise ValueError(
+        f"Could not optimize image below {max_bytes} bytes"
+    )
+
+
+def _heic_to_jpeg_pillow(buffer: bytes) -> bytes:
+    from pillow_heif import register_heif_opener
+    
+    register_heif_opener()
+    return _encode_jpeg(_open_image(buffer, rgb=True), 90)
+
+
+def _heic_to_jpeg_sips(buffer: bytes) -> bytes:
+    import tempfile
+    
+    with tempfile.NamedTemporaryFile(suffix=".heic", delete=False) as tmp_in:
+        tmp_in.write(buffer)
+        tmp_in_path = Path(tmp_in.name)
+    
+    tmp_out_path = tmp_in_path.with_suffix(".jpg")
+    try:
+        result = subprocess.run(
+            ["sips", "-s", "format", "jpeg", str(tmp_in_path), "--out", str(tmp_out_path)],
+            capture_output=True,
+            timeout=30
         )
+        if result.returncode != 0 or not tmp_out_path.exists():
+            raise RuntimeError(result.stderr.decode(errors="replace").strip() or "sips failed")
+        return tmp_out_path.read_bytes()
+    finally:
+        tmp_in_path.unlink(missing_ok=True)
+        tmp_out_path.unlink(missing_ok=True)
+
+
+def _pack_optimized(image: OptimizedImage) -> bytes:
+    """OptimizedImage as bytes (JSON header line + image), for the variant cache"""
+    header = {k: v for k, v in asdict(image).items() if k != "buffer"}
+    return json.dumps(header).encode() + b"\n" + image.buffer
+
+
+def _unpack_optimized(packed: bytes) -> OptimizedImage:
+    header, _, buffer = packed.partition(b"\n")
+    return OptimizedImage(buffer=buffer, **json.loads(header))
 
 
 # Convenience functions
@@ -10,6 +10,8 @@ import mimetypes
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+from .image_ops import run_image_variant
+
 logger = logging.getLogger(__name__)
 
 
@@ -118,54 +120,8 @@ async def optimize_image(data: bytes, max_bytes: int, mime_type: str) -> bytes:
         Optimized image data
     """
     try:
-        from PIL import Image
-        
-        img = Image.open(io.BytesIO(data))
-        original_format = img.format or "JPEG"
-        
-        # Convert HEIC to JPEG
-        if mime_type == "image/heic":
-            original_format = "JPEG"
-        
-        # Resize if too large
-        max_dimension = 2000
-        if max(img.size) > max_dimension:
-            ratio = max_dimension / max(img.size)
-            new_size = tuple(int(dim * ratio) for dim in img.size)
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
-            logger.info(f"Resized image to {new_size}")
-        
-        # Try progressive quality reduction
-        for quality in [85, 70, 60, 50, 40]:
-            output = io.BytesIO()
-            
-            # Save with quality
-            save_kwargs = {
-                "format": original_format,
-                "quality": quality,
-                "optimize": True,
-            }
-            
-            # Handle PNG with transparency
-            if original_format == "PNG" and img.mode in ("RGBA", "LA"):
-                save_kwargs["compress_level"] = 9
-                save_kwargs.pop("quality")
-            elif img.mode not in ("RGB", "L"):
-                # Convert to RGB for JPEG
-                if original_format == "JPEG":
-                    img = img.convert("RGB")
-            
-            img.save(output, **save_kwargs)
-            result = output.getvalue()
-            
-            logger.info(f"Compressed to {len(result)} bytes (quality={quality})")
-            
-            if len(result) <= max_bytes:
-                return result
-        
-        # If still too large, return best effort
-        logger.warning(f"Could not optimize image below {max_bytes} bytes")
-        return result
+        # Pillow work runs in the image executor; results are cached by content
+        return await run_image_variant("web-fit", data, _optimize_image_sync, max_bytes, mime_type)
     
     except ImportError:
         logger.error("PIL not available for image optimization")
@@ -175,6 +131,58 @@ async def optimize_image(data: bytes, max_bytes: int, mime_type: str) -> bytes:
         raise ValueError(f"Failed to optimize image: {e}")
 
 
+def _optimize_image_sync(data: bytes, max_bytes: int, mime_type: str) -> bytes:
+    """Body of optimize_image; runs in a worker"""
+    from PIL import Image
+    
+    img = Image.open(io.BytesIO(data))
+    original_format = img.format or "JPEG"
+    
+    # Convert HEIC to JPEG
+    if mime_type == "image/heic":
+        original_format = "JPEG"
+    
+    # Resize if too large
+    max_dimension = 2000
+    if max(img.size) > max_dimension:
+        ratio = max_dimension / max(img.size)
+        new_size = tuple(int(dim * ratio) for dim in img.size)
+        img = img.resize(new_size, Image.Resampling.LANCZOS)
+        logger.info(f"Resized image to {new_size}")
+    
+    # Try progressive quality reduction
+    for quality in [85, 70, 60, 50, 40]:
+        output = io.BytesIO()
+        
+        # Save with quality
+        save_kwargs = {
+            "format": original_format,
+            "quality": quality,
+            "optimize": True,
+        }
+        
+        # Handle PNG with transparency
+        if original_format == "PNG" and img.mode in ("RGBA", "LA"):
+            save_kwargs["compress_level"] = 9
+            save_kwargs.pop("quality")
+        elif img.mode not in ("RGB", "L"):
+            # Convert to RGB for JPEG
+            if original_format == "JPEG":
+                img = img.convert("RGB")
+        
+        img.save(output, **save_kwargs)
+        result = output.getvalue()
+        
+        logger.info(f"Compressed to {len(result)} bytes (quality={quality})")
+        
+        if len(result) <= max_bytes:
+            return result
+    
+    # If still too large, return best effort
+    logger.warning(f"Could not optimize image below {max_bytes} bytes")
+    return result
+
+
 def _is_safe_url(url: str) -> bool:
     """
     Basic SSRF protection
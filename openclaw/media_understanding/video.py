@@ -158,23 +158,26 @@ class VideoAnalyzer:
         Returns:
             Audio file path
         """
-        try:
-            import ffmpeg
-            import tempfile
-        except ImportError:
-            raise RuntimeError("ffmpeg-python not installed. Install with: pip install ffmpeg-python")
+        import tempfile
+        
+        from ..media.ffmpeg_runner import get_ffmpeg_runner
         
         # Create temp audio file
         with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
             audio_path = Path(f.name)
         
-        # Extract audio
-        (
-            ffmpeg
-            .input(str(video_path))
-            .output(str(audio_path), acodec="libmp3lame", ac=1, ar="16000")
-            .overwrite_output()
-            .run(quiet=True)
-        )
+        # Extract audio on the shared runner (async, concurrency-limited)
+        try:
+            await get_ffmpeg_runner().run([
+                "-i", str(video_path),
+                "-vn",
+                "-acodec", "libmp3lame",
+                "-ac", "1",
+                "-ar", "16000",
+                "-y", str(audio_path),
+            ])
+        except Exception:
+            audio_path.unlink(missing_ok=True)
+            raise
         
         return audio_path
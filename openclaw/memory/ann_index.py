@@ -0,0 +1,341 @@
+"""
+Inverted-file (IVF) approximate nearest-neighbour index for memory search
+
+Partitions the rows of a :class:`VectorIndex` into ``nlist`` clusters with
+spherical k-means. A query scores the centroids, then scores exactly only
+the rows in the ``nprobe`` closest clusters. Recall and latency are traded
+off with ``nprobe``.
+
+Rows appended after training are assigned to their nearest centroid when
+the next query needs them. Deleted rows are dropped by the vector index's
+live mask. When the number of inserts and deletes since training exceeds
+``drift_threshold`` of the trained size, the centroids are retrained on a
+background thread and queries keep using the old partition until the swap.
+Centroids and assignments are persisted to ``<agent>_index.ivf.npz``.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Iterable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from .vector_index import NUMPY_AVAILABLE, VectorIndex, select_top_k
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Assign rows to centroids in blocks to bound the temporary score matrix
+ASSIGN_BLOCK_ROWS = 8192
+
+# Training runs off the caller's thread; one at a time is plenty
+_training_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-ivf")
+
+
+@dataclass
+class IVFOptions:
+    """
+    IVF index tuning knobs
+
+    Attributes:
+        nlist: Number of clusters (default: sqrt of the corpus size)
+        nprobe: Clusters scanned per query; higher is slower but more exact
+        min_train_size: Below this many vectors, search stays exact
+        train_sample: Maximum rows sampled for k-means
+        train_iterations: k-means iterations
+        drift_threshold: Retrain after this fraction of rows changed
+    """
+    nlist: int | None = None
+    nprobe: int = 16
+    min_train_size: int = 10_000
+    train_sample: int = 100_000
+    train_iterations: int = 10
+    drift_threshold: float = 0.25
+
+    def resolve_nlist(self, size: int) -> int:
+        if self.nlist:
+            return max(1, min(self.nlist, size))
+        return max(1, min(int(size ** 0.5), 65_536))
+
+
+class IVFIndex:
+    """
+    IVF partition over a :class:`VectorIndex`
+
+    Searches fall back to exact search until the index has been trained.
+    """
+
+    def __init__(
+        self,
+        vectors: VectorIndex,
+        path: Path,
+        options: IVFOptions | None = None,
+    ):
+        """
+        Initialize IVF index
+
+        Args:
+            vectors: Underlying vector index (owns the matrix)
+            path: File used to persist centroids and assignments
+            options: Tuning knobs
+        """
+        self.vectors = vectors
+        self.path = path
+        self.options = options or IVFOptions()
+
+        self._lock = threading.RLock()
+        self._centroids: np.ndarray | None = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._assigned = 0
+        self._epoch = -1
+        self._lists: list[list[np.ndarray]] = []
+        self._trained_size = 0
+        self._trained_changes = 0
+        self._training: Future | None = None
+
+        self._load()
+
+    # ========================================================================
+    # State
+    # ========================================================================
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    @property
+    def nlist(self) -> int:
+        return 0 if self._centroids is None else len(self._centroids)
+
+    @property
+    def drift(self) -> float:
+        """Fraction of rows inserted or deleted since training"""
+        if not self.trained:
+            return 0.0
+        return (self.vectors.changes - self._trained_changes) / max(self._trained_size, 1)
+
+    def _load(self) -> None:
+        """Load persisted centroids and assignments, if compatible"""
+        if not self.path.exists():
+            return
+        try:
+            with np.load(self.path) as data:
+                centroids = data["centroids"].astype(np.float32)
+                assignments = data["assignments"].astype(np.int32)
+                epoch = int(data["epoch"])
+                trained_size = int(data["trained_size"])
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable IVF index {self.path}: {e}")
+            return
+
+        if self.vectors.dims is None or centroids.shape[1] != self.vectors.dims:
+            logger.info(f"IVF index {self.path} has stale dimensions, retraining later")
+            return
+
+        with self._lock:
+            self._centroids = centroids
+            self._trained_size = trained_size
+            self._trained_changes = self.vectors.changes
+            if epoch == self.vectors.epoch and len(assignments) <= self.vectors.size:
+                self._set_assignments(assignments)
+                self._epoch = epoch
+
+    def save(self) -> None:
+        """Persist centroids and assignments"""
+        with self._lock:
+            if self._centroids is None:
+                return
+            tmp = self.path.with_name(self.path.name + ".tmp.npz")
+            np.savez(
+                tmp,
+                centroids=self._centroids,
+                assignments=self._assignments[: self._assigned],
+                epoch=np.int64(self._epoch),
+                trained_size=np.int64(self._trained_size),
+            )
+            tmp.replace(self.path)
+
+    # ========================================================================
+    # Training
+    # ========================================================================
+
+    def maybe_rebuild(self, wait: bool = False) -> bool:
+        """
+        Schedule (re)training if the index is untrained or has drifted
+
+        Args:
+            wait: Block until training finishes
+
+        Returns:
+            True if training was scheduled
+        """
+        size = self.vectors.count
+        if size < self.options.min_train_size:
+            return False
+        if self.trained and self.drift < self.options.drift_threshold:
+            return False
+        if self._training is not None and not self._training.done():
+            if wait:
+                self._training.result()
+            return False
+
+        logger.info(f"Training IVF index over {size} vectors (drift {self.drift:.2f})")
+        self._training = _training_executor.submit(self._train_logged)
+        if wait:
+            self._training.result()
+        return True
+
+    def _train_logged(self) -> None:
+        try:
+            self.train()
+        except Exception as e:
+            logger.error(f"IVF training failed: {e}", exc_info=True)
+
+    def train(self) -> None:
+        """Run spherical k-means on a sample of live rows and swap in the result"""
+        options = self.options
+        with self.vectors.lock:
+            live = np.flatnonzero(self.vectors.live_mask())
+            changes = self.vectors.changes
+            if len(live) == 0:
+                return
+            rng = np.random.default_rng(len(live))
+            if len(live) > options.train_sample:
+                live = np.sort(rng.choice(live, options.train_sample, replace=False))
+            sample = np.array(self.vectors.matrix(live), dtype=np.float32)
+            size = self.vectors.count
+
+        nlist = options.resolve_nlist(size)
+        centroids = sample[rng.choice(len(sample), min(nlist, len(sample)), replace=False)].copy()
+        for _ in range(options.train_iterations):
+            labels = _nearest(sample, centroids)
+            order = np.argsort(labels, kind="stable")
+            present, starts = np.unique(labels[order], return_index=True)
+            sums = np.zeros_like(centroids)
+            sums[present] = np.add.reduceat(sample[order], starts, axis=0)
+            empty = np.ones(len(centroids), dtype=bool)
+            empty[present] = False
+            if empty.any():
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = (sums / norms).astype(np.float32)
+
+        with self.vectors.lock, self._lock:
+            self._centroids = centroids
+            self._trained_size = size
+            self._trained_changes = changes
+            self._epoch = -1
+            self._catch_up()
+            self.save()
+        logger.info(f"IVF index trained: {len(centroids)} lists over {size} vectors")
+
+    # ========================================================================
+    # Assignment
+    # ========================================================================
+
+    def _catch_up(self) -> None:
+        """Assign rows appended (or renumbered) since the last query"""
+        if self._epoch != self.vectors.epoch:
+            self._set_assignments(np.zeros(0, dtype=np.int32))
+            self._epoch = self.vectors.epoch
+        size = self.vectors.size
+        if self._assigned >= size:
+            return
+
+        start = self._assigned
+        labels = np.empty(size - start, dtype=np.int32)
+        for block in range(start, size, ASSIGN_BLOCK_ROWS):
+            end = min(block + ASSIGN_BLOCK_ROWS, size)
+            labels[block - start:end - start] = _nearest(
+                self.vectors.matrix(np.arange(block, end)), self._centroids
+            )
+        self._assignments = np.concatenate([self._assignments[:start], labels])
+        self._assigned = size
+        self._add_to_lists(np.arange(start, size), labels)
+
+    def _set_assignments(self, assignments: np.ndarray) -> None:
+        self._assignments = assignments
+        self._assigned = len(assignments)
+        self._lists = [[] for _ in range(self.nlist)]
+        self._add_to_lists(np.arange(len(assignments)), assignments)
+
+    def _add_to_lists(self, rows: np.ndarray, labels: np.ndarray) -> None:
+        if len(rows) == 0:
+            return
+        order = np.argsort(labels, kind="stable")
+        rows, labels = rows[order], labels[order]
+        bounds = np.flatnonzero(np.diff(labels)) + 1
+        for group in np.split(np.arange(len(rows)), bounds):
+            self._lists[labels[group[0]]].append(rows[group])
+
+    def _list_rows(self, list_id: int) -> np.ndarray:
+        parts = self._lists[list_id]
+        if len(parts) > 1:
+            parts[:] = [np.concatenate(parts)]
+        return parts[0] if parts else np.zeros(0, dtype=np.int64)
+
+    # ========================================================================
+    # Search
+    # ========================================================================
+
+    def search(
+        self,
+        query: Sequence[float],
+        limit: int,
+        sources: Iterable[str] | None = None,
+        nprobe: int | None = None,
+    ) -> list[tuple[str, float]]:
+        """
+        Approximate top-k search (exact until trained)
+
+        Args:
+            query: Query embedding
+            limit: Maximum number of hits
+            sources: Restrict to these source names
+            nprobe: Clusters to scan (defaults to ``options.nprobe``)
+
+        Returns:
+            (chunk_id, cosine similarity) pairs, best first
+        """
+        if not self.trained:
+            return self.vectors.search(query, limit, sources)
+
+        with self.vectors.lock, self._lock:
+            q = self.vectors.normalize_query(query)
+            if q is None or limit <= 0 or self._centroids.shape[1] != len(q):
+                return self.vectors.search(query, limit, sources) if q is not None else []
+            self._catch_up()
+
+            probe = min(nprobe or self.options.nprobe, self.nlist)
+            lists = select_top_k(self._centroids @ q, probe)
+            rows = np.concatenate([self._list_rows(int(i)) for i in lists])
+            rows = rows[self.vectors.live_mask(sources)[rows]]
+            if len(rows) < limit:
+                # A selective source filter can miss the probed lists entirely
+                return self.vectors.search(query, limit, sources)
+
+            rows = np.sort(rows)
+            scores = self.vectors.matrix(rows) @ q
+            top = select_top_k(scores, min(limit, len(rows)))
+            ids = self.vectors.chunk_ids(rows[top])
+            return list(zip(ids, (float(scores[i]) for i in top)))
+
+    def close(self) -> None:
+        """Wait for training to finish and persist assignments"""
+        if self._training is not None:
+            self._training.result()
+        self.save()
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the most similar centroid for each (normalized) row"""
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_BLOCK_ROWS):
+        block = vectors[start:start + ASSIGN_BLOCK_ROWS]
+        labels[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return labels
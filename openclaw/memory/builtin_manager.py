@@ -1,17 +1,114 @@
 """Built-in memory manager using SQLite + Vector + FTS."""
+import asyncio
+import contextlib
 import hashlib
+import io
 import logging
+import os
 import sqlite3
 import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List
 
 from .types import MemorySearchResult, MemorySource
 from .embeddings import EmbeddingProvider, OpenAIEmbeddingProvider
 from .hybrid import merge_hybrid_results, normalize_scores, SearchResult
+from .vector_index import NUMPY_AVAILABLE, VectorIndex
+from .ann_index import IVFIndex, IVFOptions
+from .embedding_pipeline import EmbeddingBackfill, EmbeddingStats
+from .chunker import DEFAULT_CHUNK_TOKENS, DEFAULT_OVERLAP_TOKENS, iter_chunks
+from .sqlite_pool import DEFAULT_READERS, SQLitePool
+from openclaw.agents.compaction.analyzer import TokenAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# File types picked up by sync()
+MEMORY_FILE_SUFFIXES = frozenset({".md", ".markdown", ".txt", ".json", ".jsonl"})
+
+# Chunk rows buffered per INSERT batch
+CHUNK_INSERT_BATCH = 500
+
+# Files read and re-indexed per transaction during sync()
+SYNC_COMMIT_EVERY = 500
+
+# Files larger than this are streamed through the chunker instead of loaded
+STREAM_THRESHOLD_BYTES = 1 << 20
+
+# Threads reading and hashing changed files during sync()
+SYNC_HASH_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+def resolve_memory_paths(workspace_dir: Path) -> list[Path]:
+    """Directories indexed by sync() and watched by SyncManager."""
+    return [
+        workspace_dir / ".openclaw" / "memory",
+        workspace_dir / ".openclaw" / "sessions",
+        workspace_dir / "docs",
+    ]
+
+
+def _scan_memory_files(roots: list[Path]) -> dict[str, os.stat_result]:
+    """Walk roots (skipping dot-entries) and stat every memory file."""
+    found: dict[str, os.stat_result] = {}
+    stack = [str(root) for root in roots]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif os.path.splitext(entry.name)[1] in MEMORY_FILE_SUFFIXES:
+                        found[entry.path] = entry.stat()
+                except OSError:
+                    continue
+    return found
+
+
+def _stat_matches(row: sqlite3.Row | None, st: os.stat_result) -> bool:
+    """Whether the indexed mtime/size still match the file."""
+    return (
+        row is not None
+        and row['mtime'] == st.st_mtime_ns // 1_000_000
+        and row['size'] == st.st_size
+    )
+
+
+def _read_and_hash(path: str) -> tuple[str | None, str] | None:
+    """
+    Hash a file, returning its content too unless it is large.
+    
+    Returns:
+        (content or None, sha256 of the text), or None if unreadable
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            if os.fstat(f.fileno()).st_size <= STREAM_THRESHOLD_BYTES:
+                content = f.read()
+                return content, hashlib.sha256(content.encode()).hexdigest()
+            digest = hashlib.sha256()
+            while block := f.read(1 << 20):
+                digest.update(block.encode())
+            return None, digest.hexdigest()
+    except (OSError, UnicodeDecodeError) as e:
+        logger.warning(f"Skipping unreadable memory file {path}: {e}")
+        return None
+
+
+def _source_for_path(path: str) -> MemorySource:
+    """Memory source for a synced file."""
+    if f".openclaw{os.sep}sessions" in path:
+        return MemorySource.SESSIONS
+    return MemorySource.MEMORY
+
 
 class BuiltinMemoryManager:
     """Manages agent memory with vector and full-text search."""
@@ -20,10 +117,34 @@ class BuiltinMemoryManager:
         self,
         agent_id: str,
         workspace_dir: Path,
-        embedding_provider: Optional[str | EmbeddingProvider] = None
+        embedding_provider: str | EmbeddingProvider | None = None,
+        index_type: str = "flat",
+        ivf_options: IVFOptions | None = None,
+        chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+        chunk_overlap: int = DEFAULT_OVERLAP_TOKENS,
+        db_readers: int = DEFAULT_READERS,
     ):
+        """
+        Initialize memory manager.
+        
+        Args:
+            agent_id: Agent identifier (names the index files)
+            workspace_dir: Agent workspace directory
+            embedding_provider: Provider name or instance
+            index_type: "flat" for exact vector search, "ivf" for approximate
+                search once the corpus reaches ``ivf_options.min_train_size``
+            ivf_options: IVF tuning knobs (only used with index_type="ivf")
+            chunk_tokens: Token budget per chunk
+            chunk_overlap: Tokens repeated across size-based chunk splits
+            db_readers: Reader connections used for concurrent searches
+        """
         self.agent_id = agent_id
         self.workspace_dir = workspace_dir
+        self.index_type = index_type
+        self.ivf_options = ivf_options
+        self.chunk_tokens = chunk_tokens
+        self.chunk_overlap = chunk_overlap
+        self.db_readers = db_readers
         
         # Initialize embedding provider
         if isinstance(embedding_provider, EmbeddingProvider):
@@ -32,20 +153,33 @@ class BuiltinMemoryManager:
             self.embedder = OpenAIEmbeddingProvider()
         else:
             self.embedder = OpenAIEmbeddingProvider()  # Default
+        self.token_analyzer = TokenAnalyzer(self.embedder.model)
         
         # Set up database path
         memory_dir = workspace_dir / ".openclaw" / "memory"
         memory_dir.mkdir(parents=True, exist_ok=True)
         
         self.db_path = memory_dir / f"{agent_id}_index.db"
+        self.vectors_path = memory_dir / f"{agent_id}_index.vectors"
+        self.ivf_path = memory_dir / f"{agent_id}_index.ivf.npz"
+        self.db_pool: SQLitePool | None = None
         self.db: Optional[sqlite3.Connection] = None
+        self.vector_index: VectorIndex | None = None
+        self.ann_index: IVFIndex | None = None
+        self.embedding_stats = EmbeddingStats()
         
         self._init_db()
+        self._init_vector_index()
     
     def _init_db(self) -> None:
-        """Initialize database with schema."""
-        self.db = sqlite3.connect(str(self.db_path))
-        self.db.row_factory = sqlite3.Row
+        """Initialize database with schema.
+        
+        ``self.db`` is the pool's writer connection. Once the manager is
+        running, writes go through ``db_pool.write`` and searches through
+        ``db_pool.read`` so SQLite never blocks the event loop.
+        """
+        self.db_pool = SQLitePool(self.db_path, readers=self.db_readers)
+        self.db = self.db_pool.writer
         
         # Create schema
         self.db.executescript("""
@@ -96,16 +230,50 @@ class BuiltinMemoryManager:
                 DELETE FROM chunks_fts WHERE rowid = old.rowid;
             END;
             
-            CREATE TRIGGER IF NOT EXISTS chunks_au AFTER UPDATE ON chunks BEGIN
+            -- Only re-index text changes (embedding writes must not touch FTS)
+            DROP TRIGGER IF EXISTS chunks_au;
+            CREATE TRIGGER chunks_au AFTER UPDATE OF path, text ON chunks BEGIN
                 DELETE FROM chunks_fts WHERE rowid = old.rowid;
                 INSERT INTO chunks_fts(rowid, id, path, text)
                 VALUES (new.rowid, new.id, new.path, new.text);
             END;
+            
+            -- Embedding cache keyed by content hash (survives re-index and renames)
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                model TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                dims INTEGER NOT NULL,
+                updated_at INTEGER NOT NULL,
+                PRIMARY KEY (model, hash)
+            );
+            
+            CREATE INDEX IF NOT EXISTS idx_chunks_hash ON chunks(hash);
         """)
         
         self.db.commit()
         logger.info(f"Initialized memory database at {self.db_path}")
     
+    def _init_vector_index(self) -> None:
+        """Open the memory-mapped vector index (requires numpy)."""
+        if not NUMPY_AVAILABLE:
+            log = logger.warning if self.index_type == "ivf" else logger.info
+            log(
+                "numpy not installed, vector search will scan embeddings in Python. "
+                "Install with: pip install 'openclaw-python[memory]'"
+            )
+            return
+        
+        try:
+            self.vector_index = VectorIndex(self.db, self.vectors_path)
+            if self.index_type == "ivf":
+                self.ann_index = IVFIndex(self.vector_index, self.ivf_path, self.ivf_options)
+                self.ann_index.maybe_rebuild()
+        except Exception as e:
+            logger.error(f"Failed to open vector index: {e}", exc_info=True)
+            self.vector_index = None
+            self.ann_index = None
+    
     async def search(
         self,
         query: str,
@@ -179,13 +347,12 @@ class BuiltinMemoryManager:
                 LIMIT ?
             """
             
-            cursor = self.db.execute(
-                sql,
-                [query] + source_values + [limit]
+            rows = await self.db_pool.read(
+                lambda conn: conn.execute(sql, [query] + source_values + [limit]).fetchall()
             )
             
             results = []
-            for row in cursor.fetchall():
+            for row in rows:
                 # Create snippet (first 200 chars)
                 snippet = row['text'][:200] + ('...' if len(row['text']) > 200 else '')
                 
@@ -223,11 +390,16 @@ class BuiltinMemoryManager:
         """
         if not self.db:
             return 0
-        
+        return await self.db_pool.write(self._add_file_sync, file_path, source)
+    
+    def _add_file_sync(self, file_path: Path, source: MemorySource) -> int:
+        """Index one file on the writer thread."""
         try:
-            # Read file content
-            content = file_path.read_text(encoding='utf-8')
-            file_hash = self._hash_content(content)
+            # Hash file content (large files are not loaded)
+            loaded = _read_and_hash(str(file_path))
+            if loaded is None:
+                return 0
+            content, file_hash = loaded
             
             # Check if file already indexed
             existing = self.db.execute(
@@ -239,120 +411,430 @@ class BuiltinMemoryManager:
                 logger.debug(f"File unchanged: {file_path}")
                 return 0
             
-            # Chunk the file
-            chunks = self._chunk_text(content, str(file_path))
-            
-            # Delete old chunks
-            self.db.execute('DELETE FROM chunks WHERE path = ?', [str(file_path)])
-            
-            # Insert chunks
-            import time
-            now = int(time.time())
-            
-            for chunk in chunks:
-                chunk_id = f"{file_path}:{chunk['start_line']}-{chunk['end_line']}"
-                
-                self.db.execute("""
-                    INSERT INTO chunks 
-                    (id, path, source, start_line, end_line, hash, model, text, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, [
-                    chunk_id,
-                    str(file_path),
-                    source.value,
-                    chunk['start_line'],
-                    chunk['end_line'],
-                    self._hash_content(chunk['text']),
-                    self.embedding_provider,
-                    chunk['text'],
-                    now
-                ])
-            
-            # Update files table
-            stat = file_path.stat()
-            self.db.execute("""
-                INSERT OR REPLACE INTO files 
-                (path, source, hash, mtime, size, indexed_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, [
-                str(file_path),
-                source.value,
-                file_hash,
-                int(stat.st_mtime),
-                stat.st_size,
-                now
-            ])
-            
+            count = self._index_content(
+                str(file_path), source, content, file_hash, file_path.stat()
+            )
             self.db.commit()
-            logger.info(f"Indexed {len(chunks)} chunks from {file_path}")
-            return len(chunks)
+            logger.info(f"Indexed {count} chunks from {file_path}")
+            return count
             
         except Exception as e:
             logger.error(f"Error adding file {file_path}: {e}", exc_info=True)
             return 0
     
-    def _chunk_text(
+    def _index_content(
         self,
-        content: str,
         path: str,
-        chunk_size: int = 500
-    ) -> list[dict]:
+        source: MemorySource,
+        content: str | None,
+        file_hash: str,
+        stat: os.stat_result,
+        indexed: bool = True,
+    ) -> int:
         """
-        Chunk text into smaller pieces.
+        Re-chunk a file and update its chunks and files row (caller commits).
+        
+        Chunk ids are derived from the chunk content, so sections that did
+        not change keep their row (and embedding); only their line range is
+        updated if they moved.
         
         Args:
-            content: File content
             path: File path
-            chunk_size: Target chunk size in lines
+            source: Memory source type
+            content: File text, or None to stream it from disk
+            file_hash: Content hash recorded in the files table
+            stat: File stat recorded in the files table
+            indexed: False if the file has no chunks yet (skips the lookup)
+        
+        Returns:
+            Number of chunks created
+        """
+        existing = {
+            row['id']: (row['start_line'], row['end_line'])
+            for row in self.db.execute(
+                'SELECT id, start_line, end_line FROM chunks WHERE path = ?', [path]
+            )
+        } if indexed else {}
+        
+        now = int(time.time())
+        model = self.embedder.model
+        occurrences: dict[str, int] = {}
+        kept: set[str] = set()
+        moved: list[tuple[int, int, str]] = []
+        inserts: list[tuple] = []
+        created = 0
+        
+        with contextlib.ExitStack() as stack:
+            lines = (
+                io.StringIO(content) if content is not None
+                else stack.enter_context(open(path, encoding='utf-8'))
+            )
+            for chunk in iter_chunks(
+                lines, self.chunk_tokens, self.chunk_overlap, self.token_analyzer
+            ):
+                seen = occurrences.get(chunk.hash, 0)
+                occurrences[chunk.hash] = seen + 1
+                chunk_id = f"{path}#{chunk.hash[:16]}" + (f"~{seen}" if seen else "")
+                
+                span = existing.get(chunk_id)
+                if span is not None:
+                    kept.add(chunk_id)
+                    if span != (chunk.start_line, chunk.end_line):
+                        moved.append((chunk.start_line, chunk.end_line, chunk_id))
+                    continue
+                
+                inserts.append((
+                    chunk_id, path, source.value, chunk.start_line, chunk.end_line,
+                    chunk.hash, model, chunk.text, now
+                ))
+                created += 1
+                if len(inserts) >= CHUNK_INSERT_BATCH:
+                    self._insert_chunks(inserts)
+                    inserts = []
+        self._insert_chunks(inserts)
+        
+        if moved:
+            self.db.executemany(
+                'UPDATE chunks SET start_line = ?, end_line = ? WHERE id = ?', moved
+            )
+        
+        # Drop chunks that no longer exist (and tombstone their vectors)
+        stale = [chunk_id for chunk_id in existing if chunk_id not in kept]
+        if stale:
+            if self.vector_index:
+                self.vector_index.remove(stale)
+            self.db.executemany('DELETE FROM chunks WHERE id = ?', [(i,) for i in stale])
+        
+        # Update files table
+        self.db.execute("""
+            INSERT OR REPLACE INTO files 
+            (path, source, hash, mtime, size, indexed_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            path,
+            source.value,
+            file_hash,
+            stat.st_mtime_ns // 1_000_000,
+            stat.st_size,
+            now
+        ])
+        
+        self._apply_cached_embeddings(path)
+        return created
+    
+    def _insert_chunks(self, rows: list[tuple]) -> None:
+        if rows:
+            self.db.executemany("""
+                INSERT INTO chunks 
+                (id, path, source, start_line, end_line, hash, model, text, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+    
+    def _delete_chunks(self, path: str) -> None:
+        """Delete a file's chunks and tombstone their vectors (caller commits)."""
+        if self.vector_index:
+            old_ids = [
+                row['id'] for row in self.db.execute(
+                    'SELECT id FROM chunks WHERE path = ?', [path]
+                )
+            ]
+            self.vector_index.remove(old_ids)
+        self.db.execute('DELETE FROM chunks WHERE path = ?', [path])
+    
+    def set_chunk_embeddings(self, embeddings: dict[str, list[float]]) -> int:
+        """
+        Store embeddings for existing chunks.
+        
+        Args:
+            embeddings: Mapping of chunk id to embedding vector
             
         Returns:
-            List of chunk dicts
+            Number of chunks updated
         """
-        lines = content.split('\n')
-        chunks = []
+        if not self.db or not embeddings:
+            return 0
+        
+        ids = list(embeddings)
+        placeholders = ','.join('?' * len(ids))
+        sources = {
+            row['id']: row['source']
+            for row in self.db.execute(
+                f'SELECT id, source FROM chunks WHERE id IN ({placeholders})', ids
+            )
+        }
         
-        # Simple chunking by line count
-        for i in range(0, len(lines), chunk_size):
-            chunk_lines = lines[i:i + chunk_size]
-            chunk_text = '\n'.join(chunk_lines)
+        self.db.executemany(
+            'UPDATE chunks SET embedding = ?, model = ? WHERE id = ?',
+            [
+                (self._serialize_embedding(embeddings[chunk_id]), self.embedder.model, chunk_id)
+                for chunk_id in sources
+            ]
+        )
+        if self.vector_index:
+            self.vector_index.add(
+                (chunk_id, source, embeddings[chunk_id])
+                for chunk_id, source in sources.items()
+            )
+        self.db.commit()
+        if self.ann_index:
+            self.ann_index.maybe_rebuild()
+        return len(sources)
+    
+    def _apply_cached_embeddings(self, path: str) -> int:
+        """Fill embeddings for a file's chunks from the content-hash cache."""
+        rows = self.db.execute("""
+            SELECT chunks.id, chunks.source, embedding_cache.embedding
+            FROM chunks
+            JOIN embedding_cache
+                ON embedding_cache.model = ? AND embedding_cache.hash = chunks.hash
+            WHERE chunks.path = ? AND chunks.embedding IS NULL
+        """, [self.embedder.model, path]).fetchall()
+        if not rows:
+            return 0
+        
+        self.db.executemany(
+            'UPDATE chunks SET embedding = ? WHERE id = ?',
+            [(row['embedding'], row['id']) for row in rows]
+        )
+        if self.vector_index:
+            self.vector_index.add(
+                (row['id'], row['source'], self._deserialize_embedding(row['embedding']))
+                for row in rows
+            )
+        self.embedding_stats.cache_hits += len(rows)
+        return len(rows)
+    
+    def count_pending_embeddings(self) -> int:
+        """Number of chunks without an embedding."""
+        if not self.db:
+            return 0
+        return self.db.execute(
+            'SELECT COUNT(*) FROM chunks WHERE embedding IS NULL'
+        ).fetchone()[0]
+    
+    def pending_embedding_hashes(
+        self,
+        after_rowid: int,
+        limit: int
+    ) -> tuple[dict[str, str], int]:
+        """
+        Scan chunks without embeddings, de-duplicated by content hash.
+        
+        Args:
+            after_rowid: Resume after this chunk rowid
+            limit: Maximum chunks to scan
             
-            chunks.append({
-                'text': chunk_text,
-                'start_line': i + 1,
-                'end_line': min(i + chunk_size, len(lines))
-            })
+        Returns:
+            (hash -> text, last scanned rowid)
+        """
+        rows = self.db.execute("""
+            SELECT rowid, hash, text FROM chunks
+            WHERE embedding IS NULL AND rowid > ?
+            ORDER BY rowid
+            LIMIT ?
+        """, [after_rowid, limit]).fetchall()
+        if not rows:
+            return {}, after_rowid
+        return {row['hash']: row['text'] for row in rows}, rows[-1]['rowid']
+    
+    def store_embeddings(self, embeddings: dict[str, list[float]]) -> int:
+        """
+        Cache embeddings by content hash and apply them to pending chunks.
         
-        return chunks
+        Args:
+            embeddings: Mapping of chunk hash to embedding vector
+            
+        Returns:
+            Number of chunks updated
+        """
+        if not self.db or not embeddings:
+            return 0
+        
+        now = int(time.time())
+        model = self.embedder.model
+        self.db.executemany("""
+            INSERT OR REPLACE INTO embedding_cache
+            (model, hash, embedding, dims, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+        """, [
+            (model, chunk_hash, self._serialize_embedding(vector), len(vector), now)
+            for chunk_hash, vector in embeddings.items()
+        ])
+        
+        hashes = list(embeddings)
+        placeholders = ','.join('?' * len(hashes))
+        by_id = {
+            row['id']: embeddings[row['hash']]
+            for row in self.db.execute(
+                f'SELECT id, hash FROM chunks WHERE embedding IS NULL AND hash IN ({placeholders})',
+                hashes
+            )
+        }
+        if not by_id:
+            self.db.commit()
+            return 0
+        return self.set_chunk_embeddings(by_id)
+    
+    async def backfill_embeddings(self, concurrency: int = 4) -> EmbeddingStats:
+        """
+        Embed all chunks that do not have a vector yet.
+        
+        Args:
+            concurrency: Maximum provider requests in flight
+            
+        Returns:
+            Embedding statistics
+        """
+        if not self.db:
+            return self.embedding_stats
+        return await EmbeddingBackfill(self, concurrency=concurrency).run()
     
     def _hash_content(self, content: str) -> str:
         """Hash content for change detection."""
         return hashlib.sha256(content.encode()).hexdigest()
     
-    async def sync(self) -> dict:
+    async def sync(
+        self,
+        paths: list[Path] | None = None,
+        force: bool = False
+    ) -> dict:
         """
         Sync memory index with filesystem.
         
+        Files whose mtime and size match the ``files`` table are skipped
+        without being read. Changed files are read and hashed in a thread
+        pool; files whose content hash is unchanged only get their stat
+        refreshed. Files that disappeared are removed in one transaction.
+        
+        Args:
+            paths: Directories to sync (defaults to resolve_memory_paths)
+            force: Re-index every file regardless of mtime/size/hash
+        
         Returns:
             Sync statistics
         """
         stats = {
+            'files_scanned': 0,
+            'files_unchanged': 0,
             'files_added': 0,
             'files_updated': 0,
             'files_removed': 0,
-            'chunks_created': 0
+            'files_failed': 0,
+            'chunks_created': 0,
+            'duration_ms': 0,
         }
+        if not self.db:
+            return stats
         
-        # TODO: Implement full sync logic
-        # - Scan memory directories
-        # - Add/update changed files
-        # - Remove deleted files
+        started = time.monotonic()
+        roots = [Path(p) for p in paths] if paths is not None else resolve_memory_paths(self.workspace_dir)
+        scanned = await asyncio.to_thread(_scan_memory_files, roots)
+        stats['files_scanned'] = len(scanned)
+        
+        known = await self.db_pool.read(
+            lambda conn: {
+                row['path']: row
+                for row in conn.execute('SELECT path, hash, mtime, size FROM files')
+            }
+        )
+        changed = [
+            path for path, st in scanned.items()
+            if force or not _stat_matches(known.get(path), st)
+        ]
+        stats['files_unchanged'] = len(scanned) - len(changed)
+        
+        # Read and hash changed files off the event loop and index them on the
+        # writer thread, one commit per slice. The next slice is read while the
+        # current one is being indexed.
+        loop = asyncio.get_running_loop()
+        batches = [
+            changed[start:start + SYNC_COMMIT_EVERY]
+            for start in range(0, len(changed), SYNC_COMMIT_EVERY)
+        ]
+        with ThreadPoolExecutor(
+            max_workers=SYNC_HASH_WORKERS, thread_name_prefix="memory-sync"
+        ) as pool:
+            def read_batch(batch: list[str]) -> asyncio.Future:
+                return loop.run_in_executor(None, lambda: list(pool.map(_read_and_hash, batch)))
+            
+            pending = read_batch(batches[0]) if batches else None
+            for i, batch in enumerate(batches):
+                loaded = await pending
+                if i + 1 < len(batches):
+                    pending = read_batch(batches[i + 1])
+                await self.db_pool.write(
+                    self._apply_sync_batch, batch, loaded, scanned, known, force, stats
+                )
         
+        # Remove files that disappeared from the synced roots
+        prefixes = tuple(str(root) + os.sep for root in roots)
+        removed = [
+            path for path in known
+            if path.startswith(prefixes) and path not in scanned
+        ]
+        if removed:
+            await self.db_pool.write(self._remove_files, removed)
+        stats['files_removed'] = len(removed)
+        
+        stats['duration_ms'] = int((time.monotonic() - started) * 1000)
+        logger.info(
+            f"Memory sync: {stats['files_scanned']} scanned, "
+            f"{stats['files_added']} added, {stats['files_updated']} updated, "
+            f"{stats['files_removed']} removed in {stats['duration_ms']}ms"
+        )
         return stats
     
+    def _apply_sync_batch(
+        self,
+        batch: list[str],
+        loaded: list[tuple[str | None, str] | None],
+        scanned: dict[str, os.stat_result],
+        known: dict[str, sqlite3.Row],
+        force: bool,
+        stats: dict,
+    ) -> None:
+        """Index one slice of read files and commit (writer thread)."""
+        for path, result in zip(batch, loaded):
+            if result is None:
+                stats['files_failed'] += 1
+                continue
+            
+            content, file_hash = result
+            st = scanned[path]
+            previous = known.get(path)
+            if previous and previous['hash'] == file_hash and not force:
+                self.db.execute(
+                    'UPDATE files SET mtime = ?, size = ? WHERE path = ?',
+                    [st.st_mtime_ns // 1_000_000, st.st_size, path]
+                )
+                stats['files_unchanged'] += 1
+                continue
+            
+            stats['chunks_created'] += self._index_content(
+                path, _source_for_path(path), content, file_hash, st,
+                indexed=previous is not None
+            )
+            stats['files_updated' if previous else 'files_added'] += 1
+        self.db.commit()
+    
+    def _remove_files(self, paths: list[str]) -> None:
+        """Drop files and their chunks in one transaction (writer thread)."""
+        for path in paths:
+            self._delete_chunks(path)
+        self.db.executemany('DELETE FROM files WHERE path = ?', [(p,) for p in paths])
+        self.db.commit()
+    
     def close(self) -> None:
-        """Close database connection."""
-        if self.db:
-            self.db.close()
+        """Close database connections."""
+        if self.ann_index:
+            self.ann_index.close()
+            self.ann_index = None
+        if self.vector_index:
+            self.vector_index.close()
+            self.vector_index = None
+        if self.db_pool:
+            self.db_pool.close()
+            self.db_pool = None
             self.db = None
 
     async def _vector_search(
@@ -376,6 +858,15 @@ class BuiltinMemoryManager:
             # Generate query embedding
             query_embedding = await self.embedder.embed_text(query)
             
+            if self.vector_index:
+                index = self.ann_index or self.vector_index
+                source_names = [s.value for s in sources] if sources else None
+                return await self.db_pool.read(
+                    lambda conn: self._load_hits(
+                        index.search(query_embedding, limit, source_names), conn
+                    )
+                )
+            
             # Build source filter
             source_filter = ""
             source_values = []
@@ -402,11 +893,13 @@ class BuiltinMemoryManager:
                 {source_filter}
             """
             
-            cursor = self.db.execute(sql, source_values)
+            rows = await self.db_pool.read(
+                lambda conn: conn.execute(sql, source_values).fetchall()
+            )
             
             # Compute cosine similarity
             results = []
-            for row in cursor.fetchall():
+            for row in rows:
                 # Deserialize embedding (stored as blob)
                 embedding_blob = row['embedding']
                 if not embedding_blob:
@@ -442,6 +935,47 @@ class BuiltinMemoryManager:
             logger.error(f"Vector search error: {e}", exc_info=True)
             return []
     
+    def _load_hits(
+        self,
+        hits: list[tuple[str, float]],
+        conn: sqlite3.Connection
+    ) -> list[MemorySearchResult]:
+        """Fetch chunk rows for (id, score) hits, preserving hit order."""
+        if not hits:
+            return []
+        
+        ids = [chunk_id for chunk_id, _ in hits]
+        placeholders = ','.join('?' * len(ids))
+        rows = {
+            row['id']: row
+            for row in conn.execute(
+                f"""
+                SELECT id, path, source, text, start_line, end_line
+                FROM chunks WHERE id IN ({placeholders})
+                """,
+                ids
+            )
+        }
+        
+        results = []
+        for chunk_id, score in hits:
+            row = rows.get(chunk_id)
+            if row is None:
+                continue
+            snippet = row['text'][:200] + ('...' if len(row['text']) > 200 else '')
+            results.append(MemorySearchResult(
+                id=row['id'],
+                path=row['path'],
+                source=MemorySource(row['source']),
+                text=row['text'],
+                snippet=snippet,
+                start_line=row['start_line'],
+                end_line=row['end_line'],
+                score=score
+            ))
+        
+        return results
+    
     async def _hybrid_search(
         self,
         query: str,
@@ -461,11 +995,11 @@ class BuiltinMemoryManager:
         Returns:
             Merged search results
         """
-        # Get vector results
-        vector_results = await self._vector_search(query, limit * 2, sources)
-        
-        # Get FTS results
-        fts_results = await self._fts_search(query, limit * 2, sources)
+        # Run vector and FTS halves concurrently on the reader pool
+        vector_results, fts_results = await asyncio.gather(
+            self._vector_search(query, limit * 2, sources),
+            self._fts_search(query, limit * 2, sources),
+        )
         
         # Convert to SearchResult format
         vector_sr = [
@@ -0,0 +1,164 @@
+"""
+Structure-aware chunking for memory indexing
+
+Streams a file line by line and groups lines into chunks of at most
+``max_tokens`` (estimated with :class:`TokenAnalyzer`):
+
+- Markdown headings always start a new chunk.
+- Chunks are split at paragraph boundaries (blank lines) or after a closing
+  code fence when possible; fenced code is only split mid-block when the
+  block alone exceeds the budget.
+- Chunks split for size repeat the trailing ``overlap_tokens`` of the
+  previous chunk so context carries across the cut.
+
+Only the lines of the chunk being built are held in memory.
+"""
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+from openclaw.agents.compaction.analyzer import TokenAnalyzer
+from openclaw.markdown.code_fence import fence_closes, match_fence
+from openclaw.markdown.parser import parse_heading
+
+DEFAULT_CHUNK_TOKENS = 400
+DEFAULT_OVERLAP_TOKENS = 80
+
+
+@dataclass
+class MemoryChunk:
+    """Chunk of a memory file (1-indexed, inclusive line range)"""
+
+    text: str
+    start_line: int
+    end_line: int
+    hash: str
+
+
+@dataclass
+class _Line:
+    number: int
+    text: str
+    tokens: int
+
+
+def iter_chunks(
+    lines: Iterable[str],
+    max_tokens: int = DEFAULT_CHUNK_TOKENS,
+    overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+    analyzer: TokenAnalyzer | None = None,
+) -> Iterator[MemoryChunk]:
+    """
+    Lazily chunk a stream of lines
+
+    Args:
+        lines: Lines including their line endings (e.g. an open file)
+        max_tokens: Token budget per chunk
+        overlap_tokens: Tokens repeated from the previous chunk after a size split
+        analyzer: Token estimator (defaults to TokenAnalyzer())
+
+    Yields:
+        Chunks in file order
+    """
+    analyzer = analyzer or TokenAnalyzer()
+    max_tokens = max(1, max_tokens)
+    overlap_tokens = max(0, min(overlap_tokens, max_tokens // 2))
+
+    current: list[_Line] = []
+    tokens = 0
+    split_at = 0  # preferred cut: index just after the last paragraph/fence end
+    fence: str | None = None
+
+    for number, text in enumerate(lines, start=1):
+        if fence is None and parse_heading(text) is not None:
+            chunk = _make_chunk(current)
+            if chunk:
+                yield chunk
+            current, tokens, split_at = [], 0, 0
+
+        for piece, piece_tokens in _split_long_line(text, analyzer, max_tokens):
+            line = _Line(number, piece, piece_tokens)
+            if current and tokens + line.tokens > max_tokens:
+                cut = split_at or len(current)
+                chunk = _make_chunk(current[:cut])
+                if chunk:
+                    yield chunk
+                carried = current[cut:]
+                overlap = _overlap(current[:cut], overlap_tokens)
+                if sum(item.tokens for item in overlap + carried) + line.tokens > max_tokens:
+                    overlap = []
+                current = overlap + carried
+                tokens = sum(item.tokens for item in current)
+                split_at = 0
+            current.append(line)
+            tokens += line.tokens
+
+        if fence is not None:
+            if fence_closes(fence, text):
+                fence = None
+                split_at = len(current)
+        elif (marker := match_fence(text)) is not None:
+            fence = marker
+        elif not text.strip():
+            split_at = len(current)
+
+    chunk = _make_chunk(current)
+    if chunk:
+        yield chunk
+
+
+def _make_chunk(lines: list[_Line]) -> MemoryChunk | None:
+    """Build a chunk, trimming blank edge lines (None if nothing is left)"""
+    start, end = 0, len(lines)
+    while start < end and not lines[start].text.strip():
+        start += 1
+    while end > start and not lines[end - 1].text.strip():
+        end -= 1
+    if start == end:
+        return None
+
+    parts = []
+    previous = None
+    for line in lines[start:end]:
+        # Pieces of one split line are rejoined without a separator
+        if previous is not None and line.number != previous:
+            parts.append("\n")
+        parts.append(line.text.rstrip("\r\n"))
+        previous = line.number
+    text = "".join(parts)
+    return MemoryChunk(
+        text=text,
+        start_line=lines[start].number,
+        end_line=lines[end - 1].number,
+        hash=hashlib.sha256(text.encode()).hexdigest(),
+    )
+
+
+def _overlap(lines: list[_Line], budget: int) -> list[_Line]:
+    """Trailing whole lines fitting in ``budget`` tokens"""
+    taken: list[_Line] = []
+    used = 0
+    for line in reversed(lines):
+        if used + line.tokens > budget:
+            break
+        taken.append(line)
+        used += line.tokens
+    taken.reverse()
+    return taken
+
+
+def _split_long_line(
+    text: str, analyzer: TokenAnalyzer, max_tokens: int
+) -> list[tuple[str, int]]:
+    """Estimate a line's tokens, splitting it into pieces if it exceeds the budget"""
+    tokens = analyzer.estimate_tokens(text) + 1
+    if tokens <= max_tokens:
+        return [(text, tokens)]
+    pieces = -(-tokens // max_tokens)
+    size = -(-len(text) // pieces)
+    return [
+        (piece, analyzer.estimate_tokens(piece) + 1)
+        for piece in (text[i:i + size] for i in range(0, len(text), size))
+    ]
@@ -0,0 +1,163 @@
+"""
+Embedding backfill for memory chunks
+
+Chunks are inserted by ``BuiltinMemoryManager.add_file`` without vectors
+(unless their content hash is already in the embedding cache). The backfill
+walks pending chunks, de-duplicates them by content hash, groups them into
+provider-sized ``embed_batch`` calls run with bounded concurrency, and
+writes each batch back in one transaction on the manager's writer thread.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .builtin_manager import BuiltinMemoryManager
+
+logger = logging.getLogger(__name__)
+
+# Pending chunks fetched per scan window, in batches
+WINDOW_BATCHES = 4
+
+
+@dataclass
+class EmbeddingStats:
+    """Embedding cache and backfill counters"""
+    pending: int = 0
+    embedded: int = 0
+    cache_hits: int = 0
+    failed: int = 0
+    batches: int = 0
+    running: bool = False
+    elapsed_seconds: float = 0.0
+    last_run_at: float | None = None
+    last_error: str | None = None
+    _started: float | None = field(default=None, repr=False)
+
+    @property
+    def throughput(self) -> float:
+        """Chunks embedded per second across all runs"""
+        elapsed = self.elapsed_seconds
+        if self._started is not None:
+            elapsed += time.monotonic() - self._started
+        return self.embedded / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "pending": self.pending,
+            "embedded": self.embedded,
+            "cacheHits": self.cache_hits,
+            "failed": self.failed,
+            "batches": self.batches,
+            "running": self.running,
+            "throughput": round(self.throughput, 2),
+            "lastRunAt": self.last_run_at,
+            "lastError": self.last_error,
+        }
+
+
+class EmbeddingBackfill:
+    """
+    Embed pending chunks in concurrent provider batches
+
+    Example:
+        stats = await EmbeddingBackfill(manager, concurrency=4).run()
+    """
+
+    def __init__(
+        self,
+        manager: BuiltinMemoryManager,
+        concurrency: int = 4,
+        batch_size: int | None = None,
+    ):
+        """
+        Initialize backfill
+
+        Args:
+            manager: Memory manager owning the chunks and embedder
+            concurrency: Maximum embed_batch calls in flight
+            batch_size: Texts per call (defaults to the provider's max)
+        """
+        self.manager = manager
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size or manager.embedder.max_batch_size)
+
+    async def run(self) -> EmbeddingStats:
+        """
+        Embed every chunk that has no vector yet
+
+        Returns:
+            Updated manager statistics
+        """
+        stats = self.manager.embedding_stats
+        if stats.running:
+            return stats
+
+        stats.running = True
+        stats._started = time.monotonic()
+        stats.last_error = None
+        semaphore = asyncio.Semaphore(self.concurrency)
+        after_rowid = 0
+        write = self.manager.db_pool.write
+
+        try:
+            stats.pending = await write(self.manager.count_pending_embeddings)
+            while True:
+                window, after_rowid = await write(
+                    self.manager.pending_embedding_hashes,
+                    after_rowid,
+                    self.batch_size * self.concurrency * WINDOW_BATCHES,
+                )
+                if not window:
+                    break
+                hashes = list(window)
+                batches = [
+                    hashes[i:i + self.batch_size]
+                    for i in range(0, len(hashes), self.batch_size)
+                ]
+                await asyncio.gather(*(
+                    self._embed_batch(semaphore, {h: window[h] for h in batch})
+                    for batch in batches
+                ))
+        finally:
+            stats.elapsed_seconds += time.monotonic() - stats._started
+            stats._started = None
+            stats.running = False
+            stats.last_run_at = time.time()
+            stats.pending = await write(self.manager.count_pending_embeddings)
+
+        logger.info(
+            f"Embedding backfill done: {stats.embedded} embedded, "
+            f"{stats.failed} failed, {stats.pending} pending"
+        )
+        return stats
+
+    async def _embed_batch(self, semaphore: asyncio.Semaphore, texts: dict[str, str]) -> None:
+        """Embed one batch (hash -> text) and write it back"""
+        stats = self.manager.embedding_stats
+        async with semaphore:
+            try:
+                batch = await self.manager.embedder.embed_batch(list(texts.values()))
+            except Exception as e:
+                stats.failed += len(texts)
+                stats.last_error = str(e)
+                logger.error(f"Embedding batch of {len(texts)} failed: {e}", exc_info=True)
+                return
+
+        if len(batch.embeddings) != len(texts):
+            stats.failed += len(texts)
+            stats.last_error = (
+                f"provider returned {len(batch.embeddings)} embeddings for {len(texts)} texts"
+            )
+            logger.error(f"Embedding batch mismatch: {stats.last_error}")
+            return
+
+        updated = await self.manager.db_pool.write(
+            self.manager.store_embeddings, dict(zip(texts, batch.embeddings))
+        )
+        stats.embedded += updated
+        stats.batches += 1
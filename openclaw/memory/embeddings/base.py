@@ -23,6 +23,9 @@ class EmbeddingProvider(ABC):
     Providers generate vector embeddings for text chunks.
     """
     
+    # Maximum number of texts sent in a single embed_batch call
+    max_batch_size: int = 64
+    
     def __init__(self, model: str = "default"):
         """
         Initialize embedding provider
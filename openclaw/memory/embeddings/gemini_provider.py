@@ -18,6 +18,8 @@ class GeminiEmbeddingProvider(EmbeddingProvider):
     - embedding-001 (768 dims, legacy)
     """
     
+    max_batch_size = 100
+    
     def __init__(self, model: str = "text-embedding-004", api_key: str | None = None):
         """
         Initialize Gemini provider
@@ -20,6 +20,8 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
     - Batch API support
     """
     
+    max_batch_size = 256
+    
     def __init__(self, model: str = "text-embedding-3-small", api_key: str | None = None):
         """
         Initialize OpenAI provider
@@ -30,6 +30,7 @@ class FileWatcher:
         self,
         watch_paths: list[Path],
         on_change: Callable[[Path], Awaitable[None]],
+        recursive: bool = True,
     ) -> None:
         """
         Start watching paths
@@ -37,6 +38,7 @@ class FileWatcher:
         Args:
             watch_paths: Paths to watch
             on_change: Callback for changes
+            recursive: Also watch subdirectories
         """
         try:
             from watchdog.observers import Observer
@@ -48,6 +50,9 @@ class FileWatcher:
         
         logger.info(f"Starting file watcher for {len(watch_paths)} paths")
         
+        # Events arrive on the observer thread; callbacks run on this loop
+        loop = asyncio.get_running_loop()
+        
         # Create event handler
         class ChangeHandler(FileSystemEventHandler):
             def __init__(self, callback: Callable):
@@ -60,13 +65,18 @@ class FileWatcher:
                 if event.is_directory:
                     return
                 
-                # Get path
-                path = Path(event.src_path)
+                # Moves affect both the old and the new path
+                paths = [Path(event.src_path)]
+                dest_path = getattr(event, "dest_path", None)
+                if dest_path:
+                    paths.append(Path(dest_path))
                 
-                # Add to pending
-                self._pending_changes.add(path)
+                loop.call_soon_threadsafe(self._schedule, paths)
+            
+            def _schedule(self, paths: list[Path]):
+                """Add paths to pending and restart the debounce (loop thread)"""
+                self._pending_changes.update(paths)
                 
-                # Debounce - schedule callback
                 if self._debounce_task:
                     self._debounce_task.cancel()
                 
@@ -78,15 +88,15 @@ class FileWatcher:
                 """Debounced callback - wait for changes to settle"""
                 await asyncio.sleep(0.5)  # 500ms debounce
                 
-                # Process pending changes
-                for path in self._pending_changes:
+                # Take pending changes; events during callbacks start a new
+                # round instead of cancelling this one
+                self._debounce_task = None
+                pending, self._pending_changes = self._pending_changes, set()
+                for path in pending:
                     try:
                         await self.callback(path)
                     except Exception as e:
                         logger.error(f"Error in change callback: {e}", exc_info=True)
-                
-                # Clear pending
-                self._pending_changes.clear()
         
         # Create observer
         self.observer = Observer()
@@ -98,7 +108,7 @@ class FileWatcher:
                 continue
             
             handler = ChangeHandler(on_change)
-            self.observer.schedule(handler, str(path), recursive=True)
+            self.observer.schedule(handler, str(path), recursive=recursive)
             
             logger.debug(f"Watching: {path}")
         
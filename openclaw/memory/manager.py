@@ -5,10 +5,15 @@ Matches TypeScript src/memory/manager.ts (simplified)
 """
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+import stat
 from pathlib import Path
 from typing import Any
 
+from .file_watcher import FileWatcher
+from .text_index import InvertedIndex
 from .types import (
     MemoryEmbeddingProbeResult,
     MemoryProviderStatus,
@@ -23,17 +28,17 @@ class SimpleMemorySearchManager:
     """
     Simple memory search manager (matches TS MemorySearchManager interface).
     
-    This is a simplified implementation that reads MEMORY.md and memory/*.md files
-    and performs basic text search. For production, consider implementing:
-    - Vector embeddings (using sentence-transformers or similar)
-    - SQLite FTS (full-text search)
-    - Chunking and indexing
+    Indexes MEMORY.md and memory/*.md into an in-memory inverted index and
+    answers queries with BM25 ranking, without touching the disk. Files are
+    re-indexed individually: on FileWatcher events when watchdog is
+    available, otherwise by a stat check (mtime/size) before each search.
     """
     
     def __init__(
         self,
         workspace_dir: Path,
-        config: Any | None = None
+        config: Any | None = None,
+        watch: bool = True,
     ):
         """
         Initialize memory manager.
@@ -41,10 +46,15 @@ class SimpleMemorySearchManager:
         Args:
             workspace_dir: Workspace directory
             config: OpenClaw configuration
+            watch: Update the index from file system events when possible
         """
         self.workspace_dir = workspace_dir
         self.config = config
-        self._memory_files: list[Path] = []
+        self.watch = watch
+        self._index = InvertedIndex()
+        self._file_stats: dict[str, tuple[int, int]] = {}
+        self._watcher: FileWatcher | None = None
+        self._lock = asyncio.Lock()
         self._indexed = False
     
     async def search(
@@ -62,51 +72,26 @@ class SimpleMemorySearchManager:
         Returns:
             List of search results
         """
-        if not self._indexed:
+        # Without a watcher, pick up changed files by stat before answering
+        if not self._indexed or self._watcher is None:
             await self._index_files()
         
         opts = opts or {}
         max_results = opts.get("maxResults", 10)
         min_score = opts.get("minScore", 0.0)
         
-        results = []
-        query_lower = query.lower()
-        
-        # Simple text search through memory files
-        for file_path in self._memory_files:
-            try:
-                content = file_path.read_text(encoding="utf-8")
-                lines = content.split("\n")
-                
-                for i, line in enumerate(lines):
-                    if query_lower in line.lower():
-                        # Simple scoring based on exact match
-                        score = 1.0 if query.lower() == line.lower().strip() else 0.5
-                        
-                        if score >= min_score:
-                            # Get context (line +/- 2)
-                            start_idx = max(0, i - 2)
-                            end_idx = min(len(lines), i + 3)
-                            snippet_lines = lines[start_idx:end_idx]
-                            snippet = "\n".join(snippet_lines)
-                            
-                            rel_path = file_path.relative_to(self.workspace_dir)
-                            
-                            results.append(MemorySearchResult(
-                                path=str(rel_path),
-                                start_line=start_idx + 1,  # 1-indexed
-                                end_line=end_idx,
-                                score=score,
-                                snippet=snippet,
-                                source=MemorySource.MEMORY
-                            ))
-            
-            except Exception as e:
-                logger.warning(f"Failed to search {file_path}: {e}")
-        
-        # Sort by score and limit
-        results.sort(key=lambda r: r.score, reverse=True)
-        return results[:max_results]
+        return [
+            MemorySearchResult(
+                path=hit.path,
+                start_line=hit.start_line,
+                end_line=hit.end_line,
+                score=hit.score,
+                snippet=hit.snippet,
+                source=MemorySource.MEMORY
+            )
+            for hit in self._index.search(query, max_results)
+            if hit.score >= min_score
+        ]
     
     async def read_file(
         self,
@@ -155,7 +140,8 @@ class SimpleMemorySearchManager:
         return MemoryProviderStatus(
             backend="builtin",
             provider="simple-text-search",
-            files=len(self._memory_files),
+            files=self._index.files,
+            chunks=self._index.passages,
             workspace_dir=str(self.workspace_dir)
         )
     
@@ -169,6 +155,9 @@ class SimpleMemorySearchManager:
         Args:
             params: Sync parameters (reason, force, progress callback)
         """
+        if params and params.get("force"):
+            self._index.clear()
+            self._file_stats.clear()
         await self._index_files()
     
     async def probe_embedding_availability(self) -> MemoryEmbeddingProbeResult:
@@ -185,27 +174,143 @@ class SimpleMemorySearchManager:
     
     async def close(self) -> None:
         """Close and cleanup resources (matches TS interface)."""
-        self._memory_files = []
+        if self._watcher:
+            await self._watcher.stop()
+            self._watcher = None
+        self._index.clear()
+        self._file_stats.clear()
         self._indexed = False
     
     async def _index_files(self) -> None:
-        """Index memory files."""
-        self._memory_files = []
-        
-        # Index MEMORY.md
-        memory_file = self.workspace_dir / "MEMORY.md"
-        if memory_file.exists():
-            self._memory_files.append(memory_file)
-        
-        # Index memory/*.md
+        """Index new and changed memory files, drop deleted ones."""
+        async with self._lock:
+            found = await asyncio.to_thread(_scan_memory_files, self.workspace_dir)
+            
+            for rel_path in set(self._file_stats) - set(found):
+                self._index.remove(rel_path)
+                del self._file_stats[rel_path]
+            
+            changed = [
+                rel_path for rel_path, file_stat in found.items()
+                if self._file_stats.get(rel_path) != file_stat
+            ]
+            if changed:
+                contents = await asyncio.to_thread(
+                    _read_memory_files, self.workspace_dir, changed
+                )
+                for rel_path, content in contents.items():
+                    self._apply(rel_path, found[rel_path], content)
+            
+            if not self._indexed:
+                self._indexed = True
+                logger.info(
+                    f"Indexed {self._index.files} memory files "
+                    f"({self._index.passages} passages)"
+                )
+            
+            if self.watch and self._watcher is None:
+                await self._start_watcher()
+    
+    def _apply(self, rel_path: str, file_stat: tuple[int, int], content: str | None) -> None:
+        """Replace one file in the index (None removes it)."""
+        if content is None:
+            self._index.remove(rel_path)
+            self._file_stats.pop(rel_path, None)
+        else:
+            self._index.update(rel_path, content)
+            self._file_stats[rel_path] = file_stat
+    
+    async def _start_watcher(self) -> None:
+        """Watch the workspace root and memory/ (both non-recursive)."""
         memory_dir = self.workspace_dir / "memory"
-        if memory_dir.exists() and memory_dir.is_dir():
-            for file in memory_dir.glob("*.md"):
-                if file.is_file():
-                    self._memory_files.append(file)
+        if not memory_dir.is_dir():
+            # memory/ may appear later; keep using stat checks until then
+            return
+        
+        watcher = FileWatcher()
+        try:
+            await watcher.start(
+                [self.workspace_dir, memory_dir],
+                self._handle_file_change,
+                recursive=False,
+            )
+        except RuntimeError as e:
+            logger.debug(f"Memory file watching disabled: {e}")
+            self.watch = False
+            return
+        self._watcher = watcher
+    
+    async def _handle_file_change(self, path: Path) -> None:
+        """Re-index a single memory file after a file system event."""
+        rel_path = _memory_rel_path(self.workspace_dir, path)
+        if rel_path is None:
+            return
         
-        self._indexed = True
-        logger.info(f"Indexed {len(self._memory_files)} memory files")
+        async with self._lock:
+            file_stat = _stat_file(path)
+            content = None
+            if file_stat is not None:
+                content = (await asyncio.to_thread(
+                    _read_memory_files, self.workspace_dir, [rel_path]
+                )).get(rel_path)
+            self._apply(rel_path, file_stat or (0, 0), content)
+        logger.debug(f"Re-indexed memory file {rel_path}")
+
+
+def _memory_rel_path(workspace_dir: Path, path: Path) -> str | None:
+    """Workspace-relative key if ``path`` is MEMORY.md or memory/*.md."""
+    if path == workspace_dir / "MEMORY.md":
+        return "MEMORY.md"
+    if path.parent == workspace_dir / "memory" and path.suffix == ".md":
+        return f"memory/{path.name}"
+    return None
+
+
+def _stat_file(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _scan_memory_files(workspace_dir: Path) -> dict[str, tuple[int, int]]:
+    """Stat MEMORY.md and memory/*.md (relative path -> (mtime_ns, size))."""
+    found = {}
+    file_stat = _stat_file(workspace_dir / "MEMORY.md")
+    if file_stat is not None:
+        found["MEMORY.md"] = file_stat
+    
+    try:
+        entries = os.scandir(workspace_dir / "memory")
+    except OSError:
+        return found
+    with entries:
+        for entry in entries:
+            if not entry.name.endswith(".md"):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue
+            found[f"memory/{entry.name}"] = (st.st_mtime_ns, st.st_size)
+    return found
+
+
+def _read_memory_files(workspace_dir: Path, rel_paths: list[str]) -> dict[str, str | None]:
+    """Read files as UTF-8 (None for files that could not be read)."""
+    contents: dict[str, str | None] = {}
+    for rel_path in rel_paths:
+        try:
+            contents[rel_path] = (workspace_dir / rel_path).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"Failed to index {rel_path}: {e}")
+            contents[rel_path] = None
+    return contents
 
 
 async def get_memory_search_manager(
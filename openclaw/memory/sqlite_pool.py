@@ -0,0 +1,136 @@
+"""
+SQLite connection pool for the memory index
+
+One writer connection, used only from a dedicated single-thread executor,
+plus a small pool of read-only connections served from a reader executor.
+The database runs in WAL mode, so readers see the last committed state and
+never wait on an index write in progress (and vice versa). Both executors
+keep blocking SQL off the event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import sqlite3
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_READERS = 4
+
+# Pragmas applied to every connection
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",  # 256 MiB
+    "PRAGMA cache_size = -65536",  # 64 MiB
+    "PRAGMA busy_timeout = 5000",
+)
+
+
+class SQLitePool:
+    """
+    Writer connection plus a pool of reader connections
+
+    Example:
+        pool = SQLitePool(db_path)
+        rows = await pool.read(lambda conn: conn.execute("SELECT 1").fetchall())
+        await pool.write(manager.add_rows, rows)
+    """
+
+    def __init__(self, path: Path, readers: int = DEFAULT_READERS):
+        """
+        Open the writer connection and switch the database to WAL
+
+        Args:
+            path: Database file
+            readers: Maximum concurrent reader connections
+        """
+        self.path = path
+        self.readers = max(1, readers)
+        self.writer = self._connect()
+        mode = self.writer.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+        if mode.lower() != "wal":
+            logger.warning(f"Memory index {path} is not in WAL mode ({mode})")
+
+        self._write_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="memory-db-write"
+        )
+        self._read_executor = ThreadPoolExecutor(
+            max_workers=self.readers, thread_name_prefix="memory-db-read"
+        )
+        self._idle: queue.SimpleQueue[sqlite3.Connection] = queue.SimpleQueue()
+        self._opened: list[sqlite3.Connection] = []
+        self._opened_lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        if read_only:
+            conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    # ========================================================================
+    # Execution
+    # ========================================================================
+
+    async def write(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run ``fn(*args)`` on the writer thread
+
+        ``fn`` uses :attr:`writer` and is responsible for committing.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._write_executor, lambda: fn(*args))
+
+    async def read(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(conn, *args)`` with a reader connection on the reader pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._read_executor, self._read_sync, fn, args)
+
+    def _read_sync(self, fn: Callable[..., T], args: tuple) -> T:
+        conn = self._checkout()
+        try:
+            return fn(conn, *args)
+        finally:
+            # End any implicit read transaction so the WAL can checkpoint
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    def _checkout(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        conn = self._connect(read_only=True)
+        with self._opened_lock:
+            self._opened.append(conn)
+        return conn
+
+    # ========================================================================
+    # Lifecycle
+    # ========================================================================
+
+    def close(self) -> None:
+        """Wait for queued work, then close every connection"""
+        if self._closed:
+            return
+        self._closed = True
+        self._write_executor.shutdown(wait=True)
+        self._read_executor.shutdown(wait=True)
+        with self._opened_lock:
+            for conn in self._opened:
+                conn.close()
+            self._opened.clear()
+        self.writer.close()
@@ -8,7 +8,7 @@ from typing import Any
 
 from .file_watcher import FileWatcher
 from .session_exporter import SessionExporter
-from .builtin_manager import BuiltinMemoryManager
+from .builtin_manager import BuiltinMemoryManager, resolve_memory_paths
 
 logger = logging.getLogger(__name__)
 
@@ -95,24 +95,7 @@ class SyncManager:
     
     def _get_watch_paths(self) -> list[Path]:
         """Get paths to watch"""
-        paths = []
-        
-        # Memory directories
-        memory_dir = self.workspace_path / ".openclaw" / "memory"
-        if memory_dir.exists():
-            paths.append(memory_dir)
-        
-        # Sessions directory
-        sessions_dir = self.workspace_path / ".openclaw" / "sessions"
-        if sessions_dir.exists():
-            paths.append(sessions_dir)
-        
-        # Docs directory
-        docs_dir = self.workspace_path / "docs"
-        if docs_dir.exists():
-            paths.append(docs_dir)
-        
-        return paths
+        return [path for path in resolve_memory_paths(self.workspace_path) if path.exists()]
     
     async def _handle_file_change(self, path: Path) -> None:
         """
@@ -137,6 +120,8 @@ class SyncManager:
         try:
             chunks = await self.memory_manager.add_file(path, source)
             logger.info(f"Re-indexed {path}: {chunks} chunks")
+            if chunks:
+                await self.memory_manager.backfill_embeddings()
         except Exception as e:
             logger.error(f"Error re-indexing {path}: {e}", exc_info=True)
     
@@ -149,7 +134,7 @@ class SyncManager:
                 
                 # Run sync
                 logger.info("Running periodic sync")
-                stats = await self.memory_manager.sync()
+                stats = await self.memory_manager.sync(resolve_memory_paths(self.workspace_path))
                 
                 logger.info(
                     f"Periodic sync complete: "
@@ -158,6 +143,8 @@ class SyncManager:
                     f"{stats.get('files_removed', 0)} removed"
                 )
                 
+                await self.memory_manager.backfill_embeddings()
+                
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -194,6 +181,7 @@ class SyncManager:
             "running": self.running,
             "watcher_running": self.file_watcher.running,
             "exporter_stats": self.session_exporter.get_stats(),
+            "embeddings": self.memory_manager.embedding_stats.to_dict(),
         }
     
     async def __aenter__(self):
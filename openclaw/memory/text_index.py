@@ -0,0 +1,251 @@
+"""
+In-memory inverted index with BM25 ranking
+
+Backs SimpleMemorySearchManager when no SQLite index is used. Each file is
+split into passages (a markdown section, capped at ``PASSAGE_MAX_LINES``);
+passages are the BM25 documents. Postings keep token positions so a query
+can be answered with the window of lines holding the most matches, without
+touching the disk. Files are added, replaced and removed individually.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from array import array
+from dataclasses import dataclass, field
+
+from openclaw.markdown.parser import parse_heading
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Longest passage (in lines) before a section is split
+PASSAGE_MAX_LINES = 40
+
+# Lines of context around the best-matching line in a snippet
+SNIPPET_CONTEXT_LINES = 2
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+@dataclass
+class TextHit:
+    """Passage match (1-indexed, inclusive snippet line range)"""
+
+    path: str
+    start_line: int
+    end_line: int
+    score: float
+    snippet: str
+
+
+@dataclass
+class _Passage:
+    path: str
+    length: int
+    token_lines: array  # line index (0-based, within the file) of each token
+
+
+@dataclass
+class _File:
+    lines: list[str]
+    passages: list[int] = field(default_factory=list)
+
+
+class InvertedIndex:
+    """
+    Positional inverted index over text files
+
+    Example:
+        index = InvertedIndex()
+        index.update("MEMORY.md", text)
+        hits = index.search("deploy checklist", limit=5)
+    """
+
+    def __init__(self):
+        self._postings: dict[str, dict[int, array]] = {}
+        self._passages: dict[int, _Passage] = {}
+        self._files: dict[str, _File] = {}
+        self._next_id = 0
+        self._total_tokens = 0
+
+    # ========================================================================
+    # State
+    # ========================================================================
+
+    @property
+    def files(self) -> int:
+        return len(self._files)
+
+    @property
+    def passages(self) -> int:
+        return len(self._passages)
+
+    @property
+    def terms(self) -> int:
+        return len(self._postings)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._files
+
+    def paths(self) -> list[str]:
+        return list(self._files)
+
+    # ========================================================================
+    # Updates
+    # ========================================================================
+
+    def update(self, path: str, text: str) -> int:
+        """
+        Index (or re-index) a file
+
+        Args:
+            path: File key
+            text: File content
+
+        Returns:
+            Number of passages indexed
+        """
+        self.remove(path)
+        lines = text.split("\n")
+        indexed = _File(lines)
+        self._files[path] = indexed
+
+        for start, end in _passage_ranges(lines):
+            passage_id = self._next_id
+            self._next_id += 1
+            token_lines = array("I")
+            positions: dict[str, array] = {}
+            for line_index in range(start, end):
+                for token in tokenize(lines[line_index]):
+                    positions.setdefault(token, array("I")).append(len(token_lines))
+                    token_lines.append(line_index)
+            if not token_lines:
+                continue
+
+            self._passages[passage_id] = _Passage(path, len(token_lines), token_lines)
+            indexed.passages.append(passage_id)
+            self._total_tokens += len(token_lines)
+            for token, token_positions in positions.items():
+                self._postings.setdefault(token, {})[passage_id] = token_positions
+
+        return len(indexed.passages)
+
+    def remove(self, path: str) -> bool:
+        """Drop a file from the index"""
+        indexed = self._files.pop(path, None)
+        if indexed is None:
+            return False
+
+        for passage_id in indexed.passages:
+            passage = self._passages.pop(passage_id)
+            self._total_tokens -= passage.length
+            lines = indexed.lines
+            terms = {
+                token
+                for line_index in sorted(set(passage.token_lines))
+                for token in tokenize(lines[line_index])
+            }
+            for token in terms:
+                postings = self._postings.get(token)
+                if postings is None:
+                    continue
+                postings.pop(passage_id, None)
+                if not postings:
+                    del self._postings[token]
+        return True
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._passages.clear()
+        self._files.clear()
+        self._total_tokens = 0
+
+    # ========================================================================
+    # Search
+    # ========================================================================
+
+    def search(self, query: str, limit: int = 10) -> list[TextHit]:
+        """
+        Rank passages against a query with BM25
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of hits
+
+        Returns:
+            Hits, best first; scores are mapped into (0, 1)
+        """
+        terms = set(tokenize(query))
+        count = len(self._passages)
+        if not terms or not count or limit <= 0:
+            return []
+
+        average_length = self._total_tokens / count
+        scores: dict[int, float] = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for passage_id, positions in postings.items():
+                tf = len(positions)
+                length = self._passages[passage_id].length
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                scores[passage_id] = scores.get(passage_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [self._hit(passage_id, score, terms) for passage_id, score in best]
+
+    def _hit(self, passage_id: int, score: float, terms: set[str]) -> TextHit:
+        """Build a hit whose snippet is the window with the most matches"""
+        passage = self._passages[passage_id]
+        lines = self._files[passage.path].lines
+
+        matches: dict[int, int] = {}
+        for term in terms:
+            for position in self._postings.get(term, {}).get(passage_id, ()):
+                line_index = passage.token_lines[position]
+                matches[line_index] = matches.get(line_index, 0) + 1
+
+        first = passage.token_lines[0]
+        last = passage.token_lines[-1]
+        center = max(
+            matches,
+            key=lambda line_index: (
+                sum(
+                    matches.get(i, 0)
+                    for i in range(line_index - SNIPPET_CONTEXT_LINES, line_index + SNIPPET_CONTEXT_LINES + 1)
+                ),
+                -line_index,
+            ),
+        )
+        start = max(first, center - SNIPPET_CONTEXT_LINES)
+        end = min(last, center + SNIPPET_CONTEXT_LINES)
+        return TextHit(
+            path=passage.path,
+            start_line=start + 1,
+            end_line=end + 1,
+            score=score / (1 + score),
+            snippet="\n".join(lines[start:end + 1]),
+        )
+
+
+def _passage_ranges(lines: list[str]) -> list[tuple[int, int]]:
+    """Split lines into [start, end) passages at headings and size caps"""
+    ranges = []
+    start = 0
+    for i, line in enumerate(lines):
+        if i > start and (parse_heading(line) is not None or i - start >= PASSAGE_MAX_LINES):
+            ranges.append((start, i))
+            start = i
+    if start < len(lines):
+        ranges.append((start, len(lines)))
+    return ranges
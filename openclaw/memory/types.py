@@ -29,6 +29,8 @@ class MemorySearchResult:
         snippet: Text snippet
         source: Source type (memory | sessions)
         citation: Optional citation string
+        id: Chunk identifier (builtin index only)
+        text: Full chunk text (builtin index only)
     """
     path: str
     start_line: int
@@ -37,6 +39,8 @@ class MemorySearchResult:
     snippet: str
     source: MemorySource
     citation: str | None = None
+    id: str | None = None
+    text: str | None = None
 
 
 @dataclass
@@ -0,0 +1,486 @@
+"""
+Memory-mapped vector index for builtin memory search
+
+Keeps every chunk embedding as one row of a contiguous float32 matrix stored
+next to the SQLite index (``<agent>_index.vectors``). Rows are L2-normalized
+on insert, so cosine similarity for a whole query is a single matrix-vector
+product followed by ``argpartition`` for top-k.
+
+The SQLite ``chunks.embedding`` BLOBs remain the source of truth. The
+``vector_rows`` table maps matrix rows to chunk ids; rows of deleted chunks
+are tombstoned and reclaimed by a rebuild once they dominate the matrix.
+"""
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None  # type: ignore[assignment]
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Minimum number of rows allocated in the sidecar file
+MIN_CAPACITY = 1024
+
+# Rebuild once this fraction of allocated rows are tombstones
+COMPACT_TOMBSTONE_RATIO = 0.5
+
+VECTOR_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS vector_rows (
+        row INTEGER PRIMARY KEY,
+        chunk_id TEXT NOT NULL UNIQUE,
+        source TEXT NOT NULL
+    );
+"""
+
+
+def select_top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Positions of the ``k`` highest scores, best first
+
+    Args:
+        scores: Score vector (masked entries set to ``-inf``)
+        k: Number of positions to return
+    """
+    if k <= 0 or len(scores) == 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < len(scores):
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+class VectorIndex:
+    """
+    Float32 embedding matrix with per-source masks
+
+    The caller owns the SQLite connection and commits; the index only issues
+    statements against ``vector_rows``/``meta`` and flushes the sidecar
+    before returning so a commit never references unwritten rows.
+    """
+
+    def __init__(self, db: sqlite3.Connection, path: Path):
+        """
+        Initialize vector index
+
+        Args:
+            db: Open connection to the memory index database
+            path: Sidecar file holding the embedding matrix
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError(
+                "numpy is required for the vector index. "
+                "Install with: pip install 'openclaw-python[memory]'"
+            )
+
+        self.db = db
+        self.path = path
+        self.dims: int | None = None
+        self.epoch = 0
+        self.changes = 0
+
+        self._lock = threading.RLock()
+        self._matrix: np.memmap | None = None
+        self._capacity = 0
+        self._count = 0
+        self._ids: list[str | None] = []
+        self._id_to_row: dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._source_codes = np.zeros(0, dtype=np.uint8)
+        self._source_names: dict[str, int] = {}
+        self._mask_cache: dict[frozenset[str] | None, np.ndarray] = {}
+
+        self.db.executescript(VECTOR_SCHEMA)
+        self.load()
+
+    # ========================================================================
+    # Properties
+    # ========================================================================
+
+    @property
+    def count(self) -> int:
+        """Number of live (non-tombstoned) vectors"""
+        return len(self._id_to_row)
+
+    @property
+    def tombstones(self) -> int:
+        """Number of allocated rows whose chunk was removed"""
+        return self._count - len(self._id_to_row)
+
+    @property
+    def size(self) -> int:
+        """Number of allocated rows, including tombstones"""
+        return self._count
+
+    @property
+    def lock(self) -> threading.RLock:
+        """Lock guarding the matrix and row mapping"""
+        return self._lock
+
+    def __contains__(self, chunk_id: str) -> bool:
+        return chunk_id in self._id_to_row
+
+    # ========================================================================
+    # Loading
+    # ========================================================================
+
+    def load(self) -> None:
+        """Load row mapping and map the sidecar, rebuilding if inconsistent"""
+        with self._lock:
+            dims_row = self.db.execute(
+                "SELECT value FROM meta WHERE key = 'vector_dims'"
+            ).fetchone()
+            dims = int(dims_row[0]) if dims_row else None
+            epoch_row = self.db.execute(
+                "SELECT value FROM meta WHERE key = 'vector_epoch'"
+            ).fetchone()
+            self.epoch = int(epoch_row[0]) if epoch_row else 0
+            rows = self.db.execute(
+                "SELECT row, chunk_id, source FROM vector_rows ORDER BY row"
+            ).fetchall()
+            expected = self.db.execute(
+                "SELECT COUNT(*) FROM chunks WHERE embedding IS NOT NULL"
+            ).fetchone()[0]
+
+            count = rows[-1][0] + 1 if rows else 0
+            consistent = len(rows) == expected and (
+                not rows
+                or (
+                    dims is not None
+                    and self.path.exists()
+                    and self.path.stat().st_size >= count * dims * 4
+                )
+            )
+            if not consistent:
+                logger.info(
+                    f"Vector index at {self.path} is stale "
+                    f"({len(rows)} rows, {expected} embeddings), rebuilding"
+                )
+                self.rebuild()
+                return
+
+            self.dims = dims
+            self._reset_arrays(count)
+            for row, chunk_id, source in rows:
+                self._ids[row] = chunk_id
+                self._id_to_row[chunk_id] = row
+                self._alive[row] = True
+                self._source_codes[row] = self._source_code(source)
+            if dims:
+                self._open_matrix(max(count, MIN_CAPACITY))
+
+    def rebuild(self) -> int:
+        """
+        Rebuild the matrix from ``chunks.embedding`` BLOBs
+
+        Returns:
+            Number of vectors indexed
+        """
+        with self._lock:
+            self._close_matrix()
+            if self.path.exists():
+                self.path.unlink()
+            self.db.execute("DELETE FROM vector_rows")
+
+            dims_row = self.db.execute(
+                "SELECT value FROM meta WHERE key = 'vector_dims'"
+            ).fetchone()
+            self.dims = int(dims_row[0]) if dims_row else None
+            self._bump_epoch()
+            self._reset_arrays(0)
+            if self.dims:
+                self._open_matrix(MIN_CAPACITY)
+
+            cursor = self.db.execute(
+                "SELECT id, source, embedding FROM chunks WHERE embedding IS NOT NULL"
+            )
+            total = 0
+            while True:
+                batch = cursor.fetchmany(4096)
+                if not batch:
+                    break
+                items = [
+                    (row[0], row[1], np.frombuffer(row[2], dtype=np.float32))
+                    for row in batch
+                ]
+                total += self._append(items)
+
+            self.db.commit()
+            return total
+
+    # ========================================================================
+    # Mutation
+    # ========================================================================
+
+    def add(self, items: Iterable[tuple[str, str, Sequence[float]]]) -> int:
+        """
+        Append or replace vectors
+
+        Args:
+            items: (chunk_id, source, embedding) tuples
+
+        Returns:
+            Number of vectors written
+        """
+        with self._lock:
+            prepared = [
+                (chunk_id, source, np.asarray(embedding, dtype=np.float32))
+                for chunk_id, source, embedding in items
+            ]
+            if not prepared:
+                return 0
+            self.remove(chunk_id for chunk_id, _, _ in prepared)
+            written = self._append(prepared)
+            self._maybe_compact()
+            return written
+
+    def remove(self, chunk_ids: Iterable[str]) -> int:
+        """
+        Tombstone vectors for the given chunks
+
+        Args:
+            chunk_ids: Chunk identifiers
+
+        Returns:
+            Number of rows tombstoned
+        """
+        with self._lock:
+            removed = []
+            for chunk_id in chunk_ids:
+                row = self._id_to_row.pop(chunk_id, None)
+                if row is None:
+                    continue
+                self._ids[row] = None
+                self._alive[row] = False
+                removed.append((row,))
+            if removed:
+                self.db.executemany("DELETE FROM vector_rows WHERE row = ?", removed)
+                self._mask_cache.clear()
+                self.changes += len(removed)
+            return len(removed)
+
+    def _append(self, items: list[tuple[str, str, np.ndarray]]) -> int:
+        """Write normalized rows at the end of the matrix"""
+        first_dims = len(items[0][2])
+        if self.dims is None or (self.dims != first_dims and not self._id_to_row):
+            self._set_dims(first_dims)
+
+        vectors = []
+        accepted = []
+        for chunk_id, source, vector in items:
+            if len(vector) != self.dims:
+                logger.warning(
+                    f"Skipping embedding for {chunk_id}: "
+                    f"{len(vector)} dims, index has {self.dims}"
+                )
+                continue
+            vectors.append(vector)
+            accepted.append((chunk_id, source))
+        if not accepted:
+            return 0
+
+        block = np.vstack(vectors).astype(np.float32, copy=False)
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        block = block / norms
+
+        start = self._count
+        end = start + len(accepted)
+        self._ensure_capacity(end)
+        self._matrix[start:end] = block
+        self._matrix.flush()
+
+        self._ids.extend(chunk_id for chunk_id, _ in accepted)
+        self._alive[start:end] = True
+        for offset, (chunk_id, source) in enumerate(accepted):
+            row = start + offset
+            self._id_to_row[chunk_id] = row
+            self._source_codes[row] = self._source_code(source)
+        self._count = end
+        self._mask_cache.clear()
+        self.changes += len(accepted)
+
+        self.db.executemany(
+            "INSERT OR REPLACE INTO vector_rows (row, chunk_id, source) VALUES (?, ?, ?)",
+            [(start + i, chunk_id, source) for i, (chunk_id, source) in enumerate(accepted)],
+        )
+        return len(accepted)
+
+    def _maybe_compact(self) -> None:
+        """Rebuild when tombstones dominate the matrix"""
+        if self._count < MIN_CAPACITY:
+            return
+        if self.tombstones / self._count >= COMPACT_TOMBSTONE_RATIO:
+            logger.info(f"Compacting vector index ({self.tombstones} tombstones)")
+            self.db.commit()
+            self.rebuild()
+
+    def _set_dims(self, dims: int) -> None:
+        """Reset the matrix for a new embedding dimension"""
+        if self.dims is not None and self.dims != dims:
+            logger.warning(f"Embedding dimension changed {self.dims} -> {dims}, resetting index")
+        self._close_matrix()
+        if self.path.exists():
+            self.path.unlink()
+        self.db.execute("DELETE FROM vector_rows")
+        self.db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('vector_dims', ?)",
+            [str(dims)],
+        )
+        self.dims = dims
+        self._bump_epoch()
+        self._reset_arrays(0)
+        self._open_matrix(MIN_CAPACITY)
+
+    def _bump_epoch(self) -> None:
+        """Record that row numbers were reassigned"""
+        self.epoch += 1
+        self.db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('vector_epoch', ?)",
+            [str(self.epoch)],
+        )
+
+    # ========================================================================
+    # Search
+    # ========================================================================
+
+    def search(
+        self,
+        query: Sequence[float],
+        limit: int,
+        sources: Iterable[str] | None = None,
+    ) -> list[tuple[str, float]]:
+        """
+        Find the most similar chunks
+
+        Args:
+            query: Query embedding
+            limit: Maximum number of hits
+            sources: Restrict to these source names
+
+        Returns:
+            (chunk_id, cosine similarity) pairs, best first
+        """
+        with self._lock:
+            q = self.normalize_query(query)
+            if q is None or limit <= 0:
+                return []
+
+            mask = self.live_mask(sources)
+            scores = self._matrix[: self._count] @ q
+            candidates = int(mask.sum())
+            if candidates < self._count:
+                scores = np.where(mask, scores, -np.inf)
+
+            top = select_top_k(scores, min(limit, candidates))
+            return [(self._ids[row], float(scores[row])) for row in top]
+
+    def normalize_query(self, query: Sequence[float]) -> np.ndarray | None:
+        """Unit-normalize a query, or None if it cannot match anything"""
+        if not self._id_to_row or self._matrix is None:
+            return None
+        q = np.asarray(query, dtype=np.float32)
+        if len(q) != self.dims:
+            return None
+        norm = float(np.linalg.norm(q))
+        if norm == 0:
+            return None
+        return q / norm
+
+    def matrix(self, rows: np.ndarray | None = None) -> np.ndarray:
+        """
+        Normalized vectors for allocated rows
+
+        Args:
+            rows: Row numbers to gather (all rows if omitted)
+        """
+        if self._matrix is None:
+            return np.zeros((0, self.dims or 0), dtype=np.float32)
+        if rows is None:
+            return self._matrix[: self._count]
+        return self._matrix[rows]
+
+    def chunk_ids(self, rows: Iterable[int]) -> list[str | None]:
+        """Chunk ids for row numbers (None for tombstones)"""
+        return [self._ids[row] for row in rows]
+
+    def live_mask(self, sources: Iterable[str] | None = None) -> np.ndarray:
+        """Live-row mask for a source filter, cached until the next mutation"""
+        key = frozenset(sources) if sources is not None else None
+        mask = self._mask_cache.get(key)
+        if mask is None:
+            alive = self._alive[: self._count]
+            if key is None:
+                mask = alive.copy()
+            else:
+                codes = [self._source_names[s] for s in key if s in self._source_names]
+                mask = alive & np.isin(self._source_codes[: self._count], codes)
+            self._mask_cache[key] = mask
+        return mask
+
+    # ========================================================================
+    # Storage
+    # ========================================================================
+
+    def _source_code(self, source: str) -> int:
+        code = self._source_names.get(source)
+        if code is None:
+            code = len(self._source_names)
+            self._source_names[source] = code
+        return code
+
+    def _reset_arrays(self, count: int) -> None:
+        self._count = count
+        self._ids = [None] * count
+        self._id_to_row = {}
+        self._alive = np.zeros(max(count, MIN_CAPACITY), dtype=bool)
+        self._source_codes = np.zeros(max(count, MIN_CAPACITY), dtype=np.uint8)
+        self._mask_cache.clear()
+
+    def _open_matrix(self, capacity: int) -> None:
+        """Map the sidecar file, growing it to ``capacity`` rows"""
+        self._close_matrix()
+        size = capacity * self.dims * 4
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+        self._matrix = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(capacity, self.dims))
+        self._capacity = capacity
+
+    def _ensure_capacity(self, rows: int) -> None:
+        if rows > self._capacity:
+            capacity = max(rows, self._capacity * 2, MIN_CAPACITY)
+            self._open_matrix(capacity)
+        if rows > len(self._alive):
+            grow = max(rows, len(self._alive) * 2) - len(self._alive)
+            self._alive = np.concatenate([self._alive, np.zeros(grow, dtype=bool)])
+            self._source_codes = np.concatenate(
+                [self._source_codes, np.zeros(grow, dtype=np.uint8)]
+            )
+
+    def _close_matrix(self) -> None:
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+            self._capacity = 0
+
+    def close(self) -> None:
+        """Flush and unmap the sidecar"""
+        with self._lock:
+            self._close_matrix()
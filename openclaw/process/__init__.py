@@ -2,10 +2,22 @@
 
 from .exec import exec_command, exec_command_stream
 from .spawn import spawn_process, SpawnedProcess
+from .supervisor import (
+    OutputLog,
+    ProcessSupervisor,
+    SupervisedProcess,
+    get_process_supervisor,
+    shutdown_process_supervisor,
+)
 
 __all__ = [
     "exec_command",
     "exec_command_stream",
     "spawn_process",
     "SpawnedProcess",
+    "ProcessSupervisor",
+    "SupervisedProcess",
+    "OutputLog",
+    "get_process_supervisor",
+    "shutdown_process_supervisor",
 ]
@@ -0,0 +1,518 @@
+"""Supervision of long-running background processes
+
+Every supervised process gets a reader task that drains its output (stdout
+and stderr merged, in order) into a fixed-size ring buffer, so a chatty
+child never blocks on a full pipe and never grows memory. Output is
+addressed by absolute byte offsets: ``read(since=offset)`` returns what was
+written after a previous read, and reports how much was lost if the ring
+wrapped in between. Optionally the output is also spilled to rotating log
+files.
+
+Exited processes are reaped automatically and kept for ``retention_sec``
+(bounded by ``max_exited``) so their final output can still be read.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import os
+import signal
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# Output kept in memory per process
+DEFAULT_LOG_BYTES = 1024 * 1024
+
+# How long exited processes stay readable, and how many are kept at most
+DEFAULT_RETENTION_SEC = 600.0
+DEFAULT_MAX_EXITED = 50
+
+# Spilled log file size before rotation, and rotated files kept
+DEFAULT_SPILL_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_SPILL_BACKUPS = 3
+
+_READ_CHUNK_BYTES = 64 * 1024
+
+
+class OutputLog:
+    """
+    Ring buffer of process output with absolute offsets
+
+    ``end_offset`` is the total number of bytes ever written;
+    ``start_offset`` is the oldest byte still held.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_LOG_BYTES,
+        spill_path: Path | None = None,
+        spill_max_bytes: int = DEFAULT_SPILL_MAX_BYTES,
+        spill_backups: int = DEFAULT_SPILL_BACKUPS,
+    ):
+        self.capacity = max(1, capacity)
+        self._buf = bytearray()
+        self.start_offset = 0
+        self.end_offset = 0
+
+        self.spill_path = spill_path
+        self.spill_max_bytes = spill_max_bytes
+        self.spill_backups = spill_backups
+        self._spill: BinaryIO | None = None
+        self._spill_size = 0
+
+    def write(self, data: bytes) -> None:
+        """Append output, dropping the oldest bytes beyond capacity"""
+        self.end_offset += len(data)
+        self._buf += data
+        excess = len(self._buf) - self.capacity
+        if excess > 0:
+            del self._buf[:excess]
+            self.start_offset += excess
+        if self.spill_path is not None:
+            self._spill_write(data)
+
+    def read(self, since: int = 0, max_bytes: int | None = None) -> tuple[bytes, int, int]:
+        """
+        Output written at or after offset ``since``
+
+        Args:
+            since: Absolute offset (``next_offset`` of a previous read)
+            max_bytes: Return at most this many bytes (the oldest ones)
+
+        Returns:
+            (data, next_offset, dropped) where dropped counts bytes after
+            ``since`` that were already overwritten
+        """
+        since = min(max(0, since), self.end_offset)
+        dropped = max(0, self.start_offset - since)
+        begin = max(since, self.start_offset) - self.start_offset
+        end = len(self._buf)
+        if max_bytes is not None:
+            end = min(end, begin + max_bytes)
+        return bytes(self._buf[begin:end]), self.start_offset + end, dropped
+
+    def tail(self, max_bytes: int | None = None, lines: int | None = None) -> bytes:
+        """Last ``max_bytes`` bytes and/or last ``lines`` lines held"""
+        data = memoryview(self._buf)
+        if max_bytes is not None:
+            data = data[-max_bytes:] if max_bytes > 0 else data[:0]
+        if lines is not None:
+            raw = data.tobytes()
+            # Ignore a trailing newline so "last N lines" means N full lines
+            cut = len(raw) - 1 if raw.endswith(b"\n") else len(raw)
+            for _ in range(max(0, lines)):
+                cut = raw.rfind(b"\n", 0, cut)
+                if cut < 0:
+                    return raw
+            return raw[cut + 1 :]
+        return data.tobytes()
+
+    def close(self) -> None:
+        """Close the spill file"""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    def _spill_write(self, data: bytes) -> None:
+        try:
+            if self._spill is None:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                self._spill = open(self.spill_path, "ab")
+                self._spill_size = self._spill.tell()
+            self._spill.write(data)
+            self._spill.flush()
+            self._spill_size += len(data)
+            if self._spill_size >= self.spill_max_bytes:
+                self._rotate_spill()
+        except OSError as e:
+            logger.warning(f"Disabling spill to {self.spill_path}: {e}")
+            self.close()
+            self.spill_path = None
+
+    def _rotate_spill(self) -> None:
+        """Shift <log>.N -> <log>.N+1, dropping the oldest, and start afresh"""
+        self.close()
+        path = self.spill_path
+        for index in range(self.spill_backups, 0, -1):
+            older = path.with_name(f"{path.name}.{index}")
+            newer = path.with_name(f"{path.name}.{index - 1}") if index > 1 else path
+            if newer.exists():
+                if index == self.spill_backups:
+                    older.unlink(missing_ok=True)
+                newer.replace(older)
+        if self.spill_backups <= 0:
+            path.unlink(missing_ok=True)
+        self._spill_size = 0
+
+
+@dataclass
+class SupervisedProcess:
+    """A background process and its captured output"""
+
+    process_id: str
+    command: str
+    process: asyncio.subprocess.Process
+    log: OutputLog
+    cwd: str | None = None
+    started_at: float = field(default_factory=time.time)
+    exited_at: float | None = None
+    _reader: asyncio.Task | None = field(default=None, repr=False)
+    _reaper: asyncio.Task | None = field(default=None, repr=False)
+    _ps: Any = field(default=None, repr=False)
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @property
+    def returncode(self) -> int | None:
+        return self.process.returncode
+
+    @property
+    def running(self) -> bool:
+        return self.exited_at is None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Status summary"""
+        return {
+            "process_id": self.process_id,
+            "pid": self.pid,
+            "command": self.command,
+            "running": self.running,
+            "return_code": self.returncode,
+            "started_at": self.started_at,
+            "exited_at": self.exited_at,
+            "output_bytes": self.log.end_offset,
+        }
+
+
+class ProcessSupervisor:
+    """
+    Start, observe and reap background processes
+
+    Features:
+    - Pipes drained continuously into per-process ring buffers
+    - Offset-based incremental reads and cheap tails
+    - Optional spill of output to rotating files
+    - Automatic reaping with bounded retention of exited processes
+    - CPU/RSS sampling including child processes
+    """
+
+    def __init__(
+        self,
+        log_bytes: int = DEFAULT_LOG_BYTES,
+        retention_sec: float = DEFAULT_RETENTION_SEC,
+        max_exited: int = DEFAULT_MAX_EXITED,
+        spill_dir: Path | str | None = None,
+        spill_max_bytes: int = DEFAULT_SPILL_MAX_BYTES,
+        spill_backups: int = DEFAULT_SPILL_BACKUPS,
+    ):
+        """
+        Initialize supervisor
+
+        Args:
+            log_bytes: In-memory output kept per process
+            retention_sec: How long exited processes stay readable
+            max_exited: Maximum exited processes kept
+            spill_dir: Also write output to ``<spill_dir>/<process_id>.log``
+            spill_max_bytes: Spill file size before rotation
+            spill_backups: Rotated spill files kept per process
+        """
+        self.log_bytes = log_bytes
+        self.retention_sec = retention_sec
+        self.max_exited = max_exited
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.spill_max_bytes = spill_max_bytes
+        self.spill_backups = spill_backups
+
+        self._processes: dict[str, SupervisedProcess] = {}
+        self._ids = itertools.count()
+
+    async def start(
+        self,
+        command: str,
+        process_id: str | None = None,
+        cwd: str | None = None,
+        env: dict[str, str] | None = None,
+    ) -> SupervisedProcess:
+        """
+        Start a shell command under supervision
+
+        Args:
+            command: Shell command
+            process_id: Identifier (generated if omitted)
+            cwd: Working directory
+            env: Environment variables
+
+        Returns:
+            The supervised process
+
+        Raises:
+            ValueError: If a running process already uses ``process_id``
+        """
+        self.reap()
+        if process_id is None:
+            process_id = self._next_id()
+        existing = self._processes.get(process_id)
+        if existing is not None:
+            if existing.running:
+                raise ValueError(f"Process '{process_id}' is already running")
+            self._forget(existing)
+
+        process = await asyncio.create_subprocess_shell(
+            command,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            cwd=cwd,
+            env=env,
+            # Own process group, so stop() also reaches the command's children
+            start_new_session=True,
+        )
+
+        spill_path = self.spill_dir / f"{process_id}.log" if self.spill_dir else None
+        log = OutputLog(self.log_bytes, spill_path, self.spill_max_bytes, self.spill_backups)
+        proc = SupervisedProcess(process_id=process_id, command=command, process=process, log=log, cwd=cwd)
+        proc._reader = asyncio.create_task(self._drain(proc))
+        proc._reaper = asyncio.create_task(self._reap_on_exit(proc))
+        self._processes[process_id] = proc
+
+        logger.info(f"Started supervised process '{process_id}' (PID: {process.pid})")
+        return proc
+
+    def get(self, process_id: str) -> SupervisedProcess | None:
+        """Look up a process (running or recently exited)"""
+        return self._processes.get(process_id)
+
+    def list_processes(self) -> list[SupervisedProcess]:
+        """All supervised processes, oldest first"""
+        self.reap()
+        return list(self._processes.values())
+
+    def read(
+        self,
+        process_id: str,
+        since: int | None = None,
+        tail_bytes: int | None = None,
+        tail_lines: int | None = None,
+        max_bytes: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        Read a process's output
+
+        With ``since`` returns output after that offset (up to ``max_bytes``);
+        otherwise returns the tail (``tail_lines`` / ``tail_bytes``, or all
+        that is held).
+
+        Raises:
+            KeyError: If the process is unknown
+        """
+        proc = self._processes[process_id]
+        log = proc.log
+        if since is not None:
+            data, next_offset, dropped = log.read(since, max_bytes)
+        else:
+            data = log.tail(tail_bytes, tail_lines)
+            next_offset, dropped = log.end_offset, 0
+        return {
+            "output": data.decode("utf-8", errors="replace"),
+            "next_offset": next_offset,
+            "dropped_bytes": dropped,
+            "running": proc.running,
+            "return_code": proc.returncode,
+        }
+
+    async def wait(self, process_id: str, timeout: float | None = None) -> int | None:
+        """
+        Wait for a process to exit and its output to be drained
+
+        Returns:
+            The exit code, or None if ``timeout`` expired first
+        """
+        proc = self._processes[process_id]
+        try:
+            await asyncio.wait_for(asyncio.shield(proc._reaper), timeout=timeout)
+        except TimeoutError:
+            return None
+        return proc.returncode
+
+    async def stop(self, process_id: str, timeout: float = 5.0) -> int | None:
+        """Terminate a process group, killing it if it outlives ``timeout``"""
+        proc = self._processes[process_id]
+        if proc.running:
+            self._signal(proc, signal.SIGTERM)
+            if await self.wait(process_id, timeout) is None:
+                self._signal(proc, signal.SIGKILL)
+                await self.wait(process_id)
+        return proc.returncode
+
+    async def kill(self, process_id: str) -> int | None:
+        """Kill a process group immediately"""
+        proc = self._processes[process_id]
+        if proc.running:
+            self._signal(proc, signal.SIGKILL)
+            await self.wait(process_id)
+        return proc.returncode
+
+    def remove(self, process_id: str) -> None:
+        """Forget an exited process and its output"""
+        proc = self._processes.get(process_id)
+        if proc is not None and not proc.running:
+            self._forget(proc)
+
+    def reap(self) -> int:
+        """
+        Drop exited processes past retention, oldest first
+
+        Returns:
+            Number of processes dropped
+        """
+        now = time.time()
+        exited = sorted(
+            (p for p in self._processes.values() if not p.running),
+            key=lambda p: p.exited_at,
+        )
+        excess = len(exited) - self.max_exited
+        dropped = 0
+        for index, proc in enumerate(exited):
+            if index < excess or now - proc.exited_at > self.retention_sec:
+                self._forget(proc)
+                dropped += 1
+        return dropped
+
+    def sample(self) -> dict[str, Any]:
+        """
+        CPU and memory of running processes, including their children
+
+        CPU percentages are measured since the previous ``sample()`` call
+        (the first call for a process reports 0.0).
+
+        Returns:
+            {"processes": {process_id: {...}}, "total": {...}}
+        """
+        per_process: dict[str, dict[str, Any]] = {}
+        total_cpu = 0.0
+        total_rss = 0
+        for proc in self._processes.values():
+            if not proc.running:
+                continue
+            cpu, rss, count = self._sample_tree(proc)
+            per_process[proc.process_id] = {
+                "pid": proc.pid,
+                "cpu_percent": round(cpu, 1),
+                "rss_bytes": rss,
+                "num_processes": count,
+            }
+            total_cpu += cpu
+            total_rss += rss
+        return {
+            "processes": per_process,
+            "total": {
+                "running": len(per_process),
+                "cpu_percent": round(total_cpu, 1),
+                "rss_bytes": total_rss,
+            },
+        }
+
+    async def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop every running process"""
+        running = [p.process_id for p in self._processes.values() if p.running]
+        await asyncio.gather(*(self.stop(pid, timeout) for pid in running), return_exceptions=True)
+        for proc in list(self._processes.values()):
+            self._forget(proc)
+
+    def _next_id(self) -> str:
+        while True:
+            process_id = f"proc-{next(self._ids)}"
+            if process_id not in self._processes:
+                return process_id
+
+    def _forget(self, proc: SupervisedProcess) -> None:
+        self._processes.pop(proc.process_id, None)
+        if proc._reader is not None and not proc._reader.done():
+            proc._reader.cancel()
+        proc.log.close()
+
+    def _signal(self, proc: SupervisedProcess, sig: int) -> None:
+        try:
+            os.killpg(proc.pid, sig)
+        except ProcessLookupError:
+            pass
+        except OSError:
+            proc.process.send_signal(sig)
+
+    def _sample_tree(self, proc: SupervisedProcess) -> tuple[float, int, int]:
+        """(cpu_percent, rss_bytes, process_count) for a process and its children"""
+        try:
+            if proc._ps is None:
+                proc._ps = {proc.pid: psutil.Process(proc.pid)}
+            root = proc._ps[proc.pid]
+            # Keep Process objects across samples so cpu_percent has a baseline
+            current = {proc.pid: root}
+            for child in root.children(recursive=True):
+                current[child.pid] = proc._ps.get(child.pid, child)
+            proc._ps = current
+        except psutil.Error:
+            return 0.0, 0, 0
+
+        cpu = 0.0
+        rss = 0
+        count = 0
+        for ps in current.values():
+            try:
+                with ps.oneshot():
+                    cpu += ps.cpu_percent(None)
+                    rss += ps.memory_info().rss
+                count += 1
+            except psutil.Error:
+                continue
+        return cpu, rss, count
+
+    async def _drain(self, proc: SupervisedProcess) -> None:
+        """Read the merged output pipe until EOF"""
+        stream = proc.process.stdout
+        try:
+            while True:
+                data = await stream.read(_READ_CHUNK_BYTES)
+                if not data:
+                    return
+                proc.log.write(data)
+        except Exception as e:
+            logger.warning(f"Output reader for '{proc.process_id}' failed: {e}")
+
+    async def _reap_on_exit(self, proc: SupervisedProcess) -> None:
+        """Record the exit and let the reader finish draining"""
+        await proc.process.wait()
+        if not proc._reader.done():
+            try:
+                # A background grandchild may keep the pipe open indefinitely
+                await asyncio.wait_for(asyncio.shield(proc._reader), timeout=1.0)
+            except TimeoutError:
+                pass
+        proc.exited_at = time.time()
+        logger.info(f"Process '{proc.process_id}' exited with code {proc.returncode}")
+
+
+# Global supervisor instance
+_supervisor: ProcessSupervisor | None = None
+
+
+def get_process_supervisor() -> ProcessSupervisor:
+    """Get global process supervisor instance"""
+    global _supervisor
+    if _supervisor is None:
+        _supervisor = ProcessSupervisor()
+    return _supervisor
+
+
+async def shutdown_process_supervisor() -> None:
+    """Stop every process started under the global supervisor"""
+    if _supervisor is not None:
+        await _supervisor.shutdown()
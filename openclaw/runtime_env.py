@@ -173,7 +173,7 @@ class RuntimeEnv:
         # If no custom prompt, build a proper one using the new architecture
         if not system_prompt:
             try:
-                from .agents.system_prompt import build_agent_system_prompt
+                from .agents.system_prompt import build_agent_system_prompt_parts
                 from .agents.system_prompt_bootstrap import load_bootstrap_files, format_bootstrap_context
                 from .agents.system_prompt_params import get_runtime_info
                 
@@ -192,7 +192,8 @@ class RuntimeEnv:
                 tool_names = [tool.name for tool in (tools or [])]
                 
                 # Build system prompt
-                system_prompt = build_agent_system_prompt(
+                # Split so the time section does not break provider prompt caching
+                system_prompt = build_agent_system_prompt_parts(
                     workspace_dir=self.workspace,
                     tool_names=tool_names,
                     prompt_mode="full",
@@ -200,7 +201,7 @@ class RuntimeEnv:
                     context_files=context_files,
                 )
                 
-                logger.debug(f"Built system prompt for {session_id} ({len(system_prompt)} chars)")
+                logger.debug(f"Built system prompt for {session_id} ({len(system_prompt.text)} chars)")
             except Exception as e:
                 logger.warning(f"Failed to build system prompt: {e}")
                 system_prompt = None
@@ -0,0 +1,165 @@
+"""
+Tests for the prefix-stable request layout used for provider prompt caching
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from openclaw.agents.prompt_cache import apply_cache_layout, stable_history_window
+from openclaw.agents.providers import AnthropicProvider, LLMMessage
+from openclaw.agents.system_prompt import build_agent_system_prompt, build_agent_system_prompt_parts
+
+
+class RecordingStream:
+    """Stands in for ``client.messages.stream``; yields no deltas"""
+
+    def __init__(self, usage):
+        self.usage = usage
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+    async def get_final_message(self):
+        return SimpleNamespace(content=[], stop_reason="end_turn", usage=self.usage)
+
+
+class RecordingClient:
+    """Records the request shape of every Anthropic call"""
+
+    def __init__(self):
+        self.requests = []
+        self.messages = self
+
+    def stream(self, **kwargs):
+        self.requests.append(kwargs)
+        usage = SimpleNamespace(
+            input_tokens=50,
+            output_tokens=10,
+            cache_read_input_tokens=1200 if len(self.requests) > 1 else 0,
+            cache_creation_input_tokens=0 if len(self.requests) > 1 else 1200,
+        )
+        return RecordingStream(usage)
+
+
+def conversation(turns: int) -> list[SimpleNamespace]:
+    messages = [SimpleNamespace(role="system", content="prompt")]
+    for i in range(turns):
+        messages.append(SimpleNamespace(role="user", content=f"u{i}"))
+        messages.append(SimpleNamespace(role="assistant", content=f"a{i}"))
+    return messages
+
+
+class TestHistoryWindow:
+    """Block truncation keeps the history prefix stable"""
+
+    def test_short_history_is_untouched(self):
+        """Test nothing is dropped below the limit"""
+        messages = conversation(5)
+        assert stable_history_window(messages, limit=20) == messages
+
+    def test_cut_point_moves_in_blocks(self):
+        """Test the first kept message changes once per step, within the limit"""
+        firsts = []
+        for turns in range(10, 40):
+            window = stable_history_window(conversation(turns), limit=20, step=10)
+            assert window[0].role == "system"
+            assert 10 < len(window) - 1 <= 20
+            firsts.append(window[1].content)
+
+        changes = sum(1 for a, b in zip(firsts, firsts[1:]) if a != b)
+        assert changes <= len(firsts) * 2 // 10 + 1
+
+
+class TestCacheLayout:
+    """Breakpoints and placement of per-call content"""
+
+    def test_caching_provider(self):
+        """Test breakpoints after the system prompt and history, note last"""
+        messages = [
+            LLMMessage(role="system", content="stable"),
+            LLMMessage(role="user", content="hi"),
+            LLMMessage(role="assistant", content="hello"),
+            LLMMessage(role="user", content="now"),
+        ]
+
+        laid_out = apply_cache_layout(messages, "time: 12:00", supports_caching=True)
+
+        assert [m.cache_breakpoint for m in laid_out] == [True, False, False, True, False]
+        assert laid_out[-1].role == "system" and laid_out[-1].content == "time: 12:00"
+        assert not messages[0].cache_breakpoint
+
+    def test_non_caching_provider(self):
+        """Test the note is folded into the system prompt otherwise"""
+        messages = [LLMMessage(role="system", content="stable"), LLMMessage(role="user", content="hi")]
+
+        laid_out = apply_cache_layout(messages, "time", supports_caching=False)
+
+        assert [m.role for m in laid_out] == ["system", "user"]
+        assert laid_out[0].content == "stable\ntime"
+        assert not any(m.cache_breakpoint for m in laid_out)
+
+
+class TestSystemPromptParts:
+    """Stable prefix vs volatile suffix"""
+
+    def test_time_is_volatile(self, tmp_path):
+        """Test the prefix is identical across calls and excludes the time"""
+        first = build_agent_system_prompt_parts(workspace_dir=tmp_path, tool_names=["read_file"])
+        second = build_agent_system_prompt_parts(workspace_dir=tmp_path, tool_names=["read_file"])
+
+        assert first.stable == second.stable
+        assert "## Current Date & Time" not in first.stable
+        assert "## Current Date & Time" in first.volatile
+        joined = build_agent_system_prompt(workspace_dir=tmp_path, tool_names=["read_file"])
+        assert joined.startswith(first.stable)
+        assert "## Current Date & Time" in joined
+
+
+class TestAnthropicRequestShape:
+    """Request shapes sent to Anthropic across turns"""
+
+    async def _turn(self, provider, history, note):
+        messages = apply_cache_layout(
+            [LLMMessage(role=m.role, content=m.content) for m in history],
+            note,
+            provider.supports_prompt_caching,
+        )
+        return [response async for response in provider.stream(messages)]
+
+    @pytest.mark.asyncio
+    async def test_prefix_is_stable_across_turns(self):
+        """Test turn N's cached prefix is a prefix of turn N+1's request"""
+        provider = AnthropicProvider("claude-sonnet-4-5", api_key="test")
+        client = provider._client = RecordingClient()
+        history = conversation(2)[:-1]
+
+        await self._turn(provider, history, "time: 12:00")
+        history += [SimpleNamespace(role="assistant", content="a1"), SimpleNamespace(role="user", content="u2")]
+        responses = await self._turn(provider, history, "time: 12:01")
+
+        first, second = client.requests
+        assert first["system"] == second["system"]
+        assert first["system"][-1]["cache_control"] == {"type": "ephemeral"}
+        # The note trails the cached part and is not carried into later turns
+        assert first["messages"][-1]["content"][0]["text"] == "time: 12:00"
+        cached = first["messages"][:-1]
+        assert cached[-1]["content"][-1]["cache_control"] == {"type": "ephemeral"}
+        assert [m["role"] for m in second["messages"][: len(cached)]] == [m["role"] for m in cached]
+        assert [m["content"] for m in second["messages"][: len(cached) - 1]] == [
+            m["content"] for m in cached[:-1]
+        ]
+        assert responses[-1].usage == {
+            "input_tokens": 50,
+            "output_tokens": 10,
+            "cache_read_tokens": 1200,
+            "cache_write_tokens": 0,
+        }
@@ -0,0 +1,342 @@
+"""
+Tests for the warm sandbox pool, exec channel and docker lookup caches
+
+A fake ``docker`` script on PATH keeps container state in files and runs
+``docker exec`` commands with the local ``sh``, so the exec channel agent
+really runs.
+"""
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from openclaw.agents.sandbox import (
+    DockerSandbox,
+    DockerSandboxConfig,
+    SandboxPool,
+    SandboxRegistry,
+    docker_container_state,
+    get_sandbox_pool,
+    invalidate_docker_cache,
+)
+from openclaw.agents.sandbox import pool as pool_module
+from openclaw.agents.sandbox.constants import HOT_CONTAINER_WINDOW_MS
+from openclaw.config.schema import ClawdbotConfig
+
+FAKE_DOCKER = r'''#!{python}
+import os, sys, time
+state = os.environ["FAKE_DOCKER_STATE"]
+args = sys.argv[1:]
+with open(os.path.join(state, "calls.log"), "a") as log:
+    log.write(" ".join(args[:2]) + "\n")
+
+def path(kind, name):
+    return os.path.join(state, kind + "-" + name.replace("/", "_").replace(":", "_"))
+
+def fail(message):
+    sys.stderr.write(message + "\n")
+    sys.exit(1)
+
+cmd = args[0]
+if cmd == "image":
+    if not os.path.exists(path("image", args[2])):
+        fail("Error: No such image: " + args[2])
+elif cmd in ("pull", "tag"):
+    open(path("image", args[-1]), "w").close()
+elif cmd == "run":
+    time.sleep(float(os.environ.get("FAKE_DOCKER_RUN_DELAY", "0")))
+    name = args[args.index("--name") + 1]
+    with open(path("container", name), "w") as f:
+        f.write("true")
+    print(name)
+elif cmd == "inspect":
+    if not os.path.exists(path("container", args[-1])):
+        fail("Error: No such object: " + args[-1])
+    print(open(path("container", args[-1])).read())
+elif cmd == "stop":
+    if os.path.exists(path("container", args[1])):
+        with open(path("container", args[1]), "w") as f:
+            f.write("false")
+elif cmd == "rm":
+    if os.path.exists(path("container", args[1])):
+        os.remove(path("container", args[1]))
+elif cmd == "exec":
+    interactive = args[1] == "-i"
+    rest = args[2:] if interactive else args[1:]
+    if not os.path.exists(path("container", rest[0])):
+        fail("Error: No such container: " + rest[0])
+    if interactive and os.environ.get("FAKE_DOCKER_NO_CHANNEL"):
+        sys.exit(127)
+    if "kill -9 -1" in rest[-1]:
+        # The reset command would kill the test runner here
+        sys.exit(0)
+    os.execvp(rest[1], rest[1:])
+'''
+
+
+def docker_calls(state: Path, prefix: str) -> int:
+    log = state / "calls.log"
+    if not log.exists():
+        return 0
+    return sum(1 for line in log.read_text().splitlines() if line.startswith(prefix))
+
+
+@pytest.fixture
+def fake_docker(tmp_path, monkeypatch):
+    """Put the fake docker on PATH; returns its state directory"""
+    bin_dir = tmp_path / "bin"
+    state = tmp_path / "state"
+    bin_dir.mkdir()
+    state.mkdir()
+    script = bin_dir / "docker"
+    script.write_text(FAKE_DOCKER.replace("{python}", sys.executable))
+    script.chmod(0o755)
+    (state / "image-openclaw_sandbox_default").touch()
+
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_DOCKER_STATE", str(state))
+    invalidate_docker_cache()
+    yield state
+    invalidate_docker_cache()
+
+
+class TestExecChannel:
+    """Commands over one long-lived docker exec"""
+
+    @pytest.mark.asyncio
+    async def test_commands_share_one_exec(self, fake_docker):
+        """Test results are intact and only one docker exec is forked"""
+        sandbox = DockerSandbox(DockerSandboxConfig())
+        await sandbox.start()
+        try:
+            first = await sandbox.exec_command("echo hello; echo oops >&2; exit 3")
+            second = await sandbox.exec_command("printf 'a\\nb'; printf 'it''s'")
+            third = await sandbox.exec_command("cat; echo done")
+        finally:
+            await sandbox.stop()
+
+        assert first == {"stdout": "hello\n", "stderr": "oops\n", "exit_code": 3, "success": False}
+        assert second["stdout"] == "a\nbits"
+        # Commands get /dev/null as stdin, not the protocol stream
+        assert third["stdout"] == "done\n"
+        assert docker_calls(fake_docker, "exec") == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_commands(self, fake_docker):
+        """Test commands overlapping a busy channel use one-shot exec"""
+        sandbox = DockerSandbox(DockerSandboxConfig())
+        await sandbox.start()
+        try:
+            results = await asyncio.gather(
+                *(sandbox.exec_command(f"sleep 0.1; echo {i}") for i in range(3))
+            )
+        finally:
+            await sandbox.stop()
+
+        assert [r["stdout"] for r in results] == ["0\n", "1\n", "2\n"]
+
+    @pytest.mark.asyncio
+    async def test_timeout_reopens_channel(self, fake_docker):
+        """Test a timed-out command doesn't poison later ones"""
+        sandbox = DockerSandbox(DockerSandboxConfig())
+        await sandbox.start()
+        try:
+            timed_out = await sandbox.exec_command("sleep 5", timeout_ms=200)
+            after = await sandbox.exec_command("echo ok")
+        finally:
+            await sandbox.stop()
+
+        assert timed_out["exit_code"] == 124
+        assert after["stdout"] == "ok\n"
+
+    @pytest.mark.asyncio
+    async def test_falls_back_without_agent(self, fake_docker, monkeypatch):
+        """Test images that cannot run the agent use docker exec"""
+        monkeypatch.setenv("FAKE_DOCKER_NO_CHANNEL", "1")
+        sandbox = DockerSandbox(DockerSandboxConfig())
+        await sandbox.start()
+        try:
+            first = await sandbox.exec_command("echo one")
+            second = await sandbox.exec_command("echo two")
+        finally:
+            await sandbox.stop()
+
+        assert (first["stdout"], second["stdout"]) == ("one\n", "two\n")
+        # One failed channel attempt, then plain exec per command
+        assert docker_calls(fake_docker, "exec -i") == 1
+
+
+class TestDockerCaches:
+    """Image and container state lookups"""
+
+    @pytest.mark.asyncio
+    async def test_image_lookup_cached(self, fake_docker):
+        """Test repeated starts inspect the image once until invalidated"""
+        sandboxes = [DockerSandbox(DockerSandboxConfig()) for _ in range(3)]
+        for sandbox in sandboxes:
+            await sandbox.start()
+        assert docker_calls(fake_docker, "image inspect") == 1
+
+        invalidate_docker_cache(image=DockerSandboxConfig().image)
+        await DockerSandbox(DockerSandboxConfig()).start()
+        assert docker_calls(fake_docker, "image inspect") == 2
+
+    @pytest.mark.asyncio
+    async def test_state_follows_own_lifecycle(self, fake_docker):
+        """Test start/stop update the cached state without inspecting"""
+        sandbox = DockerSandbox(DockerSandboxConfig())
+        name = await sandbox.start()
+
+        assert await docker_container_state(name) == {"exists": True, "running": True}
+        await sandbox.stop()
+        assert await docker_container_state(name) == {"exists": False, "running": False}
+        assert docker_calls(fake_docker, "inspect") == 0
+        assert (await docker_container_state(name, use_cache=False))["exists"] is False
+
+
+class TestSandboxPool:
+    """Warm checkout, reuse and expiry"""
+
+    @pytest.mark.asyncio
+    async def test_acquire_release_reuse(self, fake_docker, tmp_path):
+        """Test the first acquire warms a spare and released sandboxes are reused"""
+        pool = SandboxPool(min_idle=1, max_idle=2)
+        config = DockerSandboxConfig()
+
+        first = await pool.acquire(config, tmp_path)
+        await asyncio.gather(*pool._tasks)
+        second = await pool.acquire(config, tmp_path)
+        await pool.release(first)
+        await asyncio.gather(*pool._tasks)
+
+        stats = pool.stats()
+        assert (stats["misses"], stats["hits"], stats["released"]) == (1, 1, 1)
+        assert first is not second
+        assert list(stats["idle"].values()) == [2]
+        idle = [s for _, s in pool._keys[pool.pool_key(config, tmp_path)].idle]
+        assert first in idle
+        assert await pool.acquire(config, tmp_path) in idle
+
+        await pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_keys_include_workspace(self, fake_docker, tmp_path):
+        """Test a warm container is never handed to another workspace"""
+        pool = SandboxPool(min_idle=0)
+        config = DockerSandboxConfig()
+
+        sandbox = await pool.acquire(config, tmp_path / "a")
+        await pool.release(sandbox)
+        other = await pool.acquire(config, tmp_path / "b")
+
+        assert other is not sandbox
+        assert other.workspace_dir == tmp_path / "b"
+        await pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_dead_and_expired_containers_dropped(self, fake_docker):
+        """Test stopped idle containers are skipped and idle ones expire"""
+        pool = SandboxPool(min_idle=0, idle_ttl_sec=0)
+        config = DockerSandboxConfig()
+        await pool.prewarm(config, count=2)
+        dead, alive = [s for _, s in pool._keys[pool.pool_key(config)].idle]
+        (fake_docker / f"container-{alive.container_name}").write_text("false")
+        invalidate_docker_cache(container=alive.container_name)
+
+        assert await pool.acquire(config) is dead
+        assert pool.stats()["discarded"] == 1
+
+        await pool.release(dead)
+        assert await pool.prune() == 1
+        assert list(pool.stats()["idle"].values()) == [0]
+
+    @pytest.mark.asyncio
+    async def test_registry_draws_from_pool(self, fake_docker):
+        """Test the registry takes new containers from its pool"""
+        pool = SandboxPool(min_idle=0)
+        config = DockerSandboxConfig()
+        await pool.prewarm(config, count=1)
+        registry = SandboxRegistry(pool=pool)
+
+        await registry.get_or_create(config)
+
+        assert pool.stats()["hits"] == 1
+        await registry.cleanup_all()
+
+    @pytest.mark.asyncio
+    async def test_registry_idle_time_counts_against_ttl(self, fake_docker):
+        """Test a container retired after the hot window is not parked again"""
+        pool = SandboxPool(min_idle=0)
+        registry = SandboxRegistry(pool=pool)
+        config = DockerSandboxConfig()
+        sandbox = await registry.get_or_create(config)
+        registry._containers[sandbox.container_name].last_used_ms -= HOT_CONTAINER_WINDOW_MS + 1000
+
+        await registry.cleanup_old_containers()
+
+        assert pool.stats()["discarded"] == 1
+        assert list(pool.stats()["idle"].values()) == [0]
+        await pool.release(DockerSandbox(config), reset=False, idle_sec=pool.idle_ttl_sec - 1)
+        assert await pool.prune() == 0
+        await registry.cleanup_all()
+
+    def test_global_pool_takes_config(self, monkeypatch):
+        """Test the sandbox.pool config sizes the shared pool"""
+        monkeypatch.setattr(pool_module, "_pool", None)
+        config = ClawdbotConfig(sandbox={"pool": {"minIdle": 2, "maxIdle": 1, "idleTtlSec": 60}})
+        pool_config = config.sandbox.pool
+
+        pool = get_sandbox_pool(
+            min_idle=pool_config.min_idle,
+            max_idle=pool_config.max_idle,
+            idle_ttl_sec=pool_config.idle_ttl_sec,
+        )
+
+        assert (pool.min_idle, pool.max_idle, pool.idle_ttl_sec) == (2, 2, 60)
+        assert get_sandbox_pool() is pool
+
+
+@pytest.mark.slow
+class TestSandboxPoolBenchmark:
+    """Cold vs warm start and exec latency against the fake docker"""
+
+    @pytest.mark.asyncio
+    async def test_warm_start_and_exec_latency(self, fake_docker, monkeypatch):
+        """Compare cold vs warm acquire and one-shot vs channel exec"""
+        monkeypatch.setenv("FAKE_DOCKER_RUN_DELAY", "0.5")
+        pool = SandboxPool(min_idle=1)
+        config = DockerSandboxConfig()
+
+        start = time.perf_counter()
+        cold = await pool.acquire(config)
+        cold_sec = time.perf_counter() - start
+        await asyncio.gather(*pool._tasks)
+        start = time.perf_counter()
+        warm = await pool.acquire(config)
+        warm_sec = time.perf_counter() - start
+
+        n = 50
+        oneshot = DockerSandbox(config, persistent_exec=False)
+        oneshot.container_name, oneshot._started = cold.container_name, True
+        start = time.perf_counter()
+        for _ in range(n):
+            await oneshot.exec_command("true")
+        oneshot_ms = (time.perf_counter() - start) / n * 1000
+        await warm.exec_command("true")
+        start = time.perf_counter()
+        for _ in range(n):
+            await warm.exec_command("true")
+        channel_ms = (time.perf_counter() - start) / n * 1000
+
+        print(
+            f"\nacquire: cold {cold_sec * 1000:.0f} ms, warm {warm_sec * 1000:.1f} ms; "
+            f"exec: one-shot {oneshot_ms:.1f} ms, channel {channel_ms:.1f} ms"
+        )
+        assert warm_sec < cold_sec / 5
+        assert channel_ms < oneshot_ms
+        await pool.shutdown()
+        await cold.stop()
+        await warm.stop()
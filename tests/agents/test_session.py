@@ -212,6 +212,135 @@ class TestPersistence:
         assert len(session2.messages) == 0
 
 
+class TestJournal:
+    """Test append-only journal persistence."""
+    
+    def test_messages_appended_to_journal(self, test_session):
+        """Test that later messages are journaled instead of rewriting the snapshot."""
+        test_session.add_user_message("Message 1")
+        snapshot = test_session._session_file.read_text()
+        
+        test_session.add_assistant_message("Response 1")
+        test_session.set_metadata("key", "value")
+        
+        assert test_session._session_file.read_text() == snapshot
+        lines = test_session._journal_file.read_text().splitlines()
+        assert len(lines) == 2
+    
+    def test_journal_replayed_on_load(self, temp_workspace):
+        """Test that snapshot plus journal reconstructs the session."""
+        session1 = Session(session_id="journal-load", workspace_dir=temp_workspace)
+        session1.add_user_message("Message 1")
+        session1.add_assistant_message("Response 1")
+        session1.set_metadata("key", "value")
+        
+        session2 = Session(session_id="journal-load", workspace_dir=temp_workspace)
+        
+        assert [m.content for m in session2.messages] == ["Message 1", "Response 1"]
+        assert session2.get_metadata("key") == "value"
+    
+    def test_compaction_folds_journal(self, temp_workspace):
+        """Test that compaction moves journal entries into the snapshot."""
+        session = Session(
+            session_id="journal-compact", workspace_dir=temp_workspace, compact_threshold=5
+        )
+        for i in range(12):
+            session.add_user_message(f"Message {i}")
+        session.flush()
+        
+        assert not session._journal_file.exists()
+        reloaded = Session(session_id="journal-compact", workspace_dir=temp_workspace)
+        assert len(reloaded.messages) == 12
+    
+    def test_delete_while_compaction_pending(self, temp_workspace):
+        """Test that a queued compaction doesn't rewrite a deleted session."""
+        import threading
+
+        from openclaw.agents.session import SessionManager, _compaction_executor
+
+        manager = SessionManager(temp_workspace)
+        session = manager.get_session("journal-delete")
+        session._compact_threshold = 2
+        # Keep the compaction worker busy so the session's compaction stays queued
+        release = threading.Event()
+        blocker = _compaction_executor.submit(release.wait, 5)
+        for i in range(3):
+            session.add_user_message(f"Message {i}")
+        assert session._compaction_pending
+
+        manager.delete_session("journal-delete")
+        release.set()
+        blocker.result()
+        _compaction_executor.submit(lambda: None).result()
+
+        assert not session._session_file.exists()
+        assert not session._journal_file.exists()
+
+    def test_crash_between_snapshot_and_journal_rename(self, temp_workspace):
+        """Test that entries already in the snapshot are not replayed twice."""
+        session = Session(session_id="journal-crash", workspace_dir=temp_workspace)
+        session.add_user_message("Message 1")
+        session.add_user_message("Message 2")
+        journal = session._journal_file.read_text()
+        session.flush()
+        # Simulate a crash after the snapshot rename but before the journal rewrite
+        session._journal_file.write_text(journal)
+        
+        reloaded = Session(session_id="journal-crash", workspace_dir=temp_workspace)
+        
+        assert [m.content for m in reloaded.messages] == ["Message 1", "Message 2"]
+    
+    def test_torn_journal_tail_ignored(self, temp_workspace):
+        """Test that a partially written last line is dropped on load."""
+        session = Session(session_id="journal-torn", workspace_dir=temp_workspace)
+        session.add_user_message("Message 1")
+        session.add_user_message("Message 2")
+        with open(session._journal_file, "a") as f:
+            f.write('{"seq": 3, "op": "mess')
+        
+        reloaded = Session(session_id="journal-torn", workspace_dir=temp_workspace)
+        reloaded.add_user_message("Message 3")
+        
+        final = Session(session_id="journal-torn", workspace_dir=temp_workspace)
+        assert [m.content for m in final.messages] == ["Message 1", "Message 2", "Message 3"]
+    
+    def test_legacy_json_migrates_transparently(self, temp_workspace):
+        """Test that a pre-journal session file is used as the base snapshot."""
+        legacy = Session(session_id="legacy", workspace_dir=temp_workspace, journal=False)
+        legacy.add_user_message("Old message")
+        assert not legacy._journal_file.exists()
+        
+        session = Session(session_id="legacy", workspace_dir=temp_workspace)
+        session.add_user_message("New message")
+        
+        reloaded = Session(session_id="legacy", workspace_dir=temp_workspace)
+        assert [m.content for m in reloaded.messages] == ["Old message", "New message"]
+
+
+@pytest.mark.slow
+class TestJournalPerformance:
+    """Benchmark journal write cost."""
+    
+    def test_constant_per_message_write_cost(self, temp_workspace):
+        """Test that appending message 10k costs about the same as message 1k."""
+        import time
+        
+        session = Session(session_id="journal-bench", workspace_dir=temp_workspace)
+        timings = []
+        for i in range(10_000):
+            start = time.perf_counter()
+            session.add_user_message(f"Message {i} " + "x" * 200)
+            timings.append(time.perf_counter() - start)
+        session.close()
+        
+        early = sorted(timings[500:1500])[500]
+        late = sorted(timings[-1000:])[500]
+        print(f"\nmedian write: msg ~1k {early * 1e6:.0f}us, msg ~10k {late * 1e6:.0f}us")
+        
+        assert late < early * 3
+        assert len(Session(session_id="journal-bench", workspace_dir=temp_workspace).messages) == 10_000
+
+
 class TestMessageModel:
     """Test Message model."""
     
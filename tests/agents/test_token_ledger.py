@@ -0,0 +1,168 @@
+"""
+Tests for the per-session token ledger
+"""
+import time
+
+import pytest
+
+from openclaw.agents import session as session_module
+from openclaw.agents.compaction import TokenAnalyzer
+from openclaw.agents.context import ContextManager
+from openclaw.agents.session import Message, Session
+
+
+class WordTokenizer:
+    """One token per whitespace-separated word"""
+
+    def encode(self, text: str) -> list[str]:
+        return text.split()
+
+
+def recount(session: Session, analyzer: TokenAnalyzer | None = None) -> int:
+    analyzer = analyzer or TokenAnalyzer()
+    return analyzer.estimate_messages_tokens(session.get_messages_for_api())
+
+
+def fill(session: Session, turns: int) -> None:
+    for i in range(turns):
+        session.add_user_message(f"question {i} " * 10)
+        session.add_assistant_message(f"answer {i} " * 30)
+
+
+class TestTokenLedger:
+    """Running totals through appends, reloads and compaction"""
+
+    def test_running_total_matches_recount(self, tmp_path):
+        """Test the ledger equals a full recount after appends"""
+        session = Session("s", tmp_path)
+        fill(session, 5)
+        session.add_tool_message("call-1", "tool output " * 50, name="read")
+
+        assert session.token_count == recount(session)
+
+    def test_messages_are_counted_once(self, tmp_path):
+        """Test each message is tokenized once however often the total is read"""
+        calls = []
+        analyzer = TokenAnalyzer()
+
+        def counter(message):
+            calls.append(message["content"])
+            return analyzer.count_message_tokens(message)
+
+        session = Session("s", tmp_path)
+        session.set_token_counter(counter)
+        fill(session, 3)
+        for _ in range(10):
+            session.token_count
+
+        assert len(calls) == 6
+
+    def test_reload_replays_journal(self, tmp_path):
+        """Test a session loaded from snapshot plus journal is counted"""
+        session = Session("s", tmp_path)
+        fill(session, 4)
+        expected = session.token_count
+        session.close()
+
+        reloaded = Session("s", tmp_path)
+
+        assert reloaded.token_count == expected
+
+    def test_loading_is_not_counted(self, tmp_path, monkeypatch):
+        """Test opening a session defers tokenizing until the total is read"""
+        session = Session("s", tmp_path)
+        fill(session, 4)
+        session.close()
+        calls = []
+        monkeypatch.setattr(session_module, "_default_token_counter", lambda m: calls.append(m) or 1)
+
+        reloaded = Session("s", tmp_path)
+        assert calls == []
+
+        assert reloaded.token_count == 8
+        assert len(calls) == 8
+
+    def test_replace_messages(self, tmp_path):
+        """Test compaction replaces the total and persists the new history"""
+        session = Session("s", tmp_path)
+        fill(session, 5)
+        before = session.token_count
+
+        session.replace_messages(session.messages[-2:])
+        session.add_user_message("next")
+
+        assert session.token_count < before
+        assert session.token_count == recount(session)
+        assert Session("s", tmp_path).token_count == session.token_count
+
+    def test_direct_assignment_is_detected(self, tmp_path):
+        """Test assigning or clearing messages outside the API is recounted"""
+        session = Session("s", tmp_path)
+        fill(session, 2)
+
+        session.messages = [Message(role="user", content="hi")]
+        assert session.token_count == recount(session)
+
+        session.clear()
+        assert session.token_count == 0
+
+    def test_switching_tokenizer_recounts(self, tmp_path):
+        """Test a real tokenizer replaces estimates for the whole history"""
+        session = Session("s", tmp_path)
+        session.add_user_message("one two three")
+        analyzer = TokenAnalyzer("custom", tokenizer=WordTokenizer())
+
+        session.set_token_counter(analyzer.count_message_tokens)
+        session.add_assistant_message("four five")
+
+        assert analyzer.has_tokenizer
+        assert session.token_count == (4 + 3) + (4 + 2)
+        assert session.token_count == recount(session, analyzer)
+
+
+class TestContextBudget:
+    """Per-session windows fed from the ledger"""
+
+    def test_remaining_budget(self, tmp_path):
+        """Test the manager reports remaining tokens per session"""
+        manager = ContextManager(1000)
+        session = Session("s", tmp_path)
+        session.add_user_message("x" * 400)
+
+        window = manager.update_session("s", session.token_count)
+
+        assert manager.remaining_tokens("s") == 1000 - session.token_count
+        assert not window.should_compress
+        assert manager.update_session("s", 900).should_compress
+        assert manager.remaining_tokens("other") == 1000
+
+    def test_window_override(self):
+        """Test a per-session window size"""
+        manager = ContextManager(1000)
+
+        window = manager.update_session("s", 100, max_tokens=200000)
+
+        assert window.total_tokens == 200000
+        assert manager.remaining_tokens("s") == 199900
+
+
+@pytest.mark.slow
+def test_token_ledger_benchmark(tmp_path):
+    """Benchmark: context check on a 2000-message session, recount vs ledger."""
+    session = Session("bench", tmp_path)
+    fill(session, 1000)
+    analyzer = TokenAnalyzer()
+
+    started = time.perf_counter()
+    for _ in range(100):
+        full = analyzer.estimate_messages_tokens(session.get_messages_for_api())
+    scan = (time.perf_counter() - started) / 100
+
+    started = time.perf_counter()
+    for _ in range(100):
+        ledger = session.token_count
+    lookup = (time.perf_counter() - started) / 100
+
+    print(f"\n2000 messages: full recount {scan * 1e6:.0f}us, ledger {lookup * 1e6:.2f}us")
+    assert ledger == full
+    assert lookup < scan
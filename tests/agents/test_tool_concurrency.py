@@ -0,0 +1,219 @@
+"""
+Tests for concurrent execution of concurrency-safe tool calls
+"""
+
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from openclaw.agents.agent_loop import AgentLoop, AgentOptions
+from openclaw.agents.events import AgentEventType, EventEmitter
+from openclaw.agents.providers.base import LLMResponse
+from openclaw.agents.runtime import MultiProviderRuntime
+from openclaw.agents.session import Session
+from openclaw.agents.tools.base import AgentTool
+from openclaw.agents.tools.concurrency import batch_tool_calls, is_concurrency_safe, run_batch
+
+
+@dataclass
+class FakeResult:
+    success: bool
+    content: str
+    error: str | None = None
+
+
+class SleepTool(AgentTool):
+    """Records overlap while sleeping for ``params["delay"]`` seconds"""
+
+    def __init__(self, name: str, safe: bool, tracker: dict):
+        super().__init__()
+        self.name = name
+        self.description = name
+        self.concurrency_safe = safe
+        self.tracker = tracker
+
+    def get_schema(self):
+        return {"type": "object", "properties": {}}
+
+    async def execute(self, params):
+        self.tracker["active"] += 1
+        self.tracker["peak"] = max(self.tracker["peak"], self.tracker["active"])
+        try:
+            await asyncio.sleep(params.get("delay", 0.02))
+            if params.get("fail"):
+                raise RuntimeError("boom")
+            return FakeResult(success=True, content=f"{self.name}:{params.get('n')}")
+        finally:
+            self.tracker["active"] -= 1
+
+
+class TestBatching:
+    """Test batch planning"""
+
+    def test_safe_runs_are_grouped(self):
+        """Test consecutive safe calls share a batch and unsafe ones stand alone"""
+        calls = ["r1", "r2", "w1", "r3", "w2", "w3", "r4", "r5"]
+
+        batches = batch_tool_calls(calls, lambda c: c.startswith("r"))
+
+        assert batches == [["r1", "r2"], ["w1"], ["r3"], ["w2"], ["w3"], ["r4", "r5"]]
+
+    def test_unknown_tool_is_unsafe(self):
+        """Test a missing tool never joins a concurrent batch"""
+        assert not is_concurrency_safe(None)
+        assert not is_concurrency_safe(object())
+
+    @pytest.mark.asyncio
+    async def test_run_batch_is_bounded_and_ordered(self):
+        """Test results keep batch order under the concurrency bound"""
+        active = peak = 0
+
+        async def run(n):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01 * (5 - n))
+            active -= 1
+            if n == 2:
+                raise ValueError("two")
+            return n
+
+        results = await run_batch([0, 1, 2, 3, 4], run, max_parallel=2)
+
+        assert peak == 2
+        assert results[:2] == [0, 1]
+        assert isinstance(results[2], ValueError)
+        assert results[3:] == [3, 4]
+
+
+class TestAgentLoopTools:
+    """Test AgentLoop.execute_tool_calls with concurrency-safe tools"""
+
+    def _loop(self, tracker, max_parallel=8):
+        tools = [
+            SleepTool("read", True, tracker),
+            SleepTool("write", False, tracker),
+        ]
+        emitter = EventEmitter()
+        events = []
+        for event_type in (AgentEventType.TOOL_EXECUTION_START, AgentEventType.TOOL_EXECUTION_END):
+            emitter.on(event_type, lambda e: events.append((e.type, e.payload["tool_call_id"])))
+        loop = AgentLoop(
+            provider=None,
+            tools=tools,
+            event_emitter=emitter,
+            options=AgentOptions(max_parallel_tools=max_parallel),
+        )
+        return loop, events
+
+    @pytest.mark.asyncio
+    async def test_safe_calls_overlap(self):
+        """Test five read calls take about one call's latency"""
+        tracker = {"active": 0, "peak": 0}
+        loop, events = self._loop(tracker)
+        calls = [
+            {"id": f"c{i}", "name": "read", "params": {"n": i, "delay": 0.05 * (5 - i)}}
+            for i in range(5)
+        ]
+
+        started = asyncio.get_running_loop().time()
+        await loop.execute_tool_calls(calls)
+        elapsed = asyncio.get_running_loop().time() - started
+
+        assert tracker["peak"] == 5
+        assert elapsed < 0.4
+        assert [m.tool_call_id for m in loop.state.messages] == [f"c{i}" for i in range(5)]
+        assert [m.content for m in loop.state.messages] == [f"read:{i}" for i in range(5)]
+        assert events == (
+            [(AgentEventType.TOOL_EXECUTION_START, f"c{i}") for i in range(5)]
+            + [(AgentEventType.TOOL_EXECUTION_END, f"c{i}") for i in range(5)]
+        )
+
+    @pytest.mark.asyncio
+    async def test_side_effecting_calls_stay_serial(self):
+        """Test unsafe calls never overlap, even with safe neighbours"""
+        tracker = {"active": 0, "peak": 0}
+        loop, events = self._loop(tracker)
+        calls = [
+            {"id": "w1", "name": "write", "params": {}},
+            {"id": "w2", "name": "write", "params": {}},
+            {"id": "r1", "name": "read", "params": {"n": 1}},
+        ]
+
+        await loop.execute_tool_calls(calls)
+
+        assert tracker["peak"] == 1
+        assert [m.tool_call_id for m in loop.state.messages] == ["w1", "w2", "r1"]
+        assert [call_id for _, call_id in events] == ["w1", "w1", "w2", "w2", "r1", "r1"]
+
+    @pytest.mark.asyncio
+    async def test_failures_and_bound(self):
+        """Test a failing call is reported in place and the bound holds"""
+        tracker = {"active": 0, "peak": 0}
+        loop, _ = self._loop(tracker, max_parallel=2)
+        calls = [
+            {"id": "c0", "name": "read", "params": {"n": 0}},
+            {"id": "c1", "name": "read", "params": {"n": 1, "fail": True}},
+            {"id": "c2", "name": "missing", "params": {}},
+            {"id": "c3", "name": "read", "params": {"n": 3}},
+            {"id": "c4", "name": "read", "params": {"n": 4}},
+            {"id": "c5", "name": "read", "params": {"n": 5}},
+        ]
+
+        await loop.execute_tool_calls(calls)
+
+        assert tracker["peak"] == 2
+        contents = [m.content for m in loop.state.messages]
+        assert contents[0] == "read:0"
+        assert contents[1] == "Error: boom"
+        assert "not found" in contents[2]
+        assert contents[3:] == ["read:3", "read:4", "read:5"]
+
+
+class ScriptedProvider:
+    """Requests ``calls`` in its first reply, then answers in text"""
+
+    supports_prompt_caching = False
+
+    def __init__(self, calls: list[dict]):
+        self.calls = calls
+        self.requests = 0
+
+    async def stream(self, messages, tools=None, max_tokens=None, **kwargs):
+        self.requests += 1
+        if self.requests == 1:
+            yield LLMResponse(type="tool_call", content=None, tool_calls=self.calls)
+        else:
+            yield LLMResponse(type="text_delta", content="done")
+        yield LLMResponse(type="done", content=None)
+
+
+class TestRuntimeTools:
+    """Test MultiProviderRuntime.run_turn with concurrency-safe tools"""
+
+    @pytest.mark.asyncio
+    async def test_safe_calls_overlap_in_order(self, tmp_path):
+        """Test read calls of one turn overlap and report in call order"""
+        tracker = {"active": 0, "peak": 0}
+        tools = [SleepTool("read", True, tracker), SleepTool("write", False, tracker)]
+        calls = [
+            {"id": f"c{i}", "name": "read", "arguments": {"n": i, "delay": 0.05 * (5 - i)}}
+            for i in range(5)
+        ] + [{"id": "w", "name": "write", "arguments": {"n": 5}}]
+        runtime = MultiProviderRuntime(
+            "openai/gpt-4o", api_key="test", enable_context_management=False
+        )
+        runtime.provider = ScriptedProvider(calls)
+        session = Session("s", tmp_path)
+
+        started = asyncio.get_running_loop().time()
+        events = [event async for event in runtime.run_turn(session, "go", tools=tools)]
+        elapsed = asyncio.get_running_loop().time() - started
+
+        assert tracker["peak"] == 5
+        assert elapsed < 0.5
+        assert len([e for e in events if e.type == "tool_result"]) == 6
+        tool_messages = [m for m in session.messages if m.role == "tool"]
+        assert [m.tool_call_id for m in tool_messages] == [f"c{i}" for i in range(5)] + ["w"]
+        assert [m.content for m in tool_messages] == [f"read:{i}" for i in range(5)] + ["write:5"]
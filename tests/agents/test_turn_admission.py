@@ -0,0 +1,163 @@
+"""
+Tests for streaming turn admission
+"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from openclaw.agents.queuing import OverflowPolicy, QueueFullError, QueueManager, TurnAdmission
+
+
+async def _settle():
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+class Turn:
+    """A turn that holds its admission until released."""
+
+    def __init__(self, admission: TurnAdmission, session_id: str, log: list[str], message: str = "hi"):
+        self.release = asyncio.Event()
+        self.ticket = None
+        self.followups: list[str] = []
+        self.task = asyncio.create_task(self._run(admission, session_id, log, message))
+
+    async def _run(self, admission, session_id, log, message):
+        async with admission.admit(session_id, message) as ticket:
+            self.ticket = ticket
+            if ticket.coalesced:
+                return
+            log.append(f"{session_id}:{message}")
+            await self.release.wait()
+            self.followups = ticket.take_followups()
+
+
+class TestTurnAdmission:
+    """Per-session serialization, global cap and overflow policies."""
+
+    @pytest.mark.asyncio
+    async def test_session_turns_run_one_at_a_time(self):
+        admission = TurnAdmission(max_concurrent=4)
+        log: list[str] = []
+
+        first = Turn(admission, "s1", log, "a")
+        second = Turn(admission, "s1", log, "b")
+        await _settle()
+        assert log == ["s1:a"]
+        assert admission.waiting == 1
+
+        first.release.set()
+        await _settle()
+        assert log == ["s1:a", "s1:b"]
+
+        second.release.set()
+        await asyncio.gather(first.task, second.task)
+        assert admission.active == 0
+        assert not admission.is_busy("s1")
+
+    @pytest.mark.asyncio
+    async def test_global_slots_are_fair_across_sessions(self):
+        admission = TurnAdmission(max_concurrent=1)
+        log: list[str] = []
+
+        turns = [Turn(admission, "busy", log, "1")]
+        await _settle()
+        # "busy" queues two more turns before "other" arrives
+        turns.append(Turn(admission, "busy", log, "2"))
+        turns.append(Turn(admission, "busy", log, "3"))
+        turns.append(Turn(admission, "other", log, "1"))
+        await _settle()
+
+        for turn in turns:
+            turn.release.set()
+            await _settle()
+        await asyncio.gather(*(t.task for t in turns))
+
+        assert log == ["busy:1", "other:1", "busy:2", "busy:3"]
+        stats = admission.get_stats()
+        assert stats["admitted"] == 4
+        assert stats["max_wait_ms"] > 0
+
+    @pytest.mark.asyncio
+    async def test_reject_policy(self):
+        admission = TurnAdmission(overflow=OverflowPolicy.REJECT)
+        log: list[str] = []
+        running = Turn(admission, "s1", log)
+        await _settle()
+
+        with pytest.raises(QueueFullError):
+            async with admission.admit("s1", "again"):
+                pass
+        async with admission.admit("s2", "fine"):
+            pass
+
+        running.release.set()
+        await running.task
+        assert admission.get_stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_followup_policy_coalesces_messages(self):
+        admission = TurnAdmission(overflow="followup")
+        log: list[str] = []
+        running = Turn(admission, "s1", log, "first")
+        await _settle()
+
+        late = [Turn(admission, "s1", log, m) for m in ("second", "third")]
+        await asyncio.gather(*(t.task for t in late))
+        assert all(t.ticket.coalesced for t in late)
+
+        running.release.set()
+        await running.task
+        assert running.followups == ["second", "third"]
+        assert log == ["s1:first"]
+        assert admission.get_stats()["coalesced"] == 2
+
+    @pytest.mark.asyncio
+    async def test_max_waiting_rejects(self):
+        admission = TurnAdmission(max_concurrent=1, max_waiting=1)
+        log: list[str] = []
+        running = Turn(admission, "s1", log)
+        queued = Turn(admission, "s2", log)
+        await _settle()
+
+        with pytest.raises(QueueFullError):
+            async with admission.admit("s3"):
+                pass
+
+        running.release.set()
+        queued.release.set()
+        await asyncio.gather(running.task, queued.task)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        admission = TurnAdmission(max_concurrent=1)
+        log: list[str] = []
+        running = Turn(admission, "s1", log)
+        queued = Turn(admission, "s2", log)
+        await _settle()
+
+        queued.task.cancel()
+        await _settle()
+        running.release.set()
+        await running.task
+
+        assert admission.active == 0
+        assert admission.waiting == 0
+        async with admission.admit("s3"):
+            assert admission.active == 1
+
+
+class TestQueueManagerTurns:
+    """QueueManager exposes turn admission."""
+
+    @pytest.mark.asyncio
+    async def test_admit_and_stats(self):
+        manager = QueueManager(max_concurrent_global=2)
+
+        async with manager.admit("s1", "hello") as ticket:
+            assert not ticket.coalesced
+            assert manager.get_stats()["turns"]["active"] == 1
+
+        assert manager.get_stats()["turns"]["admitted"] == 1
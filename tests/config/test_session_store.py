@@ -0,0 +1,237 @@
+"""Tests for the cached, indexed session store."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from openclaw.agents.session_entry import SessionEntry
+from openclaw.config.sessions import store as store_module
+from openclaw.config.sessions.store import (
+    clear_session_store_cache_for_test,
+    get_session_store_index,
+    load_session_store,
+    save_session_store,
+    update_session_store,
+    update_session_store_async,
+)
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    """Temporary sessions.json path with a clean cache."""
+    clear_session_store_cache_for_test()
+    yield tmp_path / "sessions.json"
+    clear_session_store_cache_for_test()
+
+
+def _seed(store_path, count=5):
+    store = {
+        f"agent:main:dm:{i}": SessionEntry(
+            session_id=f"s{i}",
+            updated_at=1000 + i,
+            label="even" if i % 2 == 0 else None,
+            spawned_by="agent:main:main" if i == 3 else None,
+        )
+        for i in range(count)
+    }
+    store["agent:other:main"] = SessionEntry(session_id="o1", updated_at=500)
+    save_session_store(store_path, store)
+    return store
+
+
+def test_cached_load_does_not_reparse(store_path, monkeypatch):
+    """Unchanged files are served from the cache."""
+    _seed(store_path)
+    load_session_store(store_path, skip_cache=True)
+
+    calls = []
+    original = store_module._read_record
+    monkeypatch.setattr(store_module, "_read_record", lambda p: calls.append(p) or original(p))
+
+    load_session_store(store_path)
+    load_session_store(store_path)
+    assert calls == []
+
+
+def test_external_write_invalidates_cache(store_path):
+    """A rewrite by another process changes the inode/mtime and is picked up."""
+    _seed(store_path)
+    assert load_session_store(store_path)["agent:main:dm:0"].session_id == "s0"
+
+    raw = json.loads(store_path.read_text())
+    raw["agent:main:dm:0"]["session_id"] = "replaced"
+    tmp = store_path.with_name("external.tmp")
+    tmp.write_text(json.dumps(raw))
+    tmp.replace(store_path)
+
+    assert load_session_store(store_path)["agent:main:dm:0"].session_id == "replaced"
+
+
+def test_loaded_view_mutation_does_not_leak_into_cache(store_path):
+    """Callers may add/remove keys on the returned dict without touching the cache."""
+    _seed(store_path)
+    view = load_session_store(store_path)
+    del view["agent:main:dm:0"]
+
+    assert view.index is None
+    assert "agent:main:dm:0" in load_session_store(store_path)
+
+
+def test_loaded_entry_mutation_does_not_leak_into_cache(store_path):
+    """Entries read from a view are private copies."""
+    store = _seed(store_path)
+    view = load_session_store(store_path)
+    view["agent:main:dm:0"].label = "changed"
+    for entry in view.values():
+        entry.updated_at = 0
+    store["agent:main:dm:1"].label = "saved-then-changed"
+
+    fresh = load_session_store(store_path)
+    assert fresh["agent:main:dm:0"].label == "even"
+    assert fresh["agent:main:dm:1"].label is None
+    assert fresh["agent:main:dm:4"].updated_at == 1004
+    assert fresh.index is not None
+
+
+def test_lock_taken_over_is_not_removed(store_path):
+    """Releasing a lock broken as stale leaves the new holder's lock alone."""
+    lock_path = store_path.with_name("sessions.json.lock")
+
+    with store_module._store_lock(store_path):
+        lock_path.unlink()
+        lock_path.write_text("4242 other-writer\n")
+
+    assert lock_path.read_text() == "4242 other-writer\n"
+    lock_path.unlink()
+    with store_module._store_lock(store_path):
+        assert lock_path.exists()
+    assert not lock_path.exists()
+
+
+def test_camel_case_entries_are_accepted(store_path):
+    """Stores written by the TypeScript gateway use camelCase keys."""
+    store_path.write_text(json.dumps({
+        "agent:main:main": {"sessionId": "abc", "updatedAt": 42, "spawnedBy": "agent:main:x"}
+    }))
+
+    entry = load_session_store(store_path)["agent:main:main"]
+    assert entry.session_id == "abc"
+    assert entry.spawned_by == "agent:main:x"
+
+
+def test_index_buckets_are_newest_first(store_path):
+    """Secondary indexes are sorted by updated_at descending."""
+    _seed(store_path)
+    index = get_session_store_index(store_path)
+
+    assert index.by_updated[0] == "agent:main:dm:4"
+    assert index.by_updated[-1] == "agent:other:main"
+    assert index.by_label["even"] == ["agent:main:dm:4", "agent:main:dm:2", "agent:main:dm:0"]
+    assert index.by_spawned_by["agent:main:main"] == ["agent:main:dm:3"]
+    assert index.by_agent["other"] == ["agent:other:main"]
+    assert index.candidates(agent_id="main", label="even") == index.by_label["even"]
+
+
+def test_failed_mutator_leaves_store_unchanged(store_path):
+    """A mutator that raises does not leave partial changes behind."""
+    _seed(store_path)
+
+    def bad(store):
+        store["agent:main:dm:0"].label = "partial"
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        update_session_store(store_path, bad)
+
+    assert load_session_store(store_path)["agent:main:dm:0"].label == "even"
+    assert load_session_store(store_path, skip_cache=True)["agent:main:dm:0"].label == "even"
+
+
+def test_update_copies_only_entries_it_touches(store_path):
+    """Untouched entries carry over to the next cached generation without a copy."""
+    _seed(store_path)
+    key = store_module._cache_key(store_path)
+    untouched = store_module._cache[key].store["agent:main:dm:3"]
+
+    updated = store_module.update_session_store_entry(
+        store_path, "agent:main:dm:0", {"label": "patched"}
+    )
+    updated.label = "changed-after-return"
+
+    assert store_module._cache[key].store["agent:main:dm:3"] is untouched
+    assert load_session_store(store_path)["agent:main:dm:0"].label == "patched"
+    assert load_session_store(store_path, skip_cache=True)["agent:main:dm:0"].label == "patched"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_async_updates_are_batched(store_path, monkeypatch):
+    """Concurrent patches coalesce into far fewer writes than callers."""
+    _seed(store_path)
+    writes = []
+    original = store_module._write_store_atomic
+    monkeypatch.setattr(
+        store_module, "_write_store_atomic", lambda p, s: writes.append(1) or original(p, s)
+    )
+
+    def make_mutator(i):
+        def mutator(store):
+            store[f"agent:main:new:{i}"] = SessionEntry(session_id=f"n{i}", updated_at=2000 + i)
+            return i
+        return mutator
+
+    results = await asyncio.gather(
+        *(update_session_store_async(store_path, make_mutator(i)) for i in range(50))
+    )
+
+    assert results == list(range(50))
+    assert len(writes) < 50
+    final = load_session_store(store_path, skip_cache=True)
+    assert all(f"agent:main:new:{i}" in final for i in range(50))
+
+
+@pytest.mark.asyncio
+async def test_async_update_error_isolated(store_path):
+    """One failing mutator in a batch does not fail its neighbours."""
+    _seed(store_path)
+
+    def ok(store):
+        store["agent:main:ok"] = SessionEntry(session_id="ok", updated_at=1)
+
+    def bad(store):
+        store["agent:main:bad"] = SessionEntry(session_id="bad", updated_at=1)
+        raise RuntimeError("nope")
+
+    results = await asyncio.gather(
+        update_session_store_async(store_path, ok),
+        update_session_store_async(store_path, bad),
+        return_exceptions=True,
+    )
+
+    assert results[0] is None
+    assert isinstance(results[1], RuntimeError)
+    final = load_session_store(store_path, skip_cache=True)
+    assert "agent:main:ok" in final
+    assert "agent:main:bad" not in final
+
+
+@pytest.mark.slow
+def test_cached_load_benchmark(store_path):
+    """Benchmark: cached load of 20k sessions is far cheaper than a parse."""
+    store = {
+        f"agent:main:dm:{i}": SessionEntry(session_id=f"s{i}", updated_at=i) for i in range(20_000)
+    }
+    save_session_store(store_path, store)
+
+    start = time.perf_counter()
+    load_session_store(store_path, skip_cache=True)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(10):
+        load_session_store(store_path)
+    warm = (time.perf_counter() - start) / 10
+
+    print(f"\ncold load {cold * 1000:.1f}ms, cached load {warm * 1000:.2f}ms")
+    assert warm < cold / 10
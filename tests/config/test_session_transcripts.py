@@ -0,0 +1,131 @@
+"""Tests for transcript summaries used by sessions.list."""
+
+import json
+import time
+
+import pytest
+
+from openclaw.agents.session_entry import SessionEntry
+from openclaw.config.sessions import transcripts as transcripts_module
+from openclaw.config.sessions.store import (
+    clear_session_store_cache_for_test,
+    load_session_store,
+    save_session_store,
+)
+from openclaw.config.sessions.transcripts import (
+    clear_transcript_summary_cache_for_test,
+    compact_transcript,
+    get_transcript_summary,
+    read_first_user_message,
+    read_last_message_preview,
+    write_transcript_line,
+)
+from openclaw.gateway.session_utils import SessionsListOptions, list_sessions_from_store
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    """Temporary sessions.json path with clean caches."""
+    clear_session_store_cache_for_test()
+    clear_transcript_summary_cache_for_test()
+    yield tmp_path / "sessions.json"
+    clear_session_store_cache_for_test()
+    clear_transcript_summary_cache_for_test()
+
+
+def _message(role, text):
+    return {"type": "message", "message": {"role": role, "content": [{"type": "text", "text": text}]}}
+
+
+def test_legacy_transcript_summary_built_lazily(store_path):
+    """Transcripts without a sidecar are summarized on first read."""
+    transcript = store_path.parent / "s1.jsonl"
+    lines = [
+        {"type": "session", "id": "s1"},
+        {"role": "user", "content": "What is the weather?"},
+        {"role": "assistant", "content": "Sunny."},
+    ]
+    transcript.write_text("".join(json.dumps(line) + "\n" for line in lines))
+
+    summary = get_transcript_summary("s1", store_path)
+
+    assert summary.message_count == 2
+    assert summary.first_user_message == "What is the weather?"
+    assert summary.last_message_preview == "Sunny."
+    assert (store_path.parent / "s1.jsonl.summary").exists()
+
+
+def test_append_updates_summary_without_rereading(store_path, monkeypatch):
+    """Appends through write_transcript_line update the cached summary in place."""
+    transcript = store_path.parent / "s1.jsonl"
+    write_transcript_line(transcript, _message("user", "Hello"))
+    assert read_first_user_message("s1", store_path) == "Hello"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("transcript should not be re-read")
+
+    monkeypatch.setattr(transcripts_module, "_iter_transcript_lines", fail)
+    write_transcript_line(transcript, _message("assistant", "Hi there"))
+
+    assert read_last_message_preview("s1", store_path) == "Hi there"
+    assert get_transcript_summary("s1", store_path).message_count == 2
+
+
+def test_external_append_parses_only_tail(store_path):
+    """Lines appended by another writer are folded in from the old offset."""
+    transcript = store_path.parent / "s1.jsonl"
+    write_transcript_line(transcript, _message("user", "First"))
+    get_transcript_summary("s1", store_path)
+
+    with open(transcript, "a") as f:
+        f.write(json.dumps(_message("assistant", "Second")) + "\n")
+
+    summary = get_transcript_summary("s1", store_path)
+    assert summary.message_count == 2
+    assert summary.first_user_message == "First"
+    assert summary.last_message_preview == "Second"
+
+
+def test_compaction_rebuilds_summary(store_path):
+    """Rewriting the transcript invalidates its summary."""
+    transcript = store_path.parent / "s1.jsonl"
+    for i in range(5):
+        write_transcript_line(transcript, _message("user", f"Message {i}"))
+    get_transcript_summary("s1", store_path)
+
+    result = compact_transcript("s1", store_path, keep_lines=2)
+
+    assert result["removed_lines"] == 3
+    summary = get_transcript_summary("s1", store_path)
+    assert summary.message_count == 2
+    assert summary.first_user_message == "Message 3"
+
+
+@pytest.mark.slow
+def test_sessions_list_with_previews_benchmark(store_path):
+    """Benchmark: sessions.list over 10k sessions with both preview flags on."""
+    store = {}
+    for i in range(10_000):
+        session_id = f"session-{i}"
+        store[f"agent:main:dm:{i}"] = SessionEntry(session_id=session_id, updated_at=i)
+        with open(store_path.parent / f"{session_id}.jsonl", "w") as f:
+            f.write(json.dumps({"type": "session", "id": session_id}) + "\n")
+            f.write(json.dumps({"role": "user", "content": f"Question {i}"}) + "\n")
+            f.write(json.dumps({"role": "assistant", "content": f"Answer {i}"}) + "\n")
+    save_session_store(store_path, store)
+
+    opts = SessionsListOptions(add_derived_titles=True, add_last_message_preview=True)
+
+    start = time.perf_counter()
+    cold = list_sessions_from_store(str(store_path), load_session_store(store_path), opts)
+    cold_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    warm = list_sessions_from_store(str(store_path), load_session_store(store_path), opts)
+    warm_s = time.perf_counter() - start
+
+    print(f"\nsessions.list 10k rows: cold {cold_s * 1000:.0f}ms, warm {warm_s * 1000:.0f}ms")
+    assert warm.count == cold.count == 10_000
+    assert warm.sessions[0].derived_title == "Question 9999"
+    assert warm.sessions[0].last_message_preview == "Answer 9999"
+    assert warm_s < cold_s
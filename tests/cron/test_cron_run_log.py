@@ -0,0 +1,129 @@
+"""
+Tests for the segmented cron run log
+"""
+import json
+import time
+
+import pytest
+
+from openclaw.cron.store import CronRunLog
+
+
+def run(i: int) -> dict:
+    return {"timestamp": f"t{i}", "status": "success", "n": i}
+
+
+class TestCronRunLog:
+    """Append, rotation and tail reads"""
+
+    def test_append_and_read(self, tmp_path):
+        """Test entries come back oldest first, limited to the tail"""
+        log = CronRunLog(tmp_path, "job", max_entries=10)
+        for i in range(5):
+            log.append(run(i))
+
+        assert [e["n"] for e in log.read()] == [0, 1, 2, 3, 4]
+        assert [e["n"] for e in log.read(limit=2)] == [3, 4]
+
+    def test_rotation_bounds_storage(self, tmp_path):
+        """Test old runs are dropped by rotating segments"""
+        log = CronRunLog(tmp_path, "job", max_entries=10)
+        for i in range(35):
+            log.append(run(i))
+
+        # 30..34 in the active segment, 20..29 in the previous one
+        assert not (tmp_path / "job.2.jsonl").exists()
+        lines = sum(
+            len(p.read_text().splitlines()) for p in (log.log_path, log.prev_path)
+        )
+        assert lines == 15
+        assert [e["n"] for e in log.read()] == list(range(25, 35))
+        assert [e["n"] for e in log.read(limit=7)] == list(range(28, 35))
+        assert [e["n"] for e in log.read(limit=100)] == list(range(25, 35))
+
+    def test_new_instances_share_counts(self, tmp_path):
+        """Test a fresh instance per append (as the service does) still rotates"""
+        for i in range(25):
+            CronRunLog(tmp_path, "job", max_entries=10).append(run(i))
+
+        assert [e["n"] for e in CronRunLog(tmp_path, "job", max_entries=10).read()] == list(
+            range(15, 25)
+        )
+
+    def test_external_changes_are_recounted(self, tmp_path):
+        """Test an active segment written elsewhere is counted before rotating"""
+        log = CronRunLog(tmp_path, "job", max_entries=5)
+        log.append(run(0))
+        with open(log.log_path, "a") as f:
+            for i in range(1, 4):
+                f.write(json.dumps(run(i)) + "\n")
+
+        log.append(run(4))
+
+        assert not log.log_path.exists()
+        assert [e["n"] for e in log.read()] == [0, 1, 2, 3, 4]
+
+    def test_long_entries_span_blocks(self, tmp_path):
+        """Test tail reads across several read blocks"""
+        log = CronRunLog(tmp_path, "job", max_entries=50)
+        for i in range(40):
+            log.append({**run(i), "summary": "x" * 1000})
+
+        assert [e["n"] for e in log.read(limit=20)] == list(range(20, 40))
+
+    def test_block_edges(self, tmp_path, monkeypatch):
+        """Test tail reads when line boundaries fall exactly on block edges"""
+        log = CronRunLog(tmp_path, "job", max_entries=1000)
+        for i in range(200):
+            log.append({"n": i})
+        lines = log.log_path.read_bytes().splitlines()
+
+        for block in range(1, 24):
+            monkeypatch.setattr(CronRunLog, "_TAIL_BLOCK", block)
+            for count in range(1, 6):
+                assert log._tail_lines(log.log_path, count) == lines[-count:], (block, count)
+
+    def test_line_counts_bounded(self, tmp_path, monkeypatch):
+        """Test the shared line-count cache evicts the least recently used"""
+        monkeypatch.setattr(CronRunLog, "_line_counts", type(CronRunLog._line_counts)())
+        monkeypatch.setattr(CronRunLog, "_MAX_LINE_COUNTS", 3)
+        for job in ("a", "b", "c", "d"):
+            CronRunLog(tmp_path, job).append(run(0))
+
+        assert list(CronRunLog._line_counts) == [tmp_path / f"{job}.jsonl" for job in "bcd"]
+
+    def test_clear(self, tmp_path):
+        """Test clearing removes both segments"""
+        log = CronRunLog(tmp_path, "job", max_entries=3)
+        for i in range(5):
+            log.append(run(i))
+
+        log.clear()
+
+        assert log.read() == []
+        log.append(run(9))
+        assert [e["n"] for e in log.read()] == [9]
+
+
+@pytest.mark.slow
+def test_run_log_benchmark(tmp_path):
+    """Benchmark: a job firing every minute for two months."""
+    runs = 60 * 24 * 60
+    log = CronRunLog(tmp_path, "job", max_entries=100)
+    entry = {"timestamp": "2026-01-01T00:00:00+00:00", "duration_ms": 1234, "status": "success",
+             "error": None, "summary": "Daily digest sent to 3 channels"}
+
+    started = time.perf_counter()
+    for _ in range(runs):
+        log.append(entry)
+    append = (time.perf_counter() - started) / runs
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        entries = log.read(limit=50)
+    read = (time.perf_counter() - started) / 1000
+
+    print(f"\n{runs} runs: append {append * 1e6:.1f}us, read(limit=50) {read * 1e6:.0f}us")
+    assert len(entries) == 50
+    on_disk = sum(p.stat().st_size for p in tmp_path.iterdir())
+    assert on_disk < 2 * 100 * 200
@@ -0,0 +1,256 @@
+"""
+Tests for the heap-based cron timer and concurrent job dispatch
+"""
+import asyncio
+import random
+import time
+from datetime import UTC, datetime
+
+import pytest
+
+from openclaw.cron import CronService, MisfirePolicy
+from openclaw.cron.timer import CronTimer
+from openclaw.cron.types import CronJob, EverySchedule, SystemEventPayload
+
+
+def now_ms() -> int:
+    return int(datetime.now(UTC).timestamp() * 1000)
+
+
+def make_job(job_id: str, next_run_ms: int, interval_ms: int = 60_000, agent_id: str | None = None) -> CronJob:
+    job = CronJob(
+        id=job_id,
+        name=job_id,
+        agent_id=agent_id,
+        schedule=EverySchedule(interval_ms=interval_ms, type="every"),
+        payload=SystemEventPayload(kind="systemEvent", text=job_id),
+    )
+    job.state.next_run_ms = next_run_ms
+    return job
+
+
+async def wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+class TestCronTimer:
+    """Heap scheduling"""
+
+    @pytest.mark.asyncio
+    async def test_add_update_remove(self):
+        """Test incremental changes keep the earliest job on top"""
+        timer = CronTimer(on_timer_callback=None)
+        base = now_ms() + 60_000
+        jobs = [make_job(f"j{i}", base + i * 1000) for i in range(5)]
+        timer.arm_timer(jobs)
+        assert timer._peek() == base
+
+        jobs[0].state.next_run_ms = base + 10_000
+        timer.schedule_job(jobs[0])
+        assert timer._peek() == base + 1000
+
+        timer.unschedule_job("j1")
+        assert timer._peek() == base + 2000
+
+        jobs[4].enabled = False
+        timer.schedule_job(jobs[4])
+        assert timer.get_status()["scheduled_jobs"] == 3
+        timer.stop()
+
+    @pytest.mark.asyncio
+    async def test_fires_due_jobs_and_wakes_early(self):
+        """Test a job scheduled ahead of the armed one fires on time"""
+        fired = []
+
+        async def on_timer(due):
+            fired.extend(job.id for job in due)
+
+        timer = CronTimer(on_timer_callback=on_timer)
+        timer.arm_timer([make_job("later", now_ms() + 60_000)])
+        await asyncio.sleep(0.01)
+
+        timer.schedule_job(make_job("soon", now_ms() + 50))
+        await wait_for(lambda: fired)
+
+        assert fired == ["soon"]
+        # Fired jobs stay out until rescheduled
+        assert timer.get_status()["scheduled_jobs"] == 1
+        timer.stop()
+
+    @pytest.mark.asyncio
+    async def test_stale_entries_are_compacted(self):
+        """Test repeated updates do not grow the heap without bound"""
+        timer = CronTimer(on_timer_callback=None)
+        job = make_job("j", now_ms() + 60_000)
+        timer.arm_timer([job])
+
+        for i in range(1000):
+            job.state.next_run_ms += 1
+            timer.schedule_job(job)
+
+        assert len(timer._heap) <= 64
+        timer.stop()
+
+
+class TestCronDispatch:
+    """Concurrent execution of due jobs"""
+
+    def _service(self, on_system_event, **kwargs) -> CronService:
+        return CronService(on_system_event=on_system_event, **kwargs)
+
+    @pytest.mark.asyncio
+    async def test_due_jobs_run_concurrently(self):
+        """Test one slow job does not delay others due at the same time"""
+        active = peak = 0
+        done = []
+
+        async def on_system_event(text, agent_id=None):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.3 if text == "slow" else 0.01)
+            active -= 1
+            done.append(text)
+
+        service = self._service(on_system_event, max_concurrent_jobs=4)
+        due = now_ms() - 1
+        for name in ["slow", "a", "b", "c"]:
+            service.jobs[name] = make_job(name, due, agent_id=name)
+        service.start()
+
+        await wait_for(lambda: len(done) == 4)
+        service.stop()
+
+        assert done[-1] == "slow"
+        assert peak == 4
+
+    @pytest.mark.asyncio
+    async def test_update_while_running_fires_once(self):
+        """Test a job edited mid-run is not fired again until the run ends"""
+        started = []
+        finished = []
+
+        async def on_system_event(text, agent_id=None):
+            started.append(text)
+            await asyncio.sleep(0.3)
+            finished.append(text)
+
+        service = self._service(on_system_event)
+        service.jobs["j"] = make_job("j", now_ms() - 1)
+        service.start()
+        await wait_for(lambda: started)
+
+        # Due again 50 ms from now, well before the running call returns
+        assert service.update_job(make_job("j", 0, interval_ms=50))
+        await wait_for(lambda: finished)
+        assert started == ["j"]
+
+        await wait_for(lambda: len(started) == 2)
+        service.stop()
+
+    @pytest.mark.asyncio
+    async def test_limits(self):
+        """Test the global and per-target limits"""
+        active: dict[str, int] = {}
+        peak = {"all": 0, "agent-a": 0}
+        done = []
+
+        async def on_system_event(text, agent_id=None):
+            active[agent_id] = active.get(agent_id, 0) + 1
+            peak["all"] = max(peak["all"], sum(active.values()))
+            peak["agent-a"] = max(peak["agent-a"], active.get("agent-a", 0))
+            await asyncio.sleep(0.02)
+            active[agent_id] -= 1
+            done.append(text)
+
+        service = self._service(on_system_event, max_concurrent_jobs=3, max_concurrent_per_target=1)
+        due = now_ms() - 1
+        for i in range(4):
+            service.jobs[f"a{i}"] = make_job(f"a{i}", due, agent_id="agent-a")
+            service.jobs[f"b{i}"] = make_job(f"b{i}", due, agent_id=f"agent-b{i}")
+        service.start()
+
+        await wait_for(lambda: len(done) == 8)
+        service.stop()
+
+        assert peak["agent-a"] == 1
+        assert peak["all"] == 3
+        assert service._target_slots == {}
+
+    @pytest.mark.asyncio
+    async def test_misfire_skip(self):
+        """Test the skip policy drops a missed run"""
+        ran = []
+
+        async def on_system_event(text, agent_id=None):
+            ran.append(text)
+
+        service = self._service(on_system_event, misfire_policy=MisfirePolicy.SKIP)
+        job = make_job("late", now_ms() - 10 * 60_000)
+        service.jobs[job.id] = job
+        service.start()
+
+        await wait_for(lambda: job.state.next_run_ms > now_ms())
+        service.stop()
+
+        assert ran == []
+
+    @pytest.mark.asyncio
+    async def test_misfire_catch_up(self):
+        """Test the catch-up policy replays missed occurrences, bounded"""
+        ran = []
+
+        async def on_system_event(text, agent_id=None):
+            ran.append(text)
+
+        service = self._service(
+            on_system_event, misfire_policy="catch-up", max_catch_up_runs=3
+        )
+        job = make_job("late", now_ms() - 10_500, interval_ms=1000)
+        service.jobs[job.id] = job
+        service.start()
+
+        await wait_for(lambda: len(ran) == 4 and job.state.next_run_ms > now_ms())
+        await asyncio.sleep(0.05)
+        service.stop()
+
+        # The late run plus three replayed occurrences, then back to now
+        assert len(ran) == 4
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_timer_benchmark():
+    """Benchmark: 10k jobs, rescheduling one job at a time."""
+    jobs_count, updates = 10_000, 2000
+    base = now_ms() + 3_600_000
+    jobs = [make_job(f"job-{i}", base + random.randrange(86_400_000)) for i in range(jobs_count)]
+
+    # Previous behaviour: every re-arm scanned all jobs for the earliest
+    started = time.perf_counter()
+    for _ in range(200):
+        min((job for job in jobs if job.enabled), key=lambda job: job.state.next_run_ms)
+    scan = (time.perf_counter() - started) / 200
+
+    timer = CronTimer(on_timer_callback=None)
+    started = time.perf_counter()
+    timer.arm_timer(jobs)
+    arm = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for i in range(updates):
+        job = jobs[random.randrange(jobs_count)]
+        job.state.next_run_ms = base + random.randrange(86_400_000)
+        timer.schedule_job(job)
+    update = (time.perf_counter() - started) / updates
+    timer.stop()
+
+    print(
+        f"\n{jobs_count} jobs: full scan {scan * 1e6:.0f}us/re-arm, heap build {arm * 1000:.1f}ms, "
+        f"incremental update {update * 1e6:.1f}us"
+    )
+    assert timer._peek() == min(job.state.next_run_ms for job in jobs)
+    assert update < scan
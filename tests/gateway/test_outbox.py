@@ -0,0 +1,160 @@
+"""
+Tests for per-connection broadcast outboxes
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from openclaw.config.schema import ClawdbotConfig
+from openclaw.gateway import server as server_module
+from openclaw.gateway.outbox import SLOW_CONSUMER_CLOSE_CODE, ConnectionOutbox, OutboxStats
+from openclaw.gateway.protocol import EventFrame
+from openclaw.gateway.server import GatewayConnection, GatewayServer
+
+
+class FakeWebSocket:
+    """Records sent frames; optionally never completes a send."""
+
+    def __init__(self, stalled: bool = False):
+        self.stalled = stalled
+        self.sent: list[str] = []
+        self.close_code: int | None = None
+
+    async def send(self, data: str) -> None:
+        if self.stalled:
+            await asyncio.Event().wait()
+        await asyncio.sleep(0)
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        self.close_code = code
+
+
+async def _settle():
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+class TestConnectionOutbox:
+    """Queueing, ordering and slow-consumer handling."""
+
+    @pytest.mark.asyncio
+    async def test_frames_sent_in_order(self):
+        ws = FakeWebSocket()
+        outbox = ConnectionOutbox(ws)
+
+        for i in range(5):
+            assert outbox.offer(f"frame{i}")
+        await _settle()
+
+        assert ws.sent == [f"frame{i}" for i in range(5)]
+        assert outbox.depth == 0
+        assert outbox.stats.sent == 5
+        await outbox.close()
+
+    @pytest.mark.asyncio
+    async def test_drop_if_slow_keeps_connection(self):
+        ws = FakeWebSocket(stalled=True)
+        outbox = ConnectionOutbox(ws, max_frames=2)
+
+        assert outbox.offer("frame0", drop_if_slow=True)
+        await _settle()  # frame0 is now in flight
+        results = [outbox.offer(f"frame{i}", drop_if_slow=True) for i in range(1, 4)]
+
+        assert results == [True, True, False]
+        assert outbox.stats.dropped == 1
+        assert not outbox.closed
+        assert ws.close_code is None
+        await outbox.close()
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_is_closed(self):
+        ws = FakeWebSocket(stalled=True)
+        totals = OutboxStats()
+        outbox = ConnectionOutbox(ws, max_bytes=10, totals=totals)
+
+        outbox.offer("x" * 6)
+        await _settle()
+        outbox.offer("x" * 6)
+        outbox.offer("x" * 6)
+        assert not outbox.offer("x" * 6)
+        await _settle()
+
+        assert outbox.closed
+        assert ws.close_code == SLOW_CONSUMER_CLOSE_CODE
+        assert not outbox.offer("late")
+        assert totals.dropped == outbox.stats.dropped == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_send_closes_outbox(self):
+        class BrokenWebSocket(FakeWebSocket):
+            async def send(self, data):
+                raise ConnectionError("gone")
+
+        outbox = ConnectionOutbox(BrokenWebSocket())
+        outbox.offer("frame")
+        await _settle()
+
+        assert outbox.closed
+        assert not outbox.offer("frame")
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_broadcast_benchmark(monkeypatch):
+    """Benchmark: GatewayServer.broadcast to 200 clients plus one stalled client, 500 events."""
+    clients, events = 200, 500
+    payload = {"type": "text", "data": {"delta": {"text": "token " * 8}}, "runId": "r1"}
+
+    # Previous behaviour: serialize per client and await each send in turn
+    # (measured without the stalled client, which would block it forever)
+    sockets = [FakeWebSocket() for _ in range(clients)]
+    started = time.perf_counter()
+    for _ in range(20):
+        for ws in sockets:
+            await ws.send(EventFrame(event="agent", payload=payload).model_dump_json())
+    serial = (time.perf_counter() - started) / 20
+
+    serialized = 0
+
+    class CountingEventFrame(EventFrame):
+        def model_dump_json(self, **kwargs):
+            nonlocal serialized
+            serialized += 1
+            return super().model_dump_json(**kwargs)
+
+    monkeypatch.setattr(server_module, "EventFrame", CountingEventFrame)
+    config = ClawdbotConfig()
+    server = GatewayServer(config=config)
+    sockets = [FakeWebSocket() for _ in range(clients)]
+    stalled = FakeWebSocket(stalled=True)
+    connections = [GatewayConnection(ws, config, server) for ws in sockets + [stalled]]
+    connections[-1].outbox.max_frames = 64
+    server.connections.update(connections)
+
+    started = time.perf_counter()
+    for _ in range(events):
+        server.broadcast("agent", payload, {"dropIfSlow": True})
+        await asyncio.sleep(0)
+    enqueue = (time.perf_counter() - started) / events
+    while any(len(ws.sent) < events for ws in sockets):
+        await asyncio.sleep(0)
+    delivered = time.perf_counter() - started
+
+    stalled_outbox = connections[-1].outbox
+    print(
+        f"\n{clients} clients + 1 stalled: serial {serial * 1000:.2f}ms/event (no stall), "
+        f"broadcast {enqueue * 1000:.3f}ms/event, {events} events delivered in "
+        f"{delivered * 1000:.0f}ms, stalled client dropped {stalled_outbox.stats.dropped}"
+    )
+    assert serialized == events
+    assert all(len(ws.sent) == events for ws in sockets)
+    assert stalled_outbox.stats.dropped == events - 65
+    assert server.get_broadcast_metrics()["dropped"] == stalled_outbox.stats.dropped
+    assert len(server.connections) == clients + 1
+    assert enqueue < serial
+    for connection in connections:
+        await connection.outbox.close()
@@ -0,0 +1,146 @@
+"""
+Tests for concurrent request dispatch in GatewayConnection
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from openclaw.config.schema import ClawdbotConfig
+from openclaw.gateway import handlers
+from openclaw.gateway.server import MAX_IN_FLIGHT_REQUESTS, GatewayConnection
+
+
+class MockWebSocket:
+    def __init__(self):
+        self.sent_messages: list[dict] = []
+        self.remote_address = ("127.0.0.1", 12345)
+
+    async def send(self, message: str):
+        self.sent_messages.append(json.loads(message))
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        pass
+
+
+@pytest.fixture
+def slow_handler():
+    """Register `test.slow`, which blocks until released."""
+    release = asyncio.Event()
+    started = []
+
+    async def handle_slow(connection, params):
+        started.append(params.get("n"))
+        await release.wait()
+        return {"n": params.get("n")}
+
+    handlers._handlers["test.slow"] = handle_slow
+    yield release, started
+    handlers._handlers.pop("test.slow", None)
+
+
+def _request(request_id: int, method: str, params: dict | None = None) -> str:
+    return json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}})
+
+
+def _connection() -> tuple[GatewayConnection, MockWebSocket]:
+    ws = MockWebSocket()
+    connection = GatewayConnection(ws, ClawdbotConfig())
+    connection.authenticated = True
+    return connection, ws
+
+
+async def _settle():
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+class TestRequestDispatch:
+    """Multiplexed requests on a single connection."""
+
+    @pytest.mark.asyncio
+    async def test_slow_request_does_not_block_health(self, slow_handler):
+        release, _ = slow_handler
+        connection, ws = _connection()
+
+        await connection.dispatch_message(_request(1, "test.slow"))
+        await connection.dispatch_message(_request(2, "health"))
+        await _settle()
+
+        assert [m["id"] for m in ws.sent_messages] == [2]
+
+        release.set()
+        await _settle()
+        assert [m["id"] for m in ws.sent_messages] == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_in_flight_limit_leaves_priority_lane_open(self, slow_handler):
+        release, started = slow_handler
+        connection, ws = _connection()
+
+        for i in range(MAX_IN_FLIGHT_REQUESTS + 2):
+            await connection.dispatch_message(_request(i, "test.slow", {"n": i}))
+        await connection.dispatch_message(_request(100, "health"))
+        await _settle()
+
+        assert len(started) == MAX_IN_FLIGHT_REQUESTS
+        assert connection.in_flight == MAX_IN_FLIGHT_REQUESTS + 2
+        assert [m["id"] for m in ws.sent_messages] == [100]
+
+        release.set()
+        await _settle()
+        assert len(started) == MAX_IN_FLIGHT_REQUESTS + 2
+        assert connection.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_disconnect_cancels_in_flight_requests(self, slow_handler):
+        connection, ws = _connection()
+
+        await connection.dispatch_message(_request(1, "test.slow"))
+        await _settle()
+        assert connection.in_flight == 1
+
+        await connection.cancel_requests()
+
+        assert connection.in_flight == 0
+        assert ws.sent_messages == []
+
+    @pytest.mark.asyncio
+    async def test_failed_request_task_is_logged(self, monkeypatch, caplog):
+        connection, _ = _connection()
+
+        async def broken(request):
+            raise RuntimeError("socket closed")
+
+        monkeypatch.setattr(connection, "handle_request", broken)
+        with caplog.at_level("ERROR", logger="openclaw.gateway.server"):
+            await connection.dispatch_message(_request(1, "health"))
+            await _settle()
+
+        assert connection.in_flight == 0
+        assert "Request task failed: socket closed" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_responses_share_outbox_with_broadcasts(self):
+        connection, ws = _connection()
+
+        await connection.handle_message(_request(1, "health"))
+        connection.outbox.offer(json.dumps({"type": "event", "event": "tick"}), drop_if_slow=True)
+        await connection.send_event("presence", {})
+        await _settle()
+
+        assert [m.get("id", m.get("event")) for m in ws.sent_messages] == [1, "tick", "presence"]
+        assert connection.outbox.stats.sent == 3
+
+    @pytest.mark.asyncio
+    async def test_unauthenticated_requests_still_rejected(self):
+        connection, ws = _connection()
+        connection.authenticated = False
+
+        await connection.dispatch_message(_request(1, "sessions.list"))
+        await _settle()
+
+        assert ws.sent_messages[0]["id"] == 1
+        assert "error" in ws.sent_messages[0]
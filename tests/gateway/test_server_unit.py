@@ -44,5 +44,35 @@ class TestMessageFrames:
         assert True
 
 
+class TestMemoryManagerConfig:
+    """Test the memory manager is built from the memory config."""
+    
+    def test_index_options_from_config(self, tmp_path):
+        """Test indexType and IVF tuning reach the memory manager."""
+        from openclaw.config.schema import ClawdbotConfig
+        from openclaw.gateway.server import GatewayServer
+        
+        config = ClawdbotConfig(memory={"indexType": "ivf", "ivf": {"nprobe": 4, "minTrainSize": 500}})
+        server = GatewayServer(config=config, agent_runtime=MagicMock(workspace_dir=str(tmp_path)))
+        
+        manager = server.get_memory_manager()
+        
+        assert manager.index_type == "ivf"
+        assert manager.ivf_options.nprobe == 4
+        assert manager.ivf_options.min_train_size == 500
+    
+    def test_defaults_to_flat_index(self, tmp_path):
+        """Test no memory config keeps exact search."""
+        from openclaw.config.schema import ClawdbotConfig
+        from openclaw.gateway.server import GatewayServer
+        
+        server = GatewayServer(config=ClawdbotConfig(), agent_runtime=MagicMock(workspace_dir=str(tmp_path)))
+        
+        manager = server.get_memory_manager()
+        
+        assert manager.index_type == "flat"
+        assert manager.ivf_options is None
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,290 @@
+"""
+Tests for the async ffmpeg runner and the audio processor on top of it
+
+A fake ``ffmpeg`` script answers the probe, logs its calls, tracks how
+many copies run at once and echoes stdin to stdout. Tests against a real
+ffmpeg are skipped when none is installed.
+"""
+import asyncio
+import io
+import math
+import os
+import shutil
+import struct
+import sys
+import time
+import wave
+from pathlib import Path
+
+import pytest
+
+from openclaw.media import ffmpeg_runner
+from openclaw.media.audio import AudioProcessingError, AudioProcessor
+from openclaw.media.ffmpeg_runner import FFmpegError, FFmpegRunner, parse_encoders
+
+FAKE_FFMPEG = r'''#!{python}
+import fcntl, os, sys, time
+state = os.environ["FAKE_FFMPEG_STATE"]
+args = sys.argv[1:]
+with open(os.path.join(state, "calls.log"), "a") as log:
+    log.write(" ".join(args) + "\n")
+
+if "-version" in args:
+    if os.environ.get("FAKE_FFMPEG_PROBE_HANG"):
+        with open(os.path.join(state, "probe.pid"), "w") as f:
+            f.write(str(os.getpid()))
+        time.sleep(30)
+    print("ffmpeg version 6.1-fake Copyright (c) 2000-2023 the FFmpeg developers")
+    sys.exit(0)
+if "-encoders" in args:
+    print("Encoders:\n V..... = Video\n ------\n A....D aac                  AAC\n A....D libopus              Opus")
+    sys.exit(0)
+if "FAIL" in args:
+    sys.stderr.write("Invalid data found when processing input\n")
+    sys.exit(1)
+
+def bump(delta):
+    with open(os.path.join(state, "running"), "a+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        f.seek(0)
+        running = int(f.read() or 0) + delta
+        f.seek(0)
+        f.truncate()
+        f.write(str(running))
+    if delta > 0:
+        with open(os.path.join(state, "peak"), "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            peak = max(int(f.read() or 0), running)
+            f.seek(0)
+            f.truncate()
+            f.write(str(peak))
+
+bump(1)
+time.sleep(float(os.environ.get("FAKE_FFMPEG_DELAY", "0")))
+bump(-1)
+if "pipe:0" in args:
+    sys.stdout.buffer.write(sys.stdin.buffer.read())
+'''
+
+
+def ffmpeg_calls(state: Path, flag: str) -> int:
+    log = state / "calls.log"
+    if not log.exists():
+        return 0
+    return sum(1 for line in log.read_text().splitlines() if flag in line.split())
+
+
+def sine_wav(seconds: float = 1.0, rate: int = 16000, freq: float = 440.0) -> bytes:
+    """Mono 16-bit sine wave, as a stand-in voice note"""
+    frames = int(seconds * rate)
+    samples = (int(12000 * math.sin(2 * math.pi * freq * i / rate)) for i in range(frames))
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(rate)
+        out.writeframes(struct.pack(f"<{frames}h", *samples))
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    """Write the fake ffmpeg; returns (path, state directory)"""
+    state = tmp_path / "state"
+    state.mkdir()
+    script = tmp_path / "ffmpeg"
+    script.write_text(FAKE_FFMPEG.replace("{python}", sys.executable))
+    script.chmod(0o755)
+    monkeypatch.setenv("FAKE_FFMPEG_STATE", str(state))
+    return str(script), state
+
+
+requires_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+
+
+class TestFFmpegRunner:
+    """Probe caching, limits and pipes"""
+
+    def test_parse_encoders(self):
+        """Test encoder names are read from the listing"""
+        output = "Encoders:\n V..... = Video\n ------\n A....D aac   AAC\n A....D libopus   Opus\n"
+        assert parse_encoders(output) == {"aac", "libopus"}
+
+    @pytest.mark.asyncio
+    async def test_probe_runs_once(self, fake_ffmpeg):
+        """Test concurrent and repeated checks share one probe"""
+        path, state = fake_ffmpeg
+        runner = FFmpegRunner(path)
+
+        results = await asyncio.gather(*(runner.available() for _ in range(5)))
+        capabilities = await runner.probe()
+
+        assert results == [True] * 5
+        assert capabilities.version == "6.1-fake"
+        assert capabilities.has_encoder("libopus")
+        assert ffmpeg_calls(state, "-version") == 1
+        assert ffmpeg_calls(state, "-encoders") == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_binary(self, tmp_path):
+        """Test a missing binary is reported as unavailable"""
+        runner = FFmpegRunner(str(tmp_path / "no-ffmpeg"))
+
+        assert await runner.available() is False
+        with pytest.raises(FFmpegError, match="not available"):
+            await runner.run(["-i", "x.wav", "y.mp3"])
+
+    @pytest.mark.asyncio
+    async def test_probe_timeout_kills_probe(self, fake_ffmpeg, monkeypatch):
+        """Test a hung probe is killed and the binary reported unavailable"""
+        path, state = fake_ffmpeg
+        monkeypatch.setenv("FAKE_FFMPEG_PROBE_HANG", "1")
+        monkeypatch.setattr(ffmpeg_runner, "_PROBE_TIMEOUT_SEC", 0.5)
+        runner = FFmpegRunner(path)
+
+        assert await runner.available() is False
+        with pytest.raises(ProcessLookupError):
+            os.kill(int((state / "probe.pid").read_text()), 0)
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self, fake_ffmpeg, monkeypatch):
+        """Test no more than max_concurrency jobs run at once"""
+        path, state = fake_ffmpeg
+        monkeypatch.setenv("FAKE_FFMPEG_DELAY", "0.1")
+        runner = FFmpegRunner(path, max_concurrency=2)
+
+        await asyncio.gather(*(runner.run(["-i", "in.wav", "out.mp3"]) for _ in range(6)))
+
+        assert (state / "peak").read_text() == "2"
+
+    @pytest.mark.asyncio
+    async def test_pipes(self, fake_ffmpeg):
+        """Test input is streamed over stdin and output read from stdout"""
+        path, _ = fake_ffmpeg
+        runner = FFmpegRunner(path)
+
+        assert await runner.run(["-i", "pipe:0", "pipe:1"], input_data=b"audio" * 10000) == b"audio" * 10000
+
+    @pytest.mark.asyncio
+    async def test_error_includes_stderr(self, fake_ffmpeg):
+        """Test a failing job raises with ffmpeg's message"""
+        path, _ = fake_ffmpeg
+        runner = FFmpegRunner(path)
+
+        with pytest.raises(FFmpegError, match="Invalid data found"):
+            await runner.run(["-i", "FAIL", "out.mp3"])
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_job(self, fake_ffmpeg, monkeypatch):
+        """Test a job past its timeout is killed and frees its slot"""
+        path, state = fake_ffmpeg
+        monkeypatch.setenv("FAKE_FFMPEG_DELAY", "5")
+        runner = FFmpegRunner(path, max_concurrency=1)
+
+        start = time.perf_counter()
+        with pytest.raises(FFmpegError, match="timed out"):
+            await runner.run(["-i", "in.wav", "out.mp3"], timeout=0.2)
+        monkeypatch.setenv("FAKE_FFMPEG_DELAY", "0")
+        await runner.run(["-i", "in.wav", "out.mp3"])
+
+        assert time.perf_counter() - start < 2
+
+
+class TestAudioProcessor:
+    """Audio operations on the runner"""
+
+    @pytest.mark.asyncio
+    async def test_check_ffmpeg_is_cached(self, fake_ffmpeg):
+        """Test check_ffmpeg doesn't re-run ffmpeg -version"""
+        path, state = fake_ffmpeg
+        processor = AudioProcessor(runner=FFmpegRunner(path))
+
+        for _ in range(3):
+            assert await processor.check_ffmpeg()
+
+        assert ffmpeg_calls(state, "-version") == 1
+
+    @pytest.mark.asyncio
+    async def test_concat_list_over_stdin(self, fake_ffmpeg, tmp_path):
+        """Test concatenation writes no list file"""
+        path, state = fake_ffmpeg
+        processor = AudioProcessor(runner=FFmpegRunner(path))
+
+        await processor.concatenate_audio(["a.mp3", "b.mp3"], tmp_path / "out.mp3")
+
+        assert not (tmp_path / "concat_list.txt").exists()
+        assert ffmpeg_calls(state, "pipe:0") == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_wrapped(self, fake_ffmpeg, tmp_path):
+        """Test runner failures surface as AudioProcessingError"""
+        path, _ = fake_ffmpeg
+        processor = AudioProcessor(runner=FFmpegRunner(path))
+
+        with pytest.raises(AudioProcessingError, match="Trimming failed"):
+            await processor.trim_audio("FAIL", tmp_path / "out.mp3", start_time=0, duration=1)
+
+    @requires_ffmpeg
+    @pytest.mark.asyncio
+    async def test_convert_bytes(self):
+        """Test a WAV voice note converts to Ogg/Opus in memory"""
+        processor = AudioProcessor(runner=FFmpegRunner())
+
+        output = await processor.convert_audio_bytes(sine_wav(), "opus", bitrate="32k")
+
+        assert output.startswith(b"OggS")
+
+    @requires_ffmpeg
+    @pytest.mark.asyncio
+    async def test_convert_file(self, tmp_path):
+        """Test file conversion picks the format from the suffix"""
+        source = tmp_path / "note.wav"
+        source.write_bytes(sine_wav())
+        processor = AudioProcessor(runner=FFmpegRunner())
+
+        await processor.convert_audio(source, tmp_path / "note.flac")
+
+        assert (tmp_path / "note.flac").read_bytes().startswith(b"fLaC")
+
+
+@pytest.mark.slow
+@requires_ffmpeg
+class TestFFmpegRunnerBenchmark:
+    """Concurrent voice-note conversion throughput"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_voice_notes(self):
+        """Convert 100 voice notes at once while measuring event loop stalls"""
+        note = sine_wav(seconds=5.0)
+        processor = AudioProcessor(runner=FFmpegRunner())
+        await processor.check_ffmpeg()
+
+        worst_gap = 0.0
+        done = asyncio.Event()
+
+        async def ticker():
+            nonlocal worst_gap
+            last = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(0.005)
+                now = time.perf_counter()
+                worst_gap = max(worst_gap, now - last)
+                last = now
+
+        tick = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        outputs = await asyncio.gather(
+            *(processor.convert_audio_bytes(note, "opus", bitrate="32k") for _ in range(100))
+        )
+        elapsed = time.perf_counter() - start
+        done.set()
+        await tick
+
+        print(
+            f"\n100 x 5 s voice notes -> opus: {elapsed:.2f} s "
+            f"({100 / elapsed:.0f} notes/s, {processor.runner.max_concurrency} at once on "
+            f"{os.cpu_count()} cores); worst loop stall {worst_gap * 1000:.1f} ms"
+        )
+        assert all(o.startswith(b"OggS") for o in outputs)
+        assert worst_gap < 0.25
@@ -0,0 +1,263 @@
+"""
+Tests for the image executor and the derived-variant cache
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+import os
+import threading
+import time
+
+import pytest
+
+from openclaw.media.image_cache import ImageVariantCache, set_image_variant_cache
+from openclaw.media.image_executor import ImageExecutor, set_image_executor
+from openclaw.media.image_ops import ImageProcessor
+
+PIL = pytest.importorskip("PIL")
+
+
+def _noisy_image(width: int, height: int, fmt: str = "PNG") -> bytes:
+    """Image with detail, so encoders can't shrink it to nothing"""
+    from PIL import Image
+
+    img = Image.effect_noise((width, height), 64).convert("RGB")
+    buffer = io.BytesIO()
+    img.save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def _square(x: int) -> int:
+    return x * x
+
+
+_started = threading.Event()
+_release = threading.Event()
+_ran: list[int] = []
+
+
+def _blocking(x: int) -> int:
+    _started.set()
+    _release.wait(5)
+    _ran.append(x)
+    return x
+
+
+class CountingExecutor(ImageExecutor):
+    """Thread executor that counts submitted jobs"""
+
+    def __init__(self):
+        super().__init__(use_processes=False)
+        self.jobs = 0
+
+    async def run(self, fn, *args):
+        self.jobs += 1
+        return await super().run(fn, *args)
+
+
+@pytest.fixture
+def executor():
+    """Fresh counting executor and empty cache installed globally"""
+    executor = CountingExecutor()
+    set_image_executor(executor)
+    set_image_variant_cache(ImageVariantCache())
+    yield executor
+    set_image_executor(None)
+    set_image_variant_cache(None)
+
+
+class TestImageExecutor:
+    """Process pool with thread fallback"""
+
+    @pytest.mark.asyncio
+    async def test_process_pool(self):
+        """Test jobs run in worker processes"""
+        executor = ImageExecutor(max_workers=2)
+        try:
+            results = await asyncio.gather(*(executor.run(_square, i) for i in range(4)))
+        finally:
+            executor.shutdown()
+
+        assert results == [0, 1, 4, 9]
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_threads(self, monkeypatch):
+        """Test threads are used when processes cannot be started"""
+        from concurrent.futures import ProcessPoolExecutor
+
+        def refuse(self, fn, *args, **kwargs):
+            raise OSError("no semaphores")
+
+        monkeypatch.setattr(ProcessPoolExecutor, "submit", refuse)
+        executor = ImageExecutor(max_workers=1)
+
+        assert await executor.run(_square, 3) == 9
+        assert executor.kind == "thread"
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cancel_drops_queued_job(self):
+        """Test cancelling a waiter drops a job that has not started"""
+        _started.clear()
+        _release.clear()
+        _ran.clear()
+        executor = ImageExecutor(max_workers=1, use_processes=False)
+
+        running = asyncio.ensure_future(executor.run(_blocking, 1))
+        await asyncio.to_thread(_started.wait, 5)
+        queued = asyncio.ensure_future(executor.run(_blocking, 2))
+        await asyncio.sleep(0)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        await asyncio.sleep(0)
+        _release.set()
+
+        assert await running == 1
+        executor.shutdown()
+        assert _ran == [1]
+
+
+class TestImageVariantCache:
+    """Content-addressed variants"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_resize_is_not_reencoded(self, executor):
+        """Test the same variant of the same bytes is encoded once"""
+        image = _noisy_image(300, 200)
+
+        first = await ImageProcessor.resize_to_jpeg(image, max_side=100, quality=80)
+        again = await ImageProcessor.resize_to_jpeg(bytes(image), max_side=100, quality=80)
+        other = await ImageProcessor.resize_to_jpeg(image, max_side=100, quality=60)
+
+        assert again == first
+        assert other != first
+        assert executor.jobs == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_job(self, executor):
+        """Test identical in-flight requests are deduplicated"""
+        image = _noisy_image(300, 200)
+
+        results = await asyncio.gather(
+            *(ImageProcessor.optimize_to_png(image, max_side=64) for _ in range(5))
+        )
+
+        assert len(set(results)) == 1
+        assert executor.jobs == 1
+
+    @pytest.mark.asyncio
+    async def test_optimize_image_roundtrips_through_cache(self, executor):
+        """Test a cached optimize_image result keeps its parameters"""
+        image = _noisy_image(600, 400)
+
+        first = await ImageProcessor.optimize_image(image, max_bytes=120_000, preserve_alpha=False)
+        second = await ImageProcessor.optimize_image(image, max_bytes=120_000, preserve_alpha=False)
+
+        assert second == first
+        assert first.optimized_size <= 120_000
+        assert first.format == "jpeg" and first.quality is not None
+        assert executor.jobs == 1
+
+    @pytest.mark.asyncio
+    async def test_disk_tier_survives_new_instance(self, tmp_path):
+        """Test variants are read back from disk by a new cache"""
+        cache = ImageVariantCache(disk_dir=tmp_path)
+        key = cache.variant_key(cache.content_hash(b"src"), "web-fit", 100, "image/heic")
+        cache.put(key, b"variant")
+
+        fresh = ImageVariantCache(disk_dir=tmp_path)
+        assert fresh.get(key) == b"variant"
+
+    def test_memory_tier_evicts_lru(self):
+        """Test the memory tier stays within max_bytes, oldest out first"""
+        cache = ImageVariantCache(max_bytes=10)
+        cache.put("a", b"1234")
+        cache.put("b", b"1234")
+        cache.get("a")
+        cache.put("c", b"1234")
+
+        assert cache.get("a") == b"1234"
+        assert cache.get("b") is None
+        assert cache.get("c") == b"1234"
+
+    def test_disk_tier_is_bounded(self, tmp_path):
+        """Test the oldest files are removed past disk_max_bytes"""
+        cache = ImageVariantCache(max_bytes=0, disk_dir=tmp_path, disk_max_bytes=100)
+        for i in range(5):
+            cache.put(f"k{i}", b"x" * 40)
+
+        total = sum(f.stat().st_size for f in tmp_path.glob("*/*"))
+        assert total <= 100
+        assert cache.get("k4") == b"x" * 40
+
+    def test_disk_tier_evicts_least_recently_read(self, tmp_path):
+        """Test a disk hit refreshes the entry so it outlives unread ones"""
+        cache = ImageVariantCache(max_bytes=0, disk_dir=tmp_path, disk_max_bytes=100)
+        cache.put("a", b"x" * 40)
+        cache.put("b", b"x" * 40)
+        now = time.time()
+        os.utime(tmp_path / "a" / "a", (now - 100, now - 100))
+        os.utime(tmp_path / "b" / "b", (now - 50, now - 50))
+
+        assert cache.get("a") == b"x" * 40
+        cache.put("c", b"x" * 40)
+
+        assert cache.get("a") == b"x" * 40
+        assert cache.get("b") is None
+
+
+@pytest.mark.slow
+class TestImageExecutorBenchmark:
+    """Event loop responsiveness during a large resize"""
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self):
+        """Resize a 12 MP photo while measuring event loop stalls"""
+        from PIL import Image
+
+        photo = _noisy_image(4000, 3000, fmt="JPEG")
+        set_image_variant_cache(ImageVariantCache())
+        set_image_executor(ImageExecutor())
+        try:
+            # Warm the pool so worker startup isn't measured
+            await ImageProcessor.resize_to_jpeg(_noisy_image(64, 64), max_side=32)
+
+            start = time.perf_counter()
+            img = Image.open(io.BytesIO(photo)).convert("RGB")
+            img.resize((2048, 1536), Image.Resampling.LANCZOS).save(io.BytesIO(), "JPEG", quality=85)
+            inline_ms = (time.perf_counter() - start) * 1000
+
+            worst_gap = 0.0
+            done = asyncio.Event()
+
+            async def ticker():
+                nonlocal worst_gap
+                last = time.perf_counter()
+                while not done.is_set():
+                    await asyncio.sleep(0.005)
+                    now = time.perf_counter()
+                    worst_gap = max(worst_gap, now - last)
+                    last = now
+
+            tick = asyncio.create_task(ticker())
+            start = time.perf_counter()
+            await ImageProcessor.resize_to_jpeg(photo, max_side=2048, quality=85)
+            offloaded_ms = (time.perf_counter() - start) * 1000
+            done.set()
+            await tick
+
+            start = time.perf_counter()
+            await ImageProcessor.resize_to_jpeg(photo, max_side=2048, quality=85)
+            cached_ms = (time.perf_counter() - start) * 1000
+        finally:
+            set_image_executor(None)
+            set_image_variant_cache(None)
+
+        print(
+            f"\n12MP resize: inline {inline_ms:.0f} ms blocks the loop; offloaded {offloaded_ms:.0f} ms "
+            f"with worst loop stall {worst_gap * 1000:.1f} ms; cached repeat {cached_ms:.2f} ms"
+        )
+        assert worst_gap * 1000 < inline_ms / 2
+        assert cached_ms < offloaded_ms / 10
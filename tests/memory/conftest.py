@@ -0,0 +1,45 @@
+"""Shared fixtures for memory tests"""
+from __future__ import annotations
+
+import pytest
+
+from openclaw.memory.builtin_manager import BuiltinMemoryManager
+from openclaw.memory.embeddings.base import EmbeddingBatch, EmbeddingProvider
+
+
+class NullEmbeddingProvider(EmbeddingProvider):
+    """Embeds every text as the same one-dimensional vector"""
+
+    def __init__(self):
+        super().__init__("null")
+
+    async def embed_text(self, text: str) -> list[float]:
+        return [1.0]
+
+    async def embed_batch(self, texts: list[str], use_batch_api: bool = False) -> EmbeddingBatch:
+        return EmbeddingBatch(texts=texts, embeddings=[[1.0] for _ in texts], model=self.model, dimensions=1)
+
+    def get_dimensions(self) -> int:
+        return 1
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Memory manager over tmp_path with a null embedding provider"""
+    mgr = BuiltinMemoryManager("main", tmp_path, embedding_provider=NullEmbeddingProvider())
+    yield mgr
+    mgr.close()
+
+
+@pytest.fixture
+def make_docs(tmp_path):
+    """Write ``count`` markdown files under tmp_path/docs; returns the directory"""
+
+    def make(count: int, word: str = "alpha"):
+        docs = tmp_path / "docs"
+        docs.mkdir(exist_ok=True)
+        for i in range(count):
+            (docs / f"doc{i}.md").write_text(f"# Doc {i}\n\n{word} body {i}\n")
+        return docs
+
+    return make
@@ -0,0 +1,153 @@
+"""
+Tests for the IVF approximate nearest-neighbour memory index
+"""
+from __future__ import annotations
+
+import sqlite3
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from openclaw.memory.ann_index import IVFIndex, IVFOptions
+from openclaw.memory.vector_index import VectorIndex
+
+
+def _clustered(count, dims=32, clusters=50, seed=0, noise=0.1):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dims), dtype=np.float32)
+    labels = rng.integers(0, clusters, count)
+    return centers[labels] + noise * rng.standard_normal((count, dims), dtype=np.float32)
+
+
+def _open(tmp_path, options=None):
+    db = sqlite3.connect(str(tmp_path / "index.db"))
+    db.executescript("CREATE TABLE IF NOT EXISTS chunks (id TEXT PRIMARY KEY, source TEXT, embedding BLOB);")
+    vectors = VectorIndex(db, tmp_path / "index.vectors")
+    ivf = IVFIndex(vectors, tmp_path / "index.ivf.npz", options)
+    return db, vectors, ivf
+
+
+def _add(db, vectors, data, offset=0, source="memory"):
+    items = [(f"c{offset + i}", source, row) for i, row in enumerate(data)]
+    db.executemany(
+        "INSERT OR REPLACE INTO chunks (id, source, embedding) VALUES (?, ?, ?)",
+        [(chunk_id, src, row.astype(np.float32).tobytes()) for chunk_id, src, row in items],
+    )
+    vectors.add(items)
+    db.commit()
+
+
+class TestIVFIndex:
+    """IVF partitioning over the vector index."""
+
+    def test_untrained_index_is_exact(self, tmp_path):
+        db, vectors, ivf = _open(tmp_path, IVFOptions(min_train_size=1000))
+        data = _clustered(200)
+        _add(db, vectors, data)
+
+        assert not ivf.maybe_rebuild(wait=True)
+        assert ivf.search(data[0], 5) == vectors.search(data[0], 5)
+
+    def test_trained_search_finds_neighbours(self, tmp_path):
+        db, vectors, ivf = _open(tmp_path, IVFOptions(min_train_size=100, nlist=20, nprobe=4))
+        data = _clustered(2000)
+        _add(db, vectors, data)
+
+        assert ivf.maybe_rebuild(wait=True)
+        assert ivf.trained and ivf.nlist == 20
+        hits = ivf.search(data[7], 10)
+        exact = vectors.search(data[7], 10)
+        assert hits[0][0] == "c7"
+        assert len({h for h, _ in hits} & {e for e, _ in exact}) >= 8
+
+    def test_source_filter_outside_probed_lists(self, tmp_path):
+        db, vectors, ivf = _open(tmp_path, IVFOptions(min_train_size=100, nlist=20, nprobe=1))
+        data = _clustered(2000)
+        _add(db, vectors, data)
+        _add(db, vectors, -data[:3], offset=10_000, source="sessions")
+        assert ivf.maybe_rebuild(wait=True)
+
+        hits = ivf.search(data[0], 5, sources=["sessions"])
+        assert hits == vectors.search(data[0], 5, sources=["sessions"])
+        assert {chunk_id for chunk_id, _ in hits} == {"c10000", "c10001", "c10002"}
+
+    def test_inserts_and_deletes_after_training(self, tmp_path):
+        db, vectors, ivf = _open(tmp_path, IVFOptions(min_train_size=100, nlist=10, nprobe=10))
+        data = _clustered(500)
+        _add(db, vectors, data)
+        ivf.maybe_rebuild(wait=True)
+
+        _add(db, vectors, data[:1] * 2, offset=10_000)
+        vectors.remove(["c0"])
+
+        hits = [chunk_id for chunk_id, _ in ivf.search(data[0], 3)]
+        assert hits[0] == "c10000"
+        assert "c0" not in hits
+
+    def test_drift_triggers_retraining(self, tmp_path):
+        db, vectors, ivf = _open(
+            tmp_path, IVFOptions(min_train_size=100, nlist=10, drift_threshold=0.5)
+        )
+        _add(db, vectors, _clustered(200))
+        assert ivf.maybe_rebuild(wait=True)
+        assert not ivf.maybe_rebuild(wait=True)
+
+        _add(db, vectors, _clustered(150, seed=1), offset=1000)
+        assert ivf.drift >= 0.5
+        assert ivf.maybe_rebuild(wait=True)
+        assert ivf.drift == 0
+
+    def test_persisted_partition_is_reused(self, tmp_path):
+        options = IVFOptions(min_train_size=100, nlist=16)
+        db, vectors, ivf = _open(tmp_path, options)
+        data = _clustered(1000)
+        _add(db, vectors, data)
+        ivf.maybe_rebuild(wait=True)
+        ivf.close()
+        vectors.close()
+        db.close()
+
+        db, vectors, reopened = _open(tmp_path, options)
+        assert reopened.trained and reopened.nlist == 16
+        assert reopened.search(data[3], 1)[0][0] == "c3"
+        db.close()
+
+
+@pytest.mark.slow
+def test_ivf_recall_vs_latency_benchmark(tmp_path):
+    """Benchmark: recall@10 and latency for several nprobe values vs exact search."""
+    rows, dims, queries = 200_000, 128, 50
+    db, vectors, ivf = _open(tmp_path, IVFOptions(min_train_size=1000))
+    data = _clustered(rows, dims=dims, clusters=2000, noise=0.8)
+    for start in range(0, rows, 20_000):
+        _add(db, vectors, data[start:start + 20_000], offset=start)
+
+    start = time.perf_counter()
+    ivf.maybe_rebuild(wait=True)
+    print(f"\nIVF training over {rows} x {dims}: {time.perf_counter() - start:.1f}s, nlist={ivf.nlist}")
+
+    rng = np.random.default_rng(1)
+    probes = data[rng.choice(rows, queries, replace=False)] + 0.3 * rng.standard_normal(
+        (queries, dims), dtype=np.float32
+    )
+
+    start = time.perf_counter()
+    exact = [{h for h, _ in vectors.search(q, 10)} for q in probes]
+    exact_ms = (time.perf_counter() - start) / queries * 1000
+    print(f"exact: {exact_ms:.2f}ms/query")
+
+    for nprobe in (1, 4, 16, 64):
+        start = time.perf_counter()
+        found = [{h for h, _ in ivf.search(q, 10, nprobe=nprobe)} for q in probes]
+        ivf_ms = (time.perf_counter() - start) / queries * 1000
+        recall = sum(len(f & e) for f, e in zip(found, exact)) / (10 * queries)
+        print(f"nprobe={nprobe:>3}: {ivf_ms:.2f}ms/query, recall@10 {recall:.3f}")
+        if nprobe == 16:
+            assert recall >= 0.9
+            assert ivf_ms < exact_ms
+
+    ivf.close()
+    vectors.close()
+    db.close()
@@ -0,0 +1,127 @@
+"""
+Tests for the structure-aware memory chunker
+"""
+from __future__ import annotations
+
+import itertools
+
+import pytest
+
+from openclaw.memory import builtin_manager as builtin_module
+from openclaw.memory.builtin_manager import BuiltinMemoryManager
+from openclaw.memory.chunker import iter_chunks
+from openclaw.memory.embeddings.base import EmbeddingBatch, EmbeddingProvider
+
+
+def _lines(text):
+    return text.splitlines(keepends=True)
+
+
+class TestChunker:
+    """Chunk boundaries and budgets."""
+
+    def test_headings_start_new_chunks(self):
+        text = "# One\nalpha\n\n## Two\nbeta\n# Three\ngamma\n"
+
+        chunks = list(iter_chunks(_lines(text)))
+
+        assert [c.text for c in chunks] == ["# One\nalpha", "## Two\nbeta", "# Three\ngamma"]
+        assert [(c.start_line, c.end_line) for c in chunks] == [(1, 2), (4, 5), (6, 7)]
+
+    def test_code_fences_are_not_split_at_blank_lines_or_headings(self):
+        paragraph = "word " * 30 + "\n\n"
+        code = "```python\n" + "x = 1\n\n# not a heading\n" * 5 + "```\n"
+        text = paragraph + code + paragraph
+
+        chunks = list(iter_chunks(_lines(text), max_tokens=60, overlap_tokens=0))
+
+        fenced = [c for c in chunks if "```python" in c.text]
+        assert len(fenced) == 1
+        assert fenced[0].text.count("# not a heading") == 5
+        assert fenced[0].text.endswith("```")
+
+    def test_size_splits_respect_budget_and_overlap(self):
+        text = "".join(f"line {i} " + "lorem ipsum " * 4 + "\n" for i in range(100))
+
+        chunks = list(iter_chunks(_lines(text), max_tokens=100, overlap_tokens=20))
+
+        assert len(chunks) > 5
+        assert all(len(c.text) // 4 <= 100 for c in chunks)
+        for first, second in zip(chunks, chunks[1:]):
+            assert second.start_line <= first.end_line
+
+    def test_long_single_line_is_split(self):
+        chunks = list(iter_chunks(["x" * 10_000 + "\n"], max_tokens=500, overlap_tokens=0))
+
+        assert len(chunks) >= 5
+        assert "".join(c.text for c in chunks) == "x" * 10_000
+
+    def test_chunks_are_yielded_lazily(self):
+        endless = (f"paragraph {i}\n\n" for i in itertools.count())
+
+        first = next(iter_chunks(endless, max_tokens=50))
+
+        assert first.start_line == 1
+
+
+class KeywordProvider(EmbeddingProvider):
+    def __init__(self):
+        super().__init__("kw")
+        self.embedded: list[str] = []
+
+    async def embed_text(self, text: str) -> list[float]:
+        return [float(len(text)), 1.0]
+
+    async def embed_batch(self, texts: list[str], use_batch_api: bool = False) -> EmbeddingBatch:
+        self.embedded.extend(texts)
+        return EmbeddingBatch(
+            texts=texts, embeddings=[await self.embed_text(t) for t in texts], model=self.model, dimensions=2
+        )
+
+    def get_dimensions(self) -> int:
+        return 2
+
+
+class TestStableChunkIds:
+    """Editing one section leaves the other chunk rows alone."""
+
+    @pytest.mark.asyncio
+    async def test_untouched_sections_keep_rows_and_embeddings(self, tmp_path):
+        provider = KeywordProvider()
+        manager = BuiltinMemoryManager("main", tmp_path, embedding_provider=provider)
+        try:
+            path = tmp_path / "notes.md"
+            path.write_text("# A\nfirst\n\n# B\nsecond\n")
+            await manager.add_file(path)
+            await manager.backfill_embeddings()
+            before = {row["id"]: row["start_line"] for row in manager.db.execute("SELECT id, start_line FROM chunks")}
+            provider.embedded.clear()
+
+            path.write_text("# Intro\nnew section\n\n# A\nfirst\n\n# B\nsecond\n")
+            created = await manager.add_file(path)
+            await manager.backfill_embeddings()
+
+            after = {row["id"]: row["start_line"] for row in manager.db.execute("SELECT id, start_line FROM chunks")}
+            assert created == 1
+            assert provider.embedded == ["# Intro\nnew section"]
+            assert set(before) < set(after)
+            assert all(after[chunk_id] == start + 3 for chunk_id, start in before.items())
+        finally:
+            manager.close()
+
+    @pytest.mark.asyncio
+    async def test_large_files_are_streamed(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(builtin_module, "STREAM_THRESHOLD_BYTES", 16)
+        manager = BuiltinMemoryManager("main", tmp_path, embedding_provider=KeywordProvider())
+        try:
+            docs = tmp_path / "docs"
+            docs.mkdir()
+            (docs / "big.md").write_text("".join(f"# Section {i}\nbody {i}\n" for i in range(50)))
+
+            stats = await manager.sync()
+
+            assert stats["chunks_created"] == 50
+            results = await manager.search("body")
+            assert results
+        finally:
+            manager.close()
@@ -0,0 +1,133 @@
+"""
+Tests for the memory embedding cache and backfill
+"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from openclaw.memory.builtin_manager import BuiltinMemoryManager
+from openclaw.memory.embeddings.base import EmbeddingBatch, EmbeddingProvider
+from openclaw.memory.sync_manager import SyncManager
+
+
+class CountingEmbeddingProvider(EmbeddingProvider):
+    """Embeds text length; records every batch and peak concurrency."""
+
+    max_batch_size = 3
+
+    def __init__(self, fail: bool = False):
+        super().__init__("counting")
+        self.fail = fail
+        self.batches: list[list[str]] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def embed_text(self, text: str) -> list[float]:
+        return [float(len(text)), 1.0]
+
+    async def embed_batch(self, texts: list[str], use_batch_api: bool = False) -> EmbeddingBatch:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if self.fail:
+                raise RuntimeError("provider down")
+            self.batches.append(texts)
+            embeddings = [await self.embed_text(text) for text in texts]
+            return EmbeddingBatch(texts=texts, embeddings=embeddings, model=self.model, dimensions=2)
+        finally:
+            self.in_flight -= 1
+
+    def get_dimensions(self) -> int:
+        return 2
+
+
+@pytest.fixture
+def provider():
+    return CountingEmbeddingProvider()
+
+
+@pytest.fixture
+def manager(tmp_path, provider):
+    mgr = BuiltinMemoryManager("main", tmp_path, embedding_provider=provider)
+    yield mgr
+    mgr.close()
+
+
+async def _write_notes(manager, tmp_path, count, prefix="note"):
+    for i in range(count):
+        path = tmp_path / f"{prefix}{i}.md"
+        path.write_text(f"note number {i}")
+        await manager.add_file(path)
+
+
+class TestEmbeddingBackfill:
+    """Backfill batching, caching and stats."""
+
+    @pytest.mark.asyncio
+    async def test_backfill_embeds_pending_chunks_in_batches(self, manager, provider, tmp_path):
+        await _write_notes(manager, tmp_path, 10)
+        assert manager.count_pending_embeddings() == 10
+
+        stats = await manager.backfill_embeddings(concurrency=2)
+
+        assert stats.embedded == 10
+        assert stats.pending == 0
+        assert [len(b) for b in provider.batches] == [3, 3, 3, 1]
+        assert provider.peak_in_flight == 2
+        blob = manager.db.execute("SELECT embedding FROM chunks LIMIT 1").fetchone()[0]
+        assert manager._deserialize_embedding(blob)[1] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_duplicate_content_is_embedded_once(self, manager, provider, tmp_path):
+        for name in ("a.md", "b.md"):
+            (tmp_path / name).write_text("same text")
+            await manager.add_file(tmp_path / name)
+
+        stats = await manager.backfill_embeddings()
+
+        assert provider.batches == [["same text"]]
+        assert stats.embedded == 2
+
+    @pytest.mark.asyncio
+    async def test_renamed_file_reuses_cached_embeddings(self, manager, provider, tmp_path):
+        await _write_notes(manager, tmp_path, 4)
+        await manager.backfill_embeddings()
+        calls = len(provider.batches)
+
+        for i in range(4):
+            (tmp_path / f"note{i}.md").rename(tmp_path / f"moved{i}.md")
+            await manager.add_file(tmp_path / f"moved{i}.md")
+        stats = await manager.backfill_embeddings()
+
+        assert len(provider.batches) == calls
+        assert stats.cache_hits == 4
+        assert manager.count_pending_embeddings() == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_batches_stay_pending(self, tmp_path):
+        provider = CountingEmbeddingProvider(fail=True)
+        manager = BuiltinMemoryManager("main", tmp_path, embedding_provider=provider)
+        try:
+            await _write_notes(manager, tmp_path, 4)
+            stats = await manager.backfill_embeddings()
+
+            assert stats.failed == 4
+            assert stats.pending == 4
+            assert stats.last_error == "provider down"
+        finally:
+            manager.close()
+
+    @pytest.mark.asyncio
+    async def test_sync_manager_reports_embedding_stats(self, manager, tmp_path):
+        await _write_notes(manager, tmp_path, 2)
+        await manager.backfill_embeddings()
+
+        stats = SyncManager(manager, tmp_path).get_stats()["embeddings"]
+
+        assert stats["embedded"] == 2
+        assert stats["pending"] == 0
+        assert stats["running"] is False
+        assert stats["throughput"] > 0
@@ -141,3 +141,54 @@ class TestMemoryProviderStatus:
             assert status.provider == "simple-text-search"
             assert status.files == 2
             assert workspace.name in str(status.workspace_dir)
+
+
+class TestIncrementalIndex:
+    """Index updates without re-reading unchanged files."""
+    
+    @pytest.mark.asyncio
+    async def test_changed_and_deleted_files(self, tmp_path):
+        memory_dir = tmp_path / "memory"
+        memory_dir.mkdir()
+        (memory_dir / "a.md").write_text("rust notes")
+        (memory_dir / "b.md").write_text("python notes")
+        manager = await get_memory_search_manager(tmp_path)
+        
+        (memory_dir / "a.md").write_text("go notes, more than before")
+        (memory_dir / "b.md").unlink()
+        (tmp_path / "MEMORY.md").write_text("python decisions")
+        
+        assert await manager.search("rust") == []
+        assert [r.path for r in await manager.search("go")] == ["memory/a.md"]
+        assert [r.path for r in await manager.search("python")] == ["MEMORY.md"]
+        assert manager.status().files == 2
+    
+    @pytest.mark.asyncio
+    async def test_unchanged_files_are_not_reread(self, tmp_path, monkeypatch):
+        (tmp_path / "MEMORY.md").write_text("python")
+        manager = await get_memory_search_manager(tmp_path)
+        
+        def fail(*args, **kwargs):
+            raise AssertionError("unchanged file was read")
+        monkeypatch.setattr(Path, "read_text", fail)
+        
+        results = await manager.search("python")
+        assert len(results) == 1
+    
+    @pytest.mark.asyncio
+    async def test_file_change_event_updates_one_file(self, tmp_path):
+        memory_dir = tmp_path / "memory"
+        memory_dir.mkdir()
+        note = memory_dir / "a.md"
+        note.write_text("rust")
+        manager = SimpleMemorySearchManager(tmp_path, watch=False)
+        await manager.sync()
+        
+        note.write_text("python")
+        await manager._handle_file_change(note)
+        await manager._handle_file_change(tmp_path / "other.txt")
+        assert [hit.path for hit in manager._index.search("python")] == ["memory/a.md"]
+        
+        note.unlink()
+        await manager._handle_file_change(note)
+        assert manager._index.files == 0
@@ -0,0 +1,128 @@
+"""
+Tests for the memory SQLite connection pool (WAL, reader pool, writer thread)
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from openclaw.memory.sqlite_pool import SQLitePool
+
+
+class TestSQLitePool:
+    """Pool configuration and thread placement."""
+
+    def test_wal_and_pragmas(self, tmp_path):
+        pool = SQLitePool(tmp_path / "test.db")
+        try:
+            assert pool.writer.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert pool.writer.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert pool.writer.execute("PRAGMA cache_size").fetchone()[0] == -65536
+        finally:
+            pool.close()
+
+    @pytest.mark.asyncio
+    async def test_reads_and_writes_run_off_the_loop(self, tmp_path):
+        pool = SQLitePool(tmp_path / "test.db")
+        try:
+            loop_thread = threading.get_ident()
+            write_thread = await pool.write(threading.get_ident)
+            read_thread = await pool.read(lambda conn: threading.get_ident())
+            assert loop_thread not in (write_thread, read_thread)
+            assert write_thread != read_thread
+        finally:
+            pool.close()
+
+    @pytest.mark.asyncio
+    async def test_readers_are_read_only(self, tmp_path):
+        pool = SQLitePool(tmp_path / "test.db")
+        try:
+            pool.writer.execute("CREATE TABLE t (x INTEGER)")
+            pool.writer.commit()
+            with pytest.raises(Exception):
+                await pool.read(lambda conn: conn.execute("INSERT INTO t VALUES (1)"))
+        finally:
+            pool.close()
+
+    @pytest.mark.asyncio
+    async def test_readers_not_blocked_by_open_write(self, manager, tmp_path, make_docs):
+        make_docs(3)
+        await manager.sync()
+
+        # Hold an uncommitted write transaction on the writer connection
+        manager.db.execute("DELETE FROM chunks")
+        try:
+            started = time.monotonic()
+            results = await manager.search("alpha", limit=10)
+            assert time.monotonic() - started < 1.0
+            assert len(results) == 3  # last committed state
+        finally:
+            manager.db.rollback()
+
+    @pytest.mark.asyncio
+    async def test_hybrid_search_uses_reader_pool(self, manager, tmp_path, make_docs):
+        make_docs(2)
+        await manager.sync()
+
+        results = await manager.search("alpha", use_vector=True, use_hybrid=True)
+
+        assert {r.path for r in results} == {
+            str(tmp_path / "docs" / "doc0.md"),
+            str(tmp_path / "docs" / "doc1.md"),
+        }
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_parallel_search_during_bulk_sync_benchmark(manager, tmp_path, make_docs):
+    """Benchmark: N parallel memory searches while a bulk sync indexes files."""
+    make_docs(2_000)
+    await manager.sync()
+    for i in range(5_000):
+        (tmp_path / "docs" / f"new{i}.md").write_text(f"# New {i}\n\nbeta body {i}\n" * 4)
+
+    stall = 0.0
+    done = asyncio.Event()
+
+    async def monitor():
+        nonlocal stall
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            stall = max(stall, time.perf_counter() - started - 0.005)
+
+    latencies: list[float] = []
+
+    async def searcher():
+        while not done.is_set():
+            started = time.perf_counter()
+            results = await manager.search("alpha", limit=5)
+            latencies.append(time.perf_counter() - started)
+            assert results
+
+    async def run_sync():
+        try:
+            return await manager.sync()
+        finally:
+            done.set()
+
+    concurrency = 8
+    results = await asyncio.gather(
+        run_sync(), monitor(), *(searcher() for _ in range(concurrency))
+    )
+    stats = results[0]
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print(
+        f"\n{len(latencies)} searches x{concurrency} during sync of "
+        f"{stats['files_added']} files ({stats['duration_ms']}ms): "
+        f"p50 {p50:.1f}ms, p99 {p99:.1f}ms, max loop stall {stall * 1000:.1f}ms"
+    )
+    assert stats["files_added"] == 5_000
+    assert len(latencies) > concurrency
+    assert stall < 0.25
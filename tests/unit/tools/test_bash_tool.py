@@ -1,9 +1,13 @@
 """Unit tests for Bash tool"""
+import time
+import tracemalloc
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from openclaw.agents.tools.bash import BashTool
 from openclaw.agents.tools.base import ToolResult
+from openclaw.agents.tools.output_buffer import HeadTailBuffer
 
 
 class TestBashTool:
@@ -112,6 +116,113 @@ class TestBashToolSecurity:
         assert tool.working_dir == "/tmp"
 
 
+class TestBashToolStreaming:
+    """Test incremental, output-capped execution"""
+    
+    def test_head_tail_buffer(self):
+        """Test the buffer keeps both ends and reports the dropped middle"""
+        buf = HeadTailBuffer(max_bytes=10)
+        for chunk in (b"abc", b"defgh", b"ijklmnop", b"qrstuvwxyz"):
+            buf.write(chunk)
+        
+        assert buf.truncated
+        assert bytes(buf.head) == b"abcde"
+        assert bytes(buf.tail) == b"vwxyz"
+        assert buf.getvalue() == "abcde\n[... 16 bytes truncated ...]\nvwxyz"
+    
+    def test_head_tail_buffer_multibyte_split(self):
+        """Test characters straddling the head/tail split decode intact"""
+        buf = HeadTailBuffer(max_bytes=10)
+        buf.write("abcdé xyz".encode())
+        
+        assert not buf.truncated
+        assert buf.getvalue() == "abcdé xyz"
+        
+        buf = HeadTailBuffer(max_bytes=10)
+        buf.write("abcdé-0123456789-€yz".encode())
+        
+        # Cut characters are dropped whole rather than shown as U+FFFD
+        assert buf.truncated
+        assert buf.getvalue() == "abcd\n[... 14 bytes truncated ...]\n€yz"
+        assert "\ufffd" not in buf.getvalue()
+    
+    @pytest.mark.asyncio
+    async def test_large_output_is_capped(self):
+        """Test output beyond the cap is truncated, keeping head and tail"""
+        tool = BashTool(exec_config={"max_output_bytes": 1000})
+        
+        result = await tool.execute({"command": "seq 1 100000; echo done >&2"})
+        
+        assert result.success
+        assert result.metadata["truncated"]
+        assert result.metadata["outputBytes"] > 500_000
+        assert result.content.startswith("1\n2\n3\n")
+        assert "bytes truncated" in result.content
+        assert result.content.endswith("100000\n\ndone\n")
+        assert len(result.content) < 2200
+    
+    @pytest.mark.asyncio
+    async def test_small_output_unchanged(self):
+        """Test short output keeps the stdout-then-stderr format"""
+        tool = BashTool()
+        
+        result = await tool.execute({"command": "echo out; echo err >&2; exit 3"})
+        
+        assert not result.success
+        assert result.content == "out\n\nerr\n"
+        assert result.error == "Exit code: 3"
+        assert not result.metadata["truncated"]
+    
+    @pytest.mark.asyncio
+    async def test_progress_reports_partial_output(self):
+        """Test output is reported while the command is still running"""
+        tool = BashTool()
+        updates = []
+        
+        async def on_progress(current, total, message):
+            updates.append((time.monotonic(), message))
+        
+        started = time.monotonic()
+        result = await tool.execute_with_progress(
+            {"command": "echo first; sleep 0.8; echo second"}, on_progress
+        )
+        
+        assert result.success
+        assert "first" in updates[0][1]
+        assert updates[0][0] - started < 0.7
+        assert "second" in "".join(message for _, message in updates)
+    
+    @pytest.mark.asyncio
+    async def test_timeout_keeps_partial_output(self):
+        """Test a timed-out command returns what it printed so far"""
+        tool = BashTool(exec_config={"timeout_sec": 0.5})
+        
+        result = await tool.execute({"command": "echo started; sleep 5"})
+        
+        assert not result.success
+        assert "timed out" in result.error
+        assert "started" in result.content
+        assert result.metadata["outputBytes"] == len("started\n")
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_bash_output_memory_benchmark():
+    """Benchmark: peak Python allocations while a command prints 100 MB."""
+    tool = BashTool(exec_config={"max_output_bytes": 200_000})
+    
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = await tool.execute({"command": "head -c 100000000 /dev/zero | tr '\\0' 'x'"})
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    print(f"\n100 MB output: {elapsed:.2f}s, peak allocations {peak / 1024:.0f} KiB")
+    assert result.metadata["outputBytes"] == 100_000_000
+    assert peak < 5 * 1024 * 1024
+
+
 def test_bash_tool_imports():
     """Test that Bash tool can be imported"""
     try:
@@ -0,0 +1,253 @@
+"""Unit tests for the process supervisor and ProcessTool"""
+import asyncio
+import sys
+import time
+import tracemalloc
+
+import pytest
+
+from openclaw.agents.tools.process import MAX_LOG_BYTES, ProcessTool
+from openclaw.process.supervisor import (
+    OutputLog,
+    ProcessSupervisor,
+    get_process_supervisor,
+    shutdown_process_supervisor,
+)
+
+PY = sys.executable
+
+
+class TestOutputLog:
+    """Ring buffer with absolute offsets"""
+
+    def test_incremental_reads(self):
+        """Test reads from next_offset return only new output"""
+        log = OutputLog(capacity=100)
+        log.write(b"hello ")
+        data, offset, dropped = log.read(0)
+        assert (data, offset, dropped) == (b"hello ", 6, 0)
+
+        log.write(b"world")
+        data, offset, dropped = log.read(offset)
+        assert (data, offset, dropped) == (b"world", 11, 0)
+        assert log.read(offset)[0] == b""
+
+    def test_wraparound_reports_dropped(self):
+        """Test overwritten bytes are counted, not returned"""
+        log = OutputLog(capacity=10)
+        log.write(b"0123456789")
+        log.write(b"abcde")
+
+        data, offset, dropped = log.read(0)
+        assert data == b"56789abcde"
+        assert offset == 15
+        assert dropped == 5
+        assert log.start_offset == 5
+
+    def test_max_bytes_pages_output(self):
+        """Test max_bytes returns the oldest bytes and a resumable offset"""
+        log = OutputLog(capacity=100)
+        log.write(b"abcdefgh")
+
+        data, offset, _ = log.read(0, max_bytes=3)
+        assert (data, offset) == (b"abc", 3)
+        data, offset, _ = log.read(offset, max_bytes=100)
+        assert (data, offset) == (b"defgh", 8)
+
+    def test_tail_lines(self):
+        """Test tail by lines ignores the trailing newline"""
+        log = OutputLog(capacity=100)
+        log.write(b"one\ntwo\nthree\nfour\n")
+
+        assert log.tail(lines=2) == b"three\nfour\n"
+        assert log.tail(lines=10) == b"one\ntwo\nthree\nfour\n"
+        assert log.tail(max_bytes=5) == b"four\n"
+
+    def test_spill_rotation(self, tmp_path):
+        """Test spilled output rotates and keeps a bounded number of files"""
+        path = tmp_path / "job.log"
+        log = OutputLog(capacity=16, spill_path=path, spill_max_bytes=10, spill_backups=2)
+        for chunk in (b"a" * 10, b"b" * 10, b"c" * 10, b"d" * 4):
+            log.write(chunk)
+        log.close()
+
+        assert path.read_bytes() == b"d" * 4
+        assert (tmp_path / "job.log.1").read_bytes() == b"c" * 10
+        assert (tmp_path / "job.log.2").read_bytes() == b"b" * 10
+        assert not (tmp_path / "job.log.3").exists()
+
+
+class TestProcessSupervisor:
+    """Background processes with drained pipes"""
+
+    @pytest.mark.asyncio
+    async def test_large_output_does_not_block(self):
+        """Test a child writing far more than a pipe buffer still exits"""
+        supervisor = ProcessSupervisor(log_bytes=4096)
+        proc = await supervisor.start(f"{PY} -c \"import sys; sys.stdout.write('x' * 1000000)\"")
+
+        code = await supervisor.wait(proc.process_id, timeout=10)
+
+        assert code == 0
+        assert proc.log.end_offset == 1_000_000
+        result = supervisor.read(proc.process_id, since=0)
+        assert len(result["output"]) == 4096
+        assert result["dropped_bytes"] == 1_000_000 - 4096
+        assert result["running"] is False
+
+    @pytest.mark.asyncio
+    async def test_stderr_is_merged(self):
+        """Test stdout and stderr land in one log"""
+        supervisor = ProcessSupervisor()
+        proc = await supervisor.start("echo out; echo err >&2")
+        await supervisor.wait(proc.process_id, timeout=5)
+
+        output = supervisor.read(proc.process_id)["output"]
+        assert "out" in output
+        assert "err" in output
+
+    @pytest.mark.asyncio
+    async def test_duplicate_running_id_rejected(self):
+        """Test a running process_id cannot be reused"""
+        supervisor = ProcessSupervisor()
+        await supervisor.start("sleep 5", process_id="job")
+        try:
+            with pytest.raises(ValueError):
+                await supervisor.start("true", process_id="job")
+        finally:
+            await supervisor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_stop_reaches_children(self):
+        """Test stop signals the whole process group"""
+        supervisor = ProcessSupervisor()
+        proc = await supervisor.start("sleep 30 & sleep 30; wait")
+        await asyncio.sleep(0.2)
+        sample = supervisor.sample()["processes"][proc.process_id]
+        assert sample["num_processes"] >= 2
+
+        start = time.monotonic()
+        await supervisor.stop(proc.process_id, timeout=5)
+
+        assert time.monotonic() - start < 5
+        assert not proc.running
+        assert supervisor.sample()["total"]["running"] == 0
+
+    @pytest.mark.asyncio
+    async def test_reap_applies_retention(self):
+        """Test exited processes are dropped past retention and max count"""
+        supervisor = ProcessSupervisor(retention_sec=60, max_exited=2)
+        for i in range(3):
+            proc = await supervisor.start("true", process_id=f"p{i}")
+            await supervisor.wait(proc.process_id, timeout=5)
+
+        assert supervisor.reap() == 1
+        assert [p.process_id for p in supervisor.list_processes()] == ["p1", "p2"]
+
+        supervisor.retention_sec = 0
+        supervisor.get("p1").exited_at -= 1
+        supervisor.get("p2").exited_at -= 1
+        assert supervisor.reap() == 2
+        assert supervisor.list_processes() == []
+
+
+class TestProcessTool:
+    """ProcessTool on top of the supervisor"""
+
+    @pytest.mark.asyncio
+    async def test_log_follows_offsets(self):
+        """Test log returns only new output when given next_offset"""
+        tool = ProcessTool(ProcessSupervisor())
+        script = "import time\nfor i in range(3):\n    print(i, flush=True)\n    time.sleep(0.2)"
+        started = await tool.execute(
+            {"action": "start", "command": f"{PY} -c '{script}'", "process_id": "counter"}
+        )
+        assert started.success
+
+        await asyncio.sleep(0.1)
+        first = await tool.execute({"action": "log", "process_id": "counter", "offset": 0})
+        waited = await tool.execute({"action": "wait", "process_id": "counter", "timeout": 5})
+        rest = await tool.execute(
+            {"action": "log", "process_id": "counter", "offset": first.metadata["next_offset"]}
+        )
+
+        assert first.content == "0\n"
+        assert waited.success and waited.metadata["exit_code"] == 0
+        assert rest.content == "1\n2\n"
+        assert rest.metadata["running"] is False
+
+    @pytest.mark.asyncio
+    async def test_foreground_start_returns_output(self):
+        """Test background=False waits and returns the output"""
+        tool = ProcessTool(ProcessSupervisor())
+
+        result = await tool.execute({"action": "start", "command": "echo done", "background": False})
+
+        assert result.success
+        assert result.content == "done\n"
+        assert tool.supervisor.list_processes() == []
+
+    @pytest.mark.asyncio
+    async def test_foreground_start_marks_truncation(self):
+        """Test output beyond what is returned is flagged, not silently cut"""
+        tool = ProcessTool(ProcessSupervisor())
+        command = f"{PY} -c \"import sys; sys.stdout.write('x' * 100000 + 'end')\""
+
+        result = await tool.execute({"action": "start", "command": command, "background": False})
+
+        skipped = 100003 - MAX_LOG_BYTES
+        assert result.content == f"[truncated {skipped} bytes]\n" + "x" * (MAX_LOG_BYTES - 3) + "end"
+        assert result.metadata["truncated_bytes"] == skipped
+
+    @pytest.mark.asyncio
+    async def test_shared_supervisor_shutdown(self):
+        """Test the gateway shutdown hook stops processes the tool started"""
+        tool = ProcessTool()
+        assert tool.supervisor is get_process_supervisor()
+        started = await tool.execute({"action": "start", "command": "sleep 30"})
+        proc = tool.supervisor.get(started.metadata["process_id"])
+
+        await shutdown_process_supervisor()
+
+        assert not proc.running
+        assert tool.supervisor.list_processes() == []
+
+    @pytest.mark.asyncio
+    async def test_unknown_process(self):
+        """Test actions on an unknown process_id fail cleanly"""
+        tool = ProcessTool(ProcessSupervisor())
+
+        for action in ("log", "wait", "stop", "status"):
+            result = await tool.execute({"action": action, "process_id": "missing"})
+            assert not result.success
+            assert "not found" in result.error
+
+
+@pytest.mark.slow
+class TestProcessSupervisorBenchmark:
+    """Throughput and memory of draining a chatty child"""
+
+    @pytest.mark.asyncio
+    async def test_drain_throughput(self):
+        """Drain 200 MB of output into a 1 MB ring buffer"""
+        supervisor = ProcessSupervisor()
+        total = 200 * 1024 * 1024
+        command = (
+            f"{PY} -c \"import sys; b = b'y' * 65536\n"
+            f"for _ in range({total // 65536}): sys.stdout.buffer.write(b)\""
+        )
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        proc = await supervisor.start(command)
+        await supervisor.wait(proc.process_id, timeout=60)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(
+            f"\ndrained {total / 2**20:.0f} MiB in {elapsed:.2f}s "
+            f"({total / 2**20 / elapsed:.0f} MiB/s), peak {peak / 1024:.0f} KiB"
+        )
+        assert proc.log.end_offset == total
+        assert peak < 8 * 1024 * 1024